@@ -19,6 +19,7 @@ class CuPyBackend(BackendProxy, backend_name='cupy'):
 
     linalg = cp.linalg
     random = cp.random
+    fft = cp.fft
 
     @staticmethod
     def context(x):
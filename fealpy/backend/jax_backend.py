@@ -25,6 +25,7 @@ class JAXBackend(BackendProxy, backend_name='jax'):
     DATA_CLASS = Array
     linalg = jnp.linalg
     random = jax.random
+    fft = jnp.fft
 
     @staticmethod
     def context(tensor):
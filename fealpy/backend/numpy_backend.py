@@ -29,6 +29,7 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
 
     linalg = np.linalg
     random = np.random
+    fft = np.fft
 
     @staticmethod
     def context(tensor):
@@ -173,7 +174,8 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
                     coo_matvec(nnz, row, col, value, acol, rT[i])
                 return result
             else:
-                raise ValueError("`other` must be a 1-D or 2-D array.")
+                raise NotImplementedError("Batched `other` (more than 2-D) has "
+                                          "not been supported yet.")
         else:
             raise NotImplementedError("Batch sparse matrix multiplication has "
                                       "not been supported yet.")
@@ -194,7 +196,8 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
                 csr_matvecs(M, N, n_vecs, crow, col, value, other.ravel(), result.ravel())
                 return result
             else:
-                raise ValueError("`other` must be a 1-D or 2-D array.")
+                raise NotImplementedError("Batched `other` (more than 2-D) has "
+                                          "not been supported yet.")
         else:
             raise NotImplementedError("Batch sparse matrix multiplication has "
                                       "not been supported yet.")
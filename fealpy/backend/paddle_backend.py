@@ -25,6 +25,7 @@ class PaddleBackend(BackendProxy, backend_name='paddle'):
 
     linalg = paddle.linalg
     random = paddle.tensor.random
+    fft = paddle.fft
 
     @staticmethod
     def context(x):
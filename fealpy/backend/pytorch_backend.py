@@ -3,6 +3,7 @@ from typing import Union, Optional, Tuple, Any
 from itertools import combinations_with_replacement
 from functools import reduce, partial
 from math import factorial
+from threading import Lock
 
 try:
     import torch
@@ -24,6 +25,10 @@ from .base import (
 Tensor = torch.Tensor
 _device = torch.device
 
+# Forward-mode AD levels of torch.func are global, so the transforms can not
+# run concurrently in threads (e.g. in the parallel assembly of forms).
+_FUNC_TRANSFORM_LOCK = Lock()
+
 def _dim_to_axis(func):
     def wrapper(*args, axis=None, **kwargs):
         if axis is None:
@@ -62,6 +67,7 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
     DATA_CLASS = torch.Tensor
     linalg = torch.linalg
     random = torch.random
+    fft = torch.fft
 
     @staticmethod
     def context(tensor: Tensor, /):
@@ -249,9 +255,12 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
 
     @staticmethod
     def unique(a, return_index=False, return_inverse=False, return_counts=False, axis=0, **kwargs):
+        # NOTE: unique along a dim is much slower than the flattened one in torch,
+        # so use the latter for 1-d tensors where they are equivalent.
+        dim = None if a.ndim == 1 else axis
         b, inverse, counts = torch.unique(a, return_inverse=True,
                 return_counts=True,
-                dim=axis, **kwargs)
+                dim=dim, **kwargs)
         any_return = return_index or return_inverse or return_counts
         if any_return:
             result = (b, )
@@ -534,14 +543,16 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
         fn = vmap(jacfwd(
             partial(cls._simplex_shape_function_kernel, p=p, mi=mi)
         ))
-        return fn(bcs)
+        with _FUNC_TRANSFORM_LOCK:
+            return fn(bcs)
 
     @classmethod
     def simplex_hess_shape_function(cls, bcs: Tensor, p: int, mi=None) -> Tensor:
         fn = vmap(jacrev(jacfwd(
             partial(cls._simplex_shape_function_kernel, p=p, mi=mi)
         )))
-        return fn(bcs)
+        with _FUNC_TRANSFORM_LOCK:
+            return fn(bcs)
 
     @staticmethod
     def tensor_measure(entity: Tensor, node: Tensor) -> Tensor:
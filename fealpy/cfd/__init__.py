@@ -1,3 +1,12 @@
 from .ns_mac_solver import NSMacSolver
-from .ns_fem_solver import NSFEMSolver
 #from .ns_flip_solver import NSFlipSolver
+
+
+def __getattr__(name):
+    # NOTE: ns_fem_solver still depends on integrators which are not in the
+    # current fem module, it is imported on demand so that the rest of the
+    # package stays importable.
+    if name == 'NSFEMSolver':
+        from .ns_fem_solver import NSFEMSolver
+        return NSFEMSolver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
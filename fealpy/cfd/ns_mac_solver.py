@@ -1,294 +1,371 @@
 import numpy as np
-from scipy.sparse import diags
-from scipy.sparse import diags, lil_matrix,csr_matrix,coo_matrix
-from scipy.sparse import vstack,hstack
-from scipy.sparse.linalg import spsolve
+from scipy.sparse import csr_matrix
+from scipy.fft import dctn, idctn
 from ..mesh import UniformMesh2d
 
 
+class Stencil():
+    """
+    @brief 结构网格之间的线性算子, 由若干项
+
+        out[I, J] += coef * u[I + di, J + dj]
+
+    组成, 其中 (I, J) 取遍输出网格的一个矩形子区域. 作用在网格函数上时只需要
+    数组切片 (matrix-free), 需要矩阵时由同样的项生成稀疏矩阵, 两者严格一致.
+
+    @param out_shape 输出网格的节点形状 (n0, n1)
+    @param in_shape 输入网格的节点形状 (n0, n1)
+    """
+    def __init__(self, out_shape, in_shape):
+        self.out_shape = tuple(out_shape)
+        self.in_shape = tuple(in_shape)
+        self.terms = []
+
+    @property
+    def shape(self):
+        return (self.out_shape[0]*self.out_shape[1], self.in_shape[0]*self.in_shape[1])
+
+    def add(self, region, offset, coef):
+        """
+        @brief 添加一项
+        @param region 输出网格的区域 (slice, slice)
+        @param offset 输入网格相对输出网格的下标偏移 (di, dj)
+        @param coef 系数, 标量或形状与区域一致的数组
+        """
+        i0, i1, _ = region[0].indices(self.out_shape[0])
+        j0, j1, _ = region[1].indices(self.out_shape[1])
+        di, dj = offset
+        if (i0 + di < 0) or (i1 + di > self.in_shape[0]) or \
+                (j0 + dj < 0) or (j1 + dj > self.in_shape[1]):
+            raise ValueError(f"The term with region {region} and offset {offset} "
+                             f"is out of the input grid {self.in_shape}.")
+        self.terms.append(((i0, i1, j0, j1), (di, dj), coef))
+        return self
+
+    def __call__(self, u):
+        """
+        @brief 作用在网格函数上, u 的形状为 (N, ) 或 (n0, n1), 返回相同的布局
+        """
+        flat = u.ndim == 1
+        U = u.reshape(self.in_shape)
+        out = np.zeros(self.out_shape, dtype=np.result_type(U.dtype, np.float64))
+        for (i0, i1, j0, j1), (di, dj), coef in self.terms:
+            out[i0:i1, j0:j1] += coef * U[i0+di:i1+di, j0+dj:j1+dj]
+        return out.reshape(-1) if flat else out
+
+    def __matmul__(self, u):
+        return self(u)
+
+    def tocsr(self):
+        """
+        @brief 生成稀疏矩阵, 网格节点按 (i, j) 的字典序编号
+        """
+        kout = np.arange(self.shape[0]).reshape(self.out_shape)
+        kin = np.arange(self.shape[1]).reshape(self.in_shape)
+        I, J, V = [], [], []
+        for (i0, i1, j0, j1), (di, dj), coef in self.terms:
+            rows = kout[i0:i1, j0:j1]
+            I.append(rows.reshape(-1))
+            J.append(kin[i0+di:i1+di, j0+dj:j1+dj].reshape(-1))
+            V.append(np.broadcast_to(coef, rows.shape).reshape(-1))
+        I = np.concatenate(I)
+        J = np.concatenate(J)
+        V = np.concatenate(V).astype(np.float64)
+        return csr_matrix((V, (I, J)), shape=self.shape)
+
+
 class NSMacSolver():
+    """
+    @brief 交错网格 (MAC) 上的不可压 Navier-Stokes 方程求解器
+
+    @note 交错网格上的算子 (du, dv, Tuv, laplace_u 等) 都由 `Stencil` 定义, 并按
+    网格的规模和步长缓存在类中, 同样规模的求解器和时间步之间共享. `apply` 以数组
+    切片作用算子而不组装矩阵; 矩阵形式的方法 (如 `laplace_u()`) 返回缓存的矩阵,
+    调用者不应原地修改. 压力的 Poisson 方程 (齐次 Neumann 边界) 由 `pressure_solve`
+    通过离散余弦变换快速求解, 每步 O(N log N).
+    """
+    _cache = {}
+
     def __init__(self,Re, mesh):
         self.ftype = np.float64
         self.mesh = mesh
-        nx = int(mesh.ds.nx)
-        ny = int(mesh.ds.ny)
+        nx = int(mesh.nx)
+        ny = int(mesh.ny)
         hx = mesh.h[0]
         hy = mesh.h[1]
         self.umesh = UniformMesh2d([0, nx, 0, ny-1], h=(hx, hy), origin=(0, 0+hy/2))
         self.vmesh = UniformMesh2d([0, nx-1, 0, ny], h=(hx, hy), origin=(0+hx/2, 0))
         self.pmesh = UniformMesh2d([0, nx-1, 0, ny-1], h=(hx, hy), origin=(0+hx/2, 0+hy/2))
+        self._key = (nx, ny, float(hx), float(hy))
+
+    ## 算子的缓存
+    def _cached(self, name, builder):
+        key = (name, ) + self._key
+        cache = NSMacSolver._cache
+        if key not in cache:
+            cache[key] = builder()
+        return cache[key]
+
+    def stencil(self, name):
+        """
+        @brief 取缓存的算子
+        @param name 'dux', 'duy', 'dvx', 'dvy', 'Tuv', 'Tvu', 'laplace_u', 'laplace_v',
+               'dp_u', 'dp_v', 'dpm_u', 'dpm_v' 或 'laplace_phi'
+        """
+        builder = getattr(self, '_stencil_' + name, None)
+        if builder is None:
+            raise ValueError(f"Unknown operator {name}")
+        return self._cached(('stencil', name), builder)
+
+    def apply(self, name, u):
+        """
+        @brief 以数组切片作用算子 `name`, 等价于 `matrix(name) @ u`
+        """
+        return self.stencil(name)(u)
+
+    def matrix(self, name):
+        """
+        @brief 算子 `name` 的 (缓存的) 稀疏矩阵
+        """
+        return self._cached(('matrix', name), lambda: self.stencil(name).tocsr())
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache.clear()
+
+    def _shape(self, mesh):
+        return (int(mesh.nx)+1, int(mesh.ny)+1)
+
+    def _coef(self):
+        hx, hy = self._key[2:]
+        return 1/hx, 1/hy
+
+    ## 算子的定义
+    def _stencil_dux(self):
+        # 中心差分, x 方向两端的行为零
+        s = self._shape(self.umesh)
+        cx = 1/(2*self._key[2])
+        A = Stencil(s, s)
+        A.add((slice(1, None), slice(None)), (-1, 0), -cx)
+        A.add((slice(None, -1), slice(None)), (1, 0), cx)
+        return A
+
+    def _stencil_duy(self):
+        # 中心差分, y 方向两端用 u=b 的壁面做单侧修正
+        s = self._shape(self.umesh)
+        cy = 1/(2*self._key[3])
+        B = Stencil(s, s)
+        B.add((slice(None), slice(None, -1)), (0, 1), cy)
+        B.add((slice(None), slice(1, None)), (0, -1), -cy)
+        B.add((slice(None), slice(0, 1)), (0, 0), 2*cy)
+        B.add((slice(None), slice(0, 1)), (0, 1), -cy/3)
+        B.add((slice(None), slice(-1, None)), (0, 0), -2*cy)
+        B.add((slice(None), slice(-1, None)), (0, -1), cy/3)
+        return B
+
+    def _stencil_dvx(self):
+        s = self._shape(self.vmesh)
+        cx = 1/(2*self._key[2])
+        A = Stencil(s, s)
+        A.add((slice(None, -1), slice(None)), (1, 0), cx)
+        A.add((slice(1, None), slice(None)), (-1, 0), -cx)
+        A.add((slice(0, 1), slice(None)), (0, 0), 2*cx)
+        A.add((slice(0, 1), slice(None)), (1, 0), -cx/3)
+        A.add((slice(-1, None), slice(None)), (0, 0), -2*cx)
+        A.add((slice(-1, None), slice(None)), (-1, 0), cx/3)
+        return A
+
+    def _stencil_dvy(self):
+        s = self._shape(self.vmesh)
+        cy = 1/(2*self._key[3])
+        B = Stencil(s, s)
+        B.add((slice(None), slice(None, -1)), (0, 1), cy)
+        B.add((slice(None), slice(1, None)), (0, -1), -cy)
+        return B
+
+    def _stencil_Tuv(self):
+        # v 在 u 节点上的四点平均, u 网格 x 方向两端的行为零
+        su, sv = self._shape(self.umesh), self._shape(self.vmesh)
+        A = Stencil(su, sv)
+        region = (slice(1, -1), slice(None))
+        for offset in [(-1, 1), (0, 1), (0, 0), (-1, 0)]:
+            A.add(region, offset, 1/4)
+        return A
+
+    def _stencil_Tvu(self):
+        # u 在 v 节点上的四点平均, v 网格 y 方向两端的行为零
+        su, sv = self._shape(self.umesh), self._shape(self.vmesh)
+        A = Stencil(sv, su)
+        region = (slice(None), slice(1, -1))
+        for offset in [(0, 0), (1, 0), (1, -1), (0, -1)]:
+            A.add(region, offset, 1/4)
+        return A
+
+    def _laplace(self, s, cx2, cy2):
+        A = Stencil(s, s)
+        A.add((slice(None), slice(None)), (0, 0), -2*cx2 - 2*cy2)
+        A.add((slice(None, -1), slice(None)), (1, 0), cx2)
+        A.add((slice(1, None), slice(None)), (-1, 0), cx2)
+        A.add((slice(None), slice(None, -1)), (0, 1), cy2)
+        A.add((slice(None), slice(1, None)), (0, -1), cy2)
+        return A
+
+    def _stencil_laplace_u(self):
+        s = self._shape(self.umesh)
+        cx, cy = self._coef()
+        A = self._laplace(s, cx**2, cy**2)
+        A.add((slice(None), slice(0, 1)), (0, 0), -2*cy**2)
+        A.add((slice(None), slice(0, 1)), (0, 1), cy**2/3)
+        A.add((slice(None), slice(-1, None)), (0, 0), -2*cy**2)
+        A.add((slice(None), slice(-1, None)), (0, -1), cy**2/3)
+        return A
+
+    def _stencil_laplace_v(self):
+        s = self._shape(self.vmesh)
+        cx, cy = self._coef()
+        A = self._laplace(s, cx**2, cy**2)
+        A.add((slice(0, 1), slice(None)), (0, 0), -2*cx**2)
+        A.add((slice(0, 1), slice(None)), (1, 0), cx**2/3)
+        A.add((slice(-1, None), slice(None)), (0, 0), -2*cx**2)
+        A.add((slice(-1, None), slice(None)), (-1, 0), cx**2/3)
+        return A
 
+    def _stencil_dp_u(self):
+        # 压力在 u 节点上的 x 方向差分, u 网格 x 方向两端的行为零
+        su, sp = self._shape(self.umesh), self._shape(self.pmesh)
+        cx = self._coef()[0]
+        A = Stencil(su, sp)
+        A.add((slice(1, -1), slice(None)), (0, 0), cx)
+        A.add((slice(1, -1), slice(None)), (-1, 0), -cx)
+        return A
+
+    def _stencil_dp_v(self):
+        sv, sp = self._shape(self.vmesh), self._shape(self.pmesh)
+        cy = self._coef()[1]
+        A = Stencil(sv, sp)
+        A.add((slice(None), slice(1, -1)), (0, 0), cy)
+        A.add((slice(None), slice(1, -1)), (0, -1), -cy)
+        return A
+
+    def _stencil_dpm_u(self):
+        # u 在压力节点 (单元中心) 上的散度分量
+        sp, su = self._shape(self.pmesh), self._shape(self.umesh)
+        cx = self._coef()[0]
+        A = Stencil(sp, su)
+        A.add((slice(None), slice(None)), (0, 0), -cx)
+        A.add((slice(None), slice(None)), (1, 0), cx)
+        return A
+
+    def _stencil_dpm_v(self):
+        sp, sv = self._shape(self.pmesh), self._shape(self.vmesh)
+        cy = self._coef()[1]
+        B = Stencil(sp, sv)
+        B.add((slice(None), slice(None)), (0, 1), cy)
+        B.add((slice(None), slice(None)), (0, 0), -cy)
+        return B
+
+    def _stencil_laplace_phi(self):
+        # 单元中心的五点差分, 齐次 Neumann 边界 (边界处去掉缺失的邻点)
+        s = self._shape(self.pmesh)
+        cx, cy = self._coef()
+        A = Stencil(s, s)
+        A.add((slice(None, -1), slice(None)), (1, 0), cx**2)
+        A.add((slice(None, -1), slice(None)), (0, 0), -cx**2)
+        A.add((slice(1, None), slice(None)), (-1, 0), cx**2)
+        A.add((slice(1, None), slice(None)), (0, 0), -cx**2)
+        A.add((slice(None), slice(None, -1)), (0, 1), cy**2)
+        A.add((slice(None), slice(None, -1)), (0, 0), -cy**2)
+        A.add((slice(None), slice(1, None)), (0, -1), cy**2)
+        A.add((slice(None), slice(1, None)), (0, 0), -cy**2)
+        return A
+
+    ## 矩阵形式的算子
     def du(self):
-        mesh = self.umesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(2*mesh.h[0])
-        cy = 1/(2*mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A = diags([-cx,cx],[-n1,n1],shape=(NN,NN),format='csr')
-        B = diags([0,cy,-cy],[0,1,-1],shape=(NN,NN),format='csr')
-
-        val0 = np.broadcast_to(2*cy,(n0,))
-        I0 = k[:,0]
-        I_0 = k[:,-1]
-        B += csr_matrix((val0,(I0,I0)),shape=(NN,NN),dtype=self.ftype)
-        B += csr_matrix((-val0,(I_0,I_0)),shape=(NN,NN),dtype=self.ftype)
-        
-        val1 = np.broadcast_to(-cy/3,(n0,))
-        J1 = k[:,1]
-        J_1 = k[:,-2]
-        B += csr_matrix((val1,(I0,J1)),shape=(NN,NN),dtype=self.ftype)
-        B += csr_matrix((-val1,(I_0,J_1)),shape=(NN,NN),dtype=self.ftype)
-        
-        val2 = np.broadcast_to(cy,(n0-1,))
-        J0m = k[1:,0]
-        J1m = k[:-1,-1]
-        JNm = k[:-1,-1]
-        B += csr_matrix((val2,(J0m,JNm)),shape=(NN,NN),dtype=self.ftype)
-        B += csr_matrix((-val2,(J1m,J0m)),shape=(NN,NN),dtype=self.ftype)
-        return A,B
+        return self.matrix('dux'), self.matrix('duy')
 
     def dv(self):
-        mesh = self.vmesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(2*mesh.h[0])
-        cy = 1/(2*mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A = diags([0,cx,-cx],[0,n1,-n1],shape=(NN,NN), format='csr')
-        B = diags([0,cx,-cx],[0,1,-1],shape=(NN,NN), format='csr')
-        
-        val0 = np.broadcast_to(2*cx,(n1,))
-        val1 = np.broadcast_to(-cx/3,(n1,))
-        I0 = k[0,:]
-        I_0 = k[-1,:]
-        J1 = k[1,:]
-        J_1 = k[-2,:]
-        A += csr_matrix((val0, (I0,I0)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0,J1)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((-val0, (I_0,I_0)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((-val1, (I_0,J_1)), shape=(NN,NN), dtype=self.ftype)   
-        return A,B
-    
+        return self.matrix('dvx'), self.matrix('dvy')
+
     def Tuv(self):
-        vmesh = self.vmesh
-        umesh = self.umesh
-        vn0 = vmesh.ds.nx+1 
-        vn1 = vmesh.ds.ny+1 
-        un0 = umesh.ds.nx+1 
-        un1 = umesh.ds.ny+1 
-        NN = umesh.number_of_nodes()
-        vk = np.arange(NN).reshape(vn0,vn1)
-        uk = np.arange(NN).reshape(un0,un1)
-
-        val = np.broadcast_to(1/4, (NN-2*un1,))
-        Iu = uk[1:un0-1,:].flat
-        Jv0 = vk[:vn0-1,1:].flat
-        Jv1 = vk[1:,1:].flat
-        Jv2 = vk[1:,:vn1-1].flat
-        Jv3 = vk[:vn0-1,:vn1-1].flat
-        A = csr_matrix((val, (Iu, Jv0)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iu, Jv1)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iu, Jv2)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iu, Jv3)), shape=(NN, NN), dtype=self.ftype)
-        return A
-    
+        return self.matrix('Tuv')
+
     def Tvu(self):
-        vmesh = self.vmesh
-        umesh = self.umesh
-        vn0 = vmesh.ds.nx+1 
-        vn1 = vmesh.ds.ny+1 
-        un0 = umesh.ds.nx+1 
-        un1 = umesh.ds.ny+1 
-        NN = umesh.number_of_nodes()
-        vk = np.arange(NN).reshape(vn0,vn1)
-        uk = np.arange(NN).reshape(un0,un1)
-        
-        val = np.broadcast_to(1/4, (NN-2*vn0,))
-        Iv = vk[:,1:vn1-1].flat
-        Ju0 = uk[:un0-1,1:].flat
-        Ju1 = uk[1:,1:].flat
-        Ju2 = uk[1:,:un1-1].flat
-        Ju3 = uk[:un0-1,:un1-1].flat
-        A = csr_matrix((val, (Iv, Ju0)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iv, Ju1)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iv, Ju2)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val, (Iv, Ju3)), shape=(NN, NN), dtype=self.ftype)
-        return A
-        
+        return self.matrix('Tvu')
+
     def laplace_u(self,c=None):
-        mesh = self.umesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(mesh.h[0])
-        cy = 1/(mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A = diags([-4*cx*cy,cx*cy,cx*cy,cx*cy,cx*cy], [0,1,-1,n1,-n1], shape=(NN, NN), format='csr')
-        
-        val0 = np.broadcast_to(-2*cx*cy,(n0,))
-        I0 = k[:,0]
-        I_0 = k[:,-1]
-        A += csr_matrix((val0, (I0,I0)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val0, (I_0,I_0)), shape=(NN,NN), dtype=self.ftype)
-        
-        val1 = np.broadcast_to((1/3)*cx*cy,(n0,))
-        J1 = k[:,1]
-        J_1 = k[:,-2]
-        A += csr_matrix((val1, (I0,J1)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I_0,J_1)), shape=(NN,NN), dtype=self.ftype)
-        
-        val2 = np.broadcast_to(-cx*cy,(n0-1,))
-        I0m = k[1:,0]
-        J_0m = k[:-1,-1]
-        J0m = k[1:,0]
-        A += csr_matrix((val2, (I0m,J_0m)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val2, (J_0m,J0m)), shape=(NN,NN), dtype=self.ftype)
-        if c == None:
+        A = self.matrix('laplace_u')
+        if c is None:
             return A
         else:
             return c*A
 
     def laplace_v(self,c=None):
-        mesh = self.vmesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(mesh.h[0])
-        cy = 1/(mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A = diags([-4*cx*cy,cx*cy,cx*cy,cx*cy,cx*cy], [0,1,-1,n1,-n1], shape=(NN, NN), format='csr')
-
-        val0 = np.broadcast_to(-2*cx*cy, (n1,))
-        val1 = np.broadcast_to((1/3)*cx*cy, (n1,))
-        I0 = k[0,:]
-        I_0 = k[-1,:]
-        J0m = k[1,:]
-        J_0m = k[-2,:]
-        A += csr_matrix((val0, (I0,I0)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val0, (I_0,I_0)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0,J0m)), shape=(NN,NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I_0,J_0m)), shape=(NN,NN), dtype=self.ftype)
-        if c == None:
+        A = self.matrix('laplace_v')
+        if c is None:
             return A
         else:
             return c*A
-    
+
     def dp_u(self):
-        mesh = self.pmesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(mesh.h[0])
-        cy = 1/(mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A0 = diags([cx,-cx], [0,-n1], shape=(NN, NN), format='csr')
-        A1 = diags([0], [0], shape=(n1, NN), format='csr')
-        A = vstack([A0, A1], format='csr')  
-        A[ :n1, : ] = 0 
-        return A
-    
+        return self.matrix('dp_u')
+
     def dp_v(self):
-        vmesh = self.vmesh
-        pmesh = self.pmesh
-        vn0 = vmesh.ds.nx+1 
-        vn1 = vmesh.ds.ny+1 
-        pn0 = pmesh.ds.nx+1 
-        pn1 = pmesh.ds.ny+1 
-        NNv = vmesh.number_of_nodes()
-        NNp = pmesh.number_of_nodes()
-        cx = 1/(pmesh.h[0])
-        cy = 1/(pmesh.h[1])
-        vk = np.arange(NNv).reshape(vn0,vn1)
-        pk = np.arange(NNp).reshape(pn0,pn1)
-
-        val = np.broadcast_to(cy, (NNv-2*vn0,))
-        Iv = vk[:,1:vn1-1].flat
-        Jp0 = pk[:,:pn1-1].flat
-        Jp1 = pk[:,1:].flat
-        A = csr_matrix((val, (Iv, Jp1)), shape=(NNv, NNp), dtype=self.ftype)
-        A += csr_matrix((-val, (Iv, Jp0)), shape=(NNv, NNp), dtype=self.ftype)
-        return A
-    
+        return self.matrix('dp_v')
+
     def source_Fx(self, pde ,t):
         mesh = self.umesh
         nodes = mesh.entity('node')
-        source = pde.source_F(nodes,t) 
+        source = pde.source_F(nodes,t)
         return source
-    
+
     def dpm(self):
-        vmesh = self.vmesh
-        umesh = self.umesh
-        pmesh = self.pmesh
-        cx = 1 / (umesh.h[0])
-        cy = 1 / (vmesh.h[1])
-        vn0 = vmesh.ds.nx+1 
-        vn1 = vmesh.ds.ny+1 
-        un0 = umesh.ds.nx+1 
-        un1 = umesh.ds.ny+1 
-        pn0 = pmesh.ds.nx+1 
-        pn1 = pmesh.ds.ny+1 
-        NN = umesh.number_of_nodes()
-        NNp = pmesh.number_of_nodes()
-        vk = np.arange(NN).reshape(vn0,vn1)
-        uk = np.arange(NN).reshape(un0,un1)
-        pk = np.arange(NNp).reshape(pn0,pn1)
-        A = diags([-cx,cx], [0,un1], shape=(NNp, NN), format='csr')
-
-        val = np.broadcast_to(cy, (NN-vn0,))
-        I = pk.flat
-        J0m = vk[:,:-1].flat
-        J_0m = vk[:,1:].flat
-        B = csr_matrix((val, (I,J_0m)), shape=(NNp, NN), dtype=self.ftype)
-        B += csr_matrix((-val, (I,J0m)), shape=(NNp, NN), dtype=self.ftype)
-        return A,B
+        return self.matrix('dpm_u'), self.matrix('dpm_v')
 
     def laplace_phi(self):
-        mesh = self.pmesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
-        cx = 1/(mesh.h[0])
-        cy = 1/(mesh.h[1])
-        NN = mesh.number_of_nodes()
-        k = np.arange(NN).reshape(n0,n1)
-        A = diags([-4*cx*cy,cx*cy,cx*cy,cx*cy,cx*cy], [0,1,-1,n1,-n1], shape=(NN, NN), format='csr')
-        
-        val0 = np.broadcast_to(2*cx*cy,(4,))
-        val1 = np.broadcast_to(1*cx*cy,(n1-2,))
-        val2 = np.broadcast_to(-1*cx*cy,(n1-1,))
-        I0c = [k[0,0],k[0,-1],k[-1,0],k[-1,-1]]
-        I0l = k[0,1:n1-1]
-        I0r = k[-1,1:n1-1]
-        I0d = k[1:n1-1,0]
-        I0u = k[1:n1-1,-1]
-        J0m = k[1:,0]
-        J_0m = k[:-1,-1]
-        A += csr_matrix((val0, (I0c, I0c)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0l, I0l)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0r, I0r)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0d, I0d)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val1, (I0u, I0u)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val2, (J_0m, J0m)), shape=(NN, NN), dtype=self.ftype)
-        A += csr_matrix((val2, (J0m, J_0m)), shape=(NN, NN), dtype=self.ftype)
-        return A.toarray()
+        return self._cached('laplace_phi_dense', lambda: self.matrix('laplace_phi').toarray())
+
+    ## 压力 Poisson 方程的快速求解
+    def _laplace_phi_eigenvalues(self):
+        def builder():
+            n0, n1 = self._shape(self.pmesh)
+            cx, cy = self._coef()
+            lx = 2*cx**2*(np.cos(np.pi*np.arange(n0)/n0) - 1)
+            ly = 2*cy**2*(np.cos(np.pi*np.arange(n1)/n1) - 1)
+            lam = lx[:, None] + ly[None, :]
+            lam[0, 0] = 1.0 # 常数模态, 对应的分量置零
+            return lam
+        return self._cached('laplace_phi_eigenvalues', builder)
+
+    def pressure_solve(self, f):
+        """
+        @brief 求解 laplace_phi() @ phi = f. 齐次 Neumann 的五点差分由二维 DCT-II
+               对角化, 右端项投影到均值为零的空间, 返回均值为零的解
+        @param f 压力节点上的右端项, 形状为 (NNp, ) 或 (n0, n1)
+        """
+        shape = self._shape(self.pmesh)
+        F = np.reshape(f, shape)
+        lam = self._laplace_phi_eigenvalues()
+        Fh = dctn(F, type=2, norm='ortho')
+        Fh /= lam
+        Fh[0, 0] = 0.0
+        phi = idctn(Fh, type=2, norm='ortho')
+        return phi.reshape(np.shape(f))
 
     #找v网格边界点位置
     def vnodes_ub(self):
         mesh = self.mesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
+        n0 = mesh.nx+1
+        n1 = mesh.ny+1
         vmesh = self.vmesh
-        vn0 = vmesh.ds.nx+1 
-        vn1 = vmesh.ds.ny+1 
+        vn0 = vmesh.nx+1
+        vn1 = vmesh.ny+1
         nodes = mesh.entity('node')
-        vnodes = vmesh.entity('node')
+        vnodes = np.copy(vmesh.entity('node'))
         NN = mesh.number_of_nodes()
         NNv = vmesh.number_of_nodes()
         k = np.arange(NN).reshape(n0,n1)
         kv = np.arange(NNv).reshape(vn0,vn1)
-        A0 = nodes[1:vn1-1,:] 
+        A0 = nodes[1:vn1-1,:]
         A1 = nodes[NN-vn1+1:-1,:]
         I0 = kv[0,1:vn1-1]
         I1 = kv[-1,1:vn1-1]
@@ -301,13 +378,13 @@ class NSMacSolver():
     #找u网格边界点位置
     def unodes_ub(self):
         mesh = self.mesh
-        n0 = mesh.ds.nx+1 
-        n1 = mesh.ds.ny+1 
+        n0 = mesh.nx+1
+        n1 = mesh.ny+1
         umesh = self.umesh
-        un0 = umesh.ds.nx+1 
-        un1 = umesh.ds.ny+1 
+        un0 = umesh.nx+1
+        un1 = umesh.ny+1
         nodes = mesh.entity('node')
-        unodes = umesh.entity('node')
+        unodes = np.copy(umesh.entity('node'))
         NN = mesh.number_of_nodes()
         NNu = umesh.number_of_nodes()
         k = np.arange(NN).reshape(n0,n1)
@@ -322,4 +399,4 @@ class NSMacSolver():
         unodes[I1,1] = A1[:,1]
         unodes[ku[:,1:-1],0] = 0
         unodes[ku[:,1:-1],1] = 0
-        return unodes
\ No newline at end of file
+        return unodes
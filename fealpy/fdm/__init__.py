@@ -0,0 +1,3 @@
+
+from .laplace_operator import LaplaceOperator
+from .fast_poisson_solver import FastPoissonSolver
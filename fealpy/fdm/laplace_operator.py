@@ -0,0 +1,213 @@
+
+from typing import Union, Sequence, Callable, Tuple, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+
+BoundaryCondition = Union[str, Sequence[str]]
+_BC_TYPES = ('dirichlet', 'neumann', 'periodic')
+
+
+def grid_cells(mesh) -> Tuple[int, ...]:
+    """Numbers of the cells along the axes of a UniformMesh2d or UniformMesh3d."""
+    if mesh.TD == 2:
+        return (mesh.nx, mesh.ny)
+    elif mesh.TD == 3:
+        return (mesh.nx, mesh.ny, mesh.nz)
+    raise ValueError(f"Only 2d and 3d uniform meshes are supported, but got TD={mesh.TD}.")
+
+
+def boundary_conditions(bc: BoundaryCondition, TD: int) -> Tuple[str, ...]:
+    """Expand the boundary condition to one type per axis."""
+    bc = (bc, ) * TD if isinstance(bc, str) else tuple(bc)
+    if len(bc) != TD:
+        raise ValueError(f"Expected {TD} boundary conditions, but got {len(bc)}.")
+    for b in bc:
+        if b not in _BC_TYPES:
+            raise ValueError(f"Unknown boundary condition '{b}', "
+                             f"should be one of {_BC_TYPES}.")
+    return bc
+
+
+def unknown_range(n: int, bc: str) -> Tuple[int, int]:
+    """Range of the node indices of the unknowns along an axis with n cells.
+    Dirichlet nodes are eliminated, and the last node of a periodic axis is
+    identified with the first one."""
+    if bc == 'dirichlet':
+        return (1, n)
+    elif bc == 'neumann':
+        return (0, n + 1)
+    return (0, n)
+
+
+class LaplaceOperator():
+    """The 5-point (2d) or 7-point (3d) finite difference approximation of
+    -div(a grad u) on the nodes of a UniformMesh2d or UniformMesh3d.
+
+    The unknowns are the nodes not on a Dirichlet boundary, ordered as the
+    nodes of the mesh (`dof_index`). On a Neumann boundary the equation is
+    closed with the ghost node mirrored inside, and on a periodic axis the
+    last node is identified with the first one. The coefficient `a` is
+    evaluated at the midpoints of the grid edges.
+
+    The equations at the Neumann boundary nodes are multiplied by 1/2 for
+    every Neumann axis they are on, which keeps the matrix symmetric. So the
+    right-hand side there should be multiplied by `dof_weight` too.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): The mesh.
+        bc (str | Sequence[str], optional): 'dirichlet', 'neumann' or 'periodic',
+            for all the axes or one per axis. Defaults to 'dirichlet'.
+        coef (float | Callable | None, optional): The diffusion coefficient,
+            a number or a function of the points shaped (..., GD). Defaults to None (1).
+
+    Example:
+    ```
+        L = LaplaceOperator(mesh, 'dirichlet')
+        A = L.assembly()
+        f = L.dof_weight() * source(mesh.entity('node'))[L.dof_index()] + L.dirichlet_rhs(gd)
+    ```
+    """
+    def __init__(self, mesh, bc: BoundaryCondition='dirichlet',
+                 coef: Union[float, Callable, None]=None) -> None:
+        self.mesh = mesh
+        self.cells = grid_cells(mesh)
+        self.bc = boundary_conditions(bc, len(self.cells))
+        self.coef = coef
+        self.ranges = [unknown_range(n, b) for n, b in zip(self.cells, self.bc)]
+        self.grid_shape = tuple(hi - lo for lo, hi in self.ranges)
+        self._matrices = None
+
+    def number_of_dofs(self) -> int:
+        NDof = 1
+        for s in self.grid_shape:
+            NDof *= s
+        return NDof
+
+    def _multi_index(self) -> List[TensorLike]:
+        """Node multi-indices of the unknowns along every axis, flattened."""
+        ikwargs = {'dtype': self.mesh.itype, 'device': self.mesh.device}
+        axes = [bm.arange(lo, hi, **ikwargs) for lo, hi in self.ranges]
+        grids = bm.meshgrid(*axes, indexing='ij')
+        return [bm.reshape(g, (-1, )) for g in grids]
+
+    def _linear_index(self, idx: Sequence[TensorLike], shape, offset) -> TensorLike:
+        out = idx[0] - offset[0]
+        for d in range(1, len(idx)):
+            out = out * shape[d] + (idx[d] - offset[d])
+        return out
+
+    def node_index(self, idx: Sequence[TensorLike]) -> TensorLike:
+        """Indices of the mesh nodes with the multi-indices `idx`."""
+        return self._linear_index(idx, [n + 1 for n in self.cells], [0] * len(idx))
+
+    def dof_number(self, idx: Sequence[TensorLike]) -> TensorLike:
+        """Numbers of the unknowns at the nodes with the multi-indices `idx`."""
+        return self._linear_index(idx, self.grid_shape, [lo for lo, _ in self.ranges])
+
+    def dof_index(self) -> TensorLike:
+        """Indices of the mesh nodes of the unknowns, shaped (NDof, )."""
+        return self.node_index(self._multi_index())
+
+    def dof_weight(self) -> TensorLike:
+        """The factors multiplying the equations of the unknowns, 1/2 to the
+        power of the number of Neumann boundaries a node is on, shaped (NDof, )."""
+        idx = self._multi_index()
+        weight = bm.ones(idx[0].shape, dtype=self.mesh.ftype, device=self.mesh.device)
+        for d, (n, bc) in enumerate(zip(self.cells, self.bc)):
+            if bc == 'neumann':
+                weight = bm.where((idx[d] == 0) | (idx[d] == n), 0.5 * weight, weight)
+        return weight
+
+    def _weight(self, idx: Sequence[TensorLike], axis: int, link: TensorLike) -> TensorLike:
+        h, origin = self.mesh.h, self.mesh.origin
+        if (self.coef is None) or (not callable(self.coef)):
+            coef = 1.0 if self.coef is None else self.coef
+            return bm.full(link.shape, coef / h[axis]**2, dtype=self.mesh.ftype,
+                           device=self.mesh.device)
+        points = []
+        for d, i in enumerate(idx):
+            i = link + 0.5 if d == axis else i
+            points.append(origin[d] + bm.astype(i, self.mesh.ftype) * h[d])
+        points = bm.stack(points, axis=-1)
+        return self.coef(points) / h[axis]**2
+
+    def _assemble(self):
+        NDof = self.number_of_dofs()
+        NN = self.mesh.number_of_nodes()
+        idx = self._multi_index()
+        row = self.dof_number(idx)
+        diag = bm.zeros((NDof, ), dtype=self.mesh.ftype, device=self.mesh.device)
+        rows, cols, vals = [], [], []
+        brows, bcols, bvals = [], [], []
+
+        for d, (n, bc) in enumerate(zip(self.cells, self.bc)):
+            for s in (-1, 1):
+                m = idx[d] + s
+                link = idx[d] if s > 0 else idx[d] - 1
+                if bc == 'neumann': # mirrored ghost nodes and edges
+                    m = bm.where(m < 0, 1, m)
+                    m = bm.where(m > n, n - 1, m)
+                    link = bm.where(link < 0, 0, link)
+                    link = bm.where(link > n - 1, n - 1, link)
+                elif bc == 'periodic':
+                    m = m % n
+                    link = link % n
+                w = self._weight(idx, d, link)
+                diag = diag + w
+                nbr = idx[:d] + [m] + idx[d+1:]
+                if bc == 'dirichlet':
+                    flag = (m == 0) | (m == n)
+                    brows.append(row[flag])
+                    bcols.append(self.node_index(nbr)[flag])
+                    bvals.append(w[flag])
+                    flag = ~flag
+                    rows.append(row[flag])
+                    cols.append(self.dof_number(nbr)[flag])
+                    vals.append(-w[flag])
+                else:
+                    rows.append(row)
+                    cols.append(self.dof_number(nbr))
+                    vals.append(-w)
+
+        rows.append(row)
+        cols.append(row)
+        vals.append(diag)
+        weight = self.dof_weight()
+        rows = bm.concat(rows)
+        indices = bm.stack([rows, bm.concat(cols)], axis=0)
+        values = weight[rows] * bm.concat(vals)
+        A = COOTensor(indices, values, (NDof, NDof)).coalesce().tocsr()
+
+        if len(brows) > 0:
+            brows = bm.concat(brows)
+            indices = bm.stack([brows, bm.concat(bcols)], axis=0)
+            values = weight[brows] * bm.concat(bvals)
+        else:
+            indices = bm.zeros((2, 0), dtype=self.mesh.itype, device=self.mesh.device)
+            values = bm.zeros((0, ), dtype=self.mesh.ftype, device=self.mesh.device)
+        B = COOTensor(indices, values, (NDof, NN)).coalesce().tocsr()
+        return A, B
+
+    def assembly(self) -> CSRTensor:
+        """The matrix of the operator on the unknowns, shaped (NDof, NDof)."""
+        if self._matrices is None:
+            self._matrices = self._assemble()
+        return self._matrices[0]
+
+    def dirichlet_rhs(self, gd: Union[Callable, TensorLike]) -> TensorLike:
+        """Contribution of the Dirichlet boundary values to the right-hand side.
+
+        Parameters:
+            gd (Callable | Tensor): The boundary values, a function of the points
+                or a tensor of the values on all the mesh nodes shaped (NN, ).
+
+        Returns:
+            Tensor: The vector to add to the right-hand side, shaped (NDof, ).
+        """
+        if self._matrices is None:
+            self._matrices = self._assemble()
+        if callable(gd):
+            gd = gd(self.mesh.entity('node'))
+        return self._matrices[1] @ gd
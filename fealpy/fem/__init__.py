@@ -2,6 +2,7 @@
 
 ### Forms and bases
 from .integrator import *
+from .basis_cache import BasisCache, basis_cache
 from .bilinear_form import BilinearForm
 from .linear_form import LinearForm
 from .semilinear_form import SemilinearForm
@@ -37,5 +38,8 @@ from .dirichlet_bc_operator import DirichletBCOperator
 ### recovery estimate
 from .recovery_alg import RecoveryAlg
 
+### Projector
+from .transfer_projector import InterpolationProjector, L2Projector
+
 ### Other
 from .semilinear_wrapper import SemilinearWrapperInt
\ No newline at end of file
@@ -0,0 +1,214 @@
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+from threading import RLock
+import weakref
+
+from ..typing import TensorLike, Index, _S
+
+__all__ = ['BasisCache', 'basis_cache']
+
+
+def _index_key(index: Index) -> Tuple[Hashable, Any]:
+    """Hashable key of the index, and the object to be checked by identity."""
+    if isinstance(index, slice):
+        return ('slice', index.start, index.stop, index.step), None
+    if isinstance(index, int):
+        return ('int', index), None
+    return ('tensor', id(index)), index
+
+
+def _tensor_ref(tensor):
+    """Weak reference to the tensor, or its id and shape if it can not be
+    referenced weakly."""
+    if tensor is None:
+        return None
+    try:
+        return weakref.ref(tensor)
+    except TypeError:
+        return (id(tensor), getattr(tensor, 'shape', None))
+
+
+def _is_tensor(ref, tensor) -> bool:
+    if isinstance(ref, weakref.ref):
+        return ref() is tensor
+    return ref == _tensor_ref(tensor)
+
+
+def _mesh_state(mesh) -> Tuple[Any, Any]:
+    # Mesh refinement replaces the node and cell tensors, so referring to them
+    # and checking by identity detects the entries computed on the previous
+    # mesh. This costs nothing per lookup, unlike a reduction over the nodes,
+    # and the cache does not keep the tensors alive.
+    return _tensor_ref(getattr(mesh, 'node', None)), _tensor_ref(getattr(mesh, 'cell', None))
+
+
+def _same_state(state, mesh) -> bool:
+    return _is_tensor(state[0], getattr(mesh, 'node', None)) and \
+           _is_tensor(state[1], getattr(mesh, 'cell', None))
+
+
+class BasisCache():
+    """LRU cache of the quadrature, basis and entity measure tables.
+
+    Integrators on the same space (e.g. mass, diffusion and convection in one
+    form) share the tables computed by the cache, keyed on
+    (space or mesh, quadrature order, entity type, index, derivative). Entries
+    of a mesh are invalidated automatically once its node or cell tensor is
+    replaced (e.g. by refinement), and the entries of a space or a mesh are
+    removed once it is garbage collected. Nodes moved in place are not
+    detected, call `invalidate` with the mesh after moving them.
+
+    Parameters:
+        maxsize (int, optional): Maximum number of the entries. Defaults to 32.
+        enabled (bool, optional): Whether to cache the tables. If False, the
+            tables are computed in every call. Defaults to True.
+    """
+    def __init__(self, maxsize: int=32, enabled: bool=True) -> None:
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._finalizers: Dict[int, weakref.finalize] = {}
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Remove all the entries, and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def invalidate(self, obj=None) -> None:
+        """Remove the entries of a mesh or a space, or all the entries if `obj` is None.
+
+        The entries of spaces on a mesh are also removed when the mesh is given.
+        """
+        if obj is None:
+            self.clear()
+            return
+        with self._lock:
+            for key, item in list(self._data.items()):
+                if (item[0]() is obj) or (item[1]() is obj):
+                    self._data.pop(key, None)
+
+    def _evict(self, oid: int) -> None:
+        # Called when the space or the mesh with the id `oid` is collected.
+        with self._lock:
+            self._finalizers.pop(oid, None)
+            for key, item in list(self._data.items()):
+                if (key[0] == oid) or (item[1]() is None):
+                    self._data.pop(key, None)
+
+    def _watch(self, obj) -> None:
+        oid = id(obj)
+        if oid not in self._finalizers:
+            finalizer = weakref.finalize(obj, self._evict, oid)
+            finalizer.atexit = False
+            self._finalizers[oid] = finalizer
+
+    def info(self):
+        """Return the number of hits, misses and current entries."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
+
+    def get(self, owner, key: Tuple, builder: Callable[[], Any], index: Index=_S):
+        """Return the cached value, or build and cache it.
+
+        Parameters:
+            owner (Mesh | FunctionSpace): The object the value belongs to.
+            key (Tuple): Hashable key of the value within the owner.
+            builder (Callable): Function computing the value.
+            index (Index, optional): The index the value depends on. Defaults to all.
+        """
+        if not self.enabled:
+            return builder()
+
+        mesh = getattr(owner, 'mesh', owner)
+        ikey, iobj = _index_key(index)
+        full_key = (id(owner), ) + tuple(key) + (ikey, )
+        state = _mesh_state(mesh)
+
+        with self._lock:
+            item = self._data.get(full_key, None)
+            if item is not None:
+                ref, _, istate, iindex, value = item
+                if (ref() is owner) and (iindex is iobj) and _same_state(istate, mesh):
+                    self._data.move_to_end(full_key)
+                    self.hits += 1
+                    return value
+                self._data.pop(full_key, None)
+            self.misses += 1
+
+        value = builder()
+
+        with self._lock:
+            self._data[full_key] = (weakref.ref(owner), weakref.ref(mesh), state, iobj, value)
+            self._watch(owner)
+            self._watch(mesh)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        return value
+
+    def quadrature(self, mesh, q: int, etype='cell') -> Tuple[TensorLike, TensorLike]:
+        """Quadrature points (barycentric) and weights of the entities."""
+        def builder():
+            qf = mesh.quadrature_formula(q, etype)
+            return qf.get_quadrature_points_and_weights()
+        return self.get(mesh, ('quadrature', q, etype), builder)
+
+    def measure(self, mesh, etype='cell', index: Index=_S) -> TensorLike:
+        """Measure of the entities in `index`."""
+        return self.get(mesh, ('measure', etype),
+                        lambda: mesh.entity_measure(etype, index=index), index)
+
+    def basis(self, space, q: int, etype='cell', index: Index=_S,
+              diff: int=0, variable: str='x') -> TensorLike:
+        """Values (`diff=0`) or gradients (`diff=1`) of the basis functions of
+        the space on the quadrature points of order `q`.
+
+        Raises:
+            ValueError: If `etype` is not 'cell' or `diff` is not 0 or 1.
+        """
+        if etype != 'cell':
+            raise ValueError(f"Only the basis on cells is supported, but got etype {etype}.")
+        if diff not in (0, 1):
+            raise ValueError(f"Only derivatives of order 0 and 1 are supported, but got {diff}.")
+        bcs, _ = self.quadrature(space.mesh, q, etype)
+
+        if diff == 0:
+            builder = lambda: space.basis(bcs, index=index)
+            key = ('basis', q, etype, 0)
+        else:
+            builder = lambda: space.grad_basis(bcs, index=index, variable=variable)
+            key = ('basis', q, etype, 1, variable)
+
+        return self.get(space, key, builder, index)
+
+    def fetch(self, space, q: Optional[int]=None, index: Index=_S, diff: int=0,
+              variable: str='x'):
+        """Fetch the tables used by the cell integrators.
+
+        Parameters:
+            space (FunctionSpace): The function space.
+            q (int | None, optional): The quadrature order. Defaults to `space.p + 3`.
+            index (Index, optional): Index of the cells. Defaults to all.
+            diff (int, optional): Derivative order of the basis. Defaults to 0.
+            variable (str, optional): Variable of the gradient ('x' or 'u'). Defaults to 'x'.
+
+        Returns:
+            Tuple: Quadrature points, weights, basis (or gradients) and cell measure.
+        """
+        mesh = space.mesh
+        q = space.p+3 if q is None else q
+        bcs, ws = self.quadrature(mesh, q, 'cell')
+        phi = self.basis(space, q, 'cell', index, diff, variable)
+        cm = self.measure(mesh, 'cell', index)
+        return bcs, ws, phi, cm
+
+
+basis_cache = BasisCache()
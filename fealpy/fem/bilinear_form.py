@@ -5,12 +5,46 @@ from .. import logger
 from ..typing import TensorLike
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
-from .form import Form
+from .form import Form, integrate_partition, compress_entries
 from .integrator import LinearInt
 
 
+def _sorted_unique(keys: TensorLike) -> TensorLike:
+    keys = bm.sort(keys)
+    if keys.shape[0] == 0:
+        return keys
+    flag = bm.concat([bm.ones((1, ), dtype=bm.bool, device=bm.get_device(keys)),
+                      keys[1:] != keys[:-1]], axis=0)
+    return keys[flag]
+
+
+def _entry_keys(e2dofs, ncol: int, transposed: bool=False) -> TensorLike:
+    """Flattened keys `row * ncol + col` of the entries of the local matrices."""
+    ue2dof = e2dofs[0]
+    ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
+    local_shape = (ve2dof.shape[0], ve2dof.shape[1], ue2dof.shape[1])
+    I = bm.astype(bm.broadcast_to(ve2dof[:, :, None], local_shape), bm.int64)
+    J = bm.astype(bm.broadcast_to(ue2dof[:, None, :], local_shape), bm.int64)
+    if transposed:
+        I, J = J, I
+    return bm.reshape(I * ncol + J, (-1,))
+
+
+def _assemble_partition(INTS, space, group: str, index: TensorLike, e2dofs,
+                        ncol: int, transposed: bool, batch_size: int):
+    """Assemble the local block of a partition as sorted unique keys of the
+    non-zeros and their values."""
+    group_tensor = integrate_partition(INTS, space, group, index)
+    if (batch_size > 0) and (group_tensor.ndim == 3):
+        group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+    values_shape = (-1, ) if (batch_size == 0) else (batch_size, -1)
+    group_tensor = bm.reshape(group_tensor, values_shape)
+    return compress_entries(_entry_keys(e2dofs, ncol, transposed), group_tensor)
+
+
 class BilinearForm(Form[LinearInt]):
     _M = None
+    _pattern = None
 
     def _get_sparse_shape(self):
         spaces = self._spaces
@@ -73,32 +107,239 @@ class BilinearForm(Form[LinearInt]):
 
         return M
 
+    def _pattern_key(self):
+        key = [self.sparse_shape]
+        for group, INTS in self.integrators.items():
+            etg = [INTS[0].to_global_dof(s) for s in self._spaces]
+            key.append((group, ) + tuple(tuple(e2d.shape) for e2d in etg))
+        return tuple(key)
+
+    def _local_keys(self, e2dofs):
+        return _entry_keys(e2dofs, self.sparse_shape[1], getattr(self, '_transposed', False))
+
+    def _nnz_keys(self, crow: TensorLike, col: TensorLike):
+        """Sorted keys `row * ncol + col` of the non-zeros in the CSR pattern."""
+        ncol = self.sparse_shape[1]
+        kwargs = {'dtype': crow.dtype, 'device': bm.get_device(crow)}
+        row = bm.repeat(bm.arange(crow.shape[0] - 1, **kwargs), crow[1:] - crow[:-1])
+        return bm.astype(row, bm.int64) * ncol + bm.astype(col, bm.int64)
+
+    def _csr_from_keys(self, ukeys: TensorLike):
+        nrow, ncol = self.sparse_shape
+        itype = self._spaces[0].itype
+        kwargs = {'dtype': itype, 'device': bm.get_device(ukeys)}
+        row = bm.astype(ukeys // ncol, itype)
+        col = bm.astype(ukeys % ncol, itype)
+        crow = bm.zeros((nrow + 1, ), **kwargs)
+        crow = bm.index_add(crow, row + 1, bm.ones(row.shape, **kwargs))
+        crow = bm.cumsum(crow, axis=0)
+        return crow, col
+
+    def _symbolic_assembly(self):
+        """Build the CSR pattern of the global matrix, together with the maps
+        scattering the local entries of every integrator group to the non-zero slots."""
+        space = self._spaces
+        keys = []
+
+        for group, INTS in self.integrators.items():
+            e2dofs = [INTS[0].to_global_dof(s) for s in space]
+            keys.append(self._local_keys(e2dofs))
+
+        sizes = [k.shape[0] for k in keys]
+        ukeys, inverse = bm.unique(bm.concat(keys, axis=0), return_inverse=True)
+        crow, col = self._csr_from_keys(ukeys)
+
+        scatter = {}
+        start = 0
+        for group, size in zip(self.integrators.keys(), sizes):
+            scatter[group] = inverse[start:start+size]
+            start += size
+
+        return self._pattern_key(), crow, col, scatter
+
+    def _numeric_assembly(self, retain_ints: bool, batch_size: int):
+        _, crow, col, scatter = self._pattern
+        space = self._spaces
+        value_shape = (col.shape[0], ) if (batch_size == 0) else (batch_size, col.shape[0])
+        values = bm.zeros(value_shape, dtype=space[0].ftype, device=bm.get_device(space[0]))
+
+        for group in self.integrators.keys():
+            group_tensor, _ = self._assembly_group(group, retain_ints)
+            if (batch_size > 0) and (group_tensor.ndim == 3):
+                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+            values = bm.index_add(values, scatter[group], group_tensor, axis=-1)
+
+        return CSRTensor(crow, col, values, self.sparse_shape)
+
+    def _chunked_symbolic_assembly(self):
+        """Build the CSR pattern by merging the non-zeros of the chunks."""
+        space = self._spaces
+        keys = []
+
+        # Non-zeros are mostly shared within a chunk, so the unique keys of the
+        # chunks are merged, whose total size is close to the number of non-zeros.
+        for group, INTS in self.integrators.items():
+            etg = [INTS[0].to_global_dof(s) for s in space]
+            NC = etg[0].shape[0]
+            for start in range(0, NC, self.chunk_size):
+                k = self._local_keys([e2d[start:start+self.chunk_size] for e2d in etg])
+                keys.append(_sorted_unique(k))
+
+        ukeys = _sorted_unique(bm.concat(keys, axis=0))
+        crow, col = self._csr_from_keys(ukeys)
+
+        return self._pattern_key(), crow, col, None
+
+    def _chunked_numeric_assembly(self, batch_size: int):
+        _, crow, col, _ = self._pattern
+        space = self._spaces
+        nnz = col.shape[0]
+        ukeys = self._nnz_keys(crow, col)
+        value_shape = (nnz, ) if (batch_size == 0) else (batch_size, nnz)
+        values = bm.zeros(value_shape, dtype=space[0].ftype, device=bm.get_device(space[0]))
+
+        for group in self.integrators.keys():
+            for group_tensor, e2dofs in self._assembly_group_chunks(group):
+                if (batch_size > 0) and (group_tensor.ndim == 3):
+                    group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+                group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+                loc = bm.searchsorted(ukeys, self._local_keys(e2dofs))
+                values = bm.index_add(values, loc, group_tensor, axis=-1)
+
+        return CSRTensor(crow, col, values, self.sparse_shape)
+
+    def _parallel_blocks(self, batch_size: int):
+        """Assemble the local blocks of all the groups, partition by partition
+        with the executor if possible."""
+        ncol = self.sparse_shape[1]
+        transposed = getattr(self, '_transposed', False)
+        blocks = []
+
+        for group in self.integrators.keys():
+            results = self._map_partitions(group, _assemble_partition,
+                                           ncol, transposed, batch_size)
+            if results is not None:
+                blocks.extend(results)
+                continue
+
+            group_tensor, e2dofs = self._assembly_group(group, False)
+            if (batch_size > 0) and (group_tensor.ndim == 3):
+                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+            blocks.append(compress_entries(self._local_keys(e2dofs), group_tensor))
+
+        return blocks
+
+    def _parallel_assembly(self, batch_size: int, reuse_pattern: bool):
+        """Merge the blocks of the partitions into the CSR pattern.
+
+        Every block is already sorted and compressed by its worker, so the
+        pattern is the union of the block keys, and the values are located by
+        binary search and accumulated, without sorting the entries of all the cells.
+        The union still sorts the compressed keys of all the blocks (about
+        nnz per block) once per call. Only `reuse_pattern=True` avoids this
+        sort after the first call.
+        """
+        blocks = self._parallel_blocks(batch_size)
+        space = self._spaces
+
+        if (not reuse_pattern) or (self._pattern is None) or \
+            (self._pattern[0] != self._pattern_key()) or (self._pattern[3] is not None):
+            ukeys = _sorted_unique(bm.concat([k for k, _ in blocks], axis=0))
+            crow, col = self._csr_from_keys(ukeys)
+            self._pattern = (self._pattern_key(), crow, col, None)
+        else:
+            _, crow, col, _ = self._pattern
+            ukeys = self._nnz_keys(crow, col)
+
+        nnz = col.shape[0]
+        value_shape = (nnz, ) if (batch_size == 0) else (batch_size, nnz)
+        values = bm.zeros(value_shape, dtype=space[0].ftype, device=bm.get_device(space[0]))
+
+        for keys, vals in blocks:
+            values = bm.index_add(values, bm.searchsorted(ukeys, keys), vals, axis=-1)
+
+        if not reuse_pattern:
+            self._pattern = None
+
+        return CSRTensor(crow, col, values, self.sparse_shape)
+
+    def clear_pattern(self) -> None:
+        """Clear the cached sparsity pattern used by `assembly(reuse_pattern=True)`."""
+        self._pattern = None
+
     @overload
-    def assembly(self, *, retain_ints: bool=False) -> CSRTensor: ...
+    def assembly(self, *, retain_ints: bool=False, reuse_pattern: bool=False) -> CSRTensor: ...
     @overload
-    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False) -> COOTensor: ...
+    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False, reuse_pattern: bool=False) -> COOTensor: ...
     @overload
-    def assembly(self, *, format: Literal['csr'], retain_ints: bool=False) -> CSRTensor: ...
-    def assembly(self, *, format='csr', retain_ints: bool=False):
+    def assembly(self, *, format: Literal['csr'], retain_ints: bool=False, reuse_pattern: bool=False) -> CSRTensor: ...
+    def assembly(self, *, format='csr', retain_ints: bool=False, reuse_pattern: bool=False):
         """Assembly the bilinear form matrix.
 
         Parameters:
             format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.\n
-            retain_ints (bool, optional): Whether to retain the integrator cache.csr
+            retain_ints (bool, optional): Whether to retain the integrator cache.
+                Ignored if `chunk_size` of the form is positive.\n
+            reuse_pattern (bool, optional): Whether to cache the sparsity pattern and the
+                local-to-nnz scatter maps in the first call, and only assemble the
+                non-zero values in the following calls. This avoids sorting in
+                repeated assembly on an unchanged mesh and space, also with an
+                `executor`, where the keys of the blocks are otherwise merged by
+                sorting in every call. Defaults to False.
+
+        If `chunk_size` of the form is positive, the cells are integrated chunk
+        by chunk and scattered into the values of the CSR pattern directly,
+        without materializing the local tensors of all the cells.
+
+        If the form has an `executor`, the cells are split into partitions whose
+        local blocks are assembled, sorted and compressed by the workers in
+        parallel, then merged into one CSR matrix. `chunk_size` is ignored in this case.
 
         Returns:
             global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped ([batch, ]gdof, gdof).
         """
+        if format not in ('csr', 'coo'):
+            raise ValueError(f"Unsupported format {format}.")
+
+        if self.executor is not None:
+            M = self._parallel_assembly(self.batch_size, reuse_pattern)
+            self._M = M if format == 'csr' else M.tocoo()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+
+            return self._M
+
+        if self.chunk_size > 0:
+            if (not reuse_pattern) or (self._pattern is None) or \
+                (self._pattern[0] != self._pattern_key()):
+                self._pattern = self._chunked_symbolic_assembly()
+            M = self._chunked_numeric_assembly(self.batch_size)
+            if not reuse_pattern:
+                self._pattern = None
+            self._M = M if format == 'csr' else M.tocoo()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+
+            return self._M
+
+        if reuse_pattern:
+            if (self._pattern is None) or (self._pattern[0] != self._pattern_key()) \
+                or (self._pattern[3] is None):
+                self._pattern = self._symbolic_assembly()
+            M = self._numeric_assembly(retain_ints, self.batch_size)
+            self._M = M if format == 'csr' else M.tocoo()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+
+            return self._M
+
         M = self._scalar_assembly(retain_ints, self.batch_size)
         if getattr(self, '_transposed', False):
             M = M.T
 
         if format == 'csr':
             self._M = M.coalesce().tocsr()
-        elif format == 'coo':
-            self._M = M.coalesce()
         else:
-            raise ValueError(f"Unsupported format {format}.")
+            self._M = M.coalesce()
         logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
 
         return self._M
@@ -106,6 +347,12 @@ class BilinearForm(Form[LinearInt]):
     def mult(self, x: TensorLike, out: Optional[TensorLike]=None) -> TensorLike:
         """Maxtrix vector multiplication.
 
+        If the matrix is not assembled, the product is computed group by group
+        without assembling. Groups whose integrators all support `apply` (e.g.
+        the scalar diffusion and mass integrators on tensor-product meshes) are
+        applied matrix-free, without forming the local matrices; other groups
+        compute and retain their local matrices.
+
         Parameters:
             x (TensorLike): Vector, accepts batch on the first dimension.\n
             out (TensorLike, optional): Output vector. Defaults to None.
@@ -113,7 +360,33 @@ class BilinearForm(Form[LinearInt]):
         Returns:
             TensorLike: self @ x
         """
-        raise NotImplementedError
+        v = self._M @ x if (self._M is not None) else self._matrix_free_mult(x)
+
+        if out is None:
+            return v
+        return bm.set_at(out, ..., v)
+
+    def _apply_group(self, group: str, u: TensorLike):
+        """Apply the integrators in the group by `Integrator.apply`, returning None
+        if any of them does not support it."""
+        if (len(self._spaces) > 1) or (self.batch_size > 0) or (group in self.memory) \
+            or getattr(self, '_transposed', False):
+            return None
+
+        space = self._spaces[0]
+        INTS = self.integrators[group]
+        e2dof = INTS[0].to_global_dof(space)
+        gu = u[..., e2dof] # (..., NC, ldof)
+        gv = None
+
+        try:
+            for int_ in INTS:
+                val = int_.apply(space, gu)
+                gv = val if gv is None else gv + val
+        except NotImplementedError:
+            return None
+
+        return gv, e2dof
 
     @property
     def T(self):
@@ -123,9 +396,9 @@ class BilinearForm(Form[LinearInt]):
         return transposed
 
     def __matmul__(self, u: TensorLike):
-        if self._M is not None:
-            return self._M @ u
+        return self.mult(u)
 
+    def _matrix_free_mult(self, u: TensorLike):
         nrow = self.shape[-2]
         kwargs = bm.context(u)
 
@@ -148,6 +421,12 @@ class BilinearForm(Form[LinearInt]):
         gu_subs = 'bcj' if (u.ndim >= 2) else 'cj'
 
         for group in self.integrators.keys():
+            applied = self._apply_group(group, u)
+            if applied is not None:
+                gv, ve2dof = applied
+                v = bm.index_add(v, ve2dof.reshape(-1), gv.reshape(gv_reshape))
+                continue
+
             group_tensor, e2dofs = self._assembly_group(group, True)
             ue2dof = e2dofs[0]
             ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
@@ -156,5 +435,3 @@ class BilinearForm(Form[LinearInt]):
             v = bm.index_add(v, ve2dof.reshape(-1), gv.reshape(gv_reshape))
 
         return v
-
-
@@ -3,9 +3,8 @@ from typing import List
 from .. import logger
 from ..typing import Size, TensorLike
 from ..backend import backend_manager as bm
-from ..sparse import COOTensor, CSRTensor
+from ..sparse import COOTensor, CSRTensor, BlockCSRTensor
 from .form import Form
-from ..sparse import COOTensor, CSRTensor
 
 class BlockForm(Form):
     _M = None
@@ -30,6 +29,15 @@ class BlockForm(Form):
         return self.sparse_shape
 
     def assembly(self, format='csr'):
+        """Assemble the block matrix.
+
+        Parameters:
+            format (str, optional): 'csr' or 'coo' for the global matrix, or 'block'
+                for a BlockCSRTensor keeping the blocks assembled separately in CSR,
+                without the global concatenation and sorting. Defaults to 'csr'.
+        """
+        if format == 'block':
+            return self.block_assembly()
         a = bm.max(self.block_shape[...,0], axis=1)
         row_offset = bm.cumsum(bm.max(self.block_shape[...,0],axis = 1), axis=0)
         col_offset = bm.cumsum(bm.max(self.block_shape[...,1],axis = 0), axis=0)
@@ -65,6 +73,16 @@ class BlockForm(Form):
         return self._M
     
     
+    def block_assembly(self) -> BlockCSRTensor:
+        """Assemble the blocks to CSR, kept in a BlockCSRTensor."""
+        row_sizes = [int(s) for s in bm.max(self.block_shape[..., 0], axis=1)]
+        col_sizes = [int(s) for s in bm.max(self.block_shape[..., 1], axis=0)]
+        blocks = [[None if block is None else block.assembly(format='csr')
+                   for block in row] for row in self.blocks]
+        self._M = BlockCSRTensor(blocks, row_sizes, col_sizes)
+        logger.info(f"Block form matrix constructed in blocks, with shape {list(self._M.shape)}.")
+        return self._M
+
     def __matmul__(self, u: TensorLike):
         if self._M is not None:
             return self._M @ u
@@ -4,6 +4,7 @@ from typing import Optional, Tuple, Callable, Union, TypeVar
 from ..backend import backend_manager as bm
 from ..typing import TensorLike
 from ..sparse import SparseTensor, COOTensor, CSRTensor
+from ..sparse.utils import row_to_crow
 from ..functionspace.space import FunctionSpace
 
 CoefLike = Union[float, int, TensorLike, Callable[..., TensorLike]]
@@ -21,6 +22,11 @@ class DirichletBC():
         self.threshold = threshold
         self.bctype = 'Dirichlet'
         self.method = method
+        self._pattern = None
+        self._lifting = None
+        self._lifting_values = None
+        self._reduced = None
+        self._boundary_uh = None
 
         if isinstance(space, tuple):
             self.gdof = bm.array([i.number_of_global_dofs() for i in space])
@@ -100,7 +106,7 @@ class DirichletBC():
 
     def apply(self, A: SparseTensor, f: TensorLike, uh: Optional[TensorLike]=None,
               gd: Optional[CoefLike]=None, *,
-              check=True) -> Tuple[TensorLike, TensorLike]:
+              check=True, keep_pattern=False) -> Tuple[TensorLike, TensorLike]:
         """Apply Dirichlet boundary conditions.
 
         Parameters:
@@ -112,21 +118,33 @@ class DirichletBC():
             gd (CoefLike | None, optional): The Dirichlet boundary condition.\
                 Use the default gd passed in the __init__ if `None`. Default to None.
             check (bool, optional): _description_. Defaults to True.
+            keep_pattern (bool, optional): Whether to keep the sparsity pattern of `A`,\
+                see `apply_matrix`. Defaults to False.
 
         Returns:
             out (SparseTensor, Tensor): New adjusted `A` and `f`.
         """
+        if keep_pattern:
+            A = self.apply_matrix(A, check=check, keep_pattern=True)
+            f = self.apply_vector(f, A, uh, gd, check=check)
+            return A, f
         f = self.apply_vector(f, A, uh, gd, check=check)
         A = self.apply_matrix(A, check=check)
         return A, f
 
-    def apply_matrix(self, matrix: _ST, *, check=True) -> _ST:
+    def apply_matrix(self, matrix: _ST, *, check=True, keep_pattern=False) -> _ST:
         """Apply Dirichlet boundary condition to left-hand-size matrix only.
 
         Parameters:
             matrix (SparseTensor): The original left-hand-size sparse matrix\
                 of the linear system.
             check (bool, optional): Whether to check the matrix. Defaults to True.
+            keep_pattern (bool, optional): Whether to keep the sparsity pattern,\
+                zeroing the boundary rows and columns and setting the unit diagonal\
+                in the values of the matrix (in place for the numpy and pytorch\
+                backends). The positions are computed once and reused for matrices\
+                of the same pattern, and the boundary columns are kept as the lifting\
+                used by `apply_vector`. Defaults to False.
 
         Returns:
             SparseTensor: New adjusted left-hand-size matrix.
@@ -141,6 +159,8 @@ class DirichletBC():
         # ```
         # Here the adjustment is done by operating the sparse structure directly.
         A = self.check_matrix(matrix) if check else matrix
+        if keep_pattern:
+            return self._apply_matrix_in_pattern(A)
         isDDof = self.is_boundary_dof
         kwargs = A.values_context()
         if isinstance(A, COOTensor):
@@ -191,6 +211,58 @@ class DirichletBC():
 
         return A
 
+    @staticmethod
+    def _row_col(A: SparseTensor) -> Tuple[TensorLike, TensorLike]:
+        if isinstance(A, COOTensor):
+            return A.indices()[0], A.indices()[1]
+        return A.row(), A.col()
+
+    @staticmethod
+    def _same_pattern(A: SparseTensor, pattern: Tuple) -> bool:
+        index0, nnz = pattern[0], pattern[1]
+        index = A.indices() if isinstance(A, COOTensor) else (A.crow(), A.col())
+        if A.nnz != nnz or type(index) is not type(index0):
+            return False
+        if isinstance(A, COOTensor):
+            return (index is index0) or bool(bm.all(index == index0))
+        return all((i is i0) or ((i.shape == i0.shape) and bool(bm.all(i == i0)))
+                   for i, i0 in zip(index, index0))
+
+    def _setup_pattern(self, A: SparseTensor) -> None:
+        """Find the positions of the non-zeros in the boundary rows or columns,
+        the boundary diagonals, and the lifting (interior rows, boundary columns)."""
+        isDDof = self.is_boundary_dof
+        row, col = self._row_col(A)
+        is_bd_row, is_bd_col = isDDof[row], isDDof[col]
+        zero_pos = bm.nonzero(is_bd_row | is_bd_col)[0]
+        diag_pos = bm.nonzero(is_bd_row & (row == col))[0]
+        lift_pos = bm.nonzero(is_bd_col & (~is_bd_row))[0]
+
+        if diag_pos.shape[0] != self.boundary_dof_index.shape[0]:
+            raise ValueError("Pattern-preserving Dirichlet boundary condition requires "
+                             "the diagonal entries of all the boundary dofs in the matrix.")
+
+        index = A.indices() if isinstance(A, COOTensor) else (A.crow(), A.col())
+        lift_index = bm.stack([row[lift_pos], col[lift_pos]], axis=0)
+        self._pattern = (index, A.nnz, zero_pos, diag_pos, lift_pos, lift_index)
+
+    def _apply_matrix_in_pattern(self, A: _ST) -> _ST:
+        if not isinstance(A, (COOTensor, CSRTensor)):
+            raise ValueError('The type of matrix must be COOTensor or CSRTensor.')
+        if (self._pattern is None) or not self._same_pattern(A, self._pattern):
+            self._setup_pattern(A)
+        _, _, zero_pos, diag_pos, lift_pos, lift_index = self._pattern
+
+        values = A.values()
+        self._lifting = COOTensor(lift_index, bm.copy(values[..., lift_pos]), A.sparse_shape)
+        values = bm.set_at(values, (..., zero_pos), 0.)
+        values = bm.set_at(values, (..., diag_pos), 1.)
+        self._lifting_values = values
+
+        if isinstance(A, COOTensor):
+            return COOTensor(A.indices(), values, A.sparse_shape)
+        return CSRTensor(A.crow(), A.col(), values, A.sparse_shape)
+
     def apply_vector(self, vector: TensorLike, matrix: SparseTensor,
                      uh: Optional[TensorLike]=None,
                      gd: Optional[CoefLike]=None, *, check=True) -> TensorLike:
@@ -198,7 +270,8 @@ class DirichletBC():
 
         Parameters:
             vector (TensorLike): The original right-hand-size vector.
-            matrix (COOTensor): The original COO/CSR sparse matrix.
+            matrix (COOTensor): The original COO/CSR sparse matrix, or the matrix\
+                adjusted by `apply_matrix` with `keep_pattern=True`.
             uh (TensorLike | None, optional): The solution uh Tensor. Defuault to None.\
                 See `DirichletBC.apply()` for more details.
             gd (CoefLike | None, optional): The Dirichlet boundary condition.\
@@ -213,12 +286,40 @@ class DirichletBC():
         """
         A = self.check_matrix(matrix) if check else matrix
         f = self.check_vector(vector) if check else vector
+        uh = self.boundary_values(f, uh, gd)
+        bd_idx = self.boundary_dof_index
+        if (self._lifting is not None) and (A.values() is self._lifting_values):
+            # A has been adjusted in its pattern, use the boundary columns kept.
+            f = f - self._lifting.matmul(uh[:])
+        else:
+            f = f - A.matmul(uh[:])
+        f = bm.set_at(f, bd_idx, uh[bd_idx])
+        return f
+
+    def boundary_values(self, vector: TensorLike, uh: Optional[TensorLike]=None,
+                        gd: Optional[CoefLike]=None) -> TensorLike:
+        """Interpolate the Dirichlet boundary condition to the boundary dofs.
+
+        Parameters:
+            vector (TensorLike): The right-hand-size vector, giving the shape of\
+                the output if `uh` is None.
+            uh (TensorLike | None, optional): The solution uh Tensor, modified in place\
+                if given. Defaults to None.
+            gd (CoefLike | None, optional): The Dirichlet boundary condition.\
+                Use the default gd passed in the __init__ if `None`. Default to None.
+
+        Raises:
+            RuntimeError: If gd is `None` and no default gd exists.
+
+        Returns:
+            TensorLike: The vector with the boundary values on the boundary dofs.
+        """
+        f = vector
         gd = self.gd if gd is None else gd
-        
 
         if gd is None:
             raise RuntimeError("The boundary condition is None.")
-        
+
         if isinstance(self.space, tuple):
             if isinstance(gd, tuple):
                 assert len(gd) == len(self.space)
@@ -237,10 +338,108 @@ class DirichletBC():
                 uh = bm.zeros_like(f)
             uh, _ = self.space.boundary_interpolate(gd=gd,uh=uh,
                                                 threshold=self.threshold, method=self.method)
-        bd_idx = self.boundary_dof_index
-        f = f - A.matmul(uh[:])
-        f = bm.set_at(f, bd_idx, uh[bd_idx])
-        return f
+        return uh
+
+    def _setup_reduced(self, A: CSRTensor) -> None:
+        """Find the positions of the interior block A_II and the lifting A_IB
+        in the non-zeros, and the pattern of A_II."""
+        isDDof = self.is_boundary_dof
+        isIDof = bm.logical_not(isDDof)
+        row, col = A.row(), A.col()
+        ikwargs = bm.context(col)
+        NI = int(bm.sum(isIDof))
+        imap = bm.astype(bm.cumsum(isIDof, axis=0) - 1, ikwargs['dtype'])
+
+        II_pos = bm.nonzero(isIDof[row] & isIDof[col])[0]
+        IB_pos = bm.nonzero(isIDof[row] & isDDof[col])[0]
+        II_crow = bm.astype(row_to_crow(imap[row[II_pos]], NI), ikwargs['dtype'])
+        II_col = imap[col[II_pos]]
+        IB_index = bm.stack([imap[row[IB_pos]], col[IB_pos]], axis=0)
+
+        self.interior_dof_index = bm.nonzero(isIDof)[0]
+        self._reduced = ((A.crow(), A.col()), A.nnz, II_pos, II_crow, II_col, IB_pos, IB_index)
+
+    def reduce_system(self, A: SparseTensor, f: TensorLike, uh: Optional[TensorLike]=None,
+                      gd: Optional[CoefLike]=None, *,
+                      check=True) -> Tuple[CSRTensor, TensorLike]:
+        """Eliminate the Dirichlet dofs, giving the system on the interior dofs,
+
+            A_II x_I = f_I - A_IB g_B.
+
+        The positions of A_II and A_IB in the non-zeros of A are computed once
+        and reused for the matrices of the same pattern. The boundary values
+        are kept for `recover`.
+
+        Parameters:
+            A (SparseTensor): Left-hand-size sparse matrix.
+            f (Tensor): Right-hand-size vector shaped (gdof, ) or (gdof, batch).
+            uh (Tensor | None, optional): The solution uh Tensor, see `apply`.
+            gd (CoefLike | None, optional): The Dirichlet boundary condition.\
+                Use the default gd passed in the __init__ if `None`. Default to None.
+            check (bool, optional): Whether to check the matrix and the vector.\
+                Defaults to True.
+
+        Returns:
+            out (CSRTensor, Tensor): The interior matrix A_II and the vector f_I.
+        """
+        A = self.check_matrix(A) if check else A
+        f = self.check_vector(f) if check else f
+        if isinstance(A, COOTensor):
+            A = A.tocsr()
+
+        if (self._reduced is None) or not self._same_pattern(A, self._reduced):
+            self._setup_reduced(A)
+        _, _, II_pos, II_crow, II_col, IB_pos, IB_index = self._reduced
+
+        NI = II_crow.shape[0] - 1
+        values = A.values()
+        A_II = CSRTensor(II_crow, II_col, values[..., II_pos], (NI, NI))
+        A_IB = COOTensor(IB_index, values[..., IB_pos], (NI, A.shape[1]))
+
+        uh = self.boundary_values(f, uh, gd)
+        self._boundary_uh = uh
+        f_I = f[self.interior_dof_index] - A_IB.matmul(uh[:])
+        return A_II, f_I
+
+    def recover(self, x: TensorLike, uh: Optional[TensorLike]=None) -> TensorLike:
+        """Scatter the interior solution of `reduce_system` back to the full vector.
+
+        Parameters:
+            x (Tensor): The solution on the interior dofs.
+            uh (Tensor | None, optional): The full vector to write in, holding the\
+                boundary values. Use the one kept by the last `reduce_system` if None.
+
+        Returns:
+            Tensor: The full solution.
+        """
+        if uh is None:
+            uh = self._boundary_uh
+            if uh is None:
+                raise RuntimeError("No boundary values, please call `reduce_system` first.")
+            uh = bm.copy(uh)
+        return bm.set_at(uh, self.interior_dof_index, x)
+
+    def solve_reduced(self, A: SparseTensor, f: TensorLike,
+                      solver: Callable[[CSRTensor, TensorLike], TensorLike],
+                      uh: Optional[TensorLike]=None, gd: Optional[CoefLike]=None, *,
+                      check=True) -> TensorLike:
+        """Solve the system with Dirichlet boundary condition on the interior dofs only.
+
+        Parameters:
+            A (SparseTensor): Left-hand-size sparse matrix.
+            f (Tensor): Right-hand-size vector.
+            solver (Callable): Function solving the reduced system `solver(A_II, f_I)`,\
+                e.g. `spsolve`, `cg`, or a `DirectSolver` factorized with A_II.
+            uh (Tensor | None, optional): The solution uh Tensor, see `apply`.
+            gd (CoefLike | None, optional): The Dirichlet boundary condition.
+            check (bool, optional): Whether to check the matrix and the vector.
+
+        Returns:
+            Tensor: The full solution.
+        """
+        A_II, f_I = self.reduce_system(A, f, uh, gd, check=check)
+        x = solver(A_II, f_I)
+        return self.recover(x, uh)
 
 
     # def apply_for_vspace_with_scalar_basis(self, A, f, uh, dflag=None):
@@ -1,9 +1,15 @@
 
 from typing import Sequence, overload, List, Dict, Tuple, Optional, TypeVar, Generic
+from contextlib import ExitStack
+from concurrent.futures import Executor
+from copy import copy
+import os
 
 from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
 from ..functionspace import FunctionSpace as _FS
-from .integrator import Integrator
+from ..utils import is_tensor
+from .integrator import Integrator, CellInt
 
 from .. import logger
 from abc import ABC
@@ -11,20 +17,148 @@ from abc import ABC
 _I = TypeVar('_IT', bound=Integrator)
 
 
+def _integrate(INTS: Sequence[Integrator], space, group: str):
+    ct = INTS[0](space)
+
+    for int_ in INTS[1:]:
+        new_ct = int_(space)
+        fdim = min(ct.ndim, new_ct.ndim)
+        if ct.shape[:fdim] != new_ct.shape[:fdim]:
+            raise RuntimeError(f"The output of the integrator {int_.__class__.__name__} "
+                               f"has an incompatible shape {tuple(new_ct.shape)} "
+                               f"with the previous {tuple(ct.shape)} in the group '{group}'.")
+        if new_ct.ndim > ct.ndim:
+            ct = new_ct + ct[None, ...]
+        elif new_ct.ndim < ct.ndim:
+            ct = ct + new_ct[None, ...]
+        else:
+            ct = ct + new_ct
+
+    return ct
+
+
+def integrate_partition(INTS: Sequence[Integrator], space, group: str, index: TensorLike):
+    """Integrate a group of cell integrators on the cells in `index`.
+
+    The integrators are shallow-copied before being restricted, so the caller's
+    integrators are untouched and several partitions can be integrated concurrently.
+    This function is picklable to be submitted to a process pool.
+    """
+    INTS = tuple(copy(int_) for int_ in INTS)
+    with ExitStack() as stack:
+        for int_ in INTS:
+            stack.enter_context(int_.restrict(index))
+        return _integrate(INTS, space, group)
+
+
+def _run_in_backend(backend_name: str, worker, *args):
+    # The current backend is thread-local, and not inherited by spawned processes.
+    if bm.backend_name != backend_name:
+        bm.set_backend(backend_name)
+    return worker(*args)
+
+
+def compress_entries(keys: TensorLike, values: TensorLike):
+    """Sort the entries by the keys and sum up the values of the duplicates.
+
+    Parameters:
+        keys (TensorLike): Integer keys of the entries shaped (N, ).
+        values (TensorLike): Values of the entries shaped ([batch, ]N).
+
+    Returns:
+        Tuple[TensorLike, TensorLike]: The sorted unique keys shaped (M, ) and
+            the summed values shaped ([batch, ]M).
+    """
+    order = bm.argsort(keys)
+    keys = keys[order]
+    values = values[..., order]
+    if keys.shape[0] == 0:
+        return keys, values
+    flag = bm.concat([bm.ones((1, ), dtype=bm.bool, device=bm.get_device(keys)),
+                      keys[1:] != keys[:-1]], axis=0)
+    segment = bm.cumsum(bm.astype(flag, keys.dtype), axis=0) - 1
+    ukeys = keys[flag]
+    out = bm.zeros(values.shape[:-1] + (ukeys.shape[0], ), **bm.context(values))
+    return ukeys, bm.index_add(out, segment, values, axis=-1)
+
+
+def metis_cell_partition(mesh, nparts: int) -> TensorLike:
+    """Partition the cells of the mesh by METIS on the cell adjacency graph.
+
+    Returns:
+        TensorLike: The part index of every cell shaped (NC, ).
+
+    Raises:
+        ImportError: If the METIS library is not available.
+    """
+    import numpy as np
+    try:
+        from ..graph import metis
+    except (ImportError, RuntimeError) as e: # The wrapper raises if the dll is missing.
+        raise ImportError(f"METIS is not available: {e}") from e
+
+    NC = mesh.number_of_cells()
+    face2cell = bm.to_numpy(mesh.face_to_cell())
+    flag = face2cell[:, 0] != face2cell[:, 1]
+    c0, c1 = face2cell[flag, 0], face2cell[flag, 1]
+    src = np.concatenate([c0, c1])
+    dst = np.concatenate([c1, c0])
+    order = np.argsort(src, kind='stable')
+    adj = dst[order].astype(np.int32)
+    xadj = np.zeros(NC + 1, dtype=np.int32)
+    np.add.at(xadj, src + 1, 1)
+    xadj = np.cumsum(xadj).astype(np.int32)
+
+    graph = metis.array_to_metis(adj, xadj)
+    _, parts = metis.part_graph(graph, nparts)
+    return bm.tensor(np.asarray(parts), dtype=mesh.itype, device=mesh.device)
+
+
 class Form(Generic[_I], ABC):
     _spaces: Tuple[_FS, ...]
     integrators: Dict[str, Tuple[_I, ...]]
     memory: Dict[str, Tuple[TensorLike, List[TensorLike]]]
     batch_size: int
+    chunk_size: int
+    executor: Optional[Executor]
+    nparts: int
+    partitioner: str
     sparse_shape: Tuple[int, ...]
 
     @overload
-    def __init__(self, space: _FS, *, batch_size: int=0): ...
+    def __init__(self, space: _FS, *, batch_size: int=0, chunk_size: int=0,
+                 executor: Optional[Executor]=None, nparts: int=0, partitioner: str='block'): ...
     @overload
-    def __init__(self, space: Tuple[_FS, ...], *, batch_size: int=0): ...
+    def __init__(self, space: Tuple[_FS, ...], *, batch_size: int=0, chunk_size: int=0,
+                 executor: Optional[Executor]=None, nparts: int=0, partitioner: str='block'): ...
     @overload
-    def __init__(self, *space: _FS, batch_size: int=0): ...
-    def __init__(self, *space, batch_size: int=0):
+    def __init__(self, *space: _FS, batch_size: int=0, chunk_size: int=0,
+                 executor: Optional[Executor]=None, nparts: int=0, partitioner: str='block'): ...
+    def __init__(self, *space, batch_size: int=0, chunk_size: int=0,
+                 executor: Optional[Executor]=None, nparts: int=0, partitioner: str='block'):
+        """
+        Parameters:
+            *space (FunctionSpace): The function space(s).
+            batch_size (int, optional): Size of the batch dimension. Defaults to 0.
+            chunk_size (int, optional): Number of cells integrated at a time in the
+                assembly. If positive, cell integrators are evaluated chunk by chunk
+                and scattered to the global values directly, bounding the peak memory
+                by the local tensor of a chunk. Defaults to 0 (all cells at once).
+            executor (Executor | None, optional): A `concurrent.futures` executor.
+                If given, the cells are split into partitions assembled in parallel
+                by the executor, and then merged. Thread pools share the mesh data
+                with the workers; process pools pickle the integrators, spaces and
+                partition indices for every task. Defaults to None.
+            nparts (int, optional): Number of the partitions. Defaults to 0, using
+                the number of workers of the executor.
+            partitioner (str, optional): 'block' for contiguous blocks of cells,
+                or 'metis' for the METIS k-way partition of the cell adjacency
+                graph, falling back to 'block' if METIS is not available.
+                Defaults to 'block'.
+        """
+        if partitioner not in ('block', 'metis'):
+            raise ValueError(f"Unsupported partitioner '{partitioner}', "
+                             "should be 'block' or 'metis'.")
         if len(space) == 0:
             raise ValueError("No space is given.")
         if isinstance(space[0], Sequence):
@@ -34,12 +168,18 @@ class Form(Generic[_I], ABC):
         self._cursor = 0
         self.memory = {}
         self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.nparts = nparts
+        self.partitioner = partitioner
 
         self._values_ravel_shape = (-1,) if self.batch_size == 0 else (self.batch_size, -1)
         self.sparse_shape = self._get_sparse_shape()
 
     def copy(self):
-        new_obj = self.__class__(self._spaces, batch_size=self.batch_size)
+        new_obj = self.__class__(self._spaces, batch_size=self.batch_size,
+                                 chunk_size=self.chunk_size, executor=self.executor,
+                                 nparts=self.nparts, partitioner=self.partitioner)
         new_obj.integrators.update(self.integrators)
         new_obj.memory.update(self.memory)
         new_obj._values_ravel_shape = self._values_ravel_shape
@@ -121,24 +261,131 @@ class Form(Generic[_I], ABC):
             return self.memory[group]
 
         INTS = self.integrators[group]
-        ct = INTS[0](self.space)
+        ct = self._integrate_group(group)
         etg = [INTS[0].to_global_dof(s) for s in self._spaces]
 
-        for int_ in INTS[1:]:
-            new_ct = int_(self.space)
-            fdim = min(ct.ndim, new_ct.ndim)
-            if ct.shape[:fdim] != new_ct.shape[:fdim]:
-                raise RuntimeError(f"The output of the integrator {int_.__class__.__name__} "
-                                   f"has an incompatible shape {tuple(new_ct.shape)} "
-                                   f"with the previous {tuple(ct.shape)} in the group '{group}'.")
-            if new_ct.ndim > ct.ndim:
-                ct = new_ct + ct[None, ...]
-            elif new_ct.ndim < ct.ndim:
-                ct = ct + new_ct[None, ...]
-            else:
-                ct = ct + new_ct
-
         if retain_ints:
             self.memory[group] = (ct, etg)
 
         return ct, etg
+
+    def _integrate_group(self, group: str):
+        return _integrate(self.integrators[group], self.space, group)
+
+    def _splittable_cells(self, group: str):
+        """Indices of the cells integrated by the group, or None if the group
+        can not be split into subsets of cells.
+
+        Splitting requires cell integrators sharing the same `index`, without
+        tensor coefficients or sources that are bound to all the cells.
+        """
+        INTS = self.integrators[group]
+        if group in self.memory:
+            return None
+
+        for int_ in INTS:
+            if not isinstance(int_, CellInt) or not hasattr(int_, 'index'):
+                return None
+            if int_.index is not INTS[0].index:
+                return None
+            if is_tensor(getattr(int_, 'coef', None)) or is_tensor(getattr(int_, 'source', None)):
+                return None
+
+        mesh = self._spaces[0].mesh
+        NC = mesh.number_of_cells()
+        return bm.arange(NC, dtype=mesh.itype, device=mesh.device)[INTS[0].index]
+
+    def _chunk_index(self, group: str):
+        """Indices of the cells in every chunk of the group, or None if the group
+        can not be integrated chunk by chunk."""
+        if self.chunk_size <= 0:
+            return None
+        cells = self._splittable_cells(group)
+        if cells is None:
+            return None
+        NC = cells.shape[0]
+
+        return [cells[start:start+self.chunk_size]
+                for start in range(0, NC, self.chunk_size)]
+
+    def number_of_partitions(self) -> int:
+        """Number of the partitions used in the parallel assembly."""
+        if self.nparts > 0:
+            return self.nparts
+        return getattr(self.executor, '_max_workers', None) or os.cpu_count() or 1
+
+    def _partition_index(self, group: str):
+        """Positions of the cells of every partition in the cells integrated by
+        the group, or None if the group can not be assembled in parallel."""
+        if self.executor is None:
+            return None
+        cells = self._splittable_cells(group)
+        if cells is None:
+            return None
+        NC = cells.shape[0]
+        nparts = min(self.number_of_partitions(), max(NC, 1))
+        kwargs = {'dtype': cells.dtype, 'device': bm.get_device(cells)}
+
+        if (self.partitioner == 'metis') and (nparts > 1):
+            try:
+                parts = metis_cell_partition(self._spaces[0].mesh, nparts)[cells]
+            except ImportError as e:
+                logger.warning(f"{e}, use the block partition instead.")
+            else:
+                order = bm.argsort(parts, stable=True)
+                counts = bm.index_add(bm.zeros((nparts, ), **kwargs), parts,
+                                      bm.ones(parts.shape, **kwargs))
+                bounds = [0] + bm.to_numpy(bm.cumsum(counts, axis=0)).tolist()
+                return [order[bounds[i]:bounds[i+1]] for i in range(nparts)
+                        if bounds[i+1] > bounds[i]]
+
+        size = -(-NC // nparts)
+        pos = bm.arange(NC, **kwargs)
+        return [pos[start:start+size] for start in range(0, NC, size)]
+
+    def _map_partitions(self, group: str, worker, *args):
+        """Submit `worker(INTS, space, group, index, e2dofs, *args)` to the executor
+        for every partition of the group, and return the results in order.
+
+        Returns:
+            List | None: The results, or None if the group can not be assembled in parallel.
+        """
+        parts = self._partition_index(group)
+        if parts is None:
+            return None
+
+        INTS = self.integrators[group]
+        cells = self._splittable_cells(group)
+        etg = [INTS[0].to_global_dof(s) for s in self._spaces]
+        futures = [
+            self.executor.submit(_run_in_backend, bm.backend_name, worker, INTS, self.space,
+                                 group, cells[pos], [e2d[pos] for e2d in etg], *args)
+            for pos in parts
+        ]
+        return [f.result() for f in futures]
+
+    def _assembly_group_chunks(self, group: str):
+        """Iterate over the local tensors of the group chunk by chunk.
+
+        Yields:
+            Tuple[TensorLike, List[TensorLike]]: The local tensor and the
+                entity-to-global relationships of every chunk.
+        """
+        chunks = self._chunk_index(group)
+
+        if chunks is None:
+            yield self._assembly_group(group, False)
+            return
+
+        INTS = self.integrators[group]
+        etg = [INTS[0].to_global_dof(s) for s in self._spaces]
+        start = 0
+
+        for index in chunks:
+            stop = start + index.shape[0]
+            with ExitStack() as stack:
+                for int_ in INTS:
+                    stack.enter_context(int_.restrict(index))
+                ct = self._integrate_group(group)
+            yield ct, [e2d[start:stop] for e2d in etg]
+            start = stop
@@ -1,8 +1,10 @@
 
 from typing import Union, Callable, Optional, Any, TypeVar, Tuple, Dict
+from contextlib import contextmanager
 
 from ..typing import TensorLike, CoefLike
 from ..functionspace.space import FunctionSpace as _FS
+from .basis_cache import BasisCache, basis_cache
 
 __all__ = [
     'Integrator',
@@ -15,19 +17,27 @@ __all__ = [
     'FaceInt',
 ]
 
+_NO_BASIS_CACHE = BasisCache(enabled=False)
+
 _Meth = TypeVar('_Meth', bound=Callable[..., Any])
 
 
 class IntegratorMeta(type):
     def __init__(self, name: str, bases: Tuple[type, ...], dict: Dict[str, Any], /, **kwds: Any):
+        # Every class owns a copy of the map inherited from its bases, so that
+        # subclasses registering the same name do not override each other.
+        assembly_map = {}
+        for base in reversed(bases):
+            assembly_map.update(getattr(base, '_assembly_map', {}))
+        assembly_map.update(dict.get('_assembly_map', {}))
+        self._assembly_map = assembly_map
+
         for meth_name, meth in dict.items():
             if callable(meth):
                 if hasattr(meth, '__call_name__'):
                     call_name = getattr(meth, '__call_name__')
                     if call_name is None:
                         call_name = meth_name
-                    if not hasattr(self, '_assembly_map'):
-                        self._assembly_map = {}
                     self._assembly_map[call_name] = meth_name
 
         return type.__init__(self, name, bases, dict, **kwds)
@@ -92,6 +102,9 @@ class Integrator(metaclass=IntegratorMeta):
     """The base class for integrators on function spaces."""
     _value: Optional[TensorLike] = None
     _assembly_map: Dict[str, str] = {}
+    basis_cache: BasisCache = basis_cache
+    """The cache of the basis tables shared by the integrators. Set to a
+    `BasisCache(enabled=False)` for an integrator to compute its own tables."""
 
     def __init__(self, method='assembly') -> None:
         if method not in self._assembly_map:
@@ -121,6 +134,47 @@ class Integrator(metaclass=IntegratorMeta):
     def assembly(self, space: _FS) -> TensorLike:
         raise NotImplementedError
 
+    def apply(self, space: _FS, val: TensorLike) -> TensorLike:
+        """Apply the local operator to the local dof values of the trial function,
+        without forming the local matrices (matrix-free).
+
+        Parameters:
+            space (FunctionSpace): The function space.
+            val (TensorLike): Local dof values shaped (..., NC, ldof), ordered as `to_global_dof`.
+
+        Returns:
+            TensorLike: The local results shaped (..., NC, ldof).
+
+        Raises:
+            NotImplementedError: If the matrix-free application is not available
+                for the integrator and the space.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def restrict(self, index):
+        """Temporarily restrict the integrator to the entities in `index`.
+
+        The cached result and the cache of the integrator are suspended in
+        the context, and restored when exiting. Tables of the restricted
+        entities are not kept in the shared `basis_cache`.
+
+        Parameters:
+            index (Index): The entities to integrate on, replacing `self.index`.
+        """
+        state = (self.index, self._value, getattr(self, '_cache', None),
+                 self.__dict__.get('basis_cache', None))
+        self.index, self._value, self._cache = index, None, {}
+        self.basis_cache = _NO_BASIS_CACHE
+        try:
+            yield self
+        finally:
+            self.index, self._value, self._cache = state[:3]
+            if state[3] is None:
+                del self.basis_cache
+            else:
+                self.basis_cache = state[3]
+
     def clear(self, result_only=True) -> None:
         """Clear the cache of the integrators.
 
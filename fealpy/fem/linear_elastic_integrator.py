@@ -11,6 +11,7 @@ from .integrator import (
     enable_cache,
     assemblymethod
 )
+from .reference_tensor import is_reference_applicable, assemble_elastic
 
 class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
     """
@@ -51,6 +52,14 @@ class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
         return bcs, ws, gphi, cm, index, q
     
     def assembly(self, space: _TS) -> TensorLike:
+        D = self._reference_elastic_matrix(space)
+        if D is not None:
+            return assemble_elastic(self.basis_cache, space, self._order(space), D,
+                                    self.material, self.index)
+        return self.quadrature_assembly(space)
+
+    @assemblymethod('quadrature')
+    def quadrature_assembly(self, space: _TS) -> TensorLike:
         scalar_space = space.scalar_space
         bcs, ws, gphi, cm, index, q = self.fetch(scalar_space)
         
@@ -61,6 +70,52 @@ class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
         
         return KK
 
+    def _order(self, space: _TS) -> int:
+        return space.p+3 if self.q is None else self.q
+
+    def _number_of_cells(self, space: _TS) -> int:
+        NC = space.mesh.number_of_cells()
+        if isinstance(self.index, slice):
+            return len(range(NC)[self.index])
+        if self.index.dtype == bm.bool:
+            return int(bm.sum(self.index))
+        return self.index.shape[0]
+
+    def _reference_elastic_matrix(self, space: _TS) -> Optional[TensorLike]:
+        """The elastic matrix if the reference-tensor assembly applies, or None."""
+        if not (hasattr(space, 'scalar_space') and is_reference_applicable(space)):
+            return None
+        if space.dof_numel != space.mesh.geo_dimension():
+            return None
+        bcs, _ = self.basis_cache.quadrature(space.mesh, self._order(space), 'cell')
+        D = self.material.elastic_matrix(bcs)
+        NC = self._number_of_cells(space)
+        if (D.ndim == 4) and (D.shape[1] == 1) and (D.shape[0] in (1, NC)):
+            return D
+        return None
+
+    def reference_applicable(self, space: _TS) -> bool:
+        """Whether the reference-tensor assembly applies, requiring a vector
+        Lagrange space on a simplex mesh and an elastic matrix shaped
+        (1 or NC, 1, NS, NS), i.e. constant in every cell."""
+        return self._reference_elastic_matrix(space) is not None
+
+    @assemblymethod('fast')
+    def fast_assembly_reference(self, space: _TS) -> TensorLike:
+        """Assemble B^T D B by contracting the reference stiffness tensor with
+        `grad_lambda`, the cell measures and the elastic matrix, for any elastic
+        matrix constant in every cell, in 2D and 3D, with both dof orderings.
+
+        This is selected automatically by `assembly` when applicable.
+        """
+        D = self._reference_elastic_matrix(space)
+        if D is None:
+            raise RuntimeError("The fast assembly of LinearElasticIntegrator requires "
+                               "a vector Lagrange space on a simplex mesh and an "
+                               "elastic matrix constant in every cell.")
+        return assemble_elastic(self.basis_cache, space, self._order(space), D,
+                                self.material, self.index)
+
     @assemblymethod('fast_strain')
     def fast_assembly_strain(self, space: _TS) -> TensorLike:
         index = self.index
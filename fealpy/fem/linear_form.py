@@ -5,10 +5,21 @@ from .. import logger
 from ..typing import TensorLike
 from ..backend import backend_manager as bm 
 from ..sparse import COOTensor
-from .form import Form
+from .form import Form, integrate_partition, compress_entries
 from .integrator import LinearInt
 
 
+def _assemble_partition(INTS, space, group: str, index: TensorLike, e2dofs,
+                        batch_size: int):
+    """Assemble the local vector of a partition as sorted unique dofs and their values."""
+    group_tensor = integrate_partition(INTS, space, group, index)
+    if (batch_size > 0) and (group_tensor.ndim == 2):
+        group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+    values_shape = (-1, ) if (batch_size == 0) else (batch_size, -1)
+    group_tensor = bm.reshape(group_tensor, values_shape)
+    return compress_entries(bm.reshape(e2dofs[0], (-1, )), group_tensor)
+
+
 class LinearForm(Form[LinearInt]):
     _V = None
 
@@ -58,6 +69,42 @@ class LinearForm(Form[LinearInt]):
 
         return M
 
+    def _chunked_assembly(self, batch_size: int):
+        self.check_space()
+        space = self._spaces[0]
+        gdof = space.number_of_global_dofs()
+        value_shape = (gdof, ) if (batch_size == 0) else (batch_size, gdof)
+        V = bm.zeros(value_shape, dtype=space.ftype, device=bm.get_device(space))
+
+        for group in self.integrators.keys():
+            for group_tensor, e2dofs in self._assembly_group_chunks(group):
+                if (batch_size > 0) and (group_tensor.ndim == 2):
+                    group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+                group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+                V = bm.index_add(V, e2dofs[0].reshape(-1), group_tensor, axis=-1)
+
+        return V
+
+    def _parallel_assembly(self, batch_size: int):
+        self.check_space()
+        space = self._spaces[0]
+        gdof = space.number_of_global_dofs()
+        value_shape = (gdof, ) if (batch_size == 0) else (batch_size, gdof)
+        V = bm.zeros(value_shape, dtype=space.ftype, device=bm.get_device(space))
+
+        for group in self.integrators.keys():
+            blocks = self._map_partitions(group, _assemble_partition, batch_size)
+            if blocks is None:
+                group_tensor, e2dofs = self._assembly_group(group, False)
+                if (batch_size > 0) and (group_tensor.ndim == 2):
+                    group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+                group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+                blocks = [(e2dofs[0].reshape(-1), group_tensor)]
+            for dofs, vals in blocks:
+                V = bm.index_add(V, dofs, vals, axis=-1)
+
+        return V
+
     @overload
     def assembly(self, *, retain_ints: bool=False) -> TensorLike: ...
     @overload
@@ -70,10 +117,34 @@ class LinearForm(Form[LinearInt]):
         Parameters:
             format (str, optional): Layout of the output ('dense', 'coo'). Defaults to 'dense'.\n
             retain_ints (bool, optional): Whether to retain the integrator cache.
+                Ignored if `chunk_size` of the form is positive.
+
+        If `chunk_size` of the form is positive, the cells are integrated chunk
+        by chunk and added to the global vector directly.
+
+        If the form has an `executor`, the cells are split into partitions
+        assembled by the workers in parallel. `chunk_size` is ignored in this case.
 
         Returns:
             global_vector (COOTensor | TensorLike): Global sparse vector shaped ([batch, ]gdof).
         """
+        if (self.executor is not None) or (self.chunk_size > 0):
+            if self.executor is not None:
+                V = self._parallel_assembly(self.batch_size)
+            else:
+                V = self._chunked_assembly(self.batch_size)
+            if format == 'dense':
+                self._V = V
+            elif format == 'coo':
+                gdof = V.shape[-1]
+                indices = bm.arange(gdof, dtype=self._spaces[0].itype, device=bm.get_device(V))
+                self._V = COOTensor(indices[None, :], V, (gdof, ))
+            else:
+                raise ValueError(f"Unsupported format {format}.")
+            logger.info(f"Linear form vector constructed, with shape {list(V.shape)}.")
+
+            return self._V
+
         V = self._scalar_assembly(retain_ints, self.batch_size)
 
         if format == 'dense':
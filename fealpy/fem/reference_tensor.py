@@ -0,0 +1,177 @@
+
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike, Index, _S
+from ..mesh import SimplexMesh
+from ..functionspace import LagrangeFESpace
+from ..utils import is_scalar
+from .basis_cache import BasisCache
+
+# NOTE: On simplex meshes with affine cells, the basis functions are polynomials
+# of the barycentric coordinates, and the gradients of the barycentric
+# coordinates are constant in every cell. Integrals of products of the bases are
+# then the contraction of a reference tensor, computed once on the reference
+# cell, with the cell-wise geometric factors (measure and grad_lambda). This
+# removes all the work on the quadrature points from the assembly of the
+# integrators with cell-wise constant coefficients.
+
+
+def is_reference_applicable(space) -> bool:
+    """Check whether the space (or the scalar space of a tensor space) is a
+    Lagrange space on a simplex mesh with affine cells."""
+    scalar_space = getattr(space, 'scalar_space', space)
+    if not isinstance(scalar_space, LagrangeFESpace):
+        return False
+    mesh = scalar_space.mesh
+    if not isinstance(mesh, SimplexMesh):
+        return False
+    return mesh.geo_dimension() == mesh.top_dimension()
+
+
+def is_cellwise_constant(coef, NC: int) -> bool:
+    """Check whether the scalar coefficient is None, a number, or a tensor shaped
+    (NC, ), rather than a function or values on the quadrature points."""
+    if (coef is None) or is_scalar(coef):
+        return True
+    if callable(coef) or not hasattr(coef, 'shape'):
+        return False
+    return (coef.ndim == 1) and (coef.shape[0] == NC)
+
+
+def _tables(cache: BasisCache, space, q: int):
+    bcs, ws = cache.quadrature(space.mesh, q, 'cell')
+    phi = space.basis(bcs)[0] # (NQ, ldof)
+    gphi = space.grad_basis(bcs, variable='u') # (NQ, ldof, TD+1)
+    return ws, phi, gphi
+
+
+def mass_tensor(cache: BasisCache, space, q: int) -> TensorLike:
+    """Reference mass tensor M[i, j] = (phi_i, phi_j) on the unit-measure cell."""
+    def builder():
+        ws, phi, _ = _tables(cache, space, q)
+        return bm.einsum('q, qi, qj -> ij', ws, phi, phi)
+    return cache.get(space, ('reference', 'mass', q), builder)
+
+
+def stiffness_tensor(cache: BasisCache, space, q: int) -> TensorLike:
+    """Reference stiffness tensor S[k, l, i, j] = (d_k phi_i, d_l phi_j), with
+    derivatives taken w.r.t. the barycentric coordinates, reshaped to ((TD+1)^2, ldof^2)."""
+    def builder():
+        ws, _, gphi = _tables(cache, space, q)
+        S = bm.einsum('q, qik, qjl -> klij', ws, gphi, gphi)
+        return bm.reshape(S, (S.shape[0]*S.shape[1], -1))
+    return cache.get(space, ('reference', 'stiffness', q), builder)
+
+
+def convection_tensor(cache: BasisCache, space, q: int) -> TensorLike:
+    """Reference convection tensor C[l, i, j] = (phi_i, d_l phi_j), reshaped to (TD+1, ldof^2)."""
+    def builder():
+        ws, phi, gphi = _tables(cache, space, q)
+        C = bm.einsum('q, qi, qjl -> lij', ws, phi, gphi)
+        return bm.reshape(C, (C.shape[0], -1))
+    return cache.get(space, ('reference', 'convection', q), builder)
+
+
+def _scale(A: TensorLike, coef) -> TensorLike:
+    if coef is None:
+        return A
+    if is_scalar(coef):
+        return A * coef
+    return A * coef[:, None, None]
+
+
+def expand_tensor_space(A: TensorLike, space) -> TensorLike:
+    """Expand the scalar local matrices (NC, ldof, ldof) to the block-diagonal
+    local matrices of a tensor space, ordered as `space.cell_to_dof`."""
+    if not hasattr(space, 'scalar_space'):
+        return A
+    NC, ldof, _ = A.shape
+    n = space.dof_numel
+    I = bm.eye(n, **bm.context(A))
+    if space.dof_priority:
+        A = bm.einsum('ab, cij -> caibj', I, A)
+    else:
+        A = bm.einsum('ab, cij -> ciajb', I, A)
+    return bm.reshape(A, (NC, n*ldof, n*ldof))
+
+
+def assemble_mass(cache: BasisCache, space, q: int, index: Index=_S, coef=None) -> TensorLike:
+    """Local mass matrices with a cell-wise constant scalar coefficient."""
+    scalar_space = getattr(space, 'scalar_space', space)
+    mesh = scalar_space.mesh
+    cm = cache.measure(mesh, 'cell', index)
+    M = mass_tensor(cache, scalar_space, q)
+    A = cm[:, None, None] * M[None, ...]
+    return expand_tensor_space(_scale(A, coef), space)
+
+
+def _geometric_factors(cache: BasisCache, mesh, index: Index):
+    cm = cache.measure(mesh, 'cell', index)
+    glambda = mesh.grad_lambda(index=index) # (NC, TD+1, GD)
+    return cm, glambda
+
+
+def assemble_diffusion(cache: BasisCache, space, q: int, index: Index=_S, coef=None) -> TensorLike:
+    """Local stiffness matrices with a cell-wise constant scalar coefficient."""
+    scalar_space = getattr(space, 'scalar_space', space)
+    mesh = scalar_space.mesh
+    cm, glambda = _geometric_factors(cache, mesh, index)
+    S = stiffness_tensor(cache, scalar_space, q)
+    NC, K = glambda.shape[:2]
+    G = bm.einsum('c, ckm, clm -> ckl', cm, glambda, glambda)
+    ldof = scalar_space.number_of_local_dofs()
+    A = bm.reshape(bm.matmul(bm.reshape(G, (NC, K*K)), S), (NC, ldof, ldof))
+    return expand_tensor_space(_scale(A, coef), space)
+
+
+def assemble_convection(cache: BasisCache, space, q: int, index: Index=_S,
+                        velocity: Optional[TensorLike]=None) -> TensorLike:
+    """Local convection matrices (phi_i, b . grad phi_j) with a cell-wise
+    constant velocity `b` shaped (GD, ) or (NC, GD)."""
+    scalar_space = getattr(space, 'scalar_space', space)
+    mesh = scalar_space.mesh
+    cm, glambda = _geometric_factors(cache, mesh, index)
+    C = convection_tensor(cache, scalar_space, q)
+    NC = glambda.shape[0]
+    if velocity.ndim == 1:
+        velocity = velocity[None, :]
+    G = bm.einsum('c, ckm, cm -> ck', cm, glambda, velocity)
+    ldof = scalar_space.number_of_local_dofs()
+    A = bm.reshape(bm.matmul(G, C), (NC, ldof, ldof))
+    return expand_tensor_space(A, space)
+
+
+def strain_selection(material, GD: int, **kwargs) -> TensorLike:
+    """The constant tensor S[s, b, n] mapping the gradients of the displacement
+    to the strains in the Voigt notation of the material, such that
+    B[s, (j, b)] = S[s, b, n] d_n phi_j."""
+    gphi = bm.eye(GD, **kwargs)[:, None, :] # (n, ldof=1, GD)
+    B = material.strain_matrix(True, gphi=gphi) # (n, NS, b)
+    return bm.permute_dims(B, (1, 2, 0))
+
+
+def assemble_elastic(cache: BasisCache, space, q: int, D: TensorLike,
+                     material, index: Index=_S) -> TensorLike:
+    """Local stiffness matrices of the linear elasticity, B^T D B, with the
+    elastic matrix `D` shaped (1 or NC, 1, NS, NS)."""
+    scalar_space = space.scalar_space
+    mesh = scalar_space.mesh
+    GD = mesh.geo_dimension()
+    cm, glambda = _geometric_factors(cache, mesh, index)
+    S = stiffness_tensor(cache, scalar_space, q)
+    NC, K = glambda.shape[:2]
+    ldof = scalar_space.number_of_local_dofs()
+
+    # A[c, m, n, i, j] = (d_m phi_i, d_n phi_j) on the cell c.
+    G = bm.einsum('c, ckm, cln -> cmnkl', cm, glambda, glambda)
+    A = bm.matmul(bm.reshape(G, (NC*GD*GD, K*K)), S)
+    A = bm.reshape(A, (NC, GD, GD, ldof, ldof))
+
+    Sel = strain_selection(material, GD, **bm.context(D))
+    E = bm.einsum('sam, cst, tbn -> cambn', Sel, D[:, 0], Sel)
+    KK = bm.einsum('cambn, cmnij -> caibj', E, A)
+
+    if not space.dof_priority:
+        KK = bm.permute_dims(KK, (0, 2, 1, 4, 3))
+    return bm.reshape(KK, (NC, GD*ldof, GD*ldof))
@@ -14,6 +14,7 @@ from .integrator import (
     assemblymethod,
     CoefLike
 )
+from .reference_tensor import is_reference_applicable, assemble_convection
 
 class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
     r"""The convection integrator for function spaces based on homogeneous meshes."""
@@ -42,15 +43,18 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
         q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        gphi = space.grad_basis(bcs, index=index)
-        phi = space.basis(bcs, index=index)
+        bcs, ws, phi, cm = self.basis_cache.fetch(space, q, index)
+        gphi = self.basis_cache.basis(space, q, 'cell', index, diff=1)
         return bcs, ws, phi, gphi, cm, index
 
     def assembly(self, space: _FS) -> TensorLike:
+        if self.reference_applicable(space):
+            return self.fast_assembly(space)
+        return self.quadrature_assembly(space)
+
+    @assemblymethod('quadrature')
+    def quadrature_assembly(self, space: _FS) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
         bcs, ws, phi, gphi, cm, index = self.fetch(space)
@@ -61,3 +65,29 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
         else:
             raise TypeError(f"coef should be Tensor, but got {type(coef)}.")
         return result
+
+    def reference_applicable(self, space: _FS) -> bool:
+        """Whether the reference-tensor assembly applies, requiring Lagrange
+        spaces on simplex meshes and a velocity tensor shaped (GD, ) or (NC, GD)."""
+        coef = self.coef
+        if self.batched or (not is_reference_applicable(space)) or (not is_tensor(coef)):
+            return False
+        GD = space.mesh.geo_dimension()
+        if coef.ndim == 1:
+            return coef.shape[0] == GD
+        NC = self.to_global_dof(space).shape[0]
+        return (coef.ndim == 2) and (coef.shape == (NC, GD))
+
+    @assemblymethod('fast')
+    def fast_assembly(self, space: _FS) -> TensorLike:
+        """Assemble by contracting the reference convection tensor with the
+        cell-wise constant velocity, `grad_lambda` and the cell measures.
+
+        This is selected automatically by `assembly` when applicable.
+        """
+        if not self.reference_applicable(space):
+            raise RuntimeError("The fast assembly of ScalarConvectionIntegrator requires "
+                               "a Lagrange space on a simplex mesh and a cell-wise "
+                               "constant velocity.")
+        q = space.p+3 if self.q is None else self.q
+        return assemble_convection(self.basis_cache, space, q, self.index, self.coef)
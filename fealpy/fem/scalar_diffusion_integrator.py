@@ -13,6 +13,11 @@ from .integrator import (
     assemblymethod,
     CoefLike
 )
+from .sum_factorization import (
+    is_sum_factorizable, basis_1d, cell_jacobian,
+    gradient, gradient_transpose, scalar_coef
+)
+from .reference_tensor import is_reference_applicable, is_cellwise_constant, assemble_diffusion
 
 
 class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
@@ -42,14 +47,16 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        gphi = space.grad_basis(bcs, index=index, variable='x')
+        bcs, ws, gphi, cm = self.basis_cache.fetch(space, self.q, index, diff=1)
         return bcs, ws, gphi, cm, index
 
     def assembly(self, space: _FS) -> TensorLike:
+        if self.reference_applicable(space):
+            return self.fast_assembly(space)
+        return self.quadrature_assembly(space)
+
+    @assemblymethod('quadrature')
+    def quadrature_assembly(self, space: _FS) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
         bcs, ws, gphi, cm, index = self.fetch(space)
@@ -57,25 +64,67 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
 
         return bilinear_integral(gphi, gphi, ws, cm, coef, batched=self.batched)
 
-    @assemblymethod('fast')
-    def fast_assembly(self, space: _FS) -> TensorLike:
-        """
-        限制：常系数、单纯形网格
-        TODO: 加入 assert
-        """
+    def reference_applicable(self, space: _FS) -> bool:
+        """Whether the reference-tensor assembly applies, requiring Lagrange
+        spaces on simplex meshes and a cell-wise constant coefficient."""
+        if self.batched or (not is_reference_applicable(space)):
+            return False
+        return is_cellwise_constant(self.coef, self.to_global_dof(space).shape[0])
+
+    @enable_cache
+    def fetch_sum_factorization(self, space: _FS):
         index = self.index
         mesh = getattr(space, 'mesh', None)
-
-        cm = mesh.entity_measure('cell', index=index)
         q = space.p+3 if self.q is None else self.q
         qf = mesh.quadrature_formula(q, 'cell')
         bcs, ws = qf.get_quadrature_points_and_weights()
-        gphi = space.grad_basis(bcs, index=index, variable='u')
+        phi, dphi = basis_1d(bcs[0], space.p)
+        J = cell_jacobian(mesh, bcs[0], index=index)
+        detJ = bm.abs(bm.linalg.det(J))
+        Jinv = bm.linalg.inv(J)
+        G = bm.einsum('q, cq, cqmd, cqnd -> cqmn', ws, detJ, Jinv, Jinv)
+        return bcs, phi, dphi, G, index
 
-        glambda = mesh.grad_lambda()
-        M = bm.einsum('q, qik, qjl->ijkl', ws, gphi, gphi)
-        A = bm.einsum('ijkl, ckm, clm, c->cij', M, glambda, glambda, cm)
-        return A
+    def apply(self, space: _FS, val: TensorLike) -> TensorLike:
+        """Matrix-free application on tensor-product meshes by sum factorization.
+
+        The reference gradients on the quadrature points are evaluated by 1-d
+        contractions, scaled by the geometric factors w|J|J^{-1}J^{-T} and the
+        coefficient, and tested by the transposed contractions. Only the
+        geometric factors shaped (NC, NQ, TD, TD) are cached.
+        """
+        if (self._assembly != 'assembly') or self.batched or (not is_sum_factorizable(space)):
+            raise NotImplementedError
+
+        mesh = getattr(space, 'mesh', None)
+        TD = mesh.top_dimension()
+        bcs, phi, dphi, G, index = self.fetch_sum_factorization(space)
+        NC, NQ = G.shape[:2]
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        coef = scalar_coef(coef, NQ, **bm.context(G))
+
+        n = phi.shape[-1]
+        u = bm.reshape(val, val.shape[:-1] + (n, )*TD)
+        g = gradient(u, phi, dphi, TD)
+        g = bm.reshape(g, val.shape[:-1] + (NQ, TD))
+        g = bm.einsum('cqmn, cq, ...cqn -> ...cqm', G, bm.broadcast_to(coef, (NC, NQ)), g)
+        g = bm.reshape(g, val.shape[:-1] + (phi.shape[0], )*TD + (TD, ))
+        v = gradient_transpose(g, phi, dphi, TD)
+        return bm.reshape(v, val.shape)
+
+    @assemblymethod('fast')
+    def fast_assembly(self, space: _FS) -> TensorLike:
+        """Assemble by contracting the reference stiffness tensor M[ijkl] with
+        `grad_lambda` and the cell measures.
+
+        This is selected automatically by `assembly` when applicable.
+        """
+        if not self.reference_applicable(space):
+            raise RuntimeError("The fast assembly of ScalarDiffusionIntegrator requires "
+                               "a Lagrange space on a simplex mesh and a cell-wise "
+                               "constant coefficient.")
+        q = space.p+3 if self.q is None else self.q
+        return assemble_diffusion(self.basis_cache, space, q, self.index, self.coef)
 
     @assemblymethod('semilinear')
     def semilinear_assembly(self, space: _FS) -> TensorLike:
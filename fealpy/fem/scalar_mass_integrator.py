@@ -13,6 +13,11 @@ from .integrator import (
     assemblymethod,
     CoefLike
 )
+from .sum_factorization import (
+    is_sum_factorizable, basis_1d, cell_jacobian,
+    interpolate, interpolate_transpose, scalar_coef
+)
+from .reference_tensor import is_reference_applicable, is_cellwise_constant, assemble_mass
 
 
 class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
@@ -42,14 +47,16 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        phi = space.basis(bcs, index=index)
+        bcs, ws, phi, cm = self.basis_cache.fetch(space, self.q, index)
         return bcs, ws, phi, cm, index
 
     def assembly(self, space: _FS) -> TensorLike:
+        if self.reference_applicable(space):
+            return self.fast_assembly(space)
+        return self.quadrature_assembly(space)
+
+    @assemblymethod('quadrature')
+    def quadrature_assembly(self, space: _FS) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
         bcs, ws, phi, cm, index = self.fetch(space)
@@ -57,6 +64,63 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
 
         return bilinear_integral(phi, phi, ws, cm, val, batched=self.batched)
 
+    def reference_applicable(self, space: _FS) -> bool:
+        """Whether the reference-tensor assembly applies, requiring Lagrange
+        spaces on simplex meshes and a cell-wise constant coefficient."""
+        if self.batched or (not is_reference_applicable(space)):
+            return False
+        return is_cellwise_constant(self.coef, self.to_global_dof(space).shape[0])
+
+    @assemblymethod('fast')
+    def fast_assembly(self, space: _FS) -> TensorLike:
+        """Assemble by contracting the reference mass tensor with the cell measures.
+
+        This is selected automatically by `assembly` when applicable.
+        """
+        if not self.reference_applicable(space):
+            raise RuntimeError("The fast assembly of ScalarMassIntegrator requires "
+                               "a Lagrange space on a simplex mesh and a cell-wise "
+                               "constant coefficient.")
+        q = space.p+3 if self.q is None else self.q
+        return assemble_mass(self.basis_cache, space, q, self.index, self.coef)
+
+    @enable_cache
+    def fetch_sum_factorization(self, space: _FS):
+        index = self.index
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        phi, _ = basis_1d(bcs[0], space.p)
+        J = cell_jacobian(mesh, bcs[0], index=index)
+        W = ws[None, :] * bm.abs(bm.linalg.det(J))
+        return bcs, phi, W, index
+
+    def apply(self, space: _FS, val: TensorLike) -> TensorLike:
+        """Matrix-free application on tensor-product meshes by sum factorization.
+
+        The values on the quadrature points are evaluated by 1-d contractions,
+        scaled by the weights w|J| and the coefficient, and tested by the
+        transposed contractions. Only the weights shaped (NC, NQ) are cached.
+        """
+        if (self._assembly != 'assembly') or self.batched or (not is_sum_factorizable(space)):
+            raise NotImplementedError
+
+        mesh = getattr(space, 'mesh', None)
+        TD = mesh.top_dimension()
+        bcs, phi, W, index = self.fetch_sum_factorization(space)
+        NQ = W.shape[1]
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
+        coef = scalar_coef(coef, NQ, **bm.context(W))
+
+        n = phi.shape[-1]
+        u = bm.reshape(val, val.shape[:-1] + (n, )*TD)
+        u = interpolate(u, [phi]*TD)
+        u = bm.reshape(u, val.shape[:-1] + (NQ, )) * (W * coef)
+        u = bm.reshape(u, val.shape[:-1] + (phi.shape[0], )*TD)
+        v = interpolate_transpose(u, [phi]*TD)
+        return bm.reshape(v, val.shape)
+
     @assemblymethod('semilinear')
     def semilinear_assembly(self, space: _FS) -> TensorLike:
         uh = self.uh
@@ -51,11 +51,7 @@ class ScalarSemilinearDiffusionIntegrator(SemilinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        gphi = space.grad_basis(bcs, index=index, variable='x')
+        bcs, ws, gphi, cm = self.basis_cache.fetch(space, self.q, index, diff=1)
         return bcs, ws, gphi, cm, index
     def assembly(self, space: _FS) -> TensorLike:
         uh = self.uh
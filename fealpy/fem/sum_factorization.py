@@ -0,0 +1,158 @@
+
+from typing import Tuple, Sequence
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike, Index, _S
+from ..mesh import TensorMesh
+from ..utils import is_scalar
+
+_AXES = 'ijk'
+
+# NOTE: On tensor-product cells, the basis of the Lagrange space is the tensor
+# product of 1-d bases, with the local dofs ordered as (n, n[, n]) where the last
+# axis runs fastest. Evaluating the values or the gradients of a finite element
+# function on the tensor-product quadrature points is then a sequence of 1-d
+# contractions (sum factorization), costing O(p^{TD+1}) per cell instead of
+# O(p^{2TD}) with the full local matrices.
+
+
+def is_sum_factorizable(space) -> bool:
+    """Check whether the space is a continuous scalar Lagrange space on a
+    tensor-product mesh whose geometric dimension equals the topological one."""
+    mesh = getattr(space, 'mesh', None)
+    if not isinstance(mesh, TensorMesh):
+        return False
+    if getattr(space, 'ctype', None) != 'C' or not hasattr(space, 'dof'):
+        return False
+    return mesh.geo_dimension() == mesh.top_dimension()
+
+
+def basis_1d(bc: TensorLike, p: int) -> Tuple[TensorLike, TensorLike]:
+    """Values and derivatives of the 1-d Lagrange basis on the reference interval.
+
+    Parameters:
+        bc (TensorLike): 1-d barycentric coordinates of the points shaped (NQ, 2).
+        p (int): Degree of the basis.
+
+    Returns:
+        Tuple[TensorLike, TensorLike]: Values and derivatives, both shaped (NQ, p+1).
+    """
+    Dlambda = bm.array([-1, 1], dtype=bc.dtype, device=bm.get_device(bc))
+    phi = bm.simplex_shape_function(bc, p=p)
+    R = bm.simplex_grad_shape_function(bc, p=p)
+    dphi = bm.einsum('...ij, j -> ...i', R, Dlambda)
+    return phi, dphi
+
+
+def contract(M: TensorLike, u: TensorLike, axis: int, TD: int) -> TensorLike:
+    """Apply a 1-d matrix to one local axis of the tensor-product cell values.
+
+    Parameters:
+        M (TensorLike): The 1-d matrix shaped (m, n).
+        u (TensorLike): Cell values shaped (..., NC, n_0, ..., n_{TD-1}), with n_{axis} = n.
+        axis (int): The local axis to contract.
+        TD (int): Number of the local axes.
+
+    Returns:
+        TensorLike: Cell values with the local `axis` replaced by m.
+    """
+    idx = _AXES[:TD]
+    out = idx[:axis] + 'z' + idx[axis+1:]
+    return bm.einsum(f'z{idx[axis]}, ...c{idx} -> ...c{out}', M, u)
+
+
+def interpolate(u: TensorLike, ops: Sequence[TensorLike]) -> TensorLike:
+    """Apply the tensor-product operator `ops[0] x ops[1] x ...` to the cell values
+    shaped (..., NC, n_0, ..., n_{TD-1})."""
+    TD = len(ops)
+    for axis, M in enumerate(ops):
+        u = contract(M, u, axis, TD)
+    return u
+
+
+def interpolate_transpose(v: TensorLike, ops: Sequence[TensorLike]) -> TensorLike:
+    """Apply the transpose of the tensor-product operator `ops[0] x ops[1] x ...`."""
+    TD = len(ops)
+    for axis, M in enumerate(ops):
+        v = contract(bm.swapaxes(M, 0, 1), v, axis, TD)
+    return v
+
+
+def gradient(u: TensorLike, phi: TensorLike, dphi: TensorLike, TD: int) -> TensorLike:
+    """Reference gradient of the cell values on the tensor-product points.
+
+    Parameters:
+        u (TensorLike): Cell values shaped (..., NC, n, ..., n).
+        phi (TensorLike): 1-d basis values shaped (NQ, n).
+        dphi (TensorLike): 1-d basis derivatives shaped (NQ, n).
+        TD (int): Number of the local axes.
+
+    Returns:
+        TensorLike: The gradient shaped (..., NC, NQ, ..., NQ, TD).
+    """
+    grads = []
+    for d in range(TD):
+        ops = [dphi if i == d else phi for i in range(TD)]
+        grads.append(interpolate(u, ops))
+    return bm.stack(grads, axis=-1)
+
+
+def gradient_transpose(g: TensorLike, phi: TensorLike, dphi: TensorLike, TD: int) -> TensorLike:
+    """Transpose of `gradient`, mapping (..., NC, NQ, ..., NQ, TD) to (..., NC, n, ..., n)."""
+    v = 0.
+    for d in range(TD):
+        ops = [dphi if i == d else phi for i in range(TD)]
+        v = v + interpolate_transpose(g[..., d], ops)
+    return v
+
+
+def cell_jacobian(mesh: TensorMesh, bc: TensorLike, index: Index=_S) -> TensorLike:
+    """Jacobian matrices of the multi-linear cell mappings on the tensor-product points.
+
+    Parameters:
+        mesh (TensorMesh): The tensor-product mesh.
+        bc (TensorLike): 1-d barycentric coordinates of the points shaped (NQ, 2).
+        index (Index, optional): Index of the cells. Defaults to all.
+
+    Returns:
+        TensorLike: The Jacobian matrices shaped (NC, NQ^TD, GD, TD).
+    """
+    TD = mesh.top_dimension()
+    node = mesh.entity('node')
+    c2p = mesh.cell_to_ipoint(1)[index]
+    NC, GD = c2p.shape[0], node.shape[-1]
+    X = bm.reshape(node[c2p], (NC, ) + (2, )*TD + (GD, ))
+    X = bm.moveaxis(X, -1, 0) # (GD, NC, 2, ..., 2)
+    phi, dphi = basis_1d(bc, 1)
+    J = gradient(X, phi, dphi, TD) # (GD, NC, NQ, ..., NQ, TD)
+    J = bm.moveaxis(J, 0, -2)
+    return bm.reshape(J, (NC, -1, GD, TD))
+
+
+def scalar_coef(coef, NQ: int, **kwargs) -> TensorLike:
+    """Reshape a scalar coefficient to be broadcastable to (NC, NQ).
+
+    Parameters:
+        coef (Number | TensorLike | None): The coefficient, None, a number,
+            or tensor shaped (NC, ) or (NC, NQ).
+        NQ (int): Number of the quadrature points in each cell.
+        **kwargs: dtype and device of the output for number coefficients.
+
+    Returns:
+        TensorLike: The coefficient shaped (1, 1), (NC, 1) or (NC, NQ).
+
+    Raises:
+        NotImplementedError: If the coefficient is not a scalar function.
+    """
+    if coef is None:
+        return bm.ones((1, 1), **kwargs)
+    if is_scalar(coef):
+        if isinstance(coef, (int, float)):
+            return bm.full((1, 1), coef, **kwargs)
+        return bm.reshape(coef, (1, 1))
+    if coef.ndim == 1:
+        return coef[:, None]
+    if (coef.ndim == 2) and (coef.shape[-1] == NQ):
+        return coef
+    raise NotImplementedError("Only scalar coefficients are supported by the "
+                              f"sum-factorized application, but got shape {tuple(coef.shape)}.")
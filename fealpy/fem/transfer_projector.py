@@ -0,0 +1,229 @@
+
+from typing import Optional, Tuple, Union
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..functionspace.function import Function
+from ..solver import DirectSolver
+from .projector import Projector
+from .bilinear_form import BilinearForm
+from .scalar_mass_integrator import ScalarMassIntegrator
+
+
+def locate_in_space(space, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+    """Cells and local coordinates of the points in the mesh of the space.
+
+    Points outside the mesh (e.g. on a curved or moved boundary) are assigned
+    to the cell with the nearest barycenter, searched in the bins of the point
+    locator, with their local coordinates clamped to that cell, i.e. the
+    functions are extended by their values on the boundary of the cell.
+
+    Parameters:
+        space (LagrangeFESpace): The space.
+        points (Tensor): The points shaped (NP, GD).
+
+    Returns:
+        Tensor: Cell of every point shaped (NP, ).
+        Tensor: Local coordinates, see `PointLocator.local_coordinates`.
+    """
+    mesh = space.mesh
+    locator = mesh.point_locator()
+    cells, coords = locator.locate(points)
+    miss = bm.nonzero(cells < 0)[0]
+    if miss.shape[0] == 0:
+        return cells, coords
+
+    near = locator.nearest(points[miss])
+    lc = locator.local_coordinates(points[miss], near)
+    if locator.ref is None:
+        lc = bm.where(lc < 0, 0.0, lc)
+        lc = lc / bm.sum(lc, axis=-1, keepdims=True)
+    else:
+        lc = bm.clip(lc, 0.0, 1.0)
+    cells = bm.set_at(cells, miss, near)
+    coords = bm.set_at(coords, miss, lc)
+    return cells, coords
+
+
+class _TransferProjector(Projector):
+    def __init__(self, space0, space1) -> None:
+        super().__init__(space0, space1)
+        self._matrix = None
+
+    def assembly(self) -> CSRTensor:
+        raise NotImplementedError
+
+    def _apply(self, array: TensorLike) -> TensorLike:
+        return self.assembly() @ array
+
+    def __call__(self, uh: Union[Function, TensorLike]):
+        """Transfer functions of space0 to space1.
+
+        Parameters:
+            uh (Function | Tensor): A function of space0, or the degrees of
+                freedom of one or several functions shaped (GDOF0, ) or (GDOF0, NF).
+
+        Returns:
+            Function | Tensor: The function of space1, or its degrees of freedom
+                shaped (GDOF1, ) or (GDOF1, NF).
+        """
+        if isinstance(uh, Function):
+            return self.space1.function(self._apply(uh.array))
+        return self._apply(uh)
+
+
+class InterpolationProjector(_TransferProjector):
+    """Transfer finite element functions between two Lagrange spaces on
+    arbitrary (non-nested) meshes of the same dimension by interpolation:
+    the functions of space0 are evaluated at the interpolation points of space1.
+
+    The interpolation matrix, shaped (GDOF1, GDOF0), is built with the point
+    locator of the mesh of space0 on the first use and cached, so every
+    transfer afterwards is one sparse matrix-vector product, and the fields
+    transferred at once can be stacked as the columns of a matrix.
+
+    Parameters:
+        space0 (LagrangeFESpace): The space to transfer from.
+        space1 (LagrangeFESpace): The space to transfer to.
+
+    Example:
+    ```
+        P = InterpolationProjector(space0, space1)
+        uh1 = P(uh0)
+        fields1 = P(bm.stack([d0, H0], axis=-1))
+    ```
+    """
+    def assembly(self) -> CSRTensor:
+        """The interpolation matrix shaped (GDOF1, GDOF0)."""
+        if self._matrix is None:
+            space0, space1 = self.space0, self.space1
+            points = space1.interpolation_points()
+            cells, coords = locate_in_space(space0, points)
+            phi = space0.point_basis(cells, coords) # (GDOF1, LDOF0)
+            cols = space0.cell_to_dof()[cells]
+            rows = bm.broadcast_to(bm.arange(cols.shape[0], **bm.context(cols))[:, None], cols.shape)
+            indices = bm.stack([bm.reshape(rows, (-1, )), bm.reshape(cols, (-1, ))], axis=0)
+            shape = (space1.number_of_global_dofs(), space0.number_of_global_dofs())
+            self._matrix = COOTensor(indices, bm.reshape(phi, (-1, )), shape).coalesce().tocsr()
+        return self._matrix
+
+
+class L2Projector(_TransferProjector):
+    """Transfer finite element functions between two Lagrange spaces on
+    arbitrary (non-nested) meshes of the same dimension by the L2 projection,
+    M1 u1 = B u0, where M1 is the mass matrix of space1 and B the mixed mass
+    matrix, B_ij = (phi^1_i, phi^0_j).
+
+    B is integrated by quadrature on the cells of space1, with the quadrature
+    points located in the mesh of space0. The integrals are exact when the
+    meshes are nested (or equal), and otherwise up to the quadrature error
+    across the faces of mesh0.
+
+    With `conservative=True`, one global constant is added to every dof of
+    the projection so that the mean (the integral) of the function matches
+    the source. This is a global mean fix, not a conservative transfer: it
+    spreads the quadrature error uniformly over the domain, so it may break
+    bounds of the function (e.g. a phase field in [0, 1]), and it is wrong
+    when the meshes do not cover the same domain. The constant is zero when
+    B is integrated exactly.
+
+    B and the factorization of M1 are built on the first use and cached, so
+    every transfer afterwards is one sparse matrix-vector product and one
+    forward-backward substitution (plus two dot products for the mean fix).
+    With `lumped=True`, M1 is replaced by its row sums and the transfer is one
+    sparse matrix-vector product with D^{-1}B.
+
+    Parameters:
+        space0 (LagrangeFESpace): The space to transfer from.
+        space1 (LagrangeFESpace): The space to transfer to.
+        q (int | None, optional): Index of the quadrature formula on the cells of
+            space1. Defaults to None (p0 + p1 + 2).
+        conservative (bool, optional): Whether to add the global constant
+            keeping the integral of the function. Defaults to False.
+        lumped (bool, optional): Whether to lump the mass matrix. Defaults to False.
+        solver (str, optional): The direct solver for the mass matrix, see
+            `DirectSolver`. Defaults to 'scipy'.
+        chunk (int, optional): Number of the cells of space1 assembled at once.
+            Defaults to 2**14.
+    """
+    def __init__(self, space0, space1, q: Optional[int]=None, *, conservative: bool=False,
+                 lumped: bool=False, solver: str='scipy', chunk: int=2**14) -> None:
+        super().__init__(space0, space1)
+        self.q = space0.p + space1.p + 2 if q is None else q
+        self.conservative = conservative
+        self.lumped = lumped
+        self.solver = solver
+        self.chunk = chunk
+        self._mass_solver = None
+        self._integrals = None
+
+    def mixed_mass_matrix(self) -> CSRTensor:
+        """The mixed mass matrix B shaped (GDOF1, GDOF0)."""
+        space0, space1 = self.space0, self.space1
+        mesh1 = space1.mesh
+        GD = mesh1.geo_dimension()
+        qf = mesh1.quadrature_formula(self.q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        phi1 = space1.basis(bcs)[0] # (NQ, LDOF1)
+        NQ = phi1.shape[0]
+        NC = mesh1.number_of_cells()
+        measure = mesh1.entity_measure('cell')
+        cell2dof0 = space0.cell_to_dof()
+        cell2dof1 = space1.cell_to_dof()
+        shape = (space1.number_of_global_dofs(), space0.number_of_global_dofs())
+
+        # The entries of every chunk are compressed, and the chunks are
+        # collected and coalesced once at the end.
+        indices, values = [], []
+        for start in range(0, NC, self.chunk):
+            index = bm.arange(start, min(start + self.chunk, NC), **bm.context(cell2dof1))
+            cm = measure[index]
+            points = bm.reshape(mesh1.bc_to_point(bcs, index=index), (-1, GD))
+            cells0, coords0 = locate_in_space(space0, points)
+            phi0 = space0.point_basis(cells0, coords0)
+            phi0 = bm.reshape(phi0, (index.shape[0], NQ, -1)) # (NCC, NQ, LDOF0)
+            val = bm.einsum('q, c, qi, cqj -> cqij', ws, cm, phi1, phi0)
+            rows = bm.broadcast_to(cell2dof1[index][:, None, :, None], val.shape)
+            cols = bm.reshape(cell2dof0[cells0], (index.shape[0], NQ, 1, -1))
+            cols = bm.broadcast_to(cols, val.shape)
+            Bc = COOTensor(bm.stack([bm.reshape(rows, (-1, )), bm.reshape(cols, (-1, ))], axis=0),
+                           bm.reshape(val, (-1, )), shape).coalesce()
+            indices.append(Bc.indices())
+            values.append(Bc.values())
+        B = COOTensor(bm.concat(indices, axis=1), bm.concat(values, axis=0), shape)
+        return B.coalesce().tocsr()
+
+    def mass_matrix(self, space=None) -> CSRTensor:
+        """The mass matrix of the space, M1 of space1 by default."""
+        bform = BilinearForm(self.space1 if space is None else space)
+        bform.add_integrator(ScalarMassIntegrator(q=self.q))
+        return bform.assembly()
+
+    def assembly(self) -> CSRTensor:
+        """The mixed mass matrix B, or D^{-1}B if the mass matrix is lumped."""
+        if self._matrix is None:
+            B = self.mixed_mass_matrix()
+            kwargs = B.values_context()
+            M = self.mass_matrix()
+            m1 = M @ bm.ones((M.shape[1], ), **kwargs)
+            if self.conservative: # the integrals of the basis functions
+                M0 = self.mass_matrix(self.space0)
+                m0 = M0 @ bm.ones((M0.shape[1], ), **kwargs)
+                self._integrals = (m0, m1)
+            if self.lumped:
+                B = CSRTensor(B.crow(), B.col(), B.values() / m1[B.row()], B.sparse_shape)
+            else:
+                self._mass_solver = DirectSolver(self.solver).factorize(M)
+            self._matrix = B
+        return self._matrix
+
+    def _apply(self, array: TensorLike) -> TensorLike:
+        u = self.assembly() @ array
+        if not self.lumped:
+            u = self._mass_solver.solve(u)
+        if self.conservative:
+            m0, m1 = self._integrals
+            c = (m0 @ array - m1 @ u) / bm.sum(m1)
+            u = u + c
+        return u
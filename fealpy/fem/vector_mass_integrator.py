@@ -39,11 +39,7 @@ class VectorMassIntegrator(LinearInt, OpInt, CellInt):
                                f"homogeneous meshes, but {type(mesh).__name__} is"
                                "not a subclass of HomoMesh.")
 
-        cm = mesh.entity_measure('cell', index=index)
-        q = space.p+3 if self.q is None else self.q
-        qf = mesh.quadrature_formula(q, 'cell')
-        bcs, ws = qf.get_quadrature_points_and_weights()
-        phi = space.basis(bcs, index=index)
+        bcs, ws, phi, cm = self.basis_cache.fetch(space, self.q, index)
         return bcs, ws, phi, cm, index
 
     def assembly0(self, space: _FS) -> TensorLike:
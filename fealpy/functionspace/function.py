@@ -18,6 +18,12 @@ class Function(Generic[_FS]):
     def __call__(self, bcs: TensorLike, index: Index=_S):
         return self.space.value(self.array, bcs, index=index)
 
+    def eval_at_points(self, points: TensorLike, *, grad: bool=False,
+                       hint: Optional[TensorLike]=None):
+        """Evaluate the function (and its gradient) at the points shaped (NP, GD),
+        see the `eval_at_points` method of the space."""
+        return self.space.eval_at_points(self.array, points, grad=grad, hint=hint)
+
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.space}, {self.array})'
 
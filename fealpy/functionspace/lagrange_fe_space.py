@@ -146,3 +146,90 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
         cell2dof = self.dof.cell_to_dof(index=index)
         val = bm.einsum('cilm, cl -> cim', gphi, uh[cell2dof])
         return val[...]
+
+    def point_basis(self, cells: TensorLike, coords: TensorLike, *, grad: bool=False):
+        """Values (and gradients) of the basis functions at points given by
+        their cells and local coordinates, one cell for every point, as returned
+        by `PointLocator.locate`.
+
+        Parameters:
+            cells (Tensor): Cell of every point, shaped (NP, ).
+            coords (Tensor): Local coordinates of the points in their cells,
+                barycentric (NP, TD+1) on simplices or in [0, 1]^TD (NP, TD) on
+                tensor-product cells.
+            grad (bool, optional): Whether to compute the gradients too. Defaults to False.
+
+        Returns:
+            Tensor: The basis values shaped (NP, LDOF).
+            Tensor: The gradients shaped (NP, LDOF, GD), only if `grad` is True.
+        """
+        p = self.p
+        locator = self.mesh.point_locator()
+        NP = coords.shape[0]
+
+        if locator.ref is None:
+            mi = bm.multi_index_matrix(p, self.TD, dtype=self.itype)
+            phi = bm.simplex_shape_function(coords, p, mi)
+            if not grad:
+                return phi
+            R = bm.simplex_grad_shape_function(coords, p, mi) # (NP, LDOF, TD+1)
+            Jinv = locator.inverse_jacobi_matrix(coords, cells) # (NP, TD, GD)
+            Dlambda = bm.concat([-bm.sum(Jinv, axis=1, keepdims=True), Jinv], axis=1)
+            return phi, bm.einsum('nlm, nmg -> nlg', R, Dlambda)
+
+        # tensor-product cells: the 1d bases along the axes, at every point
+        mi = bm.multi_index_matrix(p, 1, dtype=self.itype)
+        Dlambda = bm.array([-1, 1], **bm.context(coords))
+        phis, dphis = [], []
+        for d in range(self.TD):
+            bc = bm.stack([1 - coords[:, d], coords[:, d]], axis=-1)
+            phis.append(bm.simplex_shape_function(bc, p, mi))
+            if grad:
+                R = bm.simplex_grad_shape_function(bc, p, mi)
+                dphis.append(bm.einsum('nij, j -> ni', R, Dlambda))
+
+        def tensorprod(factors):
+            out = factors[0]
+            for f in factors[1:]:
+                out = bm.reshape(out[:, :, None] * f[:, None, :], (NP, -1))
+            return out
+
+        phi = tensorprod(phis)
+        if not grad:
+            return phi
+        gphi = bm.stack([tensorprod(phis[:d] + [dphis[d]] + phis[d+1:])
+                         for d in range(self.TD)], axis=-1) # (NP, LDOF, TD)
+        Jinv = locator.inverse_jacobi_matrix(coords, cells) # (NP, TD, GD)
+        return phi, bm.einsum('nld, ndg -> nlg', gphi, Jinv)
+
+    def eval_at_points(self, uh: TensorLike, points: TensorLike, *,
+                       grad: bool=False, hint: Optional[TensorLike]=None):
+        """Evaluate a finite element function at arbitrary points.
+
+        The points are located with the cached point locator of the mesh, and
+        the values (and gradients) are computed for all the points at once.
+
+        Parameters:
+            uh (Tensor): The degrees of freedom shaped (..., GDOF).
+            points (Tensor): The points shaped (NP, GD).
+            grad (bool, optional): Whether to evaluate the gradients too. Defaults to False.
+            hint (Tensor | None, optional): Cells near the points, see `PointLocator.locate`.
+                Defaults to None.
+
+        Returns:
+            Tensor: The values shaped (..., NP), NaN at the points outside the mesh.
+            Tensor: The gradients shaped (..., NP, GD), only if `grad` is True.
+        """
+        cells, coords = self.mesh.point_locator().locate(points, hint=hint)
+        flag = cells >= 0
+        cells = bm.where(flag, cells, 0)
+        basis = self.point_basis(cells, coords, grad=grad)
+        phi = basis[0] if grad else basis
+        uh = uh[..., self.cell_to_dof()[cells]] # (..., NP, LDOF)
+        val = bm.einsum('nl, ...nl -> ...n', phi, uh)
+        val = bm.where(flag, val, bm.nan)
+        if not grad:
+            return val
+        gval = bm.einsum('nlg, ...nl -> ...ng', basis[1], uh)
+        gval = bm.where(flag[:, None], gval, bm.nan)
+        return val, gval
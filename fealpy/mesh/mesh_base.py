@@ -6,6 +6,7 @@ from ..typing import TensorLike, Index, _S
 from .. import logger
 from ..quadrature import Quadrature
 from .mesh_data_structure import MeshDS
+from .point_location import PointLocator
 from .utils import (
     estr2dim, simplex_gdof, simplex_ldof, tensor_gdof, tensor_ldof
 )
@@ -363,6 +364,29 @@ class HomogeneousMesh(Mesh):
 
         return bm.bc_to_points(bcs, node, entity)
 
+    # point location
+    def point_locator(self, **kwargs) -> PointLocator:
+        """Return the point locator of the mesh, kept in the relation cache so
+        that it is rebuilt after the nodes or cells of the mesh are replaced.
+        Keyword arguments are passed to `PointLocator` and force a rebuild."""
+        if len(kwargs) > 0:
+            self._relation_cache['point_locator'] = PointLocator(self, **kwargs)
+        return self.cached_relation('point_locator', lambda: PointLocator(self))
+
+    def location(self, points: TensorLike, hint: Optional[TensorLike]=None) -> TensorLike:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (Tensor): The points shaped (NP, GD).
+            hint (Tensor | None, optional): Cells near the points, e.g. the cells
+                before the points moved, to search from. Defaults to None.
+
+        Returns:
+            Tensor: Index of the cell of every point, -1 for the points outside
+                the mesh, shaped (NP, ).
+        """
+        return self.point_locator().locate(points, hint)[0]
+
     # ipoints
     def interpolation_points(self, p: int, index: Index=_S) -> TensorLike:
         raise NotImplementedError
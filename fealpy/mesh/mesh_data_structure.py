@@ -4,7 +4,9 @@ from typing import Union, Optional, Dict, overload, Callable, Any
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, EntityName, _S, _int_func
 from .. import logger
-from .utils import estr2dim, edim2entity, MeshMeta, flocc
+from ..sparse import CSRTensor
+from .utils import estr2dim, edim2entity, MeshMeta, cachedrelation
+from .utils import sort_columns, row_keys, flocc_keys
 
 
 ##################################################
@@ -14,6 +16,7 @@ from .utils import estr2dim, edim2entity, MeshMeta, flocc
 
 class MeshDS(metaclass=MeshMeta):
     _STORAGE_ATTR = ['cell', 'face', 'edge', 'node']
+    _TOPOLOGY_ATTR = ['face2cell', 'cell2face', 'edge2cell', 'cell2edge']
     cell: TensorLike
     face: TensorLike
     edge: TensorLike
@@ -23,10 +26,12 @@ class MeshDS(metaclass=MeshMeta):
     localEdge: TensorLike # only for homogeneous mesh
     localFace: TensorLike # only for homogeneous mesh
     localFace2Edge: TensorLike
+    lazy_edge: bool = False # build the edges of 3-d meshes on the first access
 
     def __init__(self, *, TD: int, itype, ftype) -> None:
         assert hasattr(self, '_entity_dim_method_name_map')
         self._entity_storage: Dict[int, TensorLike] = {}
+        self._relation_cache: Dict[str, Any] = {}
         self._entity_factory: Dict[int, Callable] = {
             k: getattr(self, self._entity_dim_method_name_map[k])
             for k in self._entity_dim_method_name_map
@@ -41,6 +46,9 @@ class MeshDS(metaclass=MeshMeta):
         if name in self._STORAGE_ATTR:
             etype_dim = estr2dim(self, name)
             return edim2entity(self._entity_storage, self._entity_factory, etype_dim)
+        elif name == 'cell2edge' and self.__dict__.get('_lazy_edge_pending', False):
+            self._construct_edge()
+            return self.__dict__['cell2edge']
         else:
             return object.__getattribute__(self, name)
 
@@ -50,18 +58,70 @@ class MeshDS(metaclass=MeshMeta):
                 raise RuntimeError('please call super().__init__() before setting attributes.')
             etype_dim = estr2dim(self, name)
             self._entity_storage[etype_dim] = value
+            self.invalidate_relations()
         else:
+            if name in self._TOPOLOGY_ATTR:
+                self.invalidate_relations()
             super().__setattr__(name, value)
 
     def __delattr__(self, name: str) -> None:
         if name in self._STORAGE_ATTR:
             del self._entity_storage[estr2dim(self, name)]
+            self.invalidate_relations()
         else:
             super().__delattr__(name)
 
     def clear(self) -> None:
         """Remove all entities from the storage."""
         self._entity_storage.clear()
+        self.invalidate_relations()
+
+    ### relation cache
+    # NOTE: Relations derived from the entities (adjacency, boundary flags,
+    # the point locator, ...) are built on the first access and cached. The
+    # whole cache is dropped at once whenever an entity or a topology relation
+    # is set, e.g. by refinement, so no stale relation can outlive them.
+    # Modifying the entity tensors in place is not tracked; call
+    # `invalidate_relations` after doing that.
+
+    def cached_relation(self, name: str, builder: Callable[[], Any]) -> Any:
+        """Get a relation from the cache, building it on the first access.
+
+        Parameters:
+            name (str): Name of the relation.
+            builder (Callable): Function without arguments building the relation.
+
+        Returns:
+            Any: The cached relation.
+        """
+        cache = self._relation_cache
+        if name not in cache:
+            cache[name] = builder()
+        return cache[name]
+
+    def invalidate_relations(self) -> None:
+        """Drop all the cached relations."""
+        self.__dict__['_relation_cache'] = {}
+
+    def relation_nbytes(self) -> Dict[str, int]:
+        """Memory used by every cached relation in bytes, not counting the
+        entities of the mesh that the relation refers to."""
+        shared = {id(et) for et in self._entity_storage.values()}
+
+        def nbytes(obj, depth=0) -> int:
+            if id(obj) in shared:
+                return 0
+            if bm.is_tensor(obj):
+                return int(obj.nbytes)
+            if isinstance(obj, CSRTensor):
+                return sum(nbytes(t) for t in (obj.crow(), obj.col(), obj.values()) if t is not None)
+            if isinstance(obj, (tuple, list)):
+                return sum(nbytes(t, depth) for t in obj)
+            if depth == 0 and hasattr(obj, '__dict__'):
+                return sum(nbytes(t, 1) for t in vars(obj).values())
+            return 0
+
+        return {k: nbytes(v) for k, v in self._relation_cache.items()}
 
     ### properties
     def top_dimension(self) -> int: return self.TD
@@ -169,6 +229,7 @@ class MeshDS(metaclass=MeshMeta):
         face2cell = self.face2cell[index]
         return face2cell
 
+    @cachedrelation(copy=True)
     def cell_to_cell(self):
         NC = self.number_of_cells()
         face2cell = self.face2cell
@@ -178,7 +239,43 @@ class MeshDS(metaclass=MeshMeta):
         cell2cell[face2cell[:, 1], face2cell[:, 3]] = face2cell[:, 0]
         return cell2cell
 
+    @cachedrelation()
+    def node_to_cell(self) -> CSRTensor:
+        """Return the cells around every node, as a CSR pattern (without values)
+        shaped (NN, NC), with the cells of every node in ascending order.
+
+        Returns:
+            CSRTensor: The node-to-cell adjacency. It is cached, do not modify it.
+        """
+        NN = self.number_of_nodes()
+        NC = self.number_of_cells()
+        cell = self.entity('cell')
+        kwargs = bm.context(cell[0]) if isinstance(cell, tuple) else bm.context(cell)
+        if isinstance(cell, tuple):
+            nodes, location = cell
+            cells = bm.repeat(bm.arange(NC, **kwargs), location[1:] - location[:-1])
+        else:
+            nodes = bm.reshape(cell, (-1, ))
+            cells = bm.repeat(bm.arange(NC, **kwargs), cell.shape[1])
+        return _csr_pattern(nodes, cells, (NN, NC))
+
+    @cachedrelation()
+    def node_to_node(self) -> CSRTensor:
+        """Return the nodes connected to every node by an edge, as a CSR pattern
+        (without values) shaped (NN, NN), with the neighbors in ascending order.
+
+        Returns:
+            CSRTensor: The node graph. It is cached, do not modify it.
+        """
+        NN = self.number_of_nodes()
+        edge = self.entity('edge')
+        row = bm.concat([edge[:, 0], edge[:, 1]])
+        col = bm.concat([edge[:, 1], edge[:, 0]])
+        order = bm.argsort(col, stable=True)
+        return _csr_pattern(row[order], col[order], (NN, NN))
+
     ### boundary
+    @cachedrelation(copy=True)
     def boundary_node_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary nodes.
 
@@ -196,6 +293,7 @@ class MeshDS(metaclass=MeshMeta):
                 bd_node_flag[bd_face2node.ravel()] = True
         return bd_node_flag
 
+    @cachedrelation(copy=True)
     def boundary_face_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary faces.
 
@@ -204,6 +302,22 @@ class MeshDS(metaclass=MeshMeta):
         """
         return self.face2cell[:, 0] == self.face2cell[:, 1]
 
+    @cachedrelation(copy=True)
+    def boundary_edge_flag(self) -> TensorLike:
+        """Return a boolean tensor indicating the boundary edges.
+
+        Returns:
+            Tensor: boundary edge flag.
+        """
+        if self.TD == 2:
+            return self.boundary_face_flag()
+        NE = self.number_of_edges()
+        bd_face_flag = self.boundary_face_flag()
+        bd_face2edge = self.face_to_edge()[bd_face_flag]
+        bd_edge_flag = bm.zeros((NE,), dtype=bm.bool, device=bm.get_device(bd_face2edge))
+        return bm.set_at(bd_edge_flag, bm.reshape(bd_face2edge, (-1, )), True)
+
+    @cachedrelation(copy=True)
     def boundary_cell_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary cells.
 
@@ -223,8 +337,8 @@ class MeshDS(metaclass=MeshMeta):
 
     def boundary_node_index(self):
         return bm.nonzero(self.boundary_node_flag())[0]
-    # TODO: finish this:
-    # def boundary_edge_index(self):
+    def boundary_edge_index(self):
+        return bm.nonzero(self.boundary_edge_flag())[0]
     def boundary_face_index(self):
         return bm.nonzero(self.boundary_face_flag())[0]
     def boundary_cell_index(self):
@@ -256,18 +370,59 @@ class MeshDS(metaclass=MeshMeta):
         total_edge = cell[..., local_edge].reshape(-1, NVE)
         return total_edge
 
-    def construct(self):
+    def _unique_local_entities(self, local_entity: TensorLike):
+        """Number the entities given by their local vertices in cells, without
+        materializing the total entity array. The sorted vertices of every local
+        entity are packed into int64 keys, so the numbering is the same as that
+        of `flocc` on the sorted total entities.
+
+        Returns:
+            out (TensorLike, TensorLike, TensorLike): see `flocc`.
+        """
+        cell = self.entity(self.TD)
+        base = int(bm.max(cell)) + 1
+        NL = local_entity.shape[0]
+        lkeys = [row_keys(sort_columns([cell[:, int(v)] for v in local_entity[l]]), base)
+                 for l in range(NL)]
+        keys = [bm.reshape(bm.stack(ks, axis=1), (-1, )) for ks in zip(*lkeys)] # (NC*NL, )
+        del lkeys
+        return flocc_keys(keys)
+
+    def _construct_edge(self) -> TensorLike:
+        """Build the edges and the cell-to-edge relation of a 3-d mesh."""
+        self._lazy_edge_pending = False
+        cell = self.entity(self.TD)
+        local_edge = self.localEdge
+        NC = cell.shape[0]
+        NEC = local_edge.shape[0]
+        i2, _, j = self._unique_local_entities(local_edge)
+        edge = cell[(i2//NEC)[:, None], local_edge[i2%NEC]]
+        # NOTE: completing the construction does not change the topology, so
+        # the cached relations are kept.
+        self._entity_storage[1] = edge
+        self.__dict__['cell2edge'] = bm.astype(j.reshape(NC, NEC), self.itype)
+        return edge
+
+    def construct(self, lazy_edge: Optional[bool]=None):
+        """Construct the faces, edges and the topology relations from the cells.
+
+        Parameters:
+            lazy_edge (bool | None, optional): Whether to build the edges and
+                `cell2edge` of a 3-d mesh only on the first access. Defaults to
+                None, using the class attribute `lazy_edge`.
+        """
         if not self.is_homogeneous():
             raise RuntimeError('Can not construct for a non-homogeneous mesh.')
 
-        totalFace = self.total_face()
-        i0, i1, j = flocc(bm.sort(totalFace, axis=1))
+        cell = self.entity(self.TD)
+        local_face = self.localFace
+        NC = self.number_of_cells()
+        NFC = self.number_of_faces_of_cells()
+        i0, i1, j = self._unique_local_entities(local_face)
 
         if self.TD > 1: # Do not add faces for interval mesh
-            self.face = totalFace[i0, :] # this also adds the edge in 2-d meshes
+            self.face = cell[(i0//NFC)[:, None], local_face[i0%NFC]] # this also adds the edge in 2-d meshes
 
-        NC = self.number_of_cells()
-        NFC = self.number_of_faces_of_cells()
         self.cell2face = bm.astype(j.reshape(NC, NFC), self.itype)
         self.face2cell = bm.astype(
             bm.stack([i0//NFC, i1//NFC, i0%NFC, i1%NFC], axis=-1),
@@ -276,12 +431,15 @@ class MeshDS(metaclass=MeshMeta):
         # NOTE: dtype must be specified here, as these tensors are the results of unique.
 
         if self.TD == 3:
-            NEC = self.number_of_edges_of_cells()
-
-            totalEdge = self.total_edge()
-            i2, _, j = flocc(bm.sort(totalEdge, axis=1))
-            self.edge = totalEdge[i2, :]
-            self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
+            if lazy_edge is None:
+                lazy_edge = self.lazy_edge
+            self._entity_storage.pop(1, None)
+            self.__dict__.pop('cell2edge', None)
+            if lazy_edge:
+                self._entity_factory[1] = self._construct_edge
+                self._lazy_edge_pending = True
+            else:
+                self._construct_edge()
 
         elif self.TD == 2:
             self.edge2cell = self.face2cell
@@ -292,3 +450,14 @@ class MeshDS(metaclass=MeshMeta):
         logger.info(f"Mesh toplogy relation constructed, with {NC} cells, {NF} "
                     f"faces, {NN} nodes "
                     f"on device ?")
+
+
+def _csr_pattern(row: TensorLike, col: TensorLike, shape) -> CSRTensor:
+    """CSR pattern of the (row, col) pairs, keeping the order of the pairs
+    within every row. The indices are int32 unless they do not fit."""
+    order = bm.argsort(row, stable=True)
+    row = row[order]
+    itype = bm.int32 if max(row.shape[0], *shape) < 2**31 else bm.int64
+    kwargs = bm.context(row)
+    crow = bm.searchsorted(row, bm.arange(shape[0] + 1, **kwargs))
+    return CSRTensor(bm.astype(crow, itype), bm.astype(col[order], itype), None, shape)
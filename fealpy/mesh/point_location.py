@@ -0,0 +1,455 @@
+
+from typing import Optional, Tuple
+from itertools import product
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+
+def _reference_nodes(mesh) -> Optional[TensorLike]:
+    """Reference coordinates of the cell vertices of a tensor-product mesh, or
+    None for a simplex mesh."""
+    from .mesh_base import SimplexMesh, StructuredMesh
+
+    if isinstance(mesh, SimplexMesh):
+        return None
+    TD = mesh.top_dimension()
+    if isinstance(mesh, StructuredMesh): # lexicographic ordering
+        ref = [[(k >> (TD - 1 - d)) & 1 for d in range(TD)] for k in range(2**TD)]
+    elif TD == 2:
+        ref = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    elif TD == 3:
+        ref = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+               (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+    else:
+        raise ValueError(f"Unsupported tensor-product mesh with TD={TD}.")
+    return bm.tensor(ref, dtype=mesh.ftype, device=bm.get_device(mesh.cell))
+
+
+class PointLocator():
+    """Locate points in the cells of a simplex (triangle, tetrahedron) or
+    tensor-product (quadrangle, hexahedron) mesh.
+
+    A uniform grid of bins over the bounding box of the mesh, with about one
+    bin per cell, is built once and each bin keeps the cells whose bounding
+    boxes overlap it (in CSR form). A query tests the points against the cells
+    of their bins in one vectorized pass: the barycentric coordinates are
+    computed in closed form for simplices and for the parallelogram
+    (parallelepiped) cells, and the reference coordinates by Newton's method
+    for the other bilinear (trilinear) cells.
+
+    For points moving between two queries, the previous cells can be given
+    as hints: the points are first searched by walking from the hinted cells
+    to their neighbours towards the points, and only the points not found in
+    a few steps are queried in the grid.
+
+    The locator keeps the `node` and `cell` tensors it was built for, and
+    `Mesh.point_locator` rebuilds it when they are replaced, e.g. by
+    refinement.
+
+    Parameters:
+        mesh (SimplexMesh | TensorMesh): The mesh, with GD == TD.
+        scale (float, optional): Size of the bins relative to the average cell
+            size. Defaults to 1.0.
+        tol (float, optional): Tolerance of the local coordinates for a point
+            to be inside a cell. Defaults to 1e-10.
+        chunk (int, optional): Number of points processed at once, limiting the
+            memory of the queries. Defaults to 2**18.
+    """
+    def __init__(self, mesh, *, scale: float=1.0, tol: float=1e-10,
+                 chunk: int=2**18) -> None:
+        TD = mesh.top_dimension()
+        GD = mesh.geo_dimension()
+        if TD != GD:
+            raise ValueError(f"Point location needs GD == TD, but got GD={GD}, TD={TD}.")
+        self.mesh = mesh
+        self.node = mesh.entity('node')
+        self.cell = mesh.entity('cell')
+        self.TD = TD
+        self.tol = tol
+        self.chunk = chunk
+        self.ref = _reference_nodes(mesh)
+        self._cell2cell = None
+        self._exit_face = None
+        self._barycenter = None
+
+        X = self.node[self.cell] # (NC, NVC, GD)
+        self.cmin = bm.min(X, axis=1)
+        self.cmax = bm.max(X, axis=1)
+        if self.ref is None:
+            J = bm.swapaxes(X[:, 1:, :] - X[:, :1, :], -1, -2) # (NC, GD, TD)
+            self.x0 = X[:, 0, :]
+            self.Jinv = bm.linalg.inv(J)
+        else:
+            self._build_affine(X)
+        self._build_bins(scale)
+
+    def _build_affine(self, X: TensorLike) -> None:
+        # The affine map of every tensor cell from its vertex at the reference
+        # origin along its edges, and whether the cell is a parallelogram
+        # (parallelepiped), where the multilinear map is this affine map.
+        ref = bm.to_numpy(self.ref)
+        TD = self.TD
+        v0 = next(v for v in range(ref.shape[0]) if not ref[v].any())
+        ve = [next(v for v in range(ref.shape[0]) if ref[v].sum() == 1 and ref[v, d] == 1)
+              for d in range(TD)]
+        self.x0 = X[:, v0, :]
+        J = bm.stack([X[:, v, :] - self.x0 for v in ve], axis=-1) # (NC, GD, TD)
+        self.Jinv = bm.linalg.inv(J)
+        Xa = self.x0[:, None, :] + bm.einsum('vd, ngd -> nvg', self.ref, J)
+        NC = X.shape[0]
+        err = bm.max(bm.reshape(bm.abs(Xa - X), (NC, -1)), axis=-1)
+        size = bm.max(self.cmax - self.cmin, axis=-1)
+        self.affine = err <= 1e-12 * size
+
+    def _build_bins(self, scale: float) -> None:
+        NC = self.cell.shape[0]
+        GD = self.TD
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        self.origin = bm.min(self.node, axis=0)
+        extent = bm.max(self.node, axis=0) - self.origin
+        volume = 1.0
+        for d in range(GD):
+            volume *= max(float(extent[d]), 1e-300)
+        h = scale * (volume / NC)**(1.0 / GD)
+        self.shape = tuple(max(1, min(int(float(extent[d]) / h) + 1, 4 * NC)) for d in range(GD))
+        self.h = extent / bm.tensor(self.shape, **bm.context(extent))
+        self.h = bm.where(self.h > 0, self.h, 1.0)
+        self.end = self.origin + self.h * bm.tensor(self.shape, **bm.context(extent))
+
+        lo = self._bin_index(self.cmin)
+        hi = self._bin_index(self.cmax)
+        size = hi - lo + 1
+        counts = bm.prod(size, axis=-1)
+        cid = bm.repeat(bm.arange(NC, **ikwargs), counts)
+        start = bm.cumsum(counts, axis=0) - counts
+        off = bm.arange(cid.shape[0], **ikwargs) - bm.repeat(start, counts)
+        bins = bm.zeros(cid.shape, **ikwargs)
+        overlap = bm.ones(cid.shape, **bm.context(self.cmin))
+        for d in range(GD - 1, -1, -1):
+            k = off % size[cid, d]
+            off = off // size[cid, d]
+            bins = bins + (lo[cid, d] + k) * self._stride(d)
+            blo = self.origin[d] + bm.astype(lo[cid, d] + k, self.cmin.dtype) * self.h[d]
+            width = bm.minimum(self.cmax[cid, d], blo + self.h[d]) - bm.maximum(self.cmin[cid, d], blo)
+            overlap = overlap * bm.where(width > 0, width, 0.0)
+        # The cells in a bin are ordered by the overlap of their bounding boxes
+        # with the bin, so that the cells most likely to contain a point in the
+        # bin are tested first.
+        order = bm.argsort(-overlap, stable=True)
+        order = order[bm.argsort(bins[order], stable=True)]
+        bins = bins[order]
+        self.bin_cell = cid[order]
+        NB = 1
+        for n in self.shape:
+            NB *= n
+        self.bin_crow = bm.searchsorted(bins, bm.arange(NB + 1, **ikwargs))
+
+    def _stride(self, d: int) -> int:
+        s = 1
+        for n in self.shape[d+1:]:
+            s *= n
+        return s
+
+    def _bin_index(self, p: TensorLike) -> TensorLike:
+        """Multi-indices of the bins of the points, clipped to the grid."""
+        i = bm.astype(bm.floor((p - self.origin) / self.h), self.cell.dtype)
+        upper = bm.tensor(self.shape, dtype=self.cell.dtype, device=bm.get_device(self.cell)) - 1
+        i = bm.where(i < 0, 0, i)
+        return bm.where(i > upper, upper, i)
+
+    ### local coordinates
+    def local_coordinates(self, points: TensorLike, cells: TensorLike) -> TensorLike:
+        """Local coordinates of the points in the cells (one cell for every point),
+        the barycentric coordinates shaped (NP, TD+1) for simplices, or the
+        reference coordinates in [0, 1]^TD shaped (NP, TD) for tensor cells."""
+        if self.ref is None:
+            v = points - self.x0[cells]
+            lam = bm.einsum('nij, nj -> ni', self.Jinv[cells], v)
+            return bm.concat([1.0 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+        # The affine map is exact on the parallelogram cells, and the initial
+        # guess of Newton's method on the others.
+        xi = bm.einsum('nij, nj -> ni', self.Jinv[cells], points - self.x0[cells])
+        index = bm.nonzero(~self.affine[cells])[0]
+        if index.shape[0] > 0:
+            xi = bm.set_at(xi, index, self._newton(points[index], cells[index], xi[index]))
+        return xi
+
+    def _tensor_map(self, xi: TensorLike, X: TensorLike):
+        """The multilinear map and its Jacobian at the reference points xi (N, TD)
+        for the cells with vertices X (N, NV, GD)."""
+        ref = self.ref                              # (NV, TD)
+        f = ref[None, :, :] * xi[:, None, :] + (1 - ref[None, :, :]) * (1 - xi[:, None, :]) # (N, NV, TD)
+        sign = 2 * ref - 1
+        phi = bm.prod(f, axis=-1)                   # (N, NV)
+        gphi = []
+        for d in range(self.TD):
+            others = [f[..., e] for e in range(self.TD) if e != d]
+            g = sign[None, :, d]
+            for o in others:
+                g = g * o
+            gphi.append(g)
+        gphi = bm.stack(gphi, axis=-1)              # (N, NV, TD)
+        x = bm.einsum('nv, nvg -> ng', phi, X)
+        J = bm.einsum('nvd, nvg -> ngd', gphi, X)
+        return x, J
+
+    def jacobi_matrix(self, coords: TensorLike, cells: TensorLike) -> TensorLike:
+        """Jacobian of the map from the reference cells to the cells at the
+        local coordinates (see `local_coordinates`), shaped (NP, GD, TD)."""
+        if self.ref is None:
+            return bm.linalg.inv(self.Jinv[cells])
+        return self._tensor_map(coords, self.node[self.cell[cells]])[1]
+
+    def inverse_jacobi_matrix(self, coords: TensorLike, cells: TensorLike) -> TensorLike:
+        """Inverse of `jacobi_matrix`, shaped (NP, TD, GD). It is cached for the
+        simplices and the parallelogram cells."""
+        Jinv = self.Jinv[cells]
+        if self.ref is None:
+            return Jinv
+        index = bm.nonzero(~self.affine[cells])[0]
+        if index.shape[0] > 0:
+            J = self.jacobi_matrix(coords[index], cells[index])
+            Jinv = bm.set_at(Jinv, index, bm.linalg.inv(J))
+        return Jinv
+
+    def _newton(self, points: TensorLike, cells: TensorLike, xi: TensorLike,
+                maxit: int=20) -> TensorLike:
+        X = self.node[self.cell[cells]]
+        xi = bm.clip(xi, -1.0, 2.0)
+        for _ in range(maxit):
+            x, J = self._tensor_map(xi, X)
+            delta = bm.linalg.solve(J, (points - x)[..., None])[..., 0]
+            xi = bm.clip(xi + delta, -1.0, 2.0)
+            if float(bm.max(bm.abs(delta))) < 1e-13:
+                break
+        return xi
+
+    def _inside(self, coords: TensorLike) -> TensorLike:
+        tol = self.tol
+        if self.ref is None:
+            return bm.all(coords >= -tol, axis=-1)
+        return bm.all((coords >= -tol) & (coords <= 1 + tol), axis=-1)
+
+    ### queries
+    def locate(self, points: TensorLike, hint: Optional[TensorLike]=None, *,
+               maxstep: int=8) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (Tensor): The points shaped (NP, GD).
+            hint (Tensor | None, optional): Cells near the points (e.g. the cells
+                of the points before moving) shaped (NP, ), to start the walks from.
+                Defaults to None.
+            maxstep (int, optional): Maximum steps of the walks. Defaults to 8.
+
+        Returns:
+            Tensor: Index of the cell containing every point, -1 if not found, shaped (NP, ).
+            Tensor: Local coordinates of the points in their cells, see
+                `local_coordinates`, zeros for the points not found.
+        """
+        NP = points.shape[0]
+        NL = self.TD + 1 if self.ref is None else self.TD
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        cells = bm.full((NP, ), -1, **ikwargs)
+        coords = bm.zeros((NP, NL), **bm.context(points))
+        todo = bm.arange(NP, **ikwargs)
+
+        if hint is not None:
+            found, c, lc = self._walk(points, hint, maxstep)
+            cells = bm.set_at(cells, found, c)
+            coords = bm.set_at(coords, found, lc)
+            flag = bm.ones((NP, ), dtype=bm.bool, device=ikwargs['device'])
+            flag = bm.set_at(flag, found, False)
+            todo = todo[flag]
+
+        for k in range(0, todo.shape[0], self.chunk):
+            idx = todo[k:k+self.chunk]
+            found, c, lc = self._query(points[idx])
+            cells = bm.set_at(cells, idx[found], c)
+            coords = bm.set_at(coords, idx[found], lc)
+
+        return cells, coords
+
+    def _query(self, points: TensorLike):
+        """Grid query of a chunk of points, returning the indices of the points
+        found, their cells and local coordinates.
+
+        The k-th candidate cells of the points not found yet are tested in the
+        k-th round, so that most points are done after a few cheap rounds."""
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        NP = points.shape[0]
+        b = self._bin_index(points)
+        bid = bm.zeros((NP, ), **ikwargs)
+        for d in range(self.TD):
+            bid = bid + b[:, d] * self._stride(d)
+        start = self.bin_crow[bid]
+        counts = self.bin_crow[bid + 1] - start
+        eps = self.tol * bm.max(self.h)
+        pid = bm.arange(NP, **ikwargs)
+        found_p, found_c, found_l = [], [], []
+
+        k = 0
+        while True:
+            pid = pid[counts[pid] > k]
+            if pid.shape[0] == 0:
+                break
+            cid = self.bin_cell[start[pid] + k]
+            p = points[pid]
+            if self.ref is not None: # bounding box filter before Newton's method
+                flag = bm.all((p >= self.cmin[cid] - eps) & (p <= self.cmax[cid] + eps), axis=-1)
+                pid_b, cid_b, p = pid[flag], cid[flag], p[flag]
+                pid = pid[~flag]
+            else:
+                pid_b, cid_b = pid, cid
+                pid = pid[:0]
+            coords = self.local_coordinates(p, cid_b)
+            flag = self._inside(coords)
+            found_p.append(pid_b[flag])
+            found_c.append(cid_b[flag])
+            found_l.append(coords[flag])
+            pid = bm.concat([pid, pid_b[~flag]], axis=0)
+            k += 1
+
+        if len(found_p) == 0:
+            NL = self.TD + 1 if self.ref is None else self.TD
+            return pid, pid, bm.zeros((0, NL), **bm.context(points))
+        return bm.concat(found_p), bm.concat(found_c), bm.concat(found_l)
+
+    def nearest(self, points: TensorLike) -> TensorLike:
+        """Cells whose barycenters are the nearest to the points, for points
+        inside or outside the mesh.
+
+        The bins are searched in rings around the bin of every point, until
+        the rings searched cover the ball of the nearest barycenter found, so
+        only a few bins are tested per point instead of all the cells.
+
+        Parameters:
+            points (Tensor): The points shaped (NP, GD).
+
+        Returns:
+            Tensor: Index of the nearest cell of every point, shaped (NP, ).
+        """
+        if self._barycenter is None:
+            self._barycenter = bm.mean(self.node[self.cell], axis=1)
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        NP = points.shape[0]
+        cells = bm.full((NP, ), -1, **ikwargs)
+        for k in range(0, NP, self.chunk):
+            idx = bm.arange(k, min(k + self.chunk, NP), **ikwargs)
+            cells = bm.set_at(cells, idx, self._nearest(points[idx]))
+        return cells
+
+    def _ring(self, r: int) -> TensorLike:
+        """Offsets of the bins at the Chebyshev distance r, shaped (NO, GD)."""
+        offsets = [o for o in product(range(-r, r + 1), repeat=self.TD)
+                   if max(abs(i) for i in o) == r]
+        return bm.tensor(offsets, dtype=self.cell.dtype, device=bm.get_device(self.cell))
+
+    def _nearest(self, points: TensorLike) -> TensorLike:
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        kwargs = bm.context(points)
+        NP = points.shape[0]
+        GD = self.TD
+        shape = bm.tensor(self.shape, **ikwargs)
+        stride = bm.tensor([self._stride(d) for d in range(GD)], **ikwargs)
+        b = self._bin_index(points)
+        best = bm.full((NP, ), -1, **ikwargs)
+        dist = bm.full((NP, ), float('inf'), **kwargs)
+        pid = bm.arange(NP, **ikwargs)
+        bary = self._barycenter
+
+        for r in range(max(self.shape)):
+            # The cells in the bins of the ring of every point, one row per pair.
+            nb = b[pid][:, None, :] + self._ring(r)[None, :, :]
+            valid = bm.all((nb >= 0) & (nb < shape), axis=-1)
+            pp = bm.broadcast_to(pid[:, None], valid.shape)[valid]
+            bid = bm.sum(nb[valid] * stride, axis=-1)
+            start = self.bin_crow[bid]
+            counts = self.bin_crow[bid + 1] - start
+            first = bm.cumsum(counts, axis=0) - counts
+            pp = bm.repeat(pp, counts)
+            pos = bm.arange(pp.shape[0], **ikwargs) - bm.repeat(first, counts)
+            cid = self.bin_cell[bm.repeat(start, counts) + pos]
+
+            if pp.shape[0] > 0:
+                # The nearest candidate of every point: sort by the distance,
+                # then stably by the point, and take the first of each point.
+                d = bm.sum((points[pp] - bary[cid])**2, axis=-1)
+                order = bm.argsort(d, stable=True)
+                order = order[bm.argsort(pp[order], stable=True)]
+                pp, cid, d = pp[order], cid[order], d[order]
+                flag = bm.concat([bm.ones((1, ), dtype=bm.bool, device=ikwargs['device']),
+                                  pp[1:] != pp[:-1]], axis=0)
+                pp, cid, d = pp[flag], cid[flag], d[flag]
+                flag = d < dist[pp]
+                best = bm.set_at(best, pp[flag], cid[flag])
+                dist = bm.set_at(dist, pp[flag], d[flag])
+
+            # Squared distance from the points to the bins not searched yet,
+            # beyond one of the sides of the searched box.
+            p = points[pid]
+            lo = self.origin + bm.astype(b[pid] - r, kwargs['dtype']) * self.h
+            hi = self.origin + bm.astype(b[pid] + r + 1, kwargs['dtype']) * self.h
+            out = bm.where(p < self.origin, self.origin - p, 0.0) + \
+                  bm.where(p > self.end, p - self.end, 0.0)
+            other = bm.sum(out**2, axis=-1, keepdims=True) - out**2
+            gap = bm.concat([bm.where(b[pid] - r > 0, (p - lo)**2 + other, float('inf')),
+                             bm.where(b[pid] + r + 1 < shape, (hi - p)**2 + other, float('inf'))],
+                            axis=-1)
+            done = (best[pid] >= 0) & (dist[pid] <= bm.min(gap, axis=-1))
+            pid = pid[~done]
+            if pid.shape[0] == 0:
+                break
+
+        return best
+
+    def _exit_faces(self):
+        """The neighbours of the cells and, for the walk, the local face to
+        leave a cell through for each violated local coordinate."""
+        if self._cell2cell is None:
+            mesh = self.mesh
+            self._cell2cell = mesh.cell_to_cell()
+            localFace = mesh.localEdge if self.TD == 2 else mesh.localFace
+            localFace = bm.to_numpy(localFace)
+            NVC = self.cell.shape[1]
+            if self.ref is None: # leave through the face opposite the vertex
+                table = [next(f for f in range(localFace.shape[0])
+                              if v not in localFace[f]) for v in range(NVC)]
+            else: # leave through the face at xi_d = 0 or 1
+                ref = bm.to_numpy(self.ref)
+                table = []
+                for side in (0, 1):
+                    for d in range(self.TD):
+                        table.append(next(f for f in range(localFace.shape[0])
+                                          if all(ref[v, d] == side for v in localFace[f])))
+            self._exit_face = bm.tensor(table, dtype=self.cell.dtype,
+                                        device=bm.get_device(self.cell))
+        return self._cell2cell, self._exit_face
+
+    def _walk(self, points: TensorLike, hint: TensorLike, maxstep: int):
+        cell2cell, exit_face = self._exit_faces()
+        ikwargs = {'dtype': self.cell.dtype, 'device': bm.get_device(self.cell)}
+        pid = bm.arange(points.shape[0], **ikwargs)
+        cid = bm.astype(hint, self.cell.dtype)
+        found_p, found_c, found_l = [], [], []
+
+        for step in range(maxstep + 1):
+            coords = self.local_coordinates(points[pid], cid)
+            flag = self._inside(coords)
+            found_p.append(pid[flag])
+            found_c.append(cid[flag])
+            found_l.append(coords[flag])
+            flag = ~flag
+            pid, cid, coords = pid[flag], cid[flag], coords[flag]
+            if (pid.shape[0] == 0) or (step == maxstep):
+                break
+            if self.ref is None:
+                k = bm.argmin(coords, axis=-1)
+            else:
+                k = bm.argmax(bm.concat([-coords, coords - 1], axis=-1), axis=-1)
+            nbr = cell2cell[cid, exit_face[k]]
+            flag = nbr != cid # stop at the boundary
+            pid, cid = pid[flag], nbr[flag]
+
+        return bm.concat(found_p), bm.concat(found_c), bm.concat(found_l)
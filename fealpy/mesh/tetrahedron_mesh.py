@@ -193,9 +193,9 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         localFace = self.localFace
         node = self.node
         cell = self.cell
-        NC = self.number_of_cells() if index == _S else len(index)
-        Dlambda = bm.zeros((NC, 4, 3), device=self.device, dtype=self.ftype)
         volume = self.entity_measure('cell', index=index)
+        NC = volume.shape[0]
+        Dlambda = bm.zeros((NC, 4, 3), device=self.device, dtype=self.ftype)
         for i in range(4):
             j,k,m = localFace[i]
             vjk = node[cell[index, k],:] - node[cell[index, j],:]
@@ -222,18 +222,6 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         Dlambda[:, 2] = bm.cross(n, v2) / length
         return Dlambda
 
-    def boundary_edge_flag(self):
-        """
-        @brief 判断边界边 
-        """
-        NE = self.number_of_edges()
-        face2edge = self.face_to_edge()
-        isBdFace = self.boundary_face_flag()
-        isBdEdge = bm.zeros(NE, dtype=bm.bool)
-        isBdEdge[face2edge[isBdFace, :]] = True
-        return isBdEdge 
-        
-
     """
     def grad_shape_function(self, bc, p=1, index=_S, variables='x'):
         R = bm.simplex_grad_shape_function(bc, p=p)
@@ -300,18 +300,6 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         pass
     
-    def location(self, points):
-        """
-        @breif  给定一组点 p , 找到这些点所在的单元
-
-        这里假设：
-
-        1. 所有点在网格内部，
-        2. 网格中没有洞
-        3. 区域还要是凸的
-        """
-        pass
-
     def circumcenter(self, index: Index=_S, returnradius=False):
         """
         @brief 计算三角形外接圆的圆心和半径
@@ -575,19 +563,22 @@ class TriangleMesh(SimplexMesh, Plotable):
         cell = self.entity('cell')
         node = self.entity('node')
 
-        valence = bm.zeros(NN, dtype=self.itype, device=self.device)
-        bm.add_at(valence, cell, 1)
+        node2cell = self.node_to_cell()
+        crow, col = node2cell.crow(), node2cell.col()
+        valence = bm.astype(crow[1:] - crow[:-1], self.itype)
 
+        newNode = cell[isMarkedCell][:, 0]
         valenceNew = bm.zeros(NN, dtype=self.itype, device=self.device)
-        bm.add_at(valenceNew, cell[isMarkedCell][:, 0], 1)
+        valenceNew = bm.index_add(valenceNew, newNode, bm.ones(newNode.shape, dtype=self.itype, device=self.device))
 
         isIGoodNode = (valence == valenceNew) & (valence == 4)
         isBGoodNode = (valence == valenceNew) & (valence == 2)
 
-        node2cell = self.node_to_cell()
+        def node_star(flag, n): # the n cells around every flagged node
+            start = crow[:-1][flag]
+            return col[start[:, None] + bm.arange(n, **bm.context(start))]
 
-        I, J = bm.nonzero(node2cell[isIGoodNode, :])
-        nodeStar = J.reshape(-1, 4)
+        nodeStar = node_star(isIGoodNode, 4)
 
         ix = (cell[nodeStar[:, 0], 2] == cell[nodeStar[:, 3], 1])
         iy = (cell[nodeStar[:, 1], 1] == cell[nodeStar[:, 2], 2])
@@ -614,8 +605,7 @@ class TriangleMesh(SimplexMesh, Plotable):
         cell = bm.set_at(cell , (t2, 2) , p1)
         cell = bm.set_at(cell , (t3, 0) , -1)
 
-        I, J = bm.nonzero(node2cell[isBGoodNode, :])
-        nodeStar = J.reshape(-1, 2)
+        nodeStar = node_star(isBGoodNode, 2)
         idx = (cell[nodeStar[:, 0], 2] == cell[nodeStar[:, 1], 1])
         nodeStar = bm.set_at(nodeStar , idx , nodeStar[idx, :][:, [0, 1]])
 
@@ -665,7 +655,7 @@ class TriangleMesh(SimplexMesh, Plotable):
         self.node = node[~isGoodNode]
 
         NN = self.node.shape[0]
-        idxMap = bm.set_at(idxMap , ~isGoodNode , bm.arange(NN))
+        idxMap = bm.set_at(idxMap , ~isGoodNode , bm.arange(NN, dtype=self.itype, device=self.device))
         cell = idxMap[cell]
 
         self.cell = cell
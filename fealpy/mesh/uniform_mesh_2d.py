@@ -540,8 +540,8 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
             length_x = nx * hx
             length_y = ny * hy
 
-            ix = bm.linspace(0, length_x, nix)
-            iy = bm.linspace(0, length_y, niy)
+            ix = bm.linspace(0, length_x, nix, dtype=self.ftype)
+            iy = bm.linspace(0, length_y, niy, dtype=self.ftype)
 
             x, y = bm.meshgrid(ix, iy, indexing='ij')
             ipoints = bm.stack([x.flatten(), y.flatten()], axis=-1)
@@ -660,19 +660,17 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         ordering = self.ipoints_ordering
 
         if ordering == 'yx':
-            edge_to_ipoint = self.edge_to_ipoint(p)
-            cell2edge = self.cell_to_edge(index=index)
-
-            start_indices = edge_to_ipoint[cell2edge[:, 0]]
-            end_indices = edge_to_ipoint[cell2edge[:, 1]]
-
-            linspace_indices = bm.linspace(0, 1, p + 1, endpoint=True, dtype=self.ftype).reshape(1, -1)
-
-            cell_ipoints_interpolated = start_indices[:, :, None] * (1 - linspace_indices) + \
-                                        end_indices[:, :, None] * linspace_indices
-
-            cell2ipoint = cell_ipoints_interpolated.reshape(-1, (p+1)**2)
-            cell2ipoint = cell2ipoint.astype(self.itype)
+            # The interpolation points form a structured grid with the y index
+            # running fastest, so the points of a cell are a sub-block of the grid.
+            niy = self.ny * p + 1
+            kwargs = {'dtype': self.itype, 'device': self.device}
+            cx = bm.arange(self.nx, **kwargs) * p
+            cy = bm.arange(self.ny, **kwargs) * p
+            start = cx[:, None] * niy + cy[None, :]
+            a = bm.arange(p + 1, **kwargs)
+            local = a[:, None] * niy + a[None, :]
+            cell2ipoint = bm.reshape(start, (-1, 1)) + bm.reshape(local, (1, -1))
+            cell2ipoint = cell2ipoint[index]
         elif ordering == 'nec':
             edge2cell = self.edge_to_cell()
             NN = self.number_of_nodes()
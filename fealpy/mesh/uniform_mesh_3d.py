@@ -77,7 +77,7 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
              origin: Tuple[float, float, float] = (0.0, 0.0, 0.0), 
              ipoints_ordering='zyx', 
              flip_direction=None, 
-             itype=None, ftype=None):
+             itype=None, ftype=None, device=None):
         """
         Initializes a 3D uniform structured mesh.
 
@@ -96,6 +96,8 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             Data type for integer values used in the mesh. Default is None, which is assigned as bm.int32.
         ftype : data type, optional
             Data type for floating-point values used in the mesh. Default is None, which is assigned as bm.float64.
+        device : optional
+            Device of the tensors of the mesh. Default is None.
         """
         if itype is None:
             itype = bm.int32
@@ -103,6 +105,8 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             ftype = bm.float64
         super().__init__(TD=3, itype=itype, ftype=ftype)
 
+        self.device = device
+
         # Mesh properties
         self.extent = [int(e) for e in extent]
         self.h = [float(val) for val in h]
@@ -988,9 +992,9 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             length_y = ny * hy
             length_z = nz * hz
 
-            ix = bm.linspace(0, length_x, nix)
-            iy = bm.linspace(0, length_y, niy)
-            iz = bm.linspace(0, length_z, niz)
+            ix = bm.linspace(0, length_x, nix, dtype=self.ftype)
+            iy = bm.linspace(0, length_y, niy, dtype=self.ftype)
+            iz = bm.linspace(0, length_z, niz, dtype=self.ftype)
 
             x, y, z = bm.meshgrid(ix, iy, iz, indexing='ij')
             ipoints = bm.stack([x.flatten(), y.flatten(), z.flatten()], axis=-1)
@@ -1165,22 +1169,19 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         ordering = self.ipoints_ordering
 
         if ordering == 'zyx':
-            face_to_ipoint = self.face_to_ipoint(p)
-            cell2face = self.cell_to_face(index=index)
-
-            start_indices = face_to_ipoint[cell2face[:, 0]]
-            end_indices = face_to_ipoint[cell2face[:, 1]]
-
-            linspace_indices = bm.linspace(0, 1, p + 1, endpoint=True, dtype=self.ftype).reshape(1, -1)
-            cell_ipoints_interpolated = start_indices[:, :, None] * (1 - linspace_indices) + \
-                                        end_indices[:, :, None] * linspace_indices
-            
-            # 首先，转换形状以便重新排列为列优先
-            reshaped = cell_ipoints_interpolated.reshape(-1, (p+1)**2, p+1)
-            # 然后，转置最后两个维度，这样插值点会按照 z, y, x 的顺序排列
-            transposed = reshaped.transpose(0, 2, 1)
-            # 最后，reshape 到最终的形状，确保插值点是列优先排序
-            cell2ipoint = transposed.reshape(-1, (p+1)**3).astype(self.itype)
+            # The interpolation points form a structured grid with the z index
+            # running fastest, so the points of a cell are a sub-block of the grid.
+            niy = self.ny * p + 1
+            niz = self.nz * p + 1
+            kwargs = {'dtype': self.itype, 'device': self.device}
+            cx = bm.arange(self.nx, **kwargs) * p
+            cy = bm.arange(self.ny, **kwargs) * p
+            cz = bm.arange(self.nz, **kwargs) * p
+            start = (cx[:, None, None] * niy + cy[None, :, None]) * niz + cz[None, None, :]
+            a = bm.arange(p + 1, **kwargs)
+            local = (a[:, None, None] * niy + a[None, :, None]) * niz + a[None, None, :]
+            cell2ipoint = bm.reshape(start, (-1, 1)) + bm.reshape(local, (1, -1))
+            cell2ipoint = cell2ipoint[index]
         elif ordering == 'nefc':
             NN = self.number_of_nodes()
             NE = self.number_of_edges()
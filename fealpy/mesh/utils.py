@@ -1,6 +1,7 @@
 
-from typing import Dict, Callable, TypeVar, Tuple, Any
+from typing import Dict, Callable, TypeVar, Tuple, List, Sequence, Any
 from math import comb
+from functools import wraps, partial
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
@@ -79,6 +80,70 @@ def flocc(array: TensorLike, /):
     return i0, i1, j
 
 
+def sort_columns(columns: Sequence[TensorLike], /) -> List[TensorLike]:
+    """Sort the rows given by their columns, by an odd-even transposition
+    network of elementwise minimum and maximum. For a few columns this is much
+    faster than sorting along the short axis of a 2D array."""
+    columns = list(columns)
+    K = len(columns)
+    for r in range(K):
+        for k in range(r % 2, K - 1, 2):
+            a, b = columns[k], columns[k+1]
+            columns[k], columns[k+1] = bm.minimum(a, b), bm.maximum(a, b)
+    return columns
+
+
+def row_keys(columns: Sequence[TensorLike], base: int, /) -> List[TensorLike]:
+    """Pack the rows of integers in [0, base), given by their columns, into as
+    few int64 keys as possible, such that comparing the keys one by one compares
+    the rows lexicographically. Rows of up to 63 // ceil(log2(base)) entries are
+    packed into a single key.
+
+    Returns:
+        List[TensorLike]: The keys shaped (N, ), the most significant first.
+    """
+    nbits = max(1, (int(base) - 1).bit_length())
+    per = max(1, 63 // nbits)
+    K = len(columns)
+    keys = []
+    for s in range(0, K, per):
+        key = bm.astype(columns[s], bm.int64)
+        for k in range(s + 1, min(s + per, K)):
+            key = key * base + bm.astype(columns[k], bm.int64)
+        keys.append(key)
+    return keys
+
+
+def flocc_keys(keys: Sequence[TensorLike], /):
+    """Find the first and last occurrence of each unique row, for rows packed
+    by `row_keys`. This gives the same results as `flocc` on the rows, with
+    one stable argsort per key instead of a lexsort over all the columns.
+
+    Returns:
+        out (TensorLike, TensorLike, TensorLike): see `flocc`.
+    """
+    indices = bm.argsort(keys[-1], stable=True)
+    for key in reversed(keys[:-1]): # least significant key first
+        indices = indices[bm.argsort(key[indices], stable=True)]
+    diff_flag = None
+    for key in keys:
+        sorted_key = key[indices]
+        flag = sorted_key[1:] != sorted_key[:-1]
+        diff_flag = flag if diff_flag is None else diff_flag | flag
+    del sorted_key
+    TRUE = bm.ones((1,), dtype=bm.bool, device=bm.get_device(diff_flag))
+    diff_flag = bm.concat([TRUE, diff_flag, TRUE])
+    group_index = bm.cumsum(diff_flag[:-1], axis=0) - 1
+
+    i0 = indices[diff_flag[:-1]]
+    i1 = indices[diff_flag[1:]]
+    j = bm.empty_like(indices)
+    j = bm.set_at(j, indices, bm.arange(len(indices), dtype=j.dtype, device=bm.get_device(j)))
+    j = group_index[j]
+
+    return i0, i1, j
+
+
 # NOTE: this meta class is used to register the entity factory method.
 # The entity factory methods can works in Structured meshes such as
 # UniformMesh2d to construct entities like `cell`.
@@ -124,6 +189,25 @@ def entitymethod(top_dim: int):
     return decorator
 
 
+def cachedrelation(copy: bool=False):
+    """A decorator caching the result of a method without arguments in the
+    relation cache of the mesh, see `MeshDS.cached_relation`.
+
+    Parameters:
+        copy (bool, optional): Whether to return a copy of the cached tensor,
+            for the results that callers may modify in place. Defaults to False.
+    """
+    def decorator(meth: _Meth) -> _Meth:
+        name = meth.__name__
+
+        @wraps(meth)
+        def wrapper(self):
+            result = self.cached_relation(name, partial(meth, self))
+            return bm.copy(result) if copy else result
+        return wrapper
+    return decorator
+
+
 def simplex_ldof(p: int, iptype: int) -> int:
     """Number of local dofs in a simplex entity."""
     if iptype == 0:
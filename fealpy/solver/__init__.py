@@ -1,3 +1,10 @@
 
 from .conjugate_gradient import cg
-from .direct_solver import spsolve
+from .direct_solver import spsolve, DirectSolver, factorize
+from .amg_solver import AMGSolver
+from .gmg_solver import GMGSolver
+from .gmres_solver import gmres
+from .minres_solver import minres
+from .bicgstab_solver import bicgstab
+from .preconditioner import *
+from .block_preconditioner import *
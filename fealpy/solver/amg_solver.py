@@ -0,0 +1,286 @@
+
+from typing import Optional, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from ..sparse.utils import row_to_crow
+from .conjugate_gradient import cg
+from .direct_solver import DirectSolver
+
+from .. import logger
+
+
+class AMGSolver():
+    """Smoothed aggregation algebraic multigrid (SA-AMG) on CSRTensor.
+
+    All the setup and cycle operations are vectorized with the backend
+    functions, so the solver works for any backend supported by `backend_manager`.
+
+    The setup phase builds a hierarchy of levels from the fine matrix:
+    1. strength graph: |a_ij| >= theta * sqrt(|a_ii a_jj|);
+    2. coarsening: aggregates grown from a maximal independent set of the graph;
+    3. interpolation: the piecewise-constant tentative prolongation smoothed
+       by one damped Jacobi step, P = (I - omega D^{-1} A) T;
+    4. coarse operator: the Galerkin product A_c = P^T A P.
+
+    Applying the solver (`solver @ r`) performs one V- or W-cycle with damped
+    Jacobi smoothers, so it can be passed as the preconditioner `M` of `cg`.
+
+    Parameters:
+        theta (float, optional): Threshold of the strength of connection. Defaults to 0.08.
+        csize (int, optional): Maximum size of the coarsest problem solved by the
+            dense inverse. If the coarsening stops above it (no more aggregates or
+            `maxlevel` reached), the coarsest problem is solved by the sparse
+            `DirectSolver` instead. Defaults to 50.
+        ptype (str, optional): Type of cycle, 'V' or 'W'. Defaults to 'V'.
+        sstep (int, optional): Number of pre- and post- smoothing steps. Defaults to 2.
+        maxlevel (int, optional): Maximum number of levels. Defaults to 20.
+        rtol (float, optional): Relative tolerance used by `solve`. Defaults to 1e-8.
+        atol (float, optional): Absolute tolerance used by `solve`. Defaults to 1e-12.
+        maxiter (int, optional): Maximum iterations used by `solve`. Defaults to 200.
+
+    Example:
+    ```
+        solver = AMGSolver()
+        solver.setup(A)
+        x = cg(A, b, M=solver)
+    ```
+    """
+    def __init__(self,
+                 theta: float = 0.08,
+                 csize: int = 50,
+                 ptype: str = 'V',
+                 sstep: int = 2,
+                 maxlevel: int = 20,
+                 rtol: float = 1e-8,
+                 atol: float = 1e-12,
+                 maxiter: int = 200):
+        if ptype not in ('V', 'W'):
+            raise ValueError(f"Unsupported cycle type '{ptype}', should be 'V' or 'W'.")
+        self.theta = theta
+        self.csize = csize
+        self.ptype = ptype
+        self.sstep = sstep
+        self.maxlevel = maxlevel
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+
+        self.A: List[CSRTensor] = []
+        self.P: List[CSRTensor] = []
+        self.R: List[CSRTensor] = []
+        self.Dinv: List[TensorLike] = []
+        self.omega: List[float] = []
+        self.Ainv = None
+        self._coarse_solver = None
+
+    @property
+    def shape(self):
+        return self.A[0].shape
+
+    def number_of_levels(self) -> int:
+        return len(self.A)
+
+    def setup(self, A: CSRTensor):
+        """Build the multigrid hierarchy of the matrix A.
+
+        Parameters:
+            A (CSRTensor): Symmetric positive-definite matrix without dense dimension.
+
+        Returns:
+            AMGSolver: The solver itself.
+        """
+        if not isinstance(A, CSRTensor):
+            A = A.tocsr()
+        if A.dense_ndim != 0:
+            raise ValueError("AMGSolver only supports matrices without dense dimension, "
+                             f"but got shape {A.shape}.")
+
+        self.A = [A]
+        self.P = []
+        self.R = []
+        self.Dinv = []
+        self.omega = []
+
+        while len(self.A) < self.maxlevel:
+            A = self.A[-1]
+            N = A.shape[0]
+            d = A.diagonal()
+            Dinv = 1.0 / d
+            omega = 4.0 / (3.0 * self._spectral_radius(A, Dinv))
+            self.Dinv.append(Dinv)
+            self.omega.append(omega)
+
+            if N <= self.csize:
+                break
+
+            agg, nagg = self.aggregate(A, d)
+            if (nagg == 0) or (nagg >= N):
+                break
+
+            T = self.tentative_prolongation(agg, nagg, dtype=A.ftype)
+            AT = A @ T
+            scale = (omega * Dinv)[AT.row()]
+            P = T.add(CSRTensor(AT.crow(), AT.col(), scale * AT.values(), AT.sparse_shape),
+                      alpha=-1)
+            R = P.T
+            self.P.append(P)
+            self.R.append(R)
+            self.A.append(R @ (A @ P))
+
+        self._setup_coarse()
+        logger.info(f"AMGSolver: setup {len(self.A)} levels with sizes "
+                    f"{[M.shape[0] for M in self.A]}.")
+
+        return self
+
+    def _setup_coarse(self) -> None:
+        A = self.A[-1]
+        N = A.shape[0]
+        self.Ainv = None
+        self._coarse_solver = None
+        if N <= self.csize:
+            self.Ainv = bm.linalg.inv(A.to_dense())
+            return
+        logger.warning(f"AMGSolver: the coarsest level has {N} > csize = {self.csize} "
+                       "unknowns, it is solved by the sparse DirectSolver.")
+        self._coarse_solver = DirectSolver().factorize(A)
+
+    def _coarse_solve(self, b: TensorLike) -> TensorLike:
+        if self._coarse_solver is None:
+            return self.Ainv @ b
+        x = self._coarse_solver.solve(b)
+        return bm.device_put(bm.astype(x, b.dtype), bm.get_device(b))
+
+    def aggregate(self, A: CSRTensor, d: Optional[TensorLike]=None):
+        """Aggregate the unknowns of A by the strength of connection.
+
+        Parameters:
+            A (CSRTensor): The matrix.
+            d (Tensor | None, optional): The diagonal of A. Defaults to None.
+
+        Returns:
+            Tuple[Tensor, int]: The aggregate index of every unknown (-1 for the
+                unknowns without strong connection), and the number of aggregates.
+        """
+        N = A.shape[0]
+        d = A.diagonal() if d is None else d
+        row, col, val = A.row(), A.col(), A.values()
+        kwargs = bm.context(val)
+        ikwargs = {'dtype': A.itype, 'device': bm.get_device(row)}
+
+        is_strong = (row != col) & (bm.abs(val) >= self.theta * bm.sqrt(bm.abs(d[row] * d[col])))
+        srow, scol = row[is_strong], col[is_strong]
+        deg = bm.index_add(bm.zeros((N, ), **kwargs), srow, bm.ones(srow.shape, **kwargs))
+
+        # Deterministic tie-breaking weights, distinct for every unknown.
+        weight = bm.arange(N, **kwargs) * 0.6180339887498949
+        weight = deg + weight - bm.floor(weight)
+
+        # Maximal independent set (Luby's method with fixed weights) as roots.
+        undecided = deg > 0
+        is_root = bm.zeros((N, ), dtype=bm.bool, device=bm.get_device(row))
+
+        while bm.any(undecided):
+            flag = undecided[scol] & (weight[scol] > weight[srow])
+            beaten = bm.index_add(bm.zeros((N, ), **kwargs), srow, bm.astype(flag, kwargs['dtype']))
+            new_root = undecided & (beaten == 0)
+            is_root = is_root | new_root
+            covered = bm.index_add(bm.zeros((N, ), **kwargs), srow,
+                                   bm.astype(new_root[scol], kwargs['dtype']))
+            undecided = undecided & (~new_root) & (covered == 0)
+
+        root = bm.nonzero(is_root)[0]
+        nagg = root.shape[0]
+        agg = bm.full((N, ), -1, **ikwargs)
+        agg = bm.set_at(agg, root, bm.arange(nagg, **ikwargs))
+
+        # Every non-root unknown joins the aggregate of its first root neighbor.
+        flag = is_root[scol] & (~is_root[srow])
+        srow, scol = srow[flag], scol[flag]
+        if srow.shape[0] > 0:
+            first = bm.concat([
+                bm.ones((1, ), dtype=bm.bool, device=bm.get_device(srow)),
+                srow[1:] != srow[:-1]
+            ], axis=0)
+            agg = bm.set_at(agg, srow[first], agg[scol[first]])
+
+        return agg, nagg
+
+    @staticmethod
+    def tentative_prolongation(agg: TensorLike, nagg: int, *, dtype=None) -> CSRTensor:
+        """The piecewise-constant prolongation with normalized columns."""
+        N = agg.shape[0]
+        is_agg = agg >= 0
+        col = agg[is_agg]
+        dtype = bm.float64 if dtype is None else dtype
+        kwargs = {'dtype': dtype, 'device': bm.get_device(agg)}
+        size = bm.index_add(bm.zeros((nagg, ), **kwargs), col, bm.ones(col.shape, **kwargs))
+        values = 1.0 / bm.sqrt(size[col])
+        crow = row_to_crow(bm.nonzero(is_agg)[0], N)
+        return CSRTensor(bm.astype(crow, agg.dtype), col, values, (N, nagg))
+
+    @staticmethod
+    def _spectral_radius(A: CSRTensor, Dinv: TensorLike, niter: int = 15) -> float:
+        """Estimate the spectral radius of D^{-1}A by the power iteration."""
+        N = A.shape[0]
+        x = bm.arange(N, **bm.context(Dinv)) * 0.6180339887498949
+        x = 1.0 + x - bm.floor(x)
+        rho = 1.0
+        for _ in range(niter):
+            y = Dinv * (A @ x)
+            rho = float(bm.linalg.norm(y) / bm.linalg.norm(x))
+            if rho == 0.0:
+                return 1.0
+            x = y / bm.linalg.norm(y)
+        return rho
+
+    def _smooth(self, level: int, x: TensorLike, b: TensorLike) -> TensorLike:
+        A = self.A[level]
+        Dinv = self.Dinv[level] if b.ndim == 1 else self.Dinv[level][:, None]
+        omega = self.omega[level]
+        for _ in range(self.sstep):
+            x = x + omega * Dinv * (b - A @ x)
+        return x
+
+    def cycle(self, b: TensorLike, level: int = 0) -> TensorLike:
+        """Apply one multigrid cycle to Ax = b with zero initial guess at `level`."""
+        if level == len(self.A) - 1:
+            return self._coarse_solve(b)
+
+        A = self.A[level]
+        gamma = 1 if self.ptype == 'V' else 2
+        x = self._smooth(level, bm.zeros_like(b), b)
+
+        for _ in range(gamma):
+            rc = self.R[level] @ (b - A @ x)
+            ec = self.cycle(rc, level + 1)
+            x = x + self.P[level] @ ec
+
+        return self._smooth(level, x, b)
+
+    def vcycle(self, b: TensorLike) -> TensorLike:
+        return self._cycle_with(b, 'V')
+
+    def wcycle(self, b: TensorLike) -> TensorLike:
+        return self._cycle_with(b, 'W')
+
+    def _cycle_with(self, b: TensorLike, ptype: str):
+        ptype, self.ptype = self.ptype, ptype
+        try:
+            return self.cycle(b)
+        finally:
+            self.ptype = ptype
+
+    def __matmul__(self, b: TensorLike) -> TensorLike:
+        if len(self.A) == 0:
+            raise RuntimeError("AMGSolver is not set up, please call `setup` first.")
+        return self.cycle(b)
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None) -> TensorLike:
+        """Solve Ax = b by the multigrid preconditioned conjugate gradient method."""
+        if len(self.A) == 0:
+            raise RuntimeError("AMGSolver is not set up, please call `setup` first.")
+        return cg(self.A[0], b, x0, atol=self.atol, rtol=self.rtol,
+                  maxiter=self.maxiter, M=self)
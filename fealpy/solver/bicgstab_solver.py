@@ -0,0 +1,120 @@
+
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .preconditioner import SupportsMatmul, _safe_div
+
+from .. import logger
+
+
+def bicgstab(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+             batch_first: bool=False,
+             atol: float=1e-12, rtol: float=1e-8,
+             maxiter: Optional[int]=10000,
+             M: Optional[SupportsMatmul]=None,
+             returninfo: bool=False):
+    """Solve a linear system Ax = b using the Biconjugate Gradient Stabilized (BiCGStab) method.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix of the linear system, can be nonsymmetric.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (SupportsMatmul, optional): The right preconditioner approximating the inverse\
+        of A, applied as `M @ r`. Default is None (no preconditioning).
+        returninfo (bool, optional): Whether to return the convergence information.\
+        Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: The convergence information, only returned if `returninfo` is True,\
+        including the number of iterations 'niter' and the residual norm\
+        in every iteration 'residual' (starting from the initial one).
+    """
+    assert isinstance(b, TensorLike), "b must be a Tensor"
+    if x0 is not None:
+        assert isinstance(x0, TensorLike), "x0 must be a Tensor if not None"
+    single_vector = b.ndim == 1
+
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    else:
+        if x0.shape != b.shape:
+            raise ValueError("x0 and b must have the same shape")
+
+    if (not single_vector) and batch_first:
+        b = bm.swapaxes(b, 0, 1)
+        x0 = bm.swapaxes(x0, 0, 1)
+
+    sol, info = _bicgstab_impl(A, b, x0, M, atol, rtol, maxiter)
+
+    if (not single_vector) and batch_first:
+        sol = bm.swapaxes(sol, 0, 1)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _bicgstab_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    # Columns converged are frozen by zero step lengths, so the breakdown of
+    # their tiny residuals does not pollute the solution.
+    precond = (lambda v: v) if M is None else (lambda v: M @ v)
+    sum_func = bm.sum
+    norm = lambda v: bm.sqrt(sum_func(v**2, axis=0))
+
+    x = x0
+    r = b - A @ x
+    rhat = r
+    tol = rtol * norm(b)
+    tol = bm.where(tol > atol, tol, atol)
+    r_norm = norm(r)
+    residual = [float(bm.linalg.norm(r_norm))]
+    active = r_norm > tol
+
+    rho = bm.ones_like(r_norm)
+    alpha = bm.ones_like(r_norm)
+    omega = bm.ones_like(r_norm)
+    v = bm.zeros_like(b)
+    p = bm.zeros_like(b)
+    n_iter = 0
+
+    while bm.any(active):
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"BiCGStab: failed, stopped by maxiter ({maxiter}).")
+            break
+
+        rho_new = sum_func(rhat*r, axis=0)
+        beta = _safe_div(rho_new, rho) * _safe_div(alpha, omega)
+        p = r + beta[None, ...] * (p - omega[None, ...]*v)
+        phat = precond(p)
+        v = A @ phat
+        alpha = bm.where(active, _safe_div(rho_new, sum_func(rhat*v, axis=0)), 0.0)
+        s = r - alpha[None, ...] * v
+        x = x + alpha[None, ...] * phat
+
+        shat = precond(s)
+        t = A @ shat
+        omega = bm.where(active & (norm(s) > tol), _safe_div(sum_func(t*s, axis=0), sum_func(t*t, axis=0)), 0.0)
+        x = x + omega[None, ...] * shat
+        r = s - omega[None, ...] * t
+        rho = rho_new
+
+        n_iter += 1
+        r_norm = norm(r)
+        residual.append(float(bm.linalg.norm(r_norm)))
+        logger.debug(f"BiCGStab: iteration {n_iter}, residual {residual[-1]:.6e}.")
+        active = active & (r_norm > tol)
+    else:
+        logger.info(f"BiCGStab: converged in {n_iter} iterations.")
+
+    return x, {'niter': n_iter, 'residual': residual}
@@ -0,0 +1,320 @@
+
+from typing import Optional, Union
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor, BlockCSRTensor
+from .preconditioner import SupportsMatmul, JacobiPreconditioner, ILU0Preconditioner, _to_csr
+from .amg_solver import AMGSolver
+from .direct_solver import DirectSolver
+
+__all__ = [
+    'SchurApproximation',
+    'PressureMassSchur',
+    'PCDSchur',
+    'LSCSchur',
+    'BlockDiagonalPreconditioner',
+    'BlockTriangularPreconditioner',
+]
+
+_Solver = Union[str, SupportsMatmul, None]
+
+# NOTE: The saddle-point systems of the incompressible flows are written as
+#
+#     K = [[F, G],
+#          [D, C]],
+#
+# with the velocity block F, the gradient block G, the divergence block D and
+# the (usually zero) stabilization block C. Depending on the sign convention of
+# the pressure, D = G^T (e.g. `BlockForm([[A, B], [B.T, None]])`) or D = -G^T
+# (a pressure gradient assembled with the opposite sign). The Schur complement
+# S = C - D F^{-1} G is approximated by spectrally equivalent operators on the
+# pressure space, and its sign is detected from the blocks, so that both
+# conventions are supported.
+
+
+def inverse(A, solver: _Solver='amg') -> SupportsMatmul:
+    """Approximate inverse of a matrix, applied by `@`.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix.
+        solver (str | SupportsMatmul, optional): 'amg' (one V-cycle of `AMGSolver`),
+            'direct' (`DirectSolver` with scipy), 'jacobi', 'ilu0', or an object
+            already approximating the inverse, returned unchanged. Defaults to 'amg'.
+
+    Returns:
+        SupportsMatmul: The approximate inverse.
+    """
+    if not isinstance(solver, str):
+        return solver
+    if solver == 'amg':
+        return AMGSolver().setup(_to_csr(A))
+    elif solver == 'direct':
+        return DirectSolver('scipy', _to_csr(A))
+    elif solver == 'jacobi':
+        return JacobiPreconditioner(A)
+    elif solver == 'ilu0':
+        return ILU0Preconditioner(A)
+    else:
+        raise ValueError(f"Unknown inner solver: {solver}")
+
+
+def _check_saddle_point(K: BlockCSRTensor) -> BlockCSRTensor:
+    if not isinstance(K, BlockCSRTensor):
+        raise TypeError("The saddle-point matrix should be a BlockCSRTensor, "
+                        f"but got {type(K).__name__}.")
+    if K.block_shape != (2, 2):
+        raise ValueError(f"The saddle-point matrix should have 2x2 blocks, but got {K.block_shape}.")
+    if (K[0, 0] is None) or (K[0, 1] is None) or (K[1, 0] is None):
+        raise ValueError("The blocks F, G and D of the saddle-point matrix should be non-zero.")
+    return K
+
+
+def schur_sign(D: CSRTensor, G: CSRTensor) -> int:
+    """The sign s such that D = s G^T, detected by comparing the bilinear forms
+    x^T D y and y^T G x on two fixed vectors. D F^{-1} G is then s times a
+    positive (semi-)definite matrix for positive-definite F."""
+    kwargs = D.values_context()
+    x = bm.cos(bm.arange(D.shape[0], **kwargs))
+    y = bm.sin(bm.arange(D.shape[1], **kwargs) + 1.0)
+    t1 = bm.sum(x * (D @ y))
+    t2 = bm.sum(y * (G @ x))
+    return 1 if bool(bm.abs(t1 - t2) <= bm.abs(t1 + t2)) else -1
+
+
+class _PressureInverse():
+    """Approximate inverse of a pressure operator, which is singular with the
+    constant pressures as the kernel for enclosed flows. In that case the
+    operator is shifted by a tiny multiple of its diagonal, and the residual and
+    the result are projected to the mean-zero pressures."""
+    def __init__(self, A, solver: _Solver, singular: Optional[bool]=None) -> None:
+        A = _to_csr(A)
+        d = A.diagonal()
+        if singular is None:
+            ones = bm.ones((A.shape[1], ), **A.values_context())
+            singular = bool(bm.max(bm.abs(A @ ones)) <= 1e-10 * bm.max(bm.abs(d)))
+        self.singular = singular
+        if singular and isinstance(solver, str) and solver in ('amg', 'direct'):
+            shift = 1e-10 * bm.max(bm.abs(d))
+            A = A.add(CSRTensor(_diag_crow(A), _diag_col(A), shift * bm.ones_like(d),
+                                A.sparse_shape))
+        self.solver = inverse(A, solver)
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        if not self.singular:
+            return self.solver @ r
+        r = r - bm.mean(r, axis=0)
+        z = self.solver @ r
+        return z - bm.mean(z, axis=0)
+
+
+def _diag_crow(A: CSRTensor) -> TensorLike:
+    return bm.arange(A.shape[0] + 1, dtype=A.itype, device=bm.get_device(A.crow()))
+
+
+def _diag_col(A: CSRTensor) -> TensorLike:
+    return bm.arange(A.shape[0], dtype=A.itype, device=bm.get_device(A.crow()))
+
+
+class SchurApproximation():
+    """Base class of the approximations of the inverse Schur complement.
+
+    `schur @ r` approximates S^{-1} r with S = C - D F^{-1} G on the pressure
+    space. The approximation is bound to the saddle-point matrix by `setup`,
+    which is called by the block preconditioners.
+    """
+    def __init__(self) -> None:
+        self.sign = None
+
+    def setup(self, K: BlockCSRTensor) -> 'SchurApproximation':
+        """Bind the approximation to the saddle-point matrix K."""
+        K = _check_saddle_point(K)
+        self.sign = schur_sign(K[1, 0], K[0, 1])
+        return self
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        raise NotImplementedError
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        if self.sign is None:
+            raise RuntimeError(f"{type(self).__name__} is not set up, please call `setup` first.")
+        return self.apply(r)
+
+
+class PressureMassSchur(SchurApproximation):
+    """Pressure mass matrix approximation of the Schur complement,
+
+        S^{-1} ~ -s (nu Mp^{-1} + alpha Ap^{-1}),
+
+    where s is the sign of D = s G^T. With alpha = 0 this is the classical
+    approximation for the Stokes problem, robust w.r.t. the mesh size; with
+    alpha = rho/dt and the pressure Laplacian Ap, this is the Cahouet-Chabard
+    approximation for the time dependent problems with the velocity block
+    rho/dt M + mu A.
+
+    Parameters:
+        Mp (CSRTensor): The pressure mass matrix.
+        nu (float, optional): The viscosity scaling the mass matrix term. Defaults to 1.0.
+        Ap (CSRTensor | None, optional): The pressure Laplacian. Defaults to None.
+        alpha (float, optional): The scaling of the Laplacian term. Defaults to 0.0.
+        mass_solver (str | SupportsMatmul, optional): Inverse of Mp, see `inverse`.
+            Mp is spectrally equivalent to its diagonal. Defaults to 'jacobi'.
+        laplace_solver (str | SupportsMatmul, optional): Inverse of Ap. Defaults to 'amg'.
+    """
+    def __init__(self, Mp, nu: float=1.0, Ap=None, alpha: float=0.0, *,
+                 mass_solver: _Solver='jacobi', laplace_solver: _Solver='amg') -> None:
+        super().__init__()
+        self.nu = nu
+        self.alpha = alpha
+        self.Mpinv = inverse(Mp, mass_solver)
+        self.Apinv = None
+        if (Ap is not None) and (alpha != 0.0):
+            self.Apinv = _PressureInverse(Ap, laplace_solver)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        z = self.nu * (self.Mpinv @ r)
+        if self.Apinv is not None:
+            z = z + self.alpha * (self.Apinv @ r)
+        return -self.sign * z
+
+
+class PCDSchur(SchurApproximation):
+    """Pressure convection-diffusion (PCD) approximation of the Schur complement,
+
+        S^{-1} ~ -s Mp^{-1} Fp Ap^{-1},
+
+    where Fp is the convection-diffusion operator of the velocity block
+    discretized on the pressure space, e.g. rho/dt Mp + mu Ap + rho (w . grad).
+
+    Parameters:
+        Mp (CSRTensor): The pressure mass matrix.
+        Ap (CSRTensor): The pressure Laplacian.
+        Fp (CSRTensor): The pressure convection-diffusion operator.
+        mass_solver (str | SupportsMatmul, optional): Inverse of Mp. Defaults to 'jacobi'.
+        laplace_solver (str | SupportsMatmul, optional): Inverse of Ap. Defaults to 'amg'.
+    """
+    def __init__(self, Mp, Ap, Fp, *, mass_solver: _Solver='jacobi',
+                 laplace_solver: _Solver='amg') -> None:
+        super().__init__()
+        self.Fp = _to_csr(Fp)
+        self.Mpinv = inverse(Mp, mass_solver)
+        self.Apinv = _PressureInverse(Ap, laplace_solver)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        z = self.Apinv @ r
+        z = self.Mpinv @ (self.Fp @ z)
+        return -self.sign * z
+
+
+class LSCSchur(SchurApproximation):
+    """Least-squares commutator (LSC) approximation of the Schur complement,
+
+        S^{-1} ~ -L^{-1} (D Q^{-1} F Q^{-1} G) L^{-1},  L = s D Q^{-1} G,
+
+    built algebraically from the blocks of the saddle-point matrix, so that
+    no operator on the pressure space is required.
+
+    Parameters:
+        Q (TensorLike | None, optional): The diagonal of the scaling matrix, usually
+            the diagonal of the velocity mass matrix. Defaults to None (identity).
+        solver (str | SupportsMatmul, optional): Inverse of L. Defaults to 'amg'.
+    """
+    def __init__(self, Q: Optional[TensorLike]=None, *, solver: _Solver='amg') -> None:
+        super().__init__()
+        self.Q = Q
+        self.solver = solver
+
+    def setup(self, K: BlockCSRTensor) -> 'LSCSchur':
+        super().setup(K)
+        self.F, self.G, self.D = K[0, 0], K[0, 1], K[1, 0]
+        G = self.G
+        if self.Q is None:
+            self.Qinv = bm.ones((G.shape[0], ), **G.values_context())
+        else:
+            self.Qinv = 1.0 / self.Q
+        QG = CSRTensor(G.crow(), G.col(), self.sign * self.Qinv[G.row()] * G.values(),
+                       G.sparse_shape)
+        self.Linv = _PressureInverse(self.D @ QG, self.solver)
+        return self
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        Qinv = self.Qinv if r.ndim == 1 else self.Qinv[:, None]
+        z = self.Linv @ r
+        z = Qinv * (self.F @ (Qinv * (self.G @ z)))
+        return -(self.Linv @ (self.D @ z))
+
+
+class _BlockPreconditioner():
+    def __init__(self, K: BlockCSRTensor, schur: SchurApproximation,
+                 velocity_solver: _Solver='amg') -> None:
+        self.K = _check_saddle_point(K)
+        self.schur = schur.setup(self.K)
+        self.Finv = inverse(self.K[0, 0], velocity_solver)
+
+    @property
+    def shape(self):
+        return self.K.shape
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        raise NotImplementedError
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.apply(r)
+
+
+class BlockDiagonalPreconditioner(_BlockPreconditioner):
+    """Block diagonal preconditioner of the saddle-point matrix,
+
+        P^{-1} = [[F^{-1}, 0], [0, |S|^{-1}]],
+
+    symmetric positive definite for the symmetric velocity solvers (e.g. AMG)
+    and the mass-based Schur approximations, so it can be used by `minres`.
+    The preconditioned matrix has three clusters of eigenvalues, GMRES or
+    MINRES converges in a number of iterations independent of the mesh size.
+
+    Parameters:
+        K (BlockCSRTensor): The 2x2 saddle-point matrix [[F, G], [D, C]].
+        schur (SchurApproximation): The approximation of the Schur complement.
+        velocity_solver (str | SupportsMatmul, optional): Inverse of F, see `inverse`.
+            Defaults to 'amg'.
+
+    Example:
+    ```
+        P = BlockDiagonalPreconditioner(K, PressureMassSchur(Mp, nu=mu))
+        x = minres(K, b, M=P)
+    ```
+    """
+    def apply(self, r: TensorLike) -> TensorLike:
+        ru, rp = self.K.split(r, axis=0)
+        zu = self.Finv @ ru
+        zp = -self.schur.sign * (self.schur @ rp)
+        return BlockCSRTensor.join([zu, zp])
+
+
+class BlockTriangularPreconditioner(_BlockPreconditioner):
+    """Block upper triangular preconditioner of the saddle-point matrix,
+
+        P = [[F, G], [0, S]],
+
+    applied by the backward substitution zp = S^{-1} rp, zu = F^{-1}(ru - G zp).
+    With the exact F and S the right-preconditioned matrix has the minimal
+    polynomial of degree 2, so GMRES converges in a few iterations with good
+    approximations. The preconditioner is nonsymmetric, use it with `gmres`.
+
+    Parameters:
+        K (BlockCSRTensor): The 2x2 saddle-point matrix [[F, G], [D, C]].
+        schur (SchurApproximation): The approximation of the Schur complement.
+        velocity_solver (str | SupportsMatmul, optional): Inverse of F, see `inverse`.
+            Defaults to 'amg'.
+
+    Example:
+    ```
+        P = BlockTriangularPreconditioner(K, LSCSchur())
+        x = gmres(K, b, solver='fealpy', M=P)
+    ```
+    """
+    def apply(self, r: TensorLike) -> TensorLike:
+        ru, rp = self.K.split(r, axis=0)
+        zp = self.schur @ rp
+        zu = self.Finv @ (ru - self.K[0, 1] @ zp)
+        return BlockCSRTensor.join([zu, zp])
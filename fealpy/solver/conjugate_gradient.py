@@ -1,20 +1,19 @@
 
-from typing import Optional, Protocol
+from typing import Optional
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
+from .preconditioner import SupportsMatmul
 
 from .. import logger
 
 
-class SupportsMatmul(Protocol):
-    def __matmul__(self, other: TensorLike) -> TensorLike: ...
-
-
 def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
        batch_first: bool=False,
        atol: float=1e-12, rtol: float=1e-8,
-       maxiter: Optional[int]=10000) -> TensorLike:
+       maxiter: Optional[int]=10000,
+       M: Optional[SupportsMatmul]=None,
+       returninfo: bool=False):
     """Solve a linear system Ax = b using the Conjugate Gradient (CG) method.
 
     Parameters:
@@ -28,9 +27,17 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
         maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.\
         If not provided, the method will continue until convergence based on the given tolerances.
+        M (SupportsMatmul, optional): The preconditioner approximating the inverse of A,\
+        applied as `M @ r` to the residual. Must be symmetric positive-definite.\
+        Default is None (no preconditioning).
+        returninfo (bool, optional): Whether to return the convergence information.\
+        Default is False.
 
     Returns:
         Tensor: The approximate solution to the system Ax = b.
+        dict: The convergence information, only returned if `returninfo` is True,\
+        including the number of iterations 'niter' and the residual norm\
+        in every iteration 'residual' (starting from the initial one).
 
     Raises:
         ValueError: If inputs do not meet the specified conditions (e.g., A is not sparse, dimensions mismatch).
@@ -57,33 +64,37 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         b = bm.swapaxes(b, 0, 1)
         x0 = bm.swapaxes(x0, 0, 1)
 
-    sol = _cg_impl(A, b, x0, atol, rtol, maxiter)
+    sol, info = _cg_impl(A, b, x0, M, atol, rtol, maxiter)
 
     if (not single_vector) and batch_first:
         sol = bm.swapaxes(sol, 0, 1)
 
+    if returninfo:
+        return sol, info
     return sol
 
 
-def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxiter):
+def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
     # initialize
     x = x0              # (dof, batch)
     r = b - A @ x       # (dof, batch)
-    p = r               # (dof, batch)
+    z = r if M is None else M @ r
+    p = z               # (dof, batch)
     n_iter = 0
     b_norm = bm.linalg.norm(b)
     sum_func = bm.sum
     sqrt_func = bm.sqrt
+    rTz = sum_func(r*z, axis=0)  # (batch,)
+    residual = [float(sqrt_func(sum_func(r**2)))]
 
     # iterate
     while True:
         Ap = A @ p      # (dof, batch)
-        rTr = sum_func(r**2, axis=0)
-        alpha = rTr / sum_func(p*Ap, axis=0)  # r @ r / (p @ Ap) # (batch,)
+        alpha = rTz / sum_func(p*Ap, axis=0)  # r @ z / (p @ Ap) # (batch,)
         x = x + alpha[None, ...] * p  # (dof, batch)
-        r_new = r - alpha[None, ...] * Ap
-        rTr_new = sum_func(r_new**2, axis=0)  # (batch,)
-        r_norm_new = sqrt_func(sum_func(rTr_new))
+        r = r - alpha[None, ...] * Ap
+        r_norm_new = sqrt_func(sum_func(r**2))
+        residual.append(float(r_norm_new))
 
         n_iter += 1
 
@@ -101,11 +112,13 @@ def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxit
             logger.info(f"CG: failed, stopped by maxiter ({maxiter}).")
             break
 
-        beta = rTr_new / rTr # (batch,)
-        p = r_new + beta[None, ...] * p
-        r = r_new
+        z = r if M is None else M @ r
+        rTz_new = sum_func(r*z, axis=0)  # (batch,)
+        beta = rTz_new / rTz # (batch,)
+        p = z + beta[None, ...] * p
+        rTz = rTz_new
 
-    return x
+    return x, {'niter': n_iter, 'residual': residual}
 
     # @staticmethod
     # def setup_context(ctx, inputs, output):
@@ -1,8 +1,13 @@
 
+from typing import Optional
+
 from ..backend import backend_manager as bm
+from ..backend import TensorLike
 from ..sparse import COOTensor, CSRTensor
 import numpy as np
 
+from .. import logger
+
 def _mumps_solve(A, b):
     """Solve a linear system using MUMPS.
 
@@ -126,4 +131,228 @@ def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
         raise ValueError(f"Unknown solver: {solver}")
 
 
+class DirectSolver():
+    """Direct solver keeping the factorization of the matrix for repeated solves.
+
+    The matrix is factorized once by `factorize`, and every `solve` (or `@`)
+    only performs the forward and backward substitutions, for a right-hand side
+    shaped (dof, ) or a block of them shaped (dof, batch). When `factorize` is
+    called again with a matrix of the same sparsity pattern (e.g. in time
+    stepping with varying coefficients), the symbolic work is reused as far
+    as the solver allows:
+    - "scipy": SuperLU `splu`, reusing only the COLAMD column ordering. The
+      matrix is refactorized in that order, and SuperLU still redoes its own
+      symbolic factorization and row pivoting every time;
+    - "mumps": MUMPS analysis (job 1) and factorization (job 2), solving
+      with job 3, reusing the analysis;
+    - "cupy": cupyx `splu`, without symbolic reuse.
+
+    Parameters:
+        solver (str, optional): The solver to use, "scipy", "mumps" or "cupy".
+            Defaults to "scipy".
+        A (COOTensor | CSRTensor | None, optional): The matrix to factorize.
+            Defaults to None.
+
+    Example:
+    ```
+        solver = DirectSolver('scipy').factorize(A)
+        for i in range(nt):
+            x = solver.solve(b)
+    ```
+    """
+    def __init__(self, solver: str="scipy", A: Optional[CSRTensor]=None) -> None:
+        if solver not in ("scipy", "mumps", "cupy"):
+            raise ValueError(f"Unknown solver: {solver}")
+        self.solver = solver
+        self.nfactorize = 0
+        self.nsymbolic = 0
+        self._shape = None
+        self._pattern = None
+        self._lu = None
+        self._ctx = None
+        self._perm = None
+        self._csc = None
+
+        if A is not None:
+            self.factorize(A)
+
+    def __del__(self):
+        self.clear()
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def clear(self) -> None:
+        """Release the factorization."""
+        if getattr(self, '_ctx', None) is not None:
+            self._ctx.destroy()
+            self._ctx = None
+        self._lu = None
+        self._pattern = None
+        self._perm = None
+        self._csc = None
+
+    def factorize(self, A: CSRTensor):
+        """Factorize the matrix, reusing the symbolic analysis if the sparsity
+        pattern is the same as the last factorized matrix.
+
+        Parameters:
+            A (COOTensor | CSRTensor): The square matrix without dense dimension.
+
+        Returns:
+            DirectSolver: The solver itself.
+        """
+        if not isinstance(A, CSRTensor):
+            A = A.tocsr()
+        if A.dense_ndim != 0:
+            raise ValueError("DirectSolver only supports matrices without dense "
+                             f"dimension, but got shape {A.shape}.")
+        crow = bm.to_numpy(A.crow())
+        col = bm.to_numpy(A.col())
+        values = bm.to_numpy(A.values())
+        same_pattern = self._same_pattern(A.shape, crow, col)
+
+        if self.solver == "scipy":
+            self._scipy_factorize(A.shape, crow, col, values, same_pattern)
+        elif self.solver == "mumps":
+            self._mumps_factorize(A.shape, crow, col, values, same_pattern)
+        else:
+            self._cupy_factorize(A)
+
+        if not same_pattern:
+            self.nsymbolic += 1
+            self._pattern = (crow, col)
+        self.nfactorize += 1
+        self._shape = A.shape
+        logger.info(f"DirectSolver: factorized the matrix of shape {tuple(A.shape)} "
+                    f"by {self.solver}, symbolic analysis "
+                    f"{'reused' if same_pattern else 'done'}.")
+        return self
+
+    def _same_pattern(self, shape, crow, col) -> bool:
+        if (self._pattern is None) or (tuple(shape) != tuple(self._shape)):
+            return False
+        crow0, col0 = self._pattern
+        return (col0.shape == col.shape) and np.array_equal(crow0, crow) \
+            and np.array_equal(col0, col)
+
+    def _scipy_factorize(self, shape, crow, col, values, same_pattern):
+        from scipy.sparse import csr_matrix, csc_matrix
+        from scipy.sparse.linalg import splu
+
+        if not same_pattern:
+            # Column ordering by COLAMD, and the map from the CSR values to
+            # the data of the column permuted CSC matrix.
+            A = csr_matrix((values, col, crow), shape=shape)
+            if not A.has_canonical_format:
+                A.sum_duplicates()
+                self._perm = None
+                self._lu = splu(A.tocsc())
+                self._csc = None
+                return
+            lu = splu(A.tocsc())
+            perm_c = np.empty_like(lu.perm_c)
+            perm_c[lu.perm_c] = np.arange(shape[1])
+            pos = csr_matrix((np.arange(1, col.shape[0]+1), col, crow), shape=shape)
+            pos = pos.tocsc()[:, perm_c]
+            pos.sort_indices()
+            self._perm = None
+            self._csc = (pos.data - 1, pos.indices, pos.indptr, perm_c)
+            self._lu = lu
+            return
+
+        if self._csc is None:
+            A = csr_matrix((values, col, crow), shape=shape)
+            A.sum_duplicates()
+            self._lu = splu(A.tocsc())
+            return
+
+        # Factorize B = A[:, perm_c] in the natural order, then x[perm_c] = B^{-1} b.
+        data_map, indices, indptr, perm_c = self._csc
+        B = csc_matrix((values[data_map], indices, indptr), shape=shape)
+        self._lu = splu(B, permc_spec='NATURAL')
+        self._perm = perm_c
+
+    def _mumps_factorize(self, shape, crow, col, values, same_pattern):
+        from mumps import DMumpsContext
+
+        if not same_pattern:
+            if self._ctx is not None:
+                self._ctx.destroy()
+            from scipy.sparse import csr_matrix
+            A = csr_matrix((values, col, crow), shape=shape)
+            ctx = DMumpsContext()
+            ctx.set_silent()
+            ctx.set_centralized_sparse(A)
+            ctx.run(job=1)
+            self._ctx = ctx
+        else:
+            # The COO entries passed to MUMPS follow the CSR order, so the
+            # new values can be set without the analysis.
+            self._ctx.set_centralized_assembled_values(values.astype(np.float64))
+        self._ctx.run(job=2)
+
+    def _cupy_factorize(self, A: CSRTensor):
+        import cupy as cp
+        from cupyx.scipy.sparse.linalg import splu
+
+        A, _ = _to_cupy_data(A.tocoo(), bm.zeros((A.shape[0], ), dtype=A.ftype))
+        self._lu = splu(A.tocsc())
+
+    def solve(self, b: TensorLike) -> TensorLike:
+        """Solve the linear system with the factorized matrix.
+
+        Parameters:
+            b (Tensor): The right-hand side shaped (dof, ) or (dof, batch).
+
+        Returns:
+            Tensor: The solution with the shape of `b`.
+        """
+        if self._shape is None:
+            raise RuntimeError("DirectSolver has no factorization, please call `factorize` first.")
+        if b.ndim not in {1, 2}:
+            raise ValueError("b must be a 1D or 2D dense tensor")
+
+        if self.solver == "scipy":
+            x = self._lu.solve(np.ascontiguousarray(bm.to_numpy(b), dtype=np.float64))
+            if self._perm is not None:
+                y = x
+                x = np.empty_like(y)
+                x[self._perm] = y
+        elif self.solver == "mumps":
+            x = self._mumps_solve(bm.to_numpy(b))
+        else:
+            import cupy as cp
+            iscpu = isinstance(b, np.ndarray) or b.device.type == "cpu"
+            bc = cp.array(bm.to_numpy(b)) if iscpu else cp.from_dlpack(b)
+            x = self._lu.solve(bc)
+            if iscpu:
+                x = cp.asnumpy(x)
+
+        return bm.tensor(x)
+
+    def _mumps_solve(self, b):
+        # PyMUMPS takes one right-hand side at a time, so the columns of a
+        # block are solved in turn with the same factorization.
+        ctx = self._ctx
+        if b.ndim == 1:
+            x = np.array(b, dtype=np.float64)
+            ctx.set_rhs(x)
+            ctx.run(job=3)
+            return x
+        x = np.empty(b.shape, dtype=np.float64)
+        for i in range(b.shape[1]):
+            rhs = np.array(b[:, i], dtype=np.float64)
+            ctx.set_rhs(rhs)
+            ctx.run(job=3)
+            x[:, i] = rhs
+        return x
+
+    def __matmul__(self, b: TensorLike) -> TensorLike:
+        return self.solve(b)
+
 
+def factorize(A: CSRTensor, solver: str="scipy") -> DirectSolver:
+    """Factorize the matrix for repeated solves, see `DirectSolver`."""
+    return DirectSolver(solver, A)
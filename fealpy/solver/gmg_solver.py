@@ -0,0 +1,445 @@
+
+from typing import Optional, List, Sequence
+from itertools import product
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..fdm.laplace_operator import (
+    BoundaryCondition, LaplaceOperator, grid_cells, boundary_conditions, unknown_range
+)
+from .conjugate_gradient import cg
+from .direct_solver import DirectSolver
+
+from .. import logger
+
+
+def _along(x: TensorLike, axis: int, fn) -> TensorLike:
+    """Apply `fn` working on the first axis to the given axis of x."""
+    if axis == 0:
+        return fn(x)
+    x = bm.swapaxes(x, axis, 0)
+    return bm.swapaxes(fn(x), axis, 0)
+
+
+def _zeros_like_slice(x: TensorLike) -> TensorLike:
+    return bm.zeros((1, ) + tuple(x.shape[1:]), **bm.context(x))
+
+
+def _prolongate_1d(c: TensorLike, bc: str) -> TensorLike:
+    """Linear interpolation along the first axis from the coarse unknowns to
+    the fine unknowns."""
+    if bc == 'dirichlet':
+        z = _zeros_like_slice(c)
+        c = bm.concat([z, c, z], axis=0)
+    elif bc == 'periodic':
+        c = bm.concat([c, c[:1]], axis=0)
+    nc = c.shape[0] - 1
+    mid = 0.5 * (c[:-1] + c[1:])
+    f = bm.reshape(bm.stack([c[:-1], mid], axis=1), (2 * nc, ) + tuple(c.shape[1:]))
+    f = bm.concat([f, c[-1:]], axis=0)
+    if bc == 'dirichlet':
+        return f[1:-1]
+    elif bc == 'periodic':
+        return f[:-1]
+    return f
+
+
+def _restrict_1d(f: TensorLike, bc: str) -> TensorLike:
+    """Full weighting along the first axis, the transpose of `_prolongate_1d`
+    divided by 2."""
+    z = _zeros_like_slice(f)
+    if bc == 'dirichlet':
+        f = bm.concat([z, f, z], axis=0)
+    elif bc == 'periodic':
+        f = bm.concat([f, z], axis=0)
+    odd = 0.5 * f[1::2]
+    c = f[0::2] + bm.concat([odd, z], axis=0) + bm.concat([z, odd], axis=0)
+    if bc == 'dirichlet':
+        c = c[1:-1]
+    elif bc == 'periodic':
+        c = bm.concat([c[:1] + c[-1:], c[1:-1]], axis=0)
+    return 0.5 * c
+
+
+class _GridLevel():
+    """An operator on the unknowns of a uniform grid, stored as the
+    coefficients of a 3x3(x3) stencil at every unknown and applied by slicing."""
+    def __init__(self, A: CSRTensor, cells: Sequence[int], bc: Sequence[str]) -> None:
+        self.A = A
+        self.cells = tuple(cells)
+        self.bc = tuple(bc)
+        self.grid_shape = tuple(hi - lo for lo, hi in
+                                (unknown_range(n, b) for n, b in zip(self.cells, self.bc)))
+        self.offsets = list(product((-1, 0, 1), repeat=len(self.cells)))
+        self.center = len(self.offsets) // 2
+        self.W = self._stencil(A)
+        self.diag = self.W[self.center]
+
+    def _stencil(self, A: CSRTensor) -> TensorLike:
+        TD = len(self.cells)
+        N = A.shape[0]
+        row, col = A.row(), A.col()
+        s = bm.zeros(row.shape, dtype=row.dtype, device=bm.get_device(row))
+        stride = N
+        for d in range(TD):
+            stride = stride // self.grid_shape[d]
+            diff = (col // stride) % self.grid_shape[d] - (row // stride) % self.grid_shape[d]
+            if self.bc[d] == 'periodic':
+                n = self.grid_shape[d]
+                diff = bm.where(diff == n - 1, -1, diff)
+                diff = bm.where(diff == 1 - n, 1, diff)
+            if bool(bm.any(bm.abs(diff) > 1)):
+                raise ValueError("GMGSolver only supports operators coupling the "
+                                 "neighbouring grid nodes (3x3 or 3x3x3 stencils).")
+            s = s * 3 + (diff + 1)
+        W = bm.zeros((len(self.offsets) * N, ), **A.values_context())
+        W = bm.index_add(W, s * N + row, A.values())
+        return bm.reshape(W, (len(self.offsets), ) + self.grid_shape)
+
+    def pad(self, u: TensorLike) -> TensorLike:
+        """Pad the grid values by one ghost layer, zero on the Dirichlet and
+        Neumann sides and periodic on the periodic axes."""
+        for d, b in enumerate(self.bc):
+            if b == 'periodic':
+                u = _along(u, d, lambda x: bm.concat([x[-1:], x, x[:1]], axis=0))
+            else:
+                u = _along(u, d, lambda x: bm.concat([_zeros_like_slice(x), x,
+                                                       _zeros_like_slice(x)], axis=0))
+        return u
+
+    def _refresh(self, U: TensorLike) -> TensorLike:
+        """Update the periodic ghost layers of the padded values in-place."""
+        for d, b in enumerate(self.bc):
+            if b == 'periodic':
+                head = (slice(None), ) * d
+                U = bm.set_at(U, head + (0, ), U[head + (-2, )])
+                U = bm.set_at(U, head + (-1, ), U[head + (1, )])
+        return U
+
+    def _weight(self, k: int, index, nbatch: int) -> TensorLike:
+        w = self.W[k][index]
+        return bm.reshape(w, tuple(w.shape) + (1, ) * nbatch)
+
+    def matvec(self, u: TensorLike) -> TensorLike:
+        """Apply the operator to grid values shaped (*grid, [batch])."""
+        nbatch = u.ndim - len(self.grid_shape)
+        U = self.pad(u)
+        out = 0.0
+        for k, o in enumerate(self.offsets):
+            index = tuple(slice(1 + od, 1 + od + n) for od, n in zip(o, self.grid_shape))
+            out = out + self._weight(k, (slice(None), ) * len(o), nbatch) * U[index]
+        return out
+
+    def gauss_seidel(self, u: TensorLike, f: TensorLike, steps: int,
+                     reverse: bool=False) -> TensorLike:
+        """Gauss-Seidel sweeps with the 2^TD colours of the node parities, in
+        which the unknowns of one colour are not coupled and updated at once."""
+        TD = len(self.grid_shape)
+        nbatch = u.ndim - TD
+        colors = list(product((0, 1), repeat=TD))
+        if reverse:
+            colors = colors[::-1]
+        U = self.pad(u)
+        for _ in range(steps):
+            for p in colors:
+                m = [(n - pd + 1) // 2 for pd, n in zip(p, self.grid_shape)]
+                if min(m) == 0:
+                    continue
+                sub = tuple(slice(pd, pd + 2*(md - 1) + 1, 2) for pd, md in zip(p, m))
+                r = f[sub]
+                for k, o in enumerate(self.offsets):
+                    if k == self.center:
+                        continue
+                    index = tuple(slice(1 + pd + od, 1 + pd + od + 2*(md - 1) + 1, 2)
+                                  for pd, od, md in zip(p, o, m))
+                    r = r - self._weight(k, sub, nbatch) * U[index]
+                index = tuple(slice(1 + pd, 1 + pd + 2*(md - 1) + 1, 2) for pd, md in zip(p, m))
+                U = bm.set_at(U, index, r / self._weight(self.center, sub, nbatch))
+                U = self._refresh(U)
+        return U[tuple(slice(1, 1 + n) for n in self.grid_shape)]
+
+    def jacobi(self, u: TensorLike, f: TensorLike, steps: int, omega: float) -> TensorLike:
+        nbatch = u.ndim - len(self.grid_shape)
+        Dinv = bm.reshape(1.0 / self.diag, self.grid_shape + (1, ) * nbatch)
+        for _ in range(steps):
+            u = u + omega * Dinv * (f - self.matvec(u))
+        return u
+
+    def restrict(self, r: TensorLike) -> TensorLike:
+        for d, b in enumerate(self.bc):
+            r = _along(r, d, lambda x: _restrict_1d(x, b))
+        return r
+
+    def prolongate(self, e: TensorLike) -> TensorLike:
+        for d, b in enumerate(self.bc):
+            e = _along(e, d, lambda x: _prolongate_1d(x, b))
+        return e
+
+
+def prolongation_matrix(cells: Sequence[int], bc: Sequence[str], *, itype=None,
+                        ftype=None, device=None) -> CSRTensor:
+    """The bilinear (trilinear) interpolation from the unknowns of the grid with
+    cells//2 cells to the unknowns of the grid with `cells` cells.
+
+    Parameters:
+        cells (Sequence[int]): Numbers of the fine cells along the axes, all even.
+        bc (Sequence[str]): Boundary condition types of the axes.
+
+    Returns:
+        CSRTensor: The prolongation matrix shaped (NDof_fine, NDof_coarse).
+    """
+    itype = bm.int64 if itype is None else itype
+    ftype = bm.float64 if ftype is None else ftype
+    rows = bm.zeros((1, ), dtype=itype, device=device)
+    cols = bm.zeros((1, ), dtype=itype, device=device)
+    vals = bm.ones((1, ), dtype=ftype, device=device)
+    nrow, ncol = 1, 1
+
+    for n, b in zip(cells, bc):
+        lo, hi = unknown_range(n, b)
+        clo, chi = unknown_range(n // 2, b)
+        i = bm.arange(lo, hi, dtype=itype, device=device)
+        r = bm.concat([i, i], axis=0)
+        c = bm.concat([i // 2, (i + 1) // 2], axis=0)
+        v = bm.where(i % 2 == 0, 1.0, 0.5)
+        v = bm.concat([v, bm.where(i % 2 == 0, 0.0, 0.5)], axis=0)
+        if b == 'periodic':
+            c = c % (n // 2)
+        flag = (v != 0) & (c >= clo) & (c < chi)
+        r, c, v = r[flag] - lo, c[flag] - clo, bm.astype(v[flag], ftype)
+
+        rows = bm.reshape(rows[:, None] * (hi - lo) + r[None, :], (-1, ))
+        cols = bm.reshape(cols[:, None] * (chi - clo) + c[None, :], (-1, ))
+        vals = bm.reshape(vals[:, None] * v[None, :], (-1, ))
+        nrow, ncol = nrow * (hi - lo), ncol * (chi - clo)
+
+    P = COOTensor(bm.stack([rows, cols], axis=0), vals, (nrow, ncol))
+    return P.coalesce().tocsr()
+
+
+class GMGSolver():
+    """Geometric multigrid on the grid hierarchy of UniformMesh2d or UniformMesh3d.
+
+    The levels are the grids obtained by halving the numbers of cells, i.e. the
+    meshes whose `uniform_refine` gives the fine mesh, as long as they are even.
+    The unknowns are the grid nodes not on a Dirichlet boundary, ordered as the
+    mesh nodes (see `fdm.LaplaceOperator.dof_index`), so both the finite
+    difference operators and the Q1 finite element matrices (restricted to the
+    interior nodes for Dirichlet boundaries) are supported.
+
+    The setup phase builds the Galerkin coarse operators R A P with the bilinear
+    (trilinear) prolongation P and the full weighting restriction R, and stores
+    every level as a 3x3(x3) stencil at the grid nodes. The cycles are then
+    matrix-free: the smoothers and the grid transfers are slicing operations
+    on the grid arrays.
+
+    Applying the solver (`solver @ r`) performs one cycle with zero initial
+    guess. With the Gauss-Seidel smoother the colours are swept in reverse order
+    in the post-smoothing, so the V- and W-cycles are symmetric and can be
+    passed as the preconditioner `M` of `cg`.
+
+    Parameters:
+        ptype (str, optional): Type of cycle, 'V', 'W' or 'F'. Defaults to 'V'.
+        sstep (int, optional): Number of pre- and post- smoothing steps. Defaults to 2.
+        smoother (str, optional): 'gs' for the coloured Gauss-Seidel, or 'jacobi'
+            for the damped Jacobi. Defaults to 'gs'.
+        csize (int, optional): Maximum size of the coarsest problem solved by
+            the dense pseudo-inverse. When the grid can not be coarsened down to
+            this size (odd numbers of cells), the coarsest problem is factorized
+            by the sparse `DirectSolver` instead. Defaults to 50.
+        maxlevel (int, optional): Maximum number of levels. Defaults to 20.
+        rtol (float, optional): Relative tolerance used by `solve`. Defaults to 1e-8.
+        atol (float, optional): Absolute tolerance used by `solve`. Defaults to 1e-12.
+        maxiter (int, optional): Maximum iterations used by `solve`. Defaults to 200.
+
+    Example:
+    ```
+        solver = GMGSolver()
+        solver.setup(mesh, A, bc='dirichlet')
+        x = cg(A, b, M=solver)
+    ```
+    """
+    def __init__(self,
+                 ptype: str = 'V',
+                 sstep: int = 2,
+                 smoother: str = 'gs',
+                 csize: int = 50,
+                 maxlevel: int = 20,
+                 rtol: float = 1e-8,
+                 atol: float = 1e-12,
+                 maxiter: int = 200):
+        if ptype not in ('V', 'W', 'F'):
+            raise ValueError(f"Unsupported cycle type '{ptype}', should be 'V', 'W' or 'F'.")
+        if smoother not in ('gs', 'jacobi'):
+            raise ValueError(f"Unsupported smoother '{smoother}', should be 'gs' or 'jacobi'.")
+        self.ptype = ptype
+        self.sstep = sstep
+        self.smoother = smoother
+        self.csize = csize
+        self.maxlevel = maxlevel
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+
+        self.levels: List[_GridLevel] = []
+        self.omega: List[float] = []
+        self.Ainv = None
+        self._coarse_solver = None
+
+    @property
+    def shape(self):
+        return self.levels[0].A.shape
+
+    def number_of_levels(self) -> int:
+        return len(self.levels)
+
+    def setup(self, mesh, A: Optional[CSRTensor]=None, bc: BoundaryCondition='dirichlet',
+              coef=None):
+        """Build the grid hierarchy of the operator A on the mesh.
+
+        Parameters:
+            mesh (UniformMesh2d | UniformMesh3d): The finest mesh.
+            A (CSRTensor | None, optional): The matrix on the unknowns of the mesh.
+                Defaults to None, using the finite difference `LaplaceOperator`
+                with the boundary conditions `bc` and the coefficient `coef`.
+            bc (str | Sequence[str], optional): 'dirichlet', 'neumann' or 'periodic',
+                for all the axes or one per axis. Defaults to 'dirichlet'.
+            coef (float | Callable | None, optional): The coefficient of the
+                `LaplaceOperator`, only used if A is None. Defaults to None.
+
+        Returns:
+            GMGSolver: The solver itself.
+        """
+        cells = grid_cells(mesh)
+        bc = boundary_conditions(bc, len(cells))
+        if A is None:
+            A = LaplaceOperator(mesh, bc, coef).assembly()
+        if not isinstance(A, CSRTensor):
+            A = A.tocsr()
+        level = _GridLevel(A, cells, bc)
+        NDof = 1
+        for n in level.grid_shape:
+            NDof *= n
+        if A.shape != (NDof, NDof):
+            raise ValueError(f"The matrix should be shaped {(NDof, NDof)} on the "
+                             f"unknowns of the mesh, but got {tuple(A.shape)}.")
+
+        self.levels = [level]
+        self.omega = []
+        TD = len(cells)
+        while len(self.levels) < self.maxlevel:
+            level = self.levels[-1]
+            self.omega.append(self._jacobi_weight(level))
+            if level.A.shape[0] <= self.csize:
+                break
+            cells = level.cells
+            if any((n % 2 != 0) or (n // 2 < (3 if b == 'periodic' else 2))
+                   for n, b in zip(cells, bc)):
+                break
+            P = prolongation_matrix(cells, bc, itype=A.itype, ftype=A.ftype,
+                                    device=bm.get_device(A.values()))
+            R = P.T.tocsr()
+            Ac = R @ (level.A @ P)
+            Ac = CSRTensor(Ac.crow(), Ac.col(), Ac.values() / 2**TD, Ac.sparse_shape)
+            self.levels.append(_GridLevel(Ac, [n // 2 for n in cells], bc))
+
+        self._setup_coarse(bc)
+        logger.info(f"GMGSolver: setup {len(self.levels)} levels with grids "
+                    f"{[l.grid_shape for l in self.levels]}.")
+
+        return self
+
+    def _setup_coarse(self, bc: Sequence[str]) -> None:
+        """The dense pseudo-inverse of the coarsest operator if it is not larger
+        than `csize`, or otherwise its sparse factorization. Without Dirichlet
+        sides the operator is singular (constants in the kernel), so the first
+        unknown is pinned to zero for the factorization and the mean is
+        removed from the solutions, as the pseudo-inverse does."""
+        A = self.levels[-1].A
+        N = A.shape[0]
+        self.Ainv = None
+        self._coarse_solver = None
+        self._singular = 'dirichlet' not in bc
+        if N <= self.csize:
+            self.Ainv = bm.linalg.pinv(A.to_dense())
+            return
+
+        logger.warning(f"GMGSolver: the coarsest grid {self.levels[-1].grid_shape} "
+                       f"has {N} > csize = {self.csize} unknowns as the numbers of "
+                       "cells can not be halved, it is solved by the sparse DirectSolver.")
+        if self._singular:
+            row, col = A.row(), A.col()
+            values = bm.where((row == 0) | (col == 0), 0.0, A.values())
+            values = bm.where((row == 0) & (col == 0), 1.0, values)
+            A = CSRTensor(A.crow(), A.col(), values, A.sparse_shape)
+        self._coarse_solver = DirectSolver().factorize(A)
+
+    def _jacobi_weight(self, level: _GridLevel, niter: int = 15) -> float:
+        """4/(3 rho), where rho is the spectral radius of D^{-1}A estimated by
+        the power iteration."""
+        x = bm.arange(level.A.shape[0], **level.A.values_context()) * 0.6180339887498949
+        x = bm.reshape(1.0 + x - bm.floor(x), level.grid_shape)
+        rho = 1.0
+        for _ in range(niter):
+            y = level.matvec(x) / level.diag
+            rho = float(bm.linalg.norm(y) / bm.linalg.norm(x))
+            if rho == 0.0:
+                return 1.0
+            x = y / bm.linalg.norm(y)
+        return 4.0 / (3.0 * rho)
+
+    def _smooth(self, level: int, x: TensorLike, b: TensorLike, post: bool) -> TensorLike:
+        L = self.levels[level]
+        if self.smoother == 'gs':
+            return L.gauss_seidel(x, b, self.sstep, reverse=post)
+        return L.jacobi(x, b, self.sstep, self.omega[level])
+
+    def _coarse_solve(self, b: TensorLike) -> TensorLike:
+        L = self.levels[-1]
+        shape = tuple(b.shape)
+        b = bm.reshape(b, (L.A.shape[0], ) + shape[len(L.grid_shape):])
+        if self._coarse_solver is None:
+            return bm.reshape(self.Ainv @ b, shape)
+        if self._singular:
+            b = bm.set_at(b, 0, 0.0)
+        x = self._coarse_solver.solve(b)
+        x = bm.device_put(bm.astype(x, b.dtype), bm.get_device(b))
+        if self._singular:
+            x = x - bm.mean(x, axis=0, keepdims=True)
+        return bm.reshape(x, shape)
+
+    def cycle(self, b: TensorLike, level: int = 0, ptype: Optional[str]=None) -> TensorLike:
+        """Apply one multigrid cycle with zero initial guess to the grid values
+        b shaped (*grid, [batch]) at `level`."""
+        ptype = self.ptype if ptype is None else ptype
+        if level == len(self.levels) - 1:
+            return self._coarse_solve(b)
+
+        L = self.levels[level]
+        x = self._smooth(level, bm.zeros_like(b), b, post=False)
+        rc = L.restrict(b - L.matvec(x))
+        if ptype == 'F':
+            ec = self.cycle(rc, level + 1, 'F')
+            ec = ec + self.cycle(rc - self.levels[level+1].matvec(ec), level + 1, 'V')
+        else:
+            ec = self.cycle(rc, level + 1, ptype)
+            if ptype == 'W':
+                ec = ec + self.cycle(rc - self.levels[level+1].matvec(ec), level + 1, 'W')
+        x = x + L.prolongate(ec)
+
+        return self._smooth(level, x, b, post=True)
+
+    def __matmul__(self, b: TensorLike) -> TensorLike:
+        if len(self.levels) == 0:
+            raise RuntimeError("GMGSolver is not set up, please call `setup` first.")
+        shape = self.levels[0].grid_shape
+        x = self.cycle(bm.reshape(b, shape + tuple(b.shape[1:])))
+        return bm.reshape(x, b.shape)
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None) -> TensorLike:
+        """Solve Ax = b by the multigrid preconditioned conjugate gradient method."""
+        if len(self.levels) == 0:
+            raise RuntimeError("GMGSolver is not set up, please call `setup` first.")
+        return cg(self.levels[0].A, b, x0, atol=self.atol, rtol=self.rtol,
+                  maxiter=self.maxiter, M=self)
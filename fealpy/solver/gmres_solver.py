@@ -1,6 +1,14 @@
+from typing import Optional
+
 from ..backend import backend_manager as bm
+from ..backend import TensorLike
 from ..sparse import COOTensor, CSRTensor
+from .preconditioner import SupportsMatmul, _safe_div
 import numpy as np
+
+from .. import logger
+
+
 def _to_cupy_data(A, b):
     """Convert the input tensors to cupy tensors.
 
@@ -56,30 +64,181 @@ def _cupy_solve(A, b, atol):
 
 def _mumps_solve(A, b, atol):
     pass
-def _scipy_solve(A, b, atol):
-    pass
-
-
-def gmres(A:[COOTensor, CSRTensor], b, solver:str="cupy", atol=1e-18):
-    """Solve a linear system using a direct solver.
+def _scipy_solve(A, b, atol, rtol=1e-5, M=None):
+    """Solve a linear system using scipy.
 
     Parameters:
         A(COOTensor | CSRTensor): The matrix of the linear system.
         b(Tensor): The right-hand side.
-        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        M(SupportsMatmul | None): The preconditioner.
+
+    Returns:
+        Tuple: The solution of the linear system, and the list of the
+        preconditioned relative residual norms in every iteration.
+    """
+    from scipy.sparse.linalg import gmres as _gmres, LinearOperator
+
+    A = A.to_scipy()
+    b = bm.to_numpy(b)
+
+    if M is not None:
+        Mop = M
+        M = LinearOperator(A.shape, dtype=A.dtype,
+                           matvec=lambda r: bm.to_numpy(Mop @ bm.from_numpy(r)))
+
+    residual = []
+    x, _ = _gmres(A, b, atol=atol, rtol=rtol, M=M,
+                  callback=residual.append, callback_type='pr_norm')
+    return x, residual
+
+
+def _gmres_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol,
+                restart: int, maxiter: Optional[int]):
+    # Right preconditioned GMRES(m), so the Givens rotated right-hand side
+    # gives the norms of the true residuals of all the columns.
+    x = x0                                  # (dof, [batch])
+    tol = rtol * bm.linalg.norm(b, axis=0) # ([batch], )
+    tol = bm.where(tol > atol, tol, atol)
+    precond = (lambda v: v) if M is None else (lambda v: M @ v)
+    r = b - A @ x
+    beta = bm.linalg.norm(r, axis=0)
+    residual = [float(bm.linalg.norm(beta))]
+    n_iter = 0
+
+    while True:
+        if bm.all(beta <= tol):
+            logger.info(f"GMRES: converged in {n_iter} iterations.")
+            break
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"GMRES: failed, stopped by maxiter ({maxiter}).")
+            break
+
+        V = [_safe_div(r, beta[None, ...])]
+        R = []      # columns of the rotated Hessenberg matrix
+        cs, sn = [], []
+        g = [beta]
+
+        for j in range(restart):
+            w = A @ precond(V[j])
+            h = []
+            for i in range(j + 1): # modified Gram-Schmidt
+                hij = bm.sum(w * V[i], axis=0)
+                w = w - hij[None, ...] * V[i]
+                h.append(hij)
+            hnorm = bm.linalg.norm(w, axis=0)
+            V.append(_safe_div(w, hnorm[None, ...]))
+
+            # Apply the previous rotations, and the new one eliminating hnorm.
+            for i in range(j):
+                h[i], h[i+1] = cs[i]*h[i] + sn[i]*h[i+1], -sn[i]*h[i] + cs[i]*h[i+1]
+            denom = bm.sqrt(h[j]**2 + hnorm**2)
+            c = bm.where(denom != 0, _safe_div(h[j], denom), 1.0)
+            s = _safe_div(hnorm, denom)
+            cs.append(c)
+            sn.append(s)
+            h[j] = denom
+            R.append(h)
+            g.append(-s * g[j])
+            g[j] = c * g[j]
+
+            n_iter += 1
+            res = bm.abs(g[j+1])
+            residual.append(float(bm.linalg.norm(res)))
+            logger.debug(f"GMRES: iteration {n_iter}, residual {residual[-1]:.6e}.")
+            if bm.all(res <= tol) or ((maxiter is not None) and (n_iter >= maxiter)):
+                break
+
+        # Back substitution of the upper triangular system R y = g.
+        k = len(R)
+        y = [None] * k
+        for i in range(k-1, -1, -1):
+            t = g[i]
+            for l in range(i+1, k):
+                t = t - R[l][i] * y[l]
+            y[i] = _safe_div(t, R[i][i])
+        update = 0.0
+        for i in range(k):
+            update = update + y[i][None, ...] * V[i]
+        x = x + precond(update)
+        r = b - A @ x
+        beta = bm.linalg.norm(r, axis=0)
+
+    return x, {'niter': n_iter, 'residual': residual}
+
+
+def _fealpy_solve(A: SupportsMatmul, b: TensorLike, x0, atol, rtol, restart,
+                  maxiter, M, batch_first):
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+    single_vector = b.ndim == 1
+
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    elif x0.shape != b.shape:
+        raise ValueError("x0 and b must have the same shape")
+
+    if (not single_vector) and batch_first:
+        b = bm.swapaxes(b, 0, 1)
+        x0 = bm.swapaxes(x0, 0, 1)
+
+    x, info = _gmres_impl(A, b, x0, M, atol, rtol, restart, maxiter)
+
+    if (not single_vector) and batch_first:
+        x = bm.swapaxes(x, 0, 1)
+    return x, info
+
+
+def gmres(A:[COOTensor, CSRTensor], b, solver:str="cupy", atol=1e-18, *,
+          rtol=1e-5, M=None, returninfo=False, x0=None, restart: int=20,
+          maxiter: Optional[int]=10000, batch_first: bool=False):
+    """Solve a linear system using the GMRES method.
+
+    Parameters:
+        A(COOTensor | CSRTensor | SupportsMatmul): The matrix of the linear system.
+            Any object supporting `A @ x` (e.g. a matrix-free `BilinearForm`)
+            is accepted by the "fealpy" solver.
+        b(Tensor): The right-hand side, shaped (dof, ) or (dof, batch).
+        solver(str): The solver to use. It can be "fealpy", "mumps", "scipy", or "cupy".
+            "fealpy" is the restarted GMRES implemented with the backend functions,
+            working for any backend and device.
+        atol(float): Absolute tolerance for convergence.
+        rtol(float): Relative tolerance for convergence, used by "scipy" and "fealpy".
+        M(SupportsMatmul | None): The preconditioner applied as `M @ r`,
+            supported by "scipy" and "fealpy" (as a right preconditioner).
+        returninfo(bool): Whether to return the convergence information,
+            supported by "scipy" and "fealpy".
+        x0(Tensor | None): Initial guess with the shape of `b`, only used by "fealpy".
+        restart(int): Number of iterations between restarts, only used by "fealpy".
+        maxiter(int | None): Maximum number of iterations, only used by "fealpy".
+            Defaults to 10000. None iterates until convergence, which never ends
+            if the residual stagnates above the tolerance.
+        batch_first(bool): Whether the batch dimension of `b` and `x0` is the first
+            dimension, only used by "fealpy". Defaults to False.
 
     Returns:
         Tensor: The solution of the linear system.
+        dict: The convergence information, only returned if `returninfo` is True,
+        including the number of iterations 'niter' and the residual norms 'residual'.
     """
-    if solver == "mumps":
+    if (solver not in ("scipy", "fealpy")) and ((M is not None) or returninfo):
+        raise ValueError(f"Preconditioner and convergence information are "
+                         f"not supported by the solver '{solver}'.")
+
+    if solver == "fealpy":
+        x, info = _fealpy_solve(A, b, x0, atol, rtol, restart, maxiter, M, batch_first)
+        if returninfo:
+            return x, info
+        return x
+    elif solver == "mumps":
         return bm.tensor(_mumps_solve(A, b))
     elif solver == "scipy":
-        return bm.tensor(_scipy_solve(A, b))
+        x, residual = _scipy_solve(A, b, atol, rtol=rtol, M=M)
+        x = bm.tensor(x)
+        if returninfo:
+            return x, {'niter': len(residual), 'residual': residual}
+        return x
     elif solver == "cupy":
         A = A.tocoo()
         return bm.tensor(_cupy_solve(A, b, atol=atol))
     else:
         raise ValueError(f"Unknown solver: {solver}")
-
-
-
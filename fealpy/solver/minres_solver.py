@@ -0,0 +1,143 @@
+
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .preconditioner import SupportsMatmul, _safe_div
+
+from .. import logger
+
+
+def minres(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+           batch_first: bool=False,
+           atol: float=1e-12, rtol: float=1e-8,
+           maxiter: Optional[int]=10000,
+           M: Optional[SupportsMatmul]=None,
+           returninfo: bool=False):
+    """Solve a linear system Ax = b using the Minimal Residual (MINRES) method.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix of the linear system, symmetric\
+        and possibly indefinite (e.g. a saddle-point system).
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (SupportsMatmul, optional): The preconditioner approximating the inverse of A,\
+        applied as `M @ r` to the residual. Must be symmetric positive-definite.\
+        Default is None (no preconditioning).
+        returninfo (bool, optional): Whether to return the convergence information.\
+        Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: The convergence information, only returned if `returninfo` is True,\
+        including the number of iterations 'niter' and the residual norm\
+        in every iteration 'residual' (starting from the initial one). With a\
+        preconditioner, the residual is measured in the norm induced by M.
+    """
+    assert isinstance(b, TensorLike), "b must be a Tensor"
+    if x0 is not None:
+        assert isinstance(x0, TensorLike), "x0 must be a Tensor if not None"
+    single_vector = b.ndim == 1
+
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    else:
+        if x0.shape != b.shape:
+            raise ValueError("x0 and b must have the same shape")
+
+    if (not single_vector) and batch_first:
+        b = bm.swapaxes(b, 0, 1)
+        x0 = bm.swapaxes(x0, 0, 1)
+
+    sol, info = _minres_impl(A, b, x0, M, atol, rtol, maxiter)
+
+    if (not single_vector) and batch_first:
+        sol = bm.swapaxes(sol, 0, 1)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _minres_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    # Preconditioned Lanczos process with the QR factorization of the
+    # tridiagonal matrix updated by Givens rotations (Paige and Saunders).
+    # All the scalars are shaped (batch, ), one for every column.
+    precond = (lambda v: v) if M is None else (lambda v: M @ v)
+    sum_func = bm.sum
+    sqrt_func = bm.sqrt
+
+    x = x0
+    r1 = b - A @ x
+    y = precond(r1)
+    beta1 = sqrt_func(bm.abs(sum_func(r1*y, axis=0)))
+    bMb = sqrt_func(bm.abs(sum_func(b*precond(b), axis=0)))
+    tol = rtol * bMb
+    tol = bm.where(tol > atol, tol, atol)
+
+    oldb = bm.zeros_like(beta1)
+    beta = beta1
+    dbar = bm.zeros_like(beta1)
+    epsln = bm.zeros_like(beta1)
+    phibar = beta1
+    cs = -bm.ones_like(beta1)
+    sn = bm.zeros_like(beta1)
+    w = bm.zeros_like(b)
+    w2 = bm.zeros_like(b)
+    r2 = r1
+    residual = [float(sqrt_func(sum_func(phibar**2)))]
+    n_iter = 0
+
+    if bm.all(phibar <= tol):
+        logger.info("MINRES: converged in 0 iterations.")
+        return x, {'niter': n_iter, 'residual': residual}
+
+    while True:
+        v = _safe_div(y, beta[None, ...])
+        y = A @ v
+        if n_iter >= 1:
+            y = y - _safe_div(beta, oldb)[None, ...] * r1
+        alpha = sum_func(v*y, axis=0)
+        y = y - _safe_div(alpha, beta)[None, ...] * r2
+        r1, r2 = r2, y
+        y = precond(r2)
+        oldb = beta
+        beta = sqrt_func(bm.abs(sum_func(r2*y, axis=0)))
+
+        oldeps = epsln
+        delta = cs*dbar + sn*alpha
+        gbar = sn*dbar - cs*alpha
+        epsln = sn*beta
+        dbar = -cs*beta
+        gamma = sqrt_func(gbar**2 + beta**2)
+        cs = bm.where(gamma != 0, _safe_div(gbar, gamma), 1.0)
+        sn = _safe_div(beta, gamma)
+        phi = cs*phibar
+        phibar = sn*phibar
+
+        w1, w2 = w2, w
+        w = _safe_div(v - oldeps[None, ...]*w1 - delta[None, ...]*w2, gamma[None, ...])
+        x = x + phi[None, ...] * w
+
+        n_iter += 1
+        residual.append(float(sqrt_func(sum_func(phibar**2))))
+        logger.debug(f"MINRES: iteration {n_iter}, residual {residual[-1]:.6e}.")
+
+        if bm.all(phibar <= tol):
+            logger.info(f"MINRES: converged in {n_iter} iterations.")
+            break
+
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"MINRES: failed, stopped by maxiter ({maxiter}).")
+            break
+
+    return x, {'niter': n_iter, 'residual': residual}
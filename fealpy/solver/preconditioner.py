@@ -0,0 +1,241 @@
+
+from typing import Protocol
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from ..sparse.utils import row_to_crow
+
+__all__ = [
+    'SupportsMatmul',
+    'Preconditioner',
+    'JacobiPreconditioner',
+    'BlockJacobiPreconditioner',
+    'SSORPreconditioner',
+    'ILU0Preconditioner',
+]
+
+
+class SupportsMatmul(Protocol):
+    def __matmul__(self, other: TensorLike) -> TensorLike: ...
+
+
+def _to_csr(A) -> CSRTensor:
+    if not isinstance(A, CSRTensor):
+        A = A.tocsr()
+    if A.dense_ndim != 0:
+        raise ValueError("Preconditioners only support matrices without dense "
+                         f"dimension, but got shape {A.shape}.")
+    return A
+
+
+def _expand(d: TensorLike, r: TensorLike) -> TensorLike:
+    """Broadcast a vector of the unknowns to the residual shaped (dof, [batch])."""
+    return d if r.ndim == 1 else d[:, None]
+
+
+def _safe_div(a: TensorLike, b: TensorLike) -> TensorLike:
+    """a / b where b is not zero, and 0 elsewhere. Used by the Krylov solvers
+    to keep the columns converged or broken down from producing nan."""
+    flag = b != 0
+    return bm.where(flag, a / bm.where(flag, b, 1.0), 0.0)
+
+
+class Preconditioner():
+    """Base class of the preconditioners.
+
+    A preconditioner M approximates the inverse of the matrix A, and is applied
+    to a residual `r` shaped (dof, ) or (dof, batch) by `M @ r`. Any object
+    supporting `__matmul__` can be used as a preconditioner in the solvers.
+    """
+    def __init__(self, A) -> None:
+        self.A = _to_csr(A)
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        raise NotImplementedError
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        return self.apply(r)
+
+
+class JacobiPreconditioner(Preconditioner):
+    """Diagonal (Jacobi) preconditioner, M = D^{-1}."""
+    def __init__(self, A) -> None:
+        super().__init__(A)
+        self.Dinv = 1.0 / self.A.diagonal()
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        return _expand(self.Dinv, r) * r
+
+
+class BlockJacobiPreconditioner(Preconditioner):
+    """Block diagonal preconditioner, inverting the diagonal blocks of A.
+
+    Parameters:
+        A (CSRTensor): The matrix.
+        blocks (Tensor): Indices of the unknowns in each block, shaped (NB, k).
+            Use `from_space` to get the per-node blocks of a `TensorFunctionSpace`.
+    """
+    def __init__(self, A, blocks: TensorLike) -> None:
+        super().__init__(A)
+        A = self.A
+        NB, k = blocks.shape
+        N = A.shape[0]
+        ikwargs = {'dtype': A.itype, 'device': bm.get_device(blocks)}
+
+        flat = bm.reshape(blocks, (-1, ))
+        block_id = bm.full((N, ), -1, **ikwargs)
+        block_id = bm.set_at(block_id, flat, bm.repeat(bm.arange(NB, **ikwargs), k))
+        local_id = bm.zeros((N, ), **ikwargs)
+        local_id = bm.set_at(local_id, flat, bm.astype(bm.arange(NB*k, **ikwargs) % k, A.itype))
+
+        row, col = A.row(), A.col()
+        flag = (block_id[row] == block_id[col]) & (block_id[row] >= 0)
+        row, col = row[flag], col[flag]
+        loc = (block_id[row] * k + local_id[row]) * k + local_id[col]
+        D = bm.zeros((NB * k * k, ), **A.values_context())
+        D = bm.index_add(D, loc, A.values()[flag])
+
+        self.blocks = blocks
+        self.Dinv = bm.linalg.inv(bm.reshape(D, (NB, k, k)))
+
+    @classmethod
+    def from_space(cls, A, space):
+        """Build the block Jacobi preconditioner with the dofs sharing the same
+        scalar dof in a `TensorFunctionSpace` as a block."""
+        gdof = space.scalar_space.number_of_global_dofs()
+        k = space.dof_numel
+        idx = bm.arange(gdof * k, dtype=space.itype, device=space.device)
+        if space.dof_priority:
+            blocks = bm.swapaxes(bm.reshape(idx, (k, gdof)), 0, 1)
+        else:
+            blocks = bm.reshape(idx, (gdof, k))
+        return cls(A, blocks)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        blocks = self.blocks
+        rb = r[blocks, ...] # (NB, k, [batch])
+        subs = 'bij, bj -> bi' if r.ndim == 1 else 'bij, bjm -> bim'
+        zb = bm.einsum(subs, self.Dinv, rb)
+        z = bm.zeros_like(r)
+        return bm.index_add(z, bm.reshape(blocks, (-1, )), bm.reshape(zb, (-1, ) + r.shape[1:]))
+
+
+def _triangular_sweeps(T: CSRTensor, Dinv: TensorLike, b: TensorLike, steps: int) -> TensorLike:
+    """Approximately solve (D + T)x = b with a few Jacobi sweeps,
+    where T is strictly lower or upper triangular."""
+    Dinv = _expand(Dinv, b)
+    x = Dinv * b
+    for _ in range(steps):
+        x = Dinv * (b - T @ x)
+    return x
+
+
+class SSORPreconditioner(Preconditioner):
+    """Symmetric successive over-relaxation (SSOR) preconditioner,
+
+        M = 1/(omega(2 - omega)) (D + omega L) D^{-1} (D + omega U).
+
+    Triangular solves are sequential by nature; to keep the application
+    vectorized on every backend, they are approximated by `steps` Jacobi sweeps.
+    For symmetric A the forward and backward approximations are transposes of
+    each other, so the preconditioner stays symmetric and is suitable for `cg`.
+
+    Parameters:
+        A (CSRTensor): The matrix.
+        omega (float, optional): Relaxation factor in (0, 2). Defaults to 1.0.
+        steps (int, optional): Number of sweeps in the triangular solves. Defaults to 3.
+    """
+    def __init__(self, A, omega: float=1.0, steps: int=3) -> None:
+        super().__init__(A)
+        if not 0 < omega < 2:
+            raise ValueError(f"omega should be in (0, 2), but got {omega}.")
+        self.omega = omega
+        self.steps = steps
+        self.D = self.A.diagonal()
+        self.L = self.A.tril(-1)
+        self.U = self.A.triu(1)
+        self.L = CSRTensor(self.L.crow(), self.L.col(), omega * self.L.values(), self.L.sparse_shape)
+        self.U = CSRTensor(self.U.crow(), self.U.col(), omega * self.U.values(), self.U.sparse_shape)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        omega = self.omega
+        Dinv = 1.0 / self.D
+        y = _triangular_sweeps(self.L, Dinv, r, self.steps)
+        y = _expand(self.D, r) * y
+        z = _triangular_sweeps(self.U, Dinv, y, self.steps)
+        return omega * (2 - omega) * z
+
+
+class ILU0Preconditioner(Preconditioner):
+    """Incomplete LU factorization with zero fill-in, M = (LU)^{-1}.
+
+    The factors are computed by the fine-grained fixed-point iteration of
+    Chow and Patel, updating all entries of the pattern of A at once in every
+    sweep, and converge to the ILU(0) factors as the number of sweeps grows.
+    Triangular solves are approximated by Jacobi sweeps as in the SSOR
+    preconditioner. The preconditioner is generally nonsymmetric, use it with `gmres`.
+
+    Parameters:
+        A (CSRTensor): The matrix, requiring non-zero diagonal entries.
+        sweeps (int, optional): Number of fixed-point sweeps of the factorization. Defaults to 3.
+        steps (int, optional): Number of sweeps in the triangular solves. Defaults to 3.
+    """
+    def __init__(self, A, sweeps: int=3, steps: int=3) -> None:
+        super().__init__(A)
+        A = self.A
+        self.steps = steps
+        N, ncol = A.shape
+        row, col, val = A.row(), A.col(), A.values()
+        ikwargs = {'dtype': A.itype, 'device': bm.get_device(row)}
+        is_lower = row > col
+        is_diag = row == col
+
+        diag_pos = bm.zeros((N, ), **ikwargs)
+        diag_pos = bm.set_at(diag_pos, row[is_diag], bm.astype(bm.nonzero(is_diag)[0], A.itype))
+
+        # Symbolic phase: all products l_ik * u_kj (k < i, k < j) falling in the pattern.
+        lpos = bm.astype(bm.nonzero(is_lower)[0], A.itype)
+        upos = bm.astype(bm.nonzero(row < col)[0], A.itype)
+        ucrow = row_to_crow(row[upos], N)
+        k = col[lpos]
+        start = ucrow[k]
+        counts = ucrow[k + 1] - start
+        total = int(bm.sum(counts))
+        ik = bm.repeat(lpos, counts)
+        offset = bm.cumsum(counts, axis=0) - counts
+        local = bm.arange(total, **ikwargs) - bm.repeat(offset, counts)
+        kj = upos[bm.repeat(start, counts) + local]
+
+        key = bm.astype(row, bm.int64) * ncol + bm.astype(col, bm.int64)
+        order = bm.argsort(key)
+        sorted_key = key[order]
+        target = bm.astype(row[ik], bm.int64) * ncol + bm.astype(col[kj], bm.int64)
+        loc = bm.searchsorted(sorted_key, target)
+        loc = bm.where(loc < key.shape[0], loc, 0)
+        flag = sorted_key[loc] == target
+        ij = order[loc[flag]]
+        ik, kj = ik[flag], kj[flag]
+
+        # Numeric phase: fixed-point sweeps starting from the entries of A.
+        ujj = val[diag_pos[col]]
+        F = bm.where(is_lower, val / ujj, val)
+        for _ in range(sweeps):
+            s = bm.zeros_like(val)
+            s = bm.index_add(s, ij, F[ik] * F[kj])
+            ujj = (val - s)[diag_pos[col]]
+            F = bm.where(is_lower, (val - s) / ujj, val - s)
+
+        LU = CSRTensor(A.crow(), A.col(), F, A.sparse_shape)
+        self.L = LU.tril(-1)
+        self.U = LU.triu(1)
+        self.Dinv = 1.0 / LU.diagonal()
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        ones = bm.ones_like(self.Dinv)
+        y = _triangular_sweeps(self.L, ones, r, self.steps)
+        return _triangular_sweeps(self.U, self.Dinv, y, self.steps)
@@ -6,6 +6,7 @@ from ..backend import Size
 from .sparse_tensor import SparseTensor
 from .coo_tensor import COOTensor
 from .csr_tensor import CSRTensor
+from .block_csr_tensor import BlockCSRTensor
 
 
 @overload
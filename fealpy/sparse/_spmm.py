@@ -1,5 +1,5 @@
 
-from typing import Tuple
+from typing import Tuple, Optional
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike as _DT
@@ -47,25 +47,40 @@ def spmm_coo(indices: _DT, values: _DT, spshape: _Size, x: _DT) -> _DT:
         return result
 
 
-def spmm_csr(crow: _DT, col: _DT, values: _DT, spshape: _Size, x: _DT) -> _DT:
-    _shape_check(spshape, x.shape)
-    nrow = spshape[0]
-    unsqueezed = False
+def spmm_csr(crow: _DT, col: _DT, values: _DT, spshape: _Size, x: _DT,
+             row: Optional[_DT]=None) -> _DT:
+    """Sparse-dense matrix multiplication for CSR format.
 
-    if x.ndim == 1:
-        x = x[:, None]
-        unsqueezed = True
+    Non-zero products are summed into the segments of rows given by `crow`,
+    using the row index of every non-zero element.
 
-    shape = x.shape[:-2] + (nrow, x.shape[-1])
-    result = bm.zeros(shape, dtype=x.dtype)
+    Parameters:
+        crow (Tensor): compressed row pointers.
+        col (Tensor): column indices of non-zero elements, shaped (nnz,).
+        values (Tensor): non-zero elements, shaped (*batch, nnz).
+        spshape (Size): shape of the sparse dimensions.
+        x (Tensor): dense vector (K,) or matrix (*batch, K, N).
+        row (Tensor | None, optional): row index of non-zero elements, shaped (nnz,).
+            Generated from `crow` if not provided. Defaults to None.
 
-    for i in range(nrow):
-        start = crow[i]
-        end = crow[i + 1]
-        r = bm.einsum('...i, ...ij -> ...j', values[..., start:end], x[..., col[start:end], :])
-        result[..., i, :] = r
+    Returns:
+        Tensor: the product, shaped (*batch, M) or (*batch, M, N).
+    """
+    _shape_check(spshape, x.shape)
+    nrow = spshape[0]
 
-    if unsqueezed:
-        result = result[..., 0]
+    if row is None:
+        kwargs = {'dtype': crow.dtype, 'device': bm.get_device(crow)}
+        row = bm.repeat(bm.arange(nrow, **kwargs), crow[1:] - crow[:-1])
 
-    return result
+    if x.ndim == 1:
+        new_vals = values * x[col] # (*batch, nnz)
+        shape = new_vals.shape[:-1] + (nrow, )
+        result = bm.zeros(shape, **bm.context(new_vals))
+        return bm.index_add(result, row, new_vals, axis=-1)
+
+    else: # x.ndim >= 2
+        new_vals = values[..., None] * x[..., col, :] # (*batch, nnz, x_col)
+        shape = new_vals.shape[:-2] + (nrow, x.shape[-1])
+        result = bm.zeros(shape, **bm.context(new_vals))
+        return bm.index_add(result, row, new_vals, axis=-2)
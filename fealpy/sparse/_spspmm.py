@@ -1,11 +1,42 @@
 
 from typing import Tuple
+from collections import OrderedDict
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike as _DT
+from .utils import row_to_crow
 
 _Size = Tuple[int, ...]
 
+# NOTE: The symbolic phase of a sparse-sparse product only depends on the index
+# tensors of the two operands. Results are cached here, keyed by the identity of
+# the index tensors, so that repeated products of matrices sharing the same
+# patterns (e.g. re-assembled with the same sparsity pattern) skip this phase.
+_SYMBOLIC_CACHE: OrderedDict = OrderedDict()
+_SYMBOLIC_CACHE_SIZE = 4
+
+
+def clear_spspmm_cache() -> None:
+    """Clear the cached symbolic phases of the sparse-sparse products."""
+    _SYMBOLIC_CACHE.clear()
+
+
+def _cached_symbolic(key_tensors: Tuple[_DT, ...], builder, *args):
+    key = tuple(id(t) for t in key_tensors)
+    item = _SYMBOLIC_CACHE.get(key, None)
+
+    if item is not None and all(a is b for a, b in zip(item[0], key_tensors)):
+        _SYMBOLIC_CACHE.move_to_end(key)
+        return item[1]
+
+    plan = builder(*args)
+    _SYMBOLIC_CACHE[key] = (key_tensors, plan)
+
+    if len(_SYMBOLIC_CACHE) > _SYMBOLIC_CACHE_SIZE:
+        _SYMBOLIC_CACHE.popitem(last=False)
+
+    return plan
+
 
 def _shape_check(spshape1: _Size, spshape2: _Size):
     if len(spshape1) != 2 or len(spshape2) != 2:
@@ -17,97 +48,97 @@ def _shape_check(spshape1: _Size, spshape2: _Size):
                         f"got shape {spshape1} and {spshape2}.")
 
 
-def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
-               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
-    _shape_check(spshape1, spshape2)
-
+def _structure_check(values1: _DT, values2: _DT):
     structure = values1.shape[:-1]
     if values2.shape[:-1] != structure:
         raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
                          f"must match that of matrix1 {structure}")
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
 
-    for i in range(size):
-        left_col_flag = (indices1[1, :] == i)
+def _symbolic(row1: _DT, col1: _DT, crow2: _DT, col2: _DT, spshape: _Size):
+    """Expand-sort-compress symbolic phase.
 
-        if not bm.any(left_col_flag, axis=0):
-            continue
+    Every non-zero A[i, k] of the left operand is expanded to the products with
+    all non-zeros B[k, :] in the row k of the right operand (given in CSR).
+    The products are then sorted and compressed by their output location.
 
-        right_row_flag = (indices2[0, :] == i)
+    Returns:
+        Tuple: (row, col) of the output non-zeros in row-major order, and
+            (left, right, inverse) mapping every product to the non-zeros of
+            the operands and to the output non-zero.
+    """
+    ncol = spshape[1]
+    kwargs = {'dtype': col2.dtype, 'device': bm.get_device(col2)}
+    start = crow2[col1]
+    counts = crow2[col1 + 1] - start
+    total = int(bm.sum(counts))
 
-        if not bm.any(right_row_flag, axis=0):
-            continue
+    left = bm.repeat(bm.arange(col1.shape[0], **kwargs), counts)
+    offset = bm.cumsum(counts, axis=0) - counts
+    local = bm.arange(total, **kwargs) - bm.repeat(offset, counts)
+    right = bm.repeat(start, counts) + local
 
-        row = indices1[0, left_col_flag]
-        col = indices2[1, right_row_flag]
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.meshgrid(row, col, indexing='ij')
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., right_row_flag]
+    key = bm.astype(row1[left], bm.int64) * ncol + bm.astype(col2[right], bm.int64)
+    ukey, inverse = bm.unique(key, return_inverse=True)
+    row = bm.astype(ukey // ncol, col2.dtype)
+    col = bm.astype(ukey % ncol, col2.dtype)
 
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-        indices_list.append(idx)
-        values_list.append(val)
+    return row, col, left, right, inverse
 
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-    return indices, values, (spshape1[0], spshape2[1])
 
+def _numeric(values1: _DT, values2: _DT, left: _DT, right: _DT, inverse: _DT, nnz: int):
+    """Numeric phase: multiply and accumulate the values of the products."""
+    products = values1[..., left] * values2[..., right]
+    shape = products.shape[:-1] + (nnz, )
+    values = bm.zeros(shape, **bm.context(products))
+    return bm.index_add(values, inverse, products, axis=-1)
 
-def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
-               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
-    _shape_check(spshape1, spshape2)
-
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-    new_crow = bm.zeros(size+1,dtype=bm.int64)
+def _symbolic_coo(indices1: _DT, indices2: _DT, spshape: _Size, nrow2: int):
+    order = bm.argsort(indices2[0], stable=True)
+    crow2 = row_to_crow(indices2[0], nrow2)
+    col2 = indices2[1, order]
+    row, col, left, right, inverse = _symbolic(indices1[0], indices1[1], crow2, col2, spshape)
+    indices = bm.stack([row, col], axis=0)
+    return indices, left, order[right], inverse
 
-    for i in range(size):
-        row = bm.array([],dtype=bm.int64)
-        left_col_flag = (col1 == i)
 
-        for x in bm.where(left_col_flag == True)[0]+1:
-            flag = ~(x>crow1[:-1])^(x<=crow1[1:])
-            row = bm.concat((row,(bm.where(flag == True))[0]))
+def _symbolic_csr(crow1: _DT, col1: _DT, crow2: _DT, col2: _DT, spshape: _Size):
+    kwargs = {'dtype': crow1.dtype, 'device': bm.get_device(crow1)}
+    row1 = bm.repeat(bm.arange(crow1.shape[0] - 1, **kwargs), crow1[1:] - crow1[:-1])
+    row, col, left, right, inverse = _symbolic(row1, col1, crow2, col2, spshape)
+    crow = row_to_crow(row, spshape[0])
+    return crow, col, left, right, inverse
 
-        col = col2[crow2[i]:crow2[i+1]]
 
-        if not bm.any(row, axis=0):
-            continue
-
-        if not bm.any(col, axis=0):
-            continue
+def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
+               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication for COO format.
 
-        idx = bm.meshgrid(row, col, indexing='ij')
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., crow2[i]:crow2[i+1]]
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
+    The output is coalesced, with indices sorted in row-major order.
+    """
+    _shape_check(spshape1, spshape2)
+    _structure_check(values1, values2)
+    spshape = (spshape1[0], spshape2[1])
 
-        indices_list.append(idx)
-        values_list.append(val)
+    indices, left, right, inverse = _cached_symbolic(
+        (indices1, indices2), _symbolic_coo, indices1, indices2, spshape, spshape2[0]
+    )
+    values = _numeric(values1, values2, left, right, inverse, indices.shape[1])
 
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
+    return indices, values, spshape
 
-    unique_indices, inverse_indices = bm.unique(indices, return_inverse=True, axis=1)
-    new_values = bm.zeros(unique_indices.shape[1])
-    new_values = bm.index_add(new_values, inverse_indices, values, axis=-1)
 
-    for x in unique_indices[0,:]:
-        new_crow[x+1]+=1
+def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
+               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication for CSR format."""
+    _shape_check(spshape1, spshape2)
+    _structure_check(values1, values2)
+    spshape = (spshape1[0], spshape2[1])
 
-    new_crow=bm.cumsum(new_crow)
+    crow, col, left, right, inverse = _cached_symbolic(
+        (crow1, col1, crow2, col2), _symbolic_csr, crow1, col1, crow2, col2, spshape
+    )
+    values = _numeric(values1, values2, left, right, inverse, col.shape[0])
 
-    return new_crow, unique_indices[1,:], new_values,(spshape1[0], spshape2[1])
+    return crow, col, values, spshape
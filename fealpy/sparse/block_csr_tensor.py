@@ -0,0 +1,285 @@
+
+from typing import Optional, Sequence, List, Tuple, Union
+
+from ..backend import TensorLike, Size
+from ..backend import backend_manager as bm
+from .coo_tensor import COOTensor
+from .csr_tensor import CSRTensor
+
+_Block = Optional[CSRTensor]
+
+
+class BlockCSRTensor():
+    """Block matrix keeping the sub-blocks as separate CSR tensors.
+
+    The blocks are never concatenated to perform `@`, `T` and the per-block
+    access, which is what the block preconditioners need. When a global matrix
+    is required (e.g. by a direct solver), `tocsr` flattens the blocks in
+    O(nnz) without sorting, and keeps the global `crow`, `col` and the positions
+    of the blocks in the global non-zeros, so that flattening again after
+    updating blocks with the same sparsity pattern only writes the values.
+    The values of every returned matrix are a new tensor, so they can be
+    modified in place (e.g. by `DirichletBC.apply` with `keep_pattern=True`).
+
+    Parameters:
+        blocks (Sequence[Sequence[CSRTensor | COOTensor | None]]): The blocks in
+            rows, None for zero blocks. COO blocks are converted to CSR.
+        row_sizes (Sequence[int] | None, optional): Number of rows of the block rows.
+            Required only if a block row has no blocks. Defaults to None.
+        col_sizes (Sequence[int] | None, optional): Number of columns of the block
+            columns. Required only if a block column has no blocks. Defaults to None.
+
+    Example:
+    ```
+        K = BlockCSRTensor([[A, B.T], [B, None]])
+        v = K @ u
+        u0, u1 = K.split(u)
+        x = spsolve(K.tocsr(), b)
+    ```
+    """
+    def __init__(self, blocks: Sequence[Sequence[Union[_Block, COOTensor]]],
+                 row_sizes: Optional[Sequence[int]]=None,
+                 col_sizes: Optional[Sequence[int]]=None) -> None:
+        nrows = len(blocks)
+        ncols = len(blocks[0]) if nrows > 0 else 0
+        if any(len(row) != ncols for row in blocks):
+            raise ValueError("All the block rows should have the same number of blocks.")
+
+        self._blocks: List[List[_Block]] = [[self._to_csr(b) for b in row] for row in blocks]
+        self.row_sizes = self._block_sizes(row_sizes, nrows, 0)
+        self.col_sizes = self._block_sizes(col_sizes, ncols, 1)
+        self.row_offsets = self._offsets(self.row_sizes)
+        self.col_offsets = self._offsets(self.col_sizes)
+        self._flat = None
+
+    @staticmethod
+    def _to_csr(block) -> _Block:
+        if block is None:
+            return None
+        if isinstance(block, COOTensor):
+            block = block.coalesce().tocsr()
+        if not isinstance(block, CSRTensor):
+            raise TypeError(f"Blocks should be CSRTensor, COOTensor or None, "
+                            f"but got {type(block).__name__}.")
+        if block.dense_ndim != 0:
+            raise ValueError("Blocks with dense dimensions are not supported, "
+                             f"but got shape {block.shape}.")
+        return block
+
+    def _block_sizes(self, sizes, n: int, axis: int) -> List[int]:
+        out = [None] * n if sizes is None else [int(s) for s in sizes]
+        if len(out) != n:
+            raise ValueError(f"Expected {n} sizes of the blocks, but got {len(out)}.")
+        for i in range(n):
+            for j in range(len(self._blocks[0]) if axis == 0 else len(self._blocks)):
+                block = self._blocks[i][j] if axis == 0 else self._blocks[j][i]
+                if block is None:
+                    continue
+                size = int(block.sparse_shape[axis])
+                if out[i] is None:
+                    out[i] = size
+                elif out[i] != size:
+                    raise ValueError(f"Inconsistent block sizes {out[i]} and {size} "
+                                     f"in the block {'row' if axis == 0 else 'column'} {i}.")
+            if out[i] is None:
+                raise ValueError(f"The size of the empty block {'row' if axis == 0 else 'column'} "
+                                 f"{i} should be given.")
+        return out
+
+    @staticmethod
+    def _offsets(sizes: Sequence[int]) -> List[int]:
+        offsets = [0]
+        for s in sizes:
+            offsets.append(offsets[-1] + s)
+        return offsets
+
+    def __repr__(self) -> str:
+        return (f"BlockCSRTensor(blocks={self.block_shape}, shape={self.shape}, "
+                f"nnz={self.nnz})")
+
+    ### 1. Data Fetching ###
+    @property
+    def block_shape(self) -> Tuple[int, int]:
+        return (len(self.row_sizes), len(self.col_sizes))
+
+    @property
+    def shape(self) -> Size:
+        return (self.row_offsets[-1], self.col_offsets[-1])
+
+    @property
+    def sparse_shape(self) -> Size:
+        return self.shape
+
+    @property
+    def nnz(self) -> int:
+        return sum(b.nnz for b in self.blocks())
+
+    def blocks(self):
+        """Iterate over the non-zero blocks."""
+        for row in self._blocks:
+            for b in row:
+                if b is not None:
+                    yield b
+
+    @property
+    def itype(self):
+        return next(self.blocks()).itype
+
+    @property
+    def ftype(self):
+        return next(self.blocks()).ftype
+
+    def values_context(self):
+        return next(self.blocks()).values_context()
+
+    def __getitem__(self, key: Tuple[int, int]) -> _Block:
+        i, j = key
+        return self._blocks[i][j]
+
+    def __setitem__(self, key: Tuple[int, int], block: Union[_Block, COOTensor]) -> None:
+        """Replace a block. If the new block has the sparsity pattern of the old
+        one, the flattening positions are kept for the next `tocsr`."""
+        i, j = key
+        block = self._to_csr(block)
+        old = self._blocks[i][j]
+        if block is not None:
+            if tuple(block.sparse_shape) != (self.row_sizes[i], self.col_sizes[j]):
+                raise ValueError(f"The shape of the block ({i}, {j}) should be "
+                                 f"{(self.row_sizes[i], self.col_sizes[j])}, "
+                                 f"but got {tuple(block.sparse_shape)}.")
+        self._blocks[i][j] = block
+
+        if not _same_pattern(old, block):
+            self._flat = None
+
+    def diagonal(self) -> TensorLike:
+        """The diagonal of the matrix, requiring square diagonal blocks."""
+        diags = []
+        for i in range(min(self.block_shape)):
+            if self.row_sizes[i] != self.col_sizes[i]:
+                raise ValueError("The diagonal blocks should be square.")
+            block = self._blocks[i][i]
+            if block is None:
+                diags.append(bm.zeros((self.row_sizes[i], ), **self.values_context()))
+            else:
+                diags.append(block.diagonal())
+        return bm.concat(diags, axis=0)
+
+    ### 2. Vector Splitting ###
+    def split(self, u: TensorLike, axis: int=1) -> List[TensorLike]:
+        """Split a vector shaped (N, ...) to the parts of the block columns
+        (axis=1, default) or the block rows (axis=0)."""
+        offsets = self.col_offsets if axis == 1 else self.row_offsets
+        return [u[offsets[k]:offsets[k+1]] for k in range(len(offsets) - 1)]
+
+    @staticmethod
+    def join(parts: Sequence[TensorLike]) -> TensorLike:
+        """Concatenate the parts of a vector, the inverse of `split`."""
+        return bm.concat(list(parts), axis=0)
+
+    ### 3. Format Conversion ###
+    def tocsr(self, *, copy=False) -> CSRTensor:
+        """Flatten to a global CSRTensor. The `crow` and `col` are cached until
+        the sparsity pattern of a block is changed, and shared by the returned
+        matrices unless `copy` is True. The values are always new."""
+        if self._flat is None:
+            self._flat = self._flatten()
+        crow, col, positions = self._flat
+        values = bm.zeros((col.shape[0], ), **self.values_context())
+        for (i, j), pos in positions.items():
+            values = bm.set_at(values, pos, self._blocks[i][j].values())
+        if copy:
+            return CSRTensor(bm.copy(crow), bm.copy(col), values, self.shape)
+        return CSRTensor(crow, col, values, self.shape)
+
+    def _flatten(self):
+        # Entries of the row r in the block row i are ordered by the block columns,
+        # so the position of an entry in block (i, j) is the start of r in the
+        # global CSR, plus the entries of r in the blocks (i, j') with j' < j,
+        # plus its offset in the local row.
+        context = self.values_context()
+        ikwargs = {'dtype': self.itype, 'device': context.get('device', None)}
+        nrows, ncols = self.block_shape
+        row_nnz = []
+        for i in range(nrows):
+            count = bm.zeros((self.row_sizes[i], ), **ikwargs)
+            for b in self._blocks[i]:
+                if b is not None:
+                    count = count + (b.crow()[1:] - b.crow()[:-1])
+            row_nnz.append(count)
+        ZERO = bm.zeros((1, ), **ikwargs)
+        crow = bm.concat([ZERO, bm.cumsum(bm.concat(row_nnz, axis=0), axis=0)], axis=0)
+        crow = bm.astype(crow, self.itype)
+        NNZ = int(crow[-1])
+
+        col = bm.zeros((NNZ, ), **ikwargs)
+        positions = {}
+        for i in range(nrows):
+            r0, r1 = self.row_offsets[i], self.row_offsets[i+1]
+            start = crow[r0:r1]
+            for j in range(ncols):
+                b = self._blocks[i][j]
+                if b is None:
+                    continue
+                bcrow = b.crow()
+                count = bcrow[1:] - bcrow[:-1]
+                pos = bm.repeat(start - bcrow[:-1], count) + bm.arange(b.nnz, **ikwargs)
+                pos = bm.astype(pos, self.itype)
+                col = bm.set_at(col, pos, bm.astype(b.col() + self.col_offsets[j], self.itype))
+                positions[(i, j)] = pos
+                start = start + count
+        return crow, col, positions
+
+    def tocoo(self, *, copy=False) -> COOTensor:
+        return self.tocsr(copy=copy).tocoo()
+
+    def to_dense(self) -> TensorLike:
+        return self.tocsr().to_dense()
+
+    def to_scipy(self):
+        return self.tocsr().to_scipy()
+
+    ### 4. Manipulation ###
+    def copy(self) -> 'BlockCSRTensor':
+        blocks = [[None if b is None else b.copy() for b in row] for row in self._blocks]
+        return BlockCSRTensor(blocks, self.row_sizes, self.col_sizes)
+
+    @property
+    def T(self) -> 'BlockCSRTensor':
+        nrows, ncols = self.block_shape
+        blocks = [[None if self._blocks[i][j] is None else self._blocks[i][j].T
+                   for i in range(nrows)] for j in range(ncols)]
+        return BlockCSRTensor(blocks, self.col_sizes, self.row_sizes)
+
+    ### 5. Arithmetic Operations ###
+    def matmul(self, other: TensorLike) -> TensorLike:
+        """Multiply with a dense tensor shaped (N, ) or (N, batch), block by block."""
+        if not isinstance(other, TensorLike):
+            raise TypeError(f"Unsupported type {type(other).__name__} in matmul")
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(f"Shape mismatch in matmul: {self.shape} and {tuple(other.shape)}.")
+        parts = self.split(other, axis=1)
+        out = []
+        for i, row in enumerate(self._blocks):
+            v = None
+            for b, u in zip(row, parts):
+                if b is not None:
+                    v = b @ u if v is None else v + b @ u
+            if v is None:
+                v = bm.zeros((self.row_sizes[i], ) + tuple(other.shape[1:]), **bm.context(other))
+            out.append(v)
+        return bm.concat(out, axis=0)
+
+    def __matmul__(self, other: TensorLike) -> TensorLike:
+        return self.matmul(other)
+
+
+def _same_pattern(a: _Block, b: _Block) -> bool:
+    if (a is None) or (b is None):
+        return False
+    if a.nnz != b.nnz:
+        return False
+    crow_a, col_a, crow_b, col_b = a.crow(), a.col(), b.crow(), b.col()
+    if (crow_a is crow_b) and (col_a is col_b):
+        return True
+    return bool(bm.all(crow_a == crow_b)) and bool(bm.all(col_a == col_b))
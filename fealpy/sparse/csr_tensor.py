@@ -6,7 +6,7 @@ from ..backend import TensorLike, Number, Size
 from ..backend import backend_manager as bm
 from .sparse_tensor import SparseTensor
 from .utils import (
-    flatten_indices,
+    flatten_indices, row_to_crow,
     check_shape_match, check_spshape_match
 )
 from ._spspmm import spspmm_csr
@@ -28,6 +28,7 @@ class CSRTensor(SparseTensor):
         self._crow = crow
         self._col = col
         self._values = values
+        self._row = None
 
         if spshape is None:
             nrow = crow.shape[0] - 1
@@ -92,13 +93,16 @@ class CSRTensor(SparseTensor):
         return self._crow
 
     def row(self) -> TensorLike:
-        """Generate the row id of non-zero elements."""
-        crow = self.crow()
-        n_row = crow.shape[0] - 1
-        return bm.repeat(
-            bm.arange(n_row, dtype=crow.dtype, device=bm.get_device(crow)),
-            crow[1:] - crow[:-1]
-        )
+        """Generate the row id of non-zero elements.
+        The result is cached on the tensor after the first call."""
+        if self._row is None:
+            crow = self.crow()
+            n_row = crow.shape[0] - 1
+            self._row = bm.repeat(
+                bm.arange(n_row, dtype=crow.dtype, device=bm.get_device(crow)),
+                crow[1:] - crow[:-1]
+            )
+        return self._row
 
     def col(self) -> TensorLike:
         """Return the column of non-zero elements."""
@@ -108,6 +112,16 @@ class CSRTensor(SparseTensor):
         """Return the non-zero elements"""
         return self._values
 
+    def diagonal(self) -> TensorLike:
+        """Return the diagonal of the last two (sparse) dimensions, shaped (..., min(M, N))."""
+        if self._values is None:
+            raise ValueError("Cannot get the diagonal of CSRTensor without value")
+        row = self.row()
+        is_diag = (row == self._col)
+        n = min(self._spshape)
+        diag = bm.zeros(self.dense_shape + (n, ), **self.values_context())
+        return bm.index_add(diag, row[is_diag], self._values[..., is_diag], axis=-1)
+
     ### 2. Data Type & Device Management ###
     def astype(self, dtype=None, /, *, copy=True):
         if self._values is None:
@@ -210,7 +224,7 @@ class CSRTensor(SparseTensor):
 
     @property
     def T(self):
-        raise NotImplementedError
+        return self.tocoo().T.tocsr()
 
     def partial(self, index: Union[TensorLike, slice]):
         crow = self.crow()
@@ -274,27 +288,22 @@ class CSRTensor(SparseTensor):
             elif (not self._values is None) and (other._values is None):
                 raise ValueError("self has value while other does not")
 
-            new_crow = bm.array([0],dtype=bm.int64)
-            new_col = bm.array([],dtype=bm.int64)
-            new_values = bm.array([],dtype=bm.int64)
-
-            for i in range(0, self._crow.shape[0]-1): 
-                indices1 = self._col[self._crow[i]:self._crow[i+1]]
-                indices2 = other._col[other._crow[i]:other._crow[i+1]]
-                col, inverse_indices = bm.unique(bm.concat((indices1,indices2)), return_inverse=True)
+            ncol = self._spshape[1]
+            row = bm.concat([self.row(), other.row()], axis=0)
+            col = bm.concat([self._col, other._col], axis=0)
+            key = bm.astype(row, bm.int64) * ncol + bm.astype(col, bm.int64)
+            ukey, inverse = bm.unique(key, return_inverse=True)
+            new_col = bm.astype(ukey % ncol, self.itype)
+            new_crow = row_to_crow(bm.astype(ukey // ncol, self.itype), self._spshape[0])
 
-                if self._values is None:
-                    new_values = None
-                else:
-                    value1 = self._values[self._crow[i]:self._crow[i+1]]
-                    value2 = other._values[other._crow[i]:other._crow[i+1]]
-                    values = bm.zeros(col.shape[0],dtype=value2.dtype)
-                    values = bm.index_add(values, inverse_indices, bm.concat((value1,alpha*value2)), axis=-1)
-                    new_values = bm.concat((new_values,values))
-                new_crow = bm.concat((new_crow,bm.tensor([len(col)+new_crow[-1]])))
-                new_col = bm.concat((new_col,col))
+            if self._values is None:
+                new_values = None
+            else:
+                src = bm.concat([self._values, other._values * alpha], axis=-1)
+                new_values = bm.zeros(src.shape[:-1] + (ukey.shape[0], ), **bm.context(src))
+                new_values = bm.index_add(new_values, inverse, src, axis=-1)
 
-            return CSRTensor(new_crow, new_col,new_values ,self.sparse_shape)
+            return CSRTensor(new_crow, new_col, new_values, self.sparse_shape)
 
         elif isinstance(other, TensorLike):
             check_shape_match(self.shape, other.shape)
@@ -433,7 +442,8 @@ class CSRTensor(SparseTensor):
             except (AttributeError, NotImplementedError):
                 pass
 
-            return spmm_csr(self._crow, self._col,self._values,self.sparse_shape, other)
+            return spmm_csr(self._crow, self._col, self._values, self.sparse_shape,
+                            other, row=self.row())
 
         else:
             raise TypeError(f"Unsupported type {type(other).__name__} in matmul")
@@ -50,6 +50,14 @@ def flatten_indices(indices: TensorLike, shape: Size) -> TensorLike:
     return flatten[None, ...]
 
 
+def row_to_crow(row: TensorLike, nrow: int) -> TensorLike:
+    """Compress the row index of non-zero elements (sorted in rows) to row pointers."""
+    kwargs = {'dtype': row.dtype, 'device': bm.get_device(row)}
+    crow = bm.zeros((nrow + 1, ), **kwargs)
+    crow = bm.index_add(crow, row + 1, bm.ones(row.shape, **kwargs))
+    return bm.cumsum(crow, axis=0)
+
+
 def tril_coo(indices: TensorLike, values: TensorLike, k: int=0):
     """Copy the lower triangular portion of a sparse COO matrix in the last two dimensions."""
     tril_pos = (indices[-2] + k) >= indices[-1]
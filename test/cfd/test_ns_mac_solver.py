@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+from scipy.sparse import diags, csr_matrix
+
+from fealpy.mesh import UniformMesh2d
+from fealpy.cfd.ns_mac_solver import NSMacSolver
+
+
+Re = 1
+
+
+def wrap(k, c, d):
+    # The entries of the +1 and -1 diagonals, with the coefficients c and d,
+    # which wrap around between the grid lines of a (n0, n1) grid.
+    NN = k.size
+    I = np.concatenate([k[:-1, -1], k[1:, 0]])
+    J = np.concatenate([k[1:, 0], k[:-1, -1]])
+    V = np.concatenate([np.full(k.shape[0]-1, c), np.full(k.shape[0]-1, d)])
+    return csr_matrix((V, (I, J)), shape=(NN, NN))
+
+
+def wall(rows, cols, val, NN):
+    return csr_matrix((np.broadcast_to(val, rows.shape), (rows, cols)), shape=(NN, NN))
+
+
+def previous_du(mesh):
+    # The matrices assembled by `NSMacSolver.du` before the stencils.
+    n0, n1 = mesh.nx+1, mesh.ny+1
+    cx, cy = 1/(2*mesh.h[0]), 1/(2*mesh.h[1])
+    NN = n0*n1
+    k = np.arange(NN).reshape(n0, n1)
+    A = diags([-cx, cx], [-n1, n1], shape=(NN, NN), format='csr')
+    B = diags([0, cy, -cy], [0, 1, -1], shape=(NN, NN), format='csr')
+    B += wall(k[:, 0], k[:, 0], 2*cy, NN) + wall(k[:, -1], k[:, -1], -2*cy, NN)
+    B += wall(k[:, 0], k[:, 1], -cy/3, NN) + wall(k[:, -1], k[:, -2], cy/3, NN)
+    B -= wrap(k, cy, -cy)
+    return A, B
+
+
+def previous_dv(mesh):
+    n0, n1 = mesh.nx+1, mesh.ny+1
+    cx, cy = 1/(2*mesh.h[0]), 1/(2*mesh.h[1])
+    NN = n0*n1
+    k = np.arange(NN).reshape(n0, n1)
+    A = diags([0, cx, -cx], [0, n1, -n1], shape=(NN, NN), format='csr')
+    A += wall(k[0, :], k[0, :], 2*cx, NN) + wall(k[-1, :], k[-1, :], -2*cx, NN)
+    A += wall(k[0, :], k[1, :], -cx/3, NN) + wall(k[-1, :], k[-2, :], cx/3, NN)
+    # NOTE: the previous matrix used cx here and kept the wrapped entries
+    B = diags([0, cy, -cy], [0, 1, -1], shape=(NN, NN), format='csr') - wrap(k, cy, -cy)
+    return A, B
+
+
+def previous_laplace(mesh, axis):
+    n0, n1 = mesh.nx+1, mesh.ny+1
+    cx, cy = 1/mesh.h[0]**2, 1/mesh.h[1]**2
+    NN = n0*n1
+    k = np.arange(NN).reshape(n0, n1)
+    # NOTE: the previous matrices used cx*cy for both directions, and laplace_v
+    # kept the wrapped entries
+    A = diags([-2*cx-2*cy, cy, cy, cx, cx], [0, 1, -1, n1, -n1], shape=(NN, NN), format='csr')
+    A -= wrap(k, cy, cy)
+    if axis == 1: # u = b on the walls y = const
+        A += wall(k[:, 0], k[:, 0], -2*cy, NN) + wall(k[:, -1], k[:, -1], -2*cy, NN)
+        A += wall(k[:, 0], k[:, 1], cy/3, NN) + wall(k[:, -1], k[:, -2], cy/3, NN)
+    else: # v = b on the walls x = const
+        A += wall(k[0, :], k[0, :], -2*cx, NN) + wall(k[-1, :], k[-1, :], -2*cx, NN)
+        A += wall(k[0, :], k[1, :], cx/3, NN) + wall(k[-1, :], k[-2, :], cx/3, NN)
+    return A
+
+
+def mac_solver(nx, ny, hx, hy):
+    NSMacSolver.clear_cache()
+    mesh = UniformMesh2d([0, nx, 0, ny], h=(hx, hy), origin=(0, 0))
+    return NSMacSolver(Re, mesh)
+
+
+@pytest.mark.parametrize("name", ['dux', 'duy', 'dvx', 'dvy', 'Tuv', 'Tvu', 'laplace_u',
+                                  'laplace_v', 'dp_u', 'dp_v', 'dpm_u', 'dpm_v', 'laplace_phi'])
+def test_stencil_apply(name):
+    solver = mac_solver(4, 4, np.pi/4, np.pi/4)
+    A = solver.matrix(name)
+    u = np.random.default_rng(0).random(A.shape[1])
+    np.testing.assert_allclose(solver.apply(name, u), A@u, atol=1e-12)
+    assert solver.matrix(name) is A
+
+
+@pytest.mark.parametrize("nx, ny, hx, hy", [(5, 3, 0.2, 0.2), (4, 7, 0.3, 0.1)])
+def test_previous_matrices(nx, ny, hx, hy):
+    solver = mac_solver(nx, ny, hx, hy)
+    expected = {
+        'dux': previous_du(solver.umesh)[0],
+        'duy': previous_du(solver.umesh)[1],
+        'dvx': previous_dv(solver.vmesh)[0],
+        'dvy': previous_dv(solver.vmesh)[1],
+        'laplace_u': previous_laplace(solver.umesh, 1),
+        'laplace_v': previous_laplace(solver.vmesh, 0),
+    }
+    for name, A in expected.items():
+        np.testing.assert_allclose(solver.stencil(name).tocsr().toarray(), A.toarray(),
+                                   atol=1e-12, err_msg=name)
+        u = np.random.default_rng(0).random(A.shape[1])
+        np.testing.assert_allclose(solver.apply(name, u), A@u, atol=1e-10, err_msg=name)
+
+
+def test_pressure_solve():
+    solver = mac_solver(8, 5, 0.1, 0.3)
+    f = np.random.default_rng(0).random(40)
+    f -= np.mean(f)
+    phi = solver.pressure_solve(f)
+    np.testing.assert_allclose(solver.laplace_phi()@phi, f, atol=1e-12)
+    assert abs(np.mean(phi)) < 1e-14
+
+
+if __name__ == "__main__":
+    pytest.main(['./test_ns_mac_solver.py', '-q'])
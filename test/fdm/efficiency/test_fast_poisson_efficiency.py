@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.fdm import LaplaceOperator, FastPoissonSolver
+from fealpy.sparse import CSRTensor
+from fealpy.solver import spsolve, cg
+
+
+@pytest.mark.parametrize("TD, n", [(2, 128), (2, 512), (3, 16), (3, 32)])
+@pytest.mark.parametrize("bc", ['dirichlet', 'periodic'])
+def test_fast_vs_direct(TD, n, bc):
+    bm.set_backend('numpy')
+    if TD == 2:
+        mesh = UniformMesh2d((0, n, 0, n), h=(1/n, 1/n))
+    else:
+        mesh = UniformMesh3d((0, n, 0, n, 0, n), h=(1/n, 1/n, 1/n))
+    start = time.time()
+    A = LaplaceOperator(mesh, bc).assembly()
+    t_assembly = time.time() - start
+    b = bm.from_numpy(np.random.default_rng(0).random(A.shape[0]))
+    shift = 1.0 if bc == 'periodic' else 0.0
+
+    start = time.time()
+    solver = FastPoissonSolver(mesh, bc, shift=shift)
+    u0 = solver.solve(b)
+    t_fast = time.time() - start
+
+    A = CSRTensor.from_scipy((A.to_scipy() + shift * sp.eye(A.shape[0])).tocsr())
+    start = time.time()
+    u1 = spsolve(A, b, 'scipy')
+    t_direct = time.time() - start
+
+    np.testing.assert_allclose(u0, u1, atol=1e-8 * float(np.max(np.abs(u1))))
+    print(f"\nTD={TD}, n={n}, bc={bc}, dof={A.shape[0]}: assembly {t_assembly:.3f} s, "
+          f"spsolve {t_direct:.3f} s, fast {t_fast:.4f} s, speedup {t_direct/t_fast:.1f}")
+
+
+@pytest.mark.parametrize("n", [64, 256])
+def test_preconditioned_cg(n):
+    bm.set_backend('numpy')
+    mesh = UniformMesh2d((0, n, 0, n), h=(1/n, 1/n))
+
+    def coef(p):
+        return 1.0 + 0.9 * bm.sin(4*p[..., 0]) * bm.sin(4*p[..., 1])
+
+    A = LaplaceOperator(mesh, coef=coef).assembly()
+    b = bm.ones((A.shape[0], ), dtype=bm.float64)
+    for name, M in [('none', None), ('fast', FastPoissonSolver(mesh))]:
+        start = time.time()
+        x, info = cg(A, b, M=M, rtol=1e-10, returninfo=True)
+        print(f"\nn={n}, preconditioner {name}: {info['niter']} iterations, "
+              f"{time.time() - start:.3f} s")
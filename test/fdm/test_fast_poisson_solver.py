@@ -0,0 +1,101 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.fdm import LaplaceOperator, FastPoissonSolver
+from fealpy.solver import cg
+
+
+def uniform_mesh(TD, n):
+    if TD == 2:
+        return UniformMesh2d((0, n, 0, n + 2), h=(1/n, 1.3/(n + 2)))
+    return UniformMesh3d((0, n, 0, n + 1, 0, n - 1), h=(1/n, 1/(n + 1), 1/(n - 1)))
+
+
+BCS = [bc for TD in (2, 3) for bc in itertools.product(['dirichlet', 'neumann', 'periodic'], repeat=TD)]
+
+
+class TestFastPoissonSolver:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("bc", BCS)
+    def test_solve(self, backend, bc):
+        bm.set_backend(backend)
+        mesh = uniform_mesh(len(bc), 6)
+        L = LaplaceOperator(mesh, bc)
+        A = L.assembly()
+        if 'neumann' not in bc:
+            np.testing.assert_array_equal(bm.to_numpy(L.dof_weight()), 1.0)
+        np.testing.assert_allclose(bm.to_numpy((A - A.T.tocsr()).values()), 0.0, atol=1e-12)
+        solver = FastPoissonSolver(mesh, bc, coef=2.0, shift=0.5)
+        assert solver.shape == A.shape
+        f = bm.from_numpy(np.random.default_rng(0).random(A.shape[0]))
+        u = solver @ f
+        np.testing.assert_allclose(bm.to_numpy(2.0*(A @ u) + 0.5*L.dof_weight()*u),
+                                   bm.to_numpy(f), atol=1e-10)
+
+        # f in the range of a singular operator
+        solver = FastPoissonSolver(mesh, bc)
+        if solver.singular:
+            f = A @ f
+        u = solver.solve(f)
+        np.testing.assert_allclose(bm.to_numpy(A @ u), bm.to_numpy(f), atol=1e-10)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_batch(self, backend):
+        bm.set_backend(backend)
+        mesh = uniform_mesh(2, 8)
+        solver = FastPoissonSolver(mesh, ('dirichlet', 'periodic'))
+        F = bm.from_numpy(np.random.default_rng(0).random((solver.shape[0], 3)))
+        U = solver @ F
+        for i in range(3):
+            np.testing.assert_allclose(bm.to_numpy(U[:, i]), bm.to_numpy(solver @ F[:, i]),
+                                       atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_convergence(self, backend):
+        bm.set_backend(backend)
+
+        def solution(p):
+            x, y = p[..., 0], p[..., 1]
+            return bm.exp(x) * bm.sin(2*y) + x*y
+
+        def source(p):
+            x, y = p[..., 0], p[..., 1]
+            return 3 * bm.exp(x) * bm.sin(2*y)
+
+        errors = []
+        for n in (16, 32):
+            mesh = uniform_mesh(2, n)
+            L = LaplaceOperator(mesh)
+            index = L.dof_index()
+            node = mesh.entity('node')
+            f = source(node)[index] + L.dirichlet_rhs(solution)
+            u = FastPoissonSolver(mesh).solve(f)
+            errors.append(float(bm.max(bm.abs(u - solution(node)[index]))))
+        assert errors[0] / errors[1] > 3.5
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_preconditioner(self, backend):
+        bm.set_backend(backend)
+
+        def coef(p):
+            return 1.0 + 0.5 * bm.sin(3*p[..., 0]) * bm.cos(2*p[..., 1])
+
+        niter = []
+        for n in (16, 64):
+            mesh = uniform_mesh(2, n)
+            A = LaplaceOperator(mesh, coef=coef).assembly()
+            assert float(bm.max(bm.abs((A - A.T.tocsr()).values()))) < 1e-12
+            b = bm.ones((A.shape[0], ), dtype=bm.float64)
+            x, info = cg(A, b, M=FastPoissonSolver(mesh), rtol=1e-10, returninfo=True)
+            assert float(bm.linalg.norm(b - A @ x) / bm.linalg.norm(b)) < 1e-9
+            niter.append(info['niter'])
+        assert niter[1] < niter[0] + 5
+        assert niter[1] < 40
+
+
+if __name__ == "__main__":
+    pytest.main(['./test_fast_poisson_solver.py', '-q'])
@@ -0,0 +1,35 @@
+import time
+import tracemalloc
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+
+
+@pytest.mark.parametrize("n", [8, 12])
+@pytest.mark.parametrize("chunk_size", [0, 1000, 10000])
+def test_chunked_assembly_peak_memory(n, chunk_size):
+    bm.set_backend('numpy')
+    mesh = TetrahedronMesh.from_box(nx=n, ny=n, nz=n)
+    space = LagrangeFESpace(mesh, p=3)
+    NC = mesh.number_of_cells()
+    ldof = space.number_of_local_dofs()
+    space.cell_to_dof()
+
+    bform = BilinearForm(space, chunk_size=chunk_size)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+
+    tracemalloc.start()
+    start = time.time()
+    A = bform.assembly()
+    t = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    local = NC * ldof * ldof * 8
+    print(f"NC={NC}, chunk_size={chunk_size}: {t:.3f} s, "
+          f"peak {peak/2**20:.1f} MB, local matrices {local/2**20:.1f} MB, "
+          f"nnz {A.nnz}")
@@ -0,0 +1,40 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+
+NCPU = os.cpu_count() or 1
+WORKERS = sorted({1, 2, 4, 8, 16, 32, 64, NCPU} & set(range(1, NCPU + 1)))
+
+
+@pytest.mark.parametrize("n", [12])
+@pytest.mark.parametrize("pool", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parallel_assembly_scaling(n, pool):
+    bm.set_backend('numpy')
+    mesh = TetrahedronMesh.from_box(nx=n, ny=n, nz=n)
+    space = LagrangeFESpace(mesh, p=3)
+    NC = mesh.number_of_cells()
+    space.cell_to_dof()
+
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+    start = time.time()
+    A0 = bform.assembly()
+    t0 = time.time() - start
+    print(f"\nNC={NC}, serial: {t0:.3f} s, nnz {A0.nnz}")
+
+    for nw in WORKERS:
+        with pool(max_workers=nw) as executor:
+            bform = BilinearForm(space, executor=executor)
+            bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+            start = time.time()
+            A = bform.assembly()
+            t = time.time() - start
+        assert A.nnz == A0.nnz
+        print(f"{pool.__name__}, {nw} workers: {t:.3f} s, speedup {t0/t:.2f}")
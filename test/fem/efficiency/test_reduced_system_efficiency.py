@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.decorator import cartesian
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, LinearForm, DirichletBC,
+    ScalarDiffusionIntegrator, ScalarSourceIntegrator
+)
+from fealpy.solver import spsolve, cg
+
+
+@cartesian
+def gd(p):
+    return bm.sin(p[..., 0]) * p[..., 1]
+
+
+@pytest.mark.parametrize("n, p", [(64, 1), (32, 2), (16, 4)])
+def test_reduced_vs_full(n, p):
+    bm.set_backend('numpy')
+    mesh = TriangleMesh.from_box(nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=p)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    lform = LinearForm(space)
+    lform.add_integrator(ScalarSourceIntegrator(1.0))
+    A, F = bform.assembly(), lform.assembly()
+    bc = DirichletBC(space, gd)
+    solvers = {
+        'spsolve': lambda A, b: spsolve(A, b, 'scipy'),
+        'cg': lambda A, b: cg(A, b, rtol=1e-10, maxiter=10000),
+    }
+
+    for name, solver in solvers.items():
+        start = time.time()
+        A0, F0 = bc.apply(A, F)
+        u0 = solver(A0, F0)
+        t0 = time.time() - start
+
+        start = time.time()
+        u1 = bc.solve_reduced(A, F, solver)
+        t1 = time.time() - start
+
+        np.testing.assert_allclose(u1, u0, atol=1e-7)
+        A_II, _ = bc.reduce_system(A, F)
+        print(f"\ngdof={A.shape[0]}, p={p}, {name}: full {t0:.3f} s (nnz {A0.nnz}), "
+              f"reduced {t1:.3f} s (nnz {A_II.nnz}), speedup {t0/t1:.2f}")
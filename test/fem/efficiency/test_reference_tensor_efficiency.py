@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material.elastic_material import LinearElasticMaterial
+from fealpy.fem import (
+    BasisCache, ScalarMassIntegrator, ScalarDiffusionIntegrator,
+    ScalarConvectionIntegrator, LinearElasticIntegrator
+)
+
+
+def timing(integrator, space):
+    integrator.basis_cache = BasisCache(enabled=False)
+    start = time.time()
+    A = integrator(space)
+    return time.time() - start, A
+
+
+@pytest.mark.parametrize("p", [1, 2, 3])
+def test_reference_tensor_vs_quadrature(p):
+    bm.set_backend('numpy')
+    mesh = TetrahedronMesh.from_box(nx=10, ny=10, nz=10)
+    space = LagrangeFESpace(mesh, p=p)
+    tspace = TensorFunctionSpace(space, (3, -1))
+    material = LinearElasticMaterial(name='E', elastic_modulus=1.0,
+                                     poisson_ratio=0.3, hypo='3D')
+    NC = mesh.number_of_cells()
+    NQ = mesh.quadrature_formula(p+3).number_of_quadrature_points()
+    velocity = bm.array([1.0, 2.0, 3.0])
+    cases = [
+        ('mass', ScalarMassIntegrator, 2.0, 2.0, space),
+        ('diffusion', ScalarDiffusionIntegrator, 2.0, 2.0, space),
+        ('convection', ScalarConvectionIntegrator, velocity,
+         bm.broadcast_to(velocity, (NC, NQ, 3)), space),
+        ('elastic', LinearElasticIntegrator, material, material, tspace),
+    ]
+
+    for name, Int, coef, qcoef, sp in cases:
+        t0, A0 = timing(Int(qcoef, method='quadrature'), sp)
+        t1, A1 = timing(Int(coef, method='fast'), sp)
+        err = float(bm.max(bm.abs(A1 - A0)) / bm.max(bm.abs(A0)))
+        assert err < 1e-10
+        print(f"\nNC={NC}, p={p}, {name}: quadrature {t0:.3f} s, reference {t1:.3f} s, "
+              f"speedup {t0/t1:.1f}, error {err:.1e}")
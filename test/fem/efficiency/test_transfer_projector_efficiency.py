@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import InterpolationProjector, L2Projector
+
+
+@pytest.mark.parametrize("n", [64, 256])
+@pytest.mark.parametrize("method", ['interpolation', 'l2', 'l2-lumped'])
+@pytest.mark.parametrize("scale", [1.0, 1.02]) # 1.02: points outside mesh0 near the boundary
+def test_transfer(n, method, scale):
+    bm.set_backend('numpy')
+    mesh0 = TriangleMesh.from_box([0, 1, 0, 1], n, n)
+    mesh1 = TriangleMesh.from_box([0, 1, 0, 1], n + 7, n - 5)
+    node = mesh1.entity('node')
+    isbd = mesh1.boundary_node_flag()
+    rng = np.random.default_rng(0)
+    mesh1.node = scale * node + bm.where(isbd[:, None], 0.0, bm.from_numpy(0.2 / n * (rng.random(node.shape) - 0.5)))
+    space0 = LagrangeFESpace(mesh0, 1)
+    space1 = LagrangeFESpace(mesh1, 1)
+    NF = 10
+    fields = bm.from_numpy(rng.random((space0.number_of_global_dofs(), NF)))
+
+    if method == 'interpolation':
+        P = InterpolationProjector(space0, space1)
+    else:
+        P = L2Projector(space0, space1, lumped=(method == 'l2-lumped'))
+    start = time.time()
+    P.assembly()
+    t_setup = time.time() - start
+    start = time.time()
+    for k in range(NF):
+        P(fields[:, k])
+    t_single = (time.time() - start) / NF
+    start = time.time()
+    P(fields)
+    t_batch = time.time() - start
+    print(f"\n{method}, scale={scale}, NC0={mesh0.number_of_cells()}, NC1={mesh1.number_of_cells()}: "
+          f"setup {t_setup:.3f} s, {t_single*1e3:.2f} ms per field, {t_batch*1e3:.2f} ms for {NF} fields")
@@ -0,0 +1,109 @@
+import gc
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.decorator import cartesian
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, BasisCache,
+    ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator
+)
+
+
+@cartesian
+def velocity(p):
+    return bm.stack([p[..., 1], -p[..., 0]], axis=-1)
+
+
+def build(space, cache):
+    ints = [ScalarDiffusionIntegrator(q=3, method='quadrature'),
+            ScalarMassIntegrator(q=3, method='quadrature'),
+            ScalarConvectionIntegrator(coef=velocity, q=3)]
+    for int_ in ints:
+        int_.basis_cache = cache
+    bform = BilinearForm(space)
+    bform.add_integrator(*ints)
+    return bform
+
+
+class TestBasisCache:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_shared_tables(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, p=2)
+        cache = BasisCache()
+
+        A = build(space, cache).assembly()
+        # quadrature, measure, basis and gradients are computed once each.
+        assert cache.misses == 4
+        A0 = build(space, BasisCache(enabled=False)).assembly()
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-12)
+
+        hits = cache.hits
+        build(space, cache).assembly()
+        assert cache.misses == 4
+        assert cache.hits > hits
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_invalidation(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        space = LagrangeFESpace(mesh, p=1)
+        cache = BasisCache()
+
+        cm0 = cache.measure(mesh)
+        assert cache.measure(mesh) is cm0
+        mesh.uniform_refine()
+        cm1 = cache.measure(mesh)
+        assert cm1.shape[0] == 4 * cm0.shape[0]
+
+        mesh.node = mesh.node * 2.0
+        cm2 = cache.measure(mesh)
+        np.testing.assert_allclose(bm.to_numpy(cm2), 4 * bm.to_numpy(cm1))
+
+        mesh.node[:] *= 0.5 # moved in place
+        assert cache.measure(mesh) is cm2
+        cache.basis(space, 2)
+        cache.invalidate(mesh)
+        assert len(cache) == 0
+        np.testing.assert_allclose(bm.to_numpy(cache.measure(mesh)), bm.to_numpy(cm1))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_release(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        space = LagrangeFESpace(mesh, p=2)
+        cache = BasisCache()
+        cache.fetch(space, 3, diff=1)
+        assert len(cache) == 3
+
+        del space
+        gc.collect()
+        assert len(cache) == 2 # the quadrature and measure of the mesh
+        del mesh
+        gc.collect()
+        assert len(cache) == 0
+        assert len(cache._finalizers) == 0
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_lru_and_restrict(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        space = LagrangeFESpace(mesh, p=1)
+        cache = BasisCache(maxsize=2)
+        for q in range(1, 5):
+            cache.quadrature(mesh, q)
+        assert len(cache) == 2
+
+        cache.clear()
+        integrator = ScalarMassIntegrator(q=2)
+        integrator.basis_cache = cache
+        index = bm.arange(3, dtype=mesh.itype)
+        with integrator.restrict(index):
+            assert integrator(space).shape[0] == 3
+        assert len(cache) == 0
+        assert integrator.basis_cache is cache
@@ -1,11 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 from fealpy.backend import backend_manager as bm
 
-from fealpy.mesh import TriangleMesh
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, HexahedronMesh
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.decorator import cartesian
 from fealpy.functionspace import LagrangeFESpace
 from fealpy.fem import (
-        BilinearForm, ScalarDiffusionIntegrator
+        BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator,
+        LinearForm, ScalarSourceIntegrator
     )
 
 from bilinear_form_data import *
@@ -43,6 +48,130 @@ class TestBilinearFormInterface:
         z = bm.to_numpy(bform @ x)
         assert np.linalg.norm(y-z) < 1e-12 
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("data", mesh_data)
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_reuse_pattern(self, backend, data, p):
+        bm.set_backend(backend)
+
+        Mesh = mesh_map[data["class"]]
+        node = bm.from_numpy(data['node'])
+        cell = bm.from_numpy(data['cell'])
+        mesh = Mesh(node, cell)
+        space = LagrangeFESpace(mesh, p)
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator())
+        A = bm.to_numpy(bform.assembly().to_dense())
+
+        B = bform.assembly(reuse_pattern=True)
+        pattern = bform._pattern
+        np.testing.assert_allclose(bm.to_numpy(B.to_dense()), A, atol=1e-12)
+
+        C = bform.assembly(reuse_pattern=True)
+        assert bform._pattern is pattern
+        np.testing.assert_allclose(bm.to_numpy(C.to_dense()), A, atol=1e-12)
+        np.testing.assert_array_equal(bm.to_numpy(C.crow()), bm.to_numpy(B.crow()))
+
+        bform.add_integrator(ScalarMassIntegrator())
+        D = bform.assembly(reuse_pattern=True)
+        assert bform._pattern is not pattern
+        E = bform.assembly()
+        np.testing.assert_allclose(bm.to_numpy(D.to_dense()),
+                                   bm.to_numpy(E.to_dense()), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", range(1, 4))
+    @pytest.mark.parametrize("coef", [None, 2.0, cartesian(lambda p: 1 + p[..., 0]**2)])
+    def test_matrix_free_2d(self, backend, p, coef):
+        bm.set_backend(backend)
+
+        for mesh in [QuadrangleMesh.from_box(nx=3, ny=2),
+                     UniformMesh2d((0, 3, 0, 4), (0.5, 0.25))]:
+            space = LagrangeFESpace(mesh, p)
+            x = bm.from_numpy(np.random.rand(space.number_of_global_dofs()))
+
+            bform = BilinearForm(space)
+            bform.add_integrator(ScalarDiffusionIntegrator(coef, q=p+2))
+            bform.add_integrator(ScalarMassIntegrator(coef, q=p+2))
+            y = bm.to_numpy(bform @ x)
+            assert len(bform.memory) == 0 # no local matrices retained
+            z = bm.to_numpy(bform.assembly() @ x)
+            np.testing.assert_allclose(y, z, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", range(2, 4))
+    def test_matrix_free_3d(self, backend, p):
+        bm.set_backend(backend)
+        f = cartesian(lambda p: p[..., 0]**2 * p[..., 1] * p[..., 2])
+        # integrals of |grad f|^2 and f^2 on [0, 2]x[0, 2]x[0, 1]
+        energy = 4*(8/3)*(8/3)*(1/3) + (32/5)*2*(1/3) + (32/5)*(8/3)
+        mass = (32/5)*(8/3)*(1/3)
+
+        for mesh in [HexahedronMesh.from_box([0, 2, 0, 2, 0, 1], nx=2, ny=2, nz=1),
+                     UniformMesh3d((0, 2, 0, 2, 0, 1), (1, 1, 1))]:
+            space = LagrangeFESpace(mesh, p)
+            u = space.interpolate(f)
+            for I, val in [(ScalarDiffusionIntegrator, energy), (ScalarMassIntegrator, mass)]:
+                bform = BilinearForm(space)
+                bform.add_integrator(I(q=p+3))
+                assert abs(float(bm.sum(u * (bform @ u))) - val) < 1e-10
+                assert len(bform.memory) == 0
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("data", mesh_data)
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+    def test_chunk_size(self, backend, data, chunk_size):
+        bm.set_backend(backend)
+
+        Mesh = mesh_map[data["class"]]
+        mesh = Mesh(bm.from_numpy(data['node']), bm.from_numpy(data['cell']))
+        space = LagrangeFESpace(mesh, 2)
+        coef = cartesian(lambda p: 1 + p[..., 0]**2)
+
+        forms = []
+        for cs in [0, chunk_size]:
+            bform = BilinearForm(space, chunk_size=cs)
+            bform.add_integrator(ScalarDiffusionIntegrator(coef), ScalarMassIntegrator(2.0))
+            lform = LinearForm(space, chunk_size=cs)
+            lform.add_integrator(ScalarSourceIntegrator(coef))
+            forms.append((bform.assembly(), lform.assembly()))
+
+        (A0, F0), (A1, F1) = forms
+        np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("data", mesh_data)
+    @pytest.mark.parametrize("nparts", [1, 3, 4])
+    def test_executor(self, backend, data, nparts):
+        bm.set_backend(backend)
+
+        Mesh = mesh_map[data["class"]]
+        mesh = Mesh(bm.from_numpy(data['node']), bm.from_numpy(data['cell']))
+        space = LagrangeFESpace(mesh, 2)
+        coef = cartesian(lambda p: 1 + p[..., 0]**2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            forms = []
+            for ex in [None, executor]:
+                bform = BilinearForm(space, executor=ex, nparts=nparts)
+                bform.add_integrator(ScalarDiffusionIntegrator(coef), ScalarMassIntegrator(2.0))
+                lform = LinearForm(space, executor=ex, nparts=nparts)
+                lform.add_integrator(ScalarSourceIntegrator(coef))
+                forms.append((bform, bform.assembly(), lform.assembly()))
+
+            bform = forms[1][0]
+            A2 = bform.assembly(reuse_pattern=True)
+            A3 = bform.assembly(reuse_pattern=True)
+
+        (_, A0, F0), (_, A1, F1) = forms
+        np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-12)
+        assert A3.col() is A2.col()
+        np.testing.assert_allclose(bm.to_numpy(A3.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-12)
+
 
 if __name__ == "__main__":
     pytest.main(['./test_bilinear_form.py', '-k', 'test_matmul'])
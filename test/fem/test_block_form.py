@@ -42,6 +42,28 @@ class TestBlockForm:
         np.testing.assert_array_almost_equal(vector, true_vector, 
                                      err_msg=f" `blockform __mult__` function is not equal to real result in backend {backend}")
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_block_format(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=3, ny=3)
+        space = LagrangeFESpace(mesh, p=1)
+        space1 = LagrangeFESpace(mesh, p=2)
+        bform0 = BilinearForm(space)
+        bform0.add_integrator(ScalarDiffusionIntegrator())
+        bform1 = BilinearForm(space1)
+        bform1.add_integrator(ScalarDiffusionIntegrator())
+
+        M = BlockForm([[bform0, None], [None, bform1]]).assembly()
+        blockform = BlockForm([[bform0, None], [None, bform1]])
+        K = blockform.assembly(format='block')
+        assert K.block_shape == (2, 2)
+        assert K[0, 1] is None
+
+        a = bm.arange(blockform.shape[1], dtype=mesh.ftype)
+        np.testing.assert_array_almost_equal(K.to_dense(), M.to_dense())
+        np.testing.assert_array_almost_equal(blockform @ a, M @ a)
+
+
 if __name__ == "__main__":
     pytest.main(['./test_block_form.py', '-sk', 'test_diag_diffusion'])
 
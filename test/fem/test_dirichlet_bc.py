@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.decorator import cartesian
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.sparse import BlockCSRTensor
+from fealpy.fem import (
+    BilinearForm, LinearForm, DirichletBC,
+    ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarSourceIntegrator
+)
+from fealpy.solver import spsolve, cg
+
+
+@cartesian
+def gd(p):
+    return p[..., 0]**2 + p[..., 1]
+
+
+@cartesian
+def gd_vector(p):
+    return bm.stack([gd(p), -gd(p)], axis=-1)
+
+
+def get_forms(p=2):
+    mesh = TriangleMesh.from_box(nx=6, ny=6)
+    space = LagrangeFESpace(mesh, p=p)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    lform = LinearForm(space)
+    lform.add_integrator(ScalarSourceIntegrator(1.0))
+    return space, bform, lform
+
+
+class TestDirichletBC:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("format", ['csr', 'coo'])
+    def test_keep_pattern(self, backend, format):
+        bm.set_backend(backend)
+        space, bform, lform = get_forms()
+        F = lform.assembly()
+        bc = DirichletBC(space, gd)
+
+        A0, F0 = bc.apply(bform.assembly(format=format), F)
+        A = bform.assembly(format=format)
+        nnz = A.nnz
+        A1, F1 = bc.apply(A, F, keep_pattern=True)
+
+        assert A1.nnz == nnz
+        np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-14)
+        np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-14)
+        # The lifting kept is used for the adjusted matrix.
+        F2 = bc.apply_vector(F, A1)
+        np.testing.assert_allclose(bm.to_numpy(F2), bm.to_numpy(F0), atol=1e-14)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_pattern_reuse(self, backend):
+        bm.set_backend(backend)
+        space, _, lform = get_forms()
+        F = lform.assembly()
+        bc = DirichletBC(space, gd)
+        mass = ScalarMassIntegrator(1.0)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(), mass)
+
+        for c in [1.0, 2.0, 3.0]:
+            mass.coef = c
+            mass.clear()
+            A = bform.assembly()
+            A0, F0 = bc.apply(A.copy(), F)
+            A1, F1 = bc.apply(A, F, keep_pattern=True)
+            np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-14)
+            np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-14)
+            pattern = bc._pattern if c == 1.0 else pattern
+            assert bc._pattern is pattern
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_block_update(self, backend):
+        # Newton-like steps: update a block, flatten and apply the boundary
+        # condition in the pattern of the flattened matrix.
+        bm.set_backend(backend)
+        space, bform, _ = get_forms(p=1)
+        tspace = TensorFunctionSpace(space, (2, -1))
+        bc = DirichletBC(tspace, gd_vector)
+        A = bform.assembly()
+        mass = ScalarMassIntegrator(1.0)
+        mform = BilinearForm(space)
+        mform.add_integrator(mass)
+        M = mform.assembly()
+        K = BlockCSRTensor([[A, M], [M, A]])
+        F = bm.ones((tspace.number_of_global_dofs(), ), dtype=bm.float64)
+
+        for c in [1.0, 2.0, 3.0]:
+            mass.coef = c
+            mass.clear()
+            Mc = mform.assembly()
+            K[0, 1] = Mc
+            K0 = BlockCSRTensor([[A, Mc], [M, A]]).tocsr()
+            A0, F0 = bc.apply(K0, F)
+            A1, F1 = bc.apply(K.tocsr(), F, keep_pattern=True)
+            np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), bm.to_numpy(A0.to_dense()), atol=1e-14)
+            np.testing.assert_allclose(bm.to_numpy(F1), bm.to_numpy(F0), atol=1e-14)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("format", ['csr', 'coo'])
+    def test_reduced_system(self, backend, format):
+        bm.set_backend(backend)
+        space, bform, lform = get_forms()
+        A, F = bform.assembly(format=format), lform.assembly()
+        bc = DirichletBC(space, gd)
+        u0 = spsolve(*bc.apply(A, F), 'scipy')
+
+        A_II, F_I = bc.reduce_system(A, F)
+        NI = space.number_of_global_dofs() - bc.boundary_dof_index.shape[0]
+        assert A_II.shape == (NI, NI)
+        assert F_I.shape == (NI, )
+        u1 = bc.recover(spsolve(A_II, F_I, 'scipy'))
+        np.testing.assert_allclose(bm.to_numpy(u1), bm.to_numpy(u0), atol=1e-12)
+
+        u2 = bc.solve_reduced(A, F, lambda A, b: cg(A, b, rtol=1e-12))
+        np.testing.assert_allclose(bm.to_numpy(u2), bm.to_numpy(u0), atol=1e-10)
+        reduced = bc._reduced
+        bc.reduce_system(bform.assembly(format=format), F)
+        assert bc._reduced is reduced
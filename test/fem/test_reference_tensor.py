@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh
+from fealpy.decorator import cartesian
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.material.elastic_material import LinearElasticMaterial
+from fealpy.fem import (
+    ScalarMassIntegrator, ScalarDiffusionIntegrator,
+    ScalarConvectionIntegrator, LinearElasticIntegrator
+)
+
+
+def get_mesh(TD):
+    if TD == 2:
+        return TriangleMesh.from_box(nx=3, ny=3)
+    return TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+
+
+def assert_close(A, B):
+    np.testing.assert_allclose(bm.to_numpy(A), bm.to_numpy(B), atol=1e-12, rtol=1e-10)
+
+
+class TestReferenceTensor:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("TD", [2, 3])
+    @pytest.mark.parametrize("p", [1, 2, 3])
+    def test_scalar_integrators(self, backend, TD, p):
+        bm.set_backend(backend)
+        mesh = get_mesh(TD)
+        space = LagrangeFESpace(mesh, p=p)
+        NC = mesh.number_of_cells()
+        c = bm.arange(NC, dtype=bm.float64) + 1.0
+        v = bm.arange(TD, dtype=bm.float64) + 1.0
+        NQ = mesh.quadrature_formula(p+2).number_of_quadrature_points()
+
+        for Int, coef, qcoef in [(ScalarMassIntegrator, 2.0, 2.0),
+                                 (ScalarMassIntegrator, c, c),
+                                 (ScalarDiffusionIntegrator, None, None),
+                                 (ScalarDiffusionIntegrator, c, c),
+                                 (ScalarConvectionIntegrator, v, bm.broadcast_to(v, (NC, NQ, TD)))]:
+            integrator = Int(coef, q=p+2)
+            assert integrator.reference_applicable(space)
+            assert_close(integrator(space), Int(qcoef, q=p+2, method='quadrature')(space))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("TD", [2, 3])
+    @pytest.mark.parametrize("priority", [True, False])
+    def test_tensor_space(self, backend, TD, priority):
+        bm.set_backend(backend)
+        mesh = get_mesh(TD)
+        space = LagrangeFESpace(mesh, p=2)
+        tspace = TensorFunctionSpace(space, (TD, -1) if priority else (-1, TD))
+
+        for Int in [ScalarMassIntegrator, ScalarDiffusionIntegrator]:
+            assert_close(Int(q=4)(tspace), Int(q=4, method='quadrature')(tspace))
+
+        hypos = ['3D'] if TD == 3 else ['plane_strain', 'plane_stress']
+        for hypo in hypos:
+            material = LinearElasticMaterial(name='E', elastic_modulus=1.0, poisson_ratio=0.3,
+                                             hypo=hypo, device=bm.get_device(mesh.node))
+            integrator = LinearElasticIntegrator(material, q=4)
+            assert integrator.reference_applicable(tspace)
+            assert_close(integrator(tspace),
+                         LinearElasticIntegrator(material, q=4, method='quadrature')(tspace))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_not_applicable(self, backend):
+        bm.set_backend(backend)
+        space = LagrangeFESpace(TriangleMesh.from_box(nx=2, ny=2), p=1)
+        coef = cartesian(lambda p: p[..., 0])
+        assert not ScalarMassIntegrator(coef).reference_applicable(space)
+        assert not ScalarDiffusionIntegrator(batched=True).reference_applicable(space)
+
+        qspace = LagrangeFESpace(QuadrangleMesh.from_box(nx=2, ny=2), p=1)
+        assert not ScalarMassIntegrator().reference_applicable(qspace)
+        with pytest.raises(RuntimeError):
+            ScalarMassIntegrator(method='fast')(qspace)
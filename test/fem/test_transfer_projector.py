@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import InterpolationProjector, L2Projector
+
+
+def quadratic(p):
+    x, y = p[..., 0], p[..., 1]
+    return x**2 + x*y - y + 1.0
+
+
+def mesh_pairs():
+    return [
+        (TriangleMesh.from_box([0, 1, 0, 1], 6, 6), QuadrangleMesh.from_box([0, 1, 0, 1], 5, 7)),
+        (QuadrangleMesh.from_box([0, 1, 0, 1], 4, 4), TriangleMesh.from_box([0, 1, 0, 1], 7, 5)),
+        (TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 2, 2),
+         HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 3, 2, 2)),
+    ]
+
+
+def integral(space, uh):
+    bcs, ws = space.mesh.quadrature_formula(4, 'cell').get_quadrature_points_and_weights()
+    val = space.value(uh, bcs)
+    return float(bm.einsum('q, cq, c ->', ws, val, space.mesh.entity_measure('cell')))
+
+
+class TestTransferProjector:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(3))
+    def test_interpolation(self, backend, k):
+        bm.set_backend(backend)
+        mesh0, mesh1 = mesh_pairs()[k]
+        space0 = LagrangeFESpace(mesh0, 2)
+        space1 = LagrangeFESpace(mesh1, 2)
+        uh0 = space0.function()
+        uh0[:] = space0.interpolate(quadratic)
+
+        P = InterpolationProjector(space0, space1)
+        uh1 = P(uh0)
+        np.testing.assert_allclose(bm.to_numpy(uh1.array),
+                                   bm.to_numpy(space1.interpolate(quadratic)), atol=1e-12)
+        assert P.assembly() is P.assembly()
+
+        fields = P(bm.stack([uh0.array, 2 * uh0.array], axis=-1))
+        assert fields.shape == (space1.number_of_global_dofs(), 2)
+        np.testing.assert_allclose(bm.to_numpy(fields[:, 1]), 2 * bm.to_numpy(uh1.array), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(3))
+    @pytest.mark.parametrize("lumped", [False, True])
+    @pytest.mark.parametrize("conservative", [False, True])
+    def test_l2_projection(self, backend, k, lumped, conservative):
+        bm.set_backend(backend)
+        mesh0, mesh1 = mesh_pairs()[k]
+        space0 = LagrangeFESpace(mesh0, 1)
+        space1 = LagrangeFESpace(mesh1, 1)
+        uh0 = space0.function()
+        uh0[:] = space0.interpolate(quadratic)
+
+        uh1 = L2Projector(space0, space1, lumped=lumped, conservative=conservative)(uh0)
+        np.testing.assert_allclose(integral(space1, uh1.array), integral(space0, uh0.array),
+                                   rtol=1e-12 if conservative else 1e-3)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_l2_projection_exact(self, backend):
+        bm.set_backend(backend)
+        mesh0 = TriangleMesh.from_box([0, 1, 0, 1], 3, 3)
+        mesh1 = TriangleMesh.from_box([0, 1, 0, 1], 4, 5)
+        space0 = LagrangeFESpace(mesh0, 1)
+        space1 = LagrangeFESpace(mesh1, 2)
+        uh0 = space0.function()
+        uh0[:] = space0.interpolate(lambda p: 1.0 + 2*p[..., 0] - p[..., 1])
+
+        # a linear function of space0 is in space1, so it is reproduced
+        uh1 = L2Projector(space0, space1)(uh0)
+        np.testing.assert_allclose(bm.to_numpy(uh1.array),
+                                   bm.to_numpy(space1.interpolate(lambda p: 1.0 + 2*p[..., 0] - p[..., 1])),
+                                   atol=1e-10)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_transfer_projector.py"])
@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+
+
+@pytest.mark.parametrize("name, mesh_factory", [
+    ('triangle', lambda: TriangleMesh.from_box([0, 1, 0, 1], 256, 256)),
+    ('quadrangle', lambda: QuadrangleMesh.from_box([0, 1, 0, 1], 256, 256)),
+    ('tetrahedron', lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 24, 24, 24)),
+    ('hexahedron', lambda: HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 32, 32, 32)),
+])
+@pytest.mark.parametrize("p", [1, 2])
+def test_eval_at_points(name, mesh_factory, p):
+    bm.set_backend('numpy')
+    mesh = mesh_factory()
+    space = LagrangeFESpace(mesh, p)
+    rng = np.random.default_rng(0)
+    uh = space.function()
+    uh[:] = bm.from_numpy(rng.random(space.number_of_global_dofs()))
+    NP = 1000000
+    points = bm.from_numpy(rng.random((NP, mesh.geo_dimension())))
+    mesh.point_locator()
+
+    start = time.time()
+    val = uh.eval_at_points(points)
+    t_val = time.time() - start
+    assert not bool(bm.any(bm.isnan(val)))
+
+    start = time.time()
+    val, gval = uh.eval_at_points(points, grad=True)
+    t_grad = time.time() - start
+
+    cells = mesh.location(points)
+    start = time.time()
+    val = uh.eval_at_points(points, hint=cells)
+    t_hint = time.time() - start
+    print(f"\n{name}, p={p}: {NP/t_val:.3e} points/s for values, {NP/t_grad:.3e} with "
+          f"gradients, {NP/t_hint:.3e} with cell hints")
@@ -104,6 +104,69 @@ class TestLagrangeFiniteElementSpace:
 
 
 
+class TestEvalAtPoints:
+    @staticmethod
+    def meshes():
+        from fealpy.mesh import (
+            TetrahedronMesh, QuadrangleMesh, HexahedronMesh, UniformMesh2d, UniformMesh3d
+        )
+        return [
+            TriangleMesh.from_box([0, 1, 0, 1], 3, 3),
+            TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 2, 2),
+            QuadrangleMesh.from_box([0, 1, 0, 1], 3, 3),
+            HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 2, 2),
+            UniformMesh2d((0, 3, 0, 3), h=(1/3, 1/3)),
+            UniformMesh3d((0, 2, 0, 2, 0, 2), h=(0.5, 0.5, 0.5)),
+        ]
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(6))
+    @pytest.mark.parametrize("p", [1, 2, 3])
+    def test_quadrature_points(self, backend, k, p):
+        bm.set_backend(backend)
+        mesh = self.meshes()[k]
+        space = LagrangeFESpace(mesh, p)
+        rng = np.random.default_rng(p)
+        uh = space.function()
+        uh[:] = bm.from_numpy(rng.random(space.number_of_global_dofs()))
+
+        qf = mesh.quadrature_formula(3, 'cell')
+        bcs, _ = qf.get_quadrature_points_and_weights()
+        points = bm.reshape(mesh.bc_to_point(bcs), (-1, mesh.geo_dimension()))
+        val = uh.eval_at_points(points)
+        np.testing.assert_allclose(bm.to_numpy(val), bm.to_numpy(uh(bcs)).reshape(-1),
+                                   atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(6))
+    def test_quadratic(self, backend, k):
+        bm.set_backend(backend)
+        def solution(p):
+            x, y = p[..., 0], p[..., 1]
+            return x**2 + 2*x*y - y**2 + (p[..., 2]*x if p.shape[-1] == 3 else 0.0)
+        def gradient(p):
+            x, y = p[..., 0], p[..., 1]
+            if p.shape[-1] == 2:
+                return bm.stack([2*x + 2*y, 2*x - 2*y], axis=-1)
+            z = p[..., 2]
+            return bm.stack([2*x + 2*y + z, 2*x - 2*y, x], axis=-1)
+
+        mesh = self.meshes()[k]
+        GD = mesh.geo_dimension()
+        space = LagrangeFESpace(mesh, 2)
+        uh = space.function()
+        uh[:] = space.interpolate(solution)
+        rng = np.random.default_rng(k)
+        points = bm.from_numpy(rng.random((200, GD)) * 1.2 - 0.1)
+        inside = np.all((bm.to_numpy(points) >= 0) & (bm.to_numpy(points) <= 1), axis=-1)
+
+        val, gval = uh.eval_at_points(points, grad=True)
+        val, gval = bm.to_numpy(val), bm.to_numpy(gval)
+        assert np.all(np.isnan(val[~inside]))
+        assert np.all(np.isnan(gval[~inside]))
+        p = points[bm.from_numpy(inside)]
+        np.testing.assert_allclose(val[inside], bm.to_numpy(solution(p)), atol=1e-12)
+        np.testing.assert_allclose(gval[inside], bm.to_numpy(gradient(p)), atol=1e-10)
 
 
 if __name__ == "__main__":
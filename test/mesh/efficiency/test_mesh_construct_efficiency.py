@@ -0,0 +1,53 @@
+import time
+import tracemalloc
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+from fealpy.mesh.utils import flocc
+
+
+def legacy_construct(mesh):
+    """The face and edge numbering by lexsort over the total entity arrays."""
+    total_face = mesh.total_face()
+    i0, i1, j = flocc(bm.sort(total_face, axis=1))
+    face = total_face[i0]
+    if mesh.top_dimension() == 3:
+        total_edge = mesh.total_edge()
+        i2, _, j = flocc(bm.sort(total_edge, axis=1))
+        edge = total_edge[i2]
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.time()
+    func()
+    t = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return t, peak
+
+
+@pytest.mark.parametrize("name, mesh_factory", [
+    ('triangle', lambda: TriangleMesh.from_box([0, 1, 0, 1], 512, 512)),
+    ('quadrangle', lambda: QuadrangleMesh.from_box([0, 1, 0, 1], 512, 512)),
+    ('tetrahedron', lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 40, 40, 40)),
+    ('hexahedron', lambda: HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 64, 64, 64)),
+])
+def test_mesh_construct(name, mesh_factory):
+    bm.set_backend('numpy')
+    mesh = mesh_factory()
+    NC = mesh.number_of_cells()
+    scale = 1e6 / NC
+
+    t0, m0 = measure(lambda: legacy_construct(mesh))
+    t1, m1 = measure(mesh.construct)
+    print(f"\n{name}: NC={NC}, per million cells: "
+          f"legacy {t0*scale:.3f} s / {m0*scale/2**20:.1f} MB, "
+          f"construct {t1*scale:.3f} s / {m1*scale/2**20:.1f} MB")
+
+    if mesh.top_dimension() == 3:
+        t2, m2 = measure(lambda: mesh.construct(lazy_edge=True))
+        print(f"{name}: lazy edges {t2*scale:.3f} s / {m2*scale/2**20:.1f} MB")
+        assert mesh.number_of_edges() > 0
@@ -0,0 +1,38 @@
+import time
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh
+
+
+@pytest.mark.parametrize("name, mesh_factory", [
+    ('triangle', lambda: TriangleMesh.from_box([0, 1, 0, 1], 256, 256)),
+    ('quadrangle', lambda: QuadrangleMesh.from_box([0, 1, 0, 1], 256, 256)),
+    ('tetrahedron', lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 24, 24, 24)),
+    ('hexahedron', lambda: HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 32, 32, 32)),
+])
+def test_point_location(name, mesh_factory):
+    bm.set_backend('numpy')
+    mesh = mesh_factory()
+    GD = mesh.geo_dimension()
+    rng = np.random.default_rng(0)
+    NP = 1000000
+    p = bm.from_numpy(rng.random((NP, GD)))
+
+    start = time.time()
+    locator = mesh.point_locator()
+    t_build = time.time() - start
+    start = time.time()
+    cells, _ = locator.locate(p)
+    t_query = time.time() - start
+    assert bool(bm.all(cells >= 0))
+
+    p = bm.clip(p + 0.1 / mesh.number_of_cells()**(1 / GD), 0.0, 1.0)
+    start = time.time()
+    cells, _ = locator.locate(p, hint=cells)
+    t_walk = time.time() - start
+    assert bool(bm.all(cells >= 0))
+    print(f"\n{name}: NC={mesh.number_of_cells()}, build {t_build:.3f} s, "
+          f"{NP/t_query:.3e} points/s by grid, {NP/t_walk:.3e} points/s by walk")
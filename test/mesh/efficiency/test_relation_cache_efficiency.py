@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+
+
+@pytest.mark.parametrize("name, mesh_factory", [
+    ('triangle', lambda: TriangleMesh.from_box([0, 1, 0, 1], 512, 512)),
+    ('tetrahedron', lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 40, 40, 40)),
+])
+@pytest.mark.parametrize("relation", ['cell_to_cell', 'boundary_node_flag',
+                                      'boundary_edge_flag', 'node_to_cell', 'node_to_node'])
+def test_relation_cache(name, mesh_factory, relation):
+    bm.set_backend('numpy')
+    mesh = mesh_factory()
+    func = getattr(mesh, relation)
+
+    start = time.time()
+    func()
+    t_build = time.time() - start
+    start = time.time()
+    for _ in range(10):
+        func()
+    t_cached = (time.time() - start) / 10
+    nbytes = mesh.relation_nbytes()[relation]
+    print(f"\n{name} {relation}: NC={mesh.number_of_cells()}, first {t_build*1e3:.2f} ms, "
+          f"cached {t_cached*1e3:.3f} ms, {nbytes/2**20:.2f} MB")
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+from fealpy.mesh.utils import flocc, flocc_keys, row_keys, sort_columns
+
+
+def meshes():
+    return [
+        TriangleMesh.from_box([0, 1, 0, 1], 5, 4),
+        QuadrangleMesh.from_box([0, 1, 0, 1], 4, 3),
+        TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 3, 2, 2),
+        HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 3, 2),
+    ]
+
+
+class TestMeshConstruct:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("base", [7, 2**40])
+    def test_flocc_keys(self, backend, base):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(0)
+        array = rng.integers(0, 7, size=(500, 4)) * (base // 7)
+        array = bm.from_numpy(array)
+        columns = sort_columns([array[:, k] for k in range(4)])
+        keys = row_keys(columns, base)
+        assert len(keys) == (1 if base == 7 else 4)
+        expected = flocc(bm.sort(array, axis=1))
+        for a, b in zip(flocc_keys(keys), expected):
+            np.testing.assert_array_equal(bm.to_numpy(a), bm.to_numpy(b))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(4))
+    def test_construct(self, backend, k):
+        bm.set_backend(backend)
+        mesh = meshes()[k]
+        total_face = mesh.total_face()
+        i0, i1, j = flocc(bm.sort(total_face, axis=1))
+        NFC = mesh.number_of_faces_of_cells()
+        np.testing.assert_array_equal(bm.to_numpy(mesh.face), bm.to_numpy(total_face[i0]))
+        np.testing.assert_array_equal(bm.to_numpy(mesh.cell2face).reshape(-1), bm.to_numpy(j))
+        np.testing.assert_array_equal(bm.to_numpy(mesh.face2cell[:, 1]), bm.to_numpy(i1 // NFC))
+
+        if mesh.top_dimension() == 3:
+            edge = bm.to_numpy(mesh.edge)
+            cell2edge = bm.to_numpy(mesh.cell2edge)
+            mesh.construct(lazy_edge=True)
+            assert 1 not in mesh.storage()
+            np.testing.assert_array_equal(bm.to_numpy(mesh.cell2edge), cell2edge)
+            np.testing.assert_array_equal(bm.to_numpy(mesh.edge), edge)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_mesh_construct.py"])
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import (
+    TriangleMesh, TetrahedronMesh, QuadrangleMesh, HexahedronMesh,
+    UniformMesh2d, UniformMesh3d
+)
+
+
+def unit_meshes():
+    return [
+        TriangleMesh.from_box([0, 1, 0, 1], 8, 8),
+        TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 3, 3, 3),
+        QuadrangleMesh.from_box([0, 1, 0, 1], 8, 8),
+        HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 3, 3, 3),
+        UniformMesh2d((0, 8, 0, 8), h=(1/8, 1/8)),
+        UniformMesh3d((0, 3, 0, 3, 0, 3), h=(1/3, 1/3, 1/3)),
+    ]
+
+
+def perturb(mesh, rng):
+    """Move the interior nodes of an unstructured mesh a little, so that the
+    tensor-product cells are not parallelograms."""
+    if isinstance(mesh, (UniformMesh2d, UniformMesh3d)):
+        return
+    node = mesh.entity('node')
+    isbd = mesh.boundary_node_flag()
+    pert = bm.from_numpy(0.04 * (rng.random(node.shape) - 0.5))
+    mesh.node = node + bm.where(isbd[:, None], 0.0, pert)
+
+
+def mapped_points(locator, mesh, cells, coords):
+    X = mesh.entity('node')[mesh.entity('cell')[cells]]
+    if locator.ref is None:
+        return bm.einsum('nv, nvg -> ng', coords, X)
+    return locator._tensor_map(coords, X)[0]
+
+
+class TestPointLocator:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(6))
+    def test_locate(self, backend, k):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(k)
+        mesh = unit_meshes()[k]
+        perturb(mesh, rng)
+        GD = mesh.geo_dimension()
+        p = rng.random((500, GD)) * 1.2 - 0.1
+        inside = np.all((p >= 0) & (p <= 1), axis=-1)
+        p = bm.from_numpy(p)
+
+        locator = mesh.point_locator()
+        cells, coords = locator.locate(p)
+        cells_np = bm.to_numpy(cells)
+        np.testing.assert_array_equal(cells_np >= 0, inside)
+
+        flag = cells >= 0
+        q = mapped_points(locator, mesh, cells[flag], coords[flag])
+        np.testing.assert_allclose(bm.to_numpy(q), bm.to_numpy(p[flag]), atol=1e-12)
+
+        if locator.ref is not None: # only the uniform meshes are not perturbed
+            assert bool(bm.all(locator.affine)) == (k >= 4)
+        J = locator.jacobi_matrix(coords[flag], cells[flag])
+        Jinv = locator.inverse_jacobi_matrix(coords[flag], cells[flag])
+        np.testing.assert_allclose(bm.to_numpy(Jinv), np.linalg.inv(bm.to_numpy(J)), atol=1e-10)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(6))
+    def test_walk(self, backend, k):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(k)
+        mesh = unit_meshes()[k]
+        perturb(mesh, rng)
+        GD = mesh.geo_dimension()
+        p = bm.from_numpy(0.05 + 0.85 * rng.random((500, GD)))
+        cells = mesh.location(p)
+        assert bool(bm.all(cells >= 0))
+
+        # move the points a little and search from their old cells
+        p = p + 0.04
+        cells = mesh.location(p, hint=cells)
+        assert bool(bm.all(cells >= 0))
+        locator = mesh.point_locator()
+        coords = locator.local_coordinates(p, cells)
+        assert bool(bm.all(locator._inside(coords)))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(6))
+    def test_nearest(self, backend, k):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(k)
+        mesh = unit_meshes()[k]
+        perturb(mesh, rng)
+        GD = mesh.geo_dimension()
+        p = rng.random((300, GD)) * 3.0 - 1.0 # mostly outside the mesh
+        bary = bm.to_numpy(mesh.entity_barycenter('cell'))
+        dist = np.sum((p[:, None, :] - bary[None, :, :])**2, axis=-1)
+
+        cells = bm.to_numpy(mesh.point_locator().nearest(bm.from_numpy(p)))
+        np.testing.assert_allclose(dist[np.arange(300), cells], np.min(dist, axis=-1), atol=1e-14)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_rebuild(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], 4, 4)
+        locator = mesh.point_locator()
+        assert mesh.point_locator() is locator
+
+        mesh.uniform_refine()
+        locator = mesh.point_locator()
+        assert locator.cell.shape[0] == mesh.number_of_cells()
+        p = bm.tensor([[0.3, 0.7], [0.95, 0.05]], dtype=mesh.ftype)
+        cells = mesh.location(p)
+        bc = mesh.entity_barycenter('cell')[cells]
+        assert bool(bm.all(bm.abs(bc - p) < 0.2))
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_point_location.py", "-k", "test_locate"])
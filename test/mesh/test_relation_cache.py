@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+
+
+def meshes():
+    return [
+        TriangleMesh.from_box([0, 1, 0, 1], 3, 2),
+        QuadrangleMesh.from_box([0, 1, 0, 1], 2, 3),
+        TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 1, 1),
+        HexahedronMesh.from_box([0, 1, 0, 1, 0, 1], 2, 1, 2),
+    ]
+
+
+def dense(csr):
+    crow, col = bm.to_numpy(csr.crow()), bm.to_numpy(csr.col())
+    A = np.zeros(csr.sparse_shape, dtype=np.int64)
+    for i in range(A.shape[0]):
+        for j in col[crow[i]:crow[i+1]]:
+            A[i, j] += 1
+    return A
+
+
+class TestRelationCache:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(4))
+    def test_adjacency(self, backend, k):
+        bm.set_backend(backend)
+        mesh = meshes()[k]
+        NN = mesh.number_of_nodes()
+        NC = mesh.number_of_cells()
+        cell = bm.to_numpy(mesh.entity('cell'))
+        edge = bm.to_numpy(mesh.entity('edge'))
+
+        node2cell = mesh.node_to_cell()
+        assert node2cell.crow().dtype == bm.int32
+        assert node2cell.values() is None
+        expected = np.zeros((NN, NC), dtype=np.int64)
+        expected[cell, np.arange(NC)[:, None]] = 1
+        np.testing.assert_array_equal(dense(node2cell), expected)
+
+        node2node = mesh.node_to_node()
+        expected = np.zeros((NN, NN), dtype=np.int64)
+        expected[edge[:, 0], edge[:, 1]] = 1
+        expected[edge[:, 1], edge[:, 0]] = 1
+        np.testing.assert_array_equal(dense(node2node), expected)
+        col = bm.to_numpy(node2node.col())
+        crow = bm.to_numpy(node2node.crow())
+        for i in range(NN):
+            assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+
+        assert mesh.node_to_cell() is node2cell
+        nbytes = mesh.relation_nbytes()
+        assert nbytes['node_to_cell'] == 4 * (NN + 1 + cell.size)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("k", range(4))
+    def test_cached_flags(self, backend, k):
+        bm.set_backend(backend)
+        mesh = meshes()[k]
+        flag = mesh.boundary_node_flag()
+        flag[:] = False # the cached flag is not modified by callers
+        assert bool(bm.any(mesh.boundary_node_flag()))
+        edge = bm.to_numpy(mesh.entity('edge'))
+        bd_edge = bm.to_numpy(mesh.boundary_edge_flag())
+        bd_node = bm.to_numpy(mesh.boundary_node_flag())
+        assert np.all(bd_node[edge[bd_edge]])
+        assert mesh.boundary_edge_index().shape[0] == bd_edge.sum()
+        assert set(mesh.relation_nbytes()) >= {'boundary_node_flag', 'boundary_edge_flag'}
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_invalidation(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], 2, 2)
+        node2cell = mesh.node_to_cell()
+        cell2cell = mesh.cell_to_cell()
+        locator = mesh.point_locator()
+        assert mesh.point_locator() is locator
+
+        mesh.uniform_refine()
+        assert len(mesh.relation_nbytes()) == 0
+        assert mesh.node_to_cell().sparse_shape == (mesh.number_of_nodes(), mesh.number_of_cells())
+        assert mesh.cell_to_cell().shape[0] == 4 * cell2cell.shape[0]
+        assert mesh.point_locator() is not locator
+        assert mesh.node_to_cell() is not node2cell
+
+        mesh.node = mesh.node * 2.0
+        assert 'node_to_cell' not in mesh.relation_nbytes()
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_relation_cache.py"])
@@ -0,0 +1,49 @@
+import time
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.fdm import LaplaceOperator
+from fealpy.solver import spsolve, cg, AMGSolver, GMGSolver
+
+
+def coef(p):
+    return 1.0 + 0.9 * bm.sin(5 * p[..., 0]) * bm.cos(3 * p[..., 1])
+
+
+@pytest.mark.parametrize("TD, n", [(2, 128), (2, 512), (3, 16), (3, 32)])
+def test_gmg_vs_amg(TD, n):
+    bm.set_backend('numpy')
+    if TD == 2:
+        mesh = UniformMesh2d((0, n, 0, n), h=(1/n, 1/n))
+    else:
+        mesh = UniformMesh3d((0, n, 0, n, 0, n), h=(1/n, 1/n, 1/n))
+    A = LaplaceOperator(mesh, coef=coef).assembly()
+    b = bm.ones((A.shape[0], ), dtype=bm.float64)
+
+    result = {}
+    solvers = [('gmg', GMGSolver())]
+    if TD == 2: # the AMG setup is too slow for the 3d grids
+        solvers.append(('amg', AMGSolver()))
+    for name, solver in solvers:
+        start = time.time()
+        if name == 'gmg':
+            solver.setup(mesh, A)
+        else:
+            solver.setup(A)
+        t_setup = time.time() - start
+        start = time.time()
+        x, info = cg(A, b, M=solver, rtol=1e-10, returninfo=True)
+        t_solve = time.time() - start
+        assert float(bm.linalg.norm(b - A @ x) / bm.linalg.norm(b)) < 1e-9
+        result[name] = x
+        print(f"\nTD={TD}, n={n}, dof={A.shape[0]}, {name}: {solver.number_of_levels()} levels, "
+              f"setup {t_setup:.3f} s, {info['niter']} cg iterations {t_solve:.3f} s")
+
+    if A.shape[0] <= 300000:
+        start = time.time()
+        x = spsolve(A, b, 'scipy')
+        print(f"TD={TD}, n={n}, spsolve {time.time() - start:.3f} s")
+        np.testing.assert_allclose(result['gmg'], x, rtol=1e-7)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor
+from fealpy.solver import cg, AMGSolver
+
+
+def laplace_2d(n):
+    """Five-point Laplacian on an n-by-n grid with Dirichlet boundary."""
+    N = n * n
+    idx = np.arange(N).reshape(n, n)
+    rows = [idx.ravel()]
+    cols = [idx.ravel()]
+    vals = [np.full(N, 4.0)]
+    for a, b in [(idx[1:, :], idx[:-1, :]), (idx[:, 1:], idx[:, :-1])]:
+        rows += [a.ravel(), b.ravel()]
+        cols += [b.ravel(), a.ravel()]
+        vals += [np.full(a.size, -1.0)] * 2
+    indices = np.stack([np.concatenate(rows), np.concatenate(cols)])
+    values = np.concatenate(vals)
+    A = COOTensor(bm.from_numpy(indices), bm.from_numpy(values), (N, N))
+    return A.coalesce().tocsr()
+
+
+class TestAMGSolver:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('ptype', ['V', 'W'])
+    def test_preconditioned_cg(self, backend, ptype):
+        bm.set_backend(backend)
+        A = laplace_2d(40)
+        x = bm.from_numpy(np.random.rand(A.shape[0]))
+        b = A @ x
+
+        solver = AMGSolver(ptype=ptype).setup(A)
+        assert solver.number_of_levels() > 2
+        for l in range(solver.number_of_levels() - 1):
+            assert solver.A[l+1].shape[0] < solver.A[l].shape[0]
+
+        x0 = cg(A, b, M=solver, rtol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(x0), bm.to_numpy(x), atol=1e-6)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_iteration_count(self, backend):
+        bm.set_backend(backend)
+        A = laplace_2d(64)
+        b = bm.ones((A.shape[0], ), dtype=bm.float64)
+        solver = AMGSolver().setup(A)
+
+        counter = {'amg': 0, 'none': 0}
+
+        class Counted:
+            def __init__(self, op, key):
+                self.op, self.key = op, key
+            def __matmul__(self, x):
+                counter[self.key] += 1
+                return self.op @ x
+
+        cg(A, b, M=Counted(solver, 'amg'), rtol=1e-8)
+        cg(Counted(A, 'none'), b, rtol=1e-8)
+        assert counter['amg'] < 20
+        assert counter['amg'] * 5 < counter['none']
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('maxlevel, nlevel', [(1, 1), (2, 2)])
+    def test_sparse_coarse_solve(self, backend, maxlevel, nlevel):
+        bm.set_backend(backend)
+        A = laplace_2d(40)
+        x = bm.from_numpy(np.random.rand(A.shape[0], 2))
+        b = A @ x
+        solver = AMGSolver(maxlevel=maxlevel, rtol=1e-10).setup(A)
+        assert solver.number_of_levels() == nlevel
+        assert solver.Ainv is None # no dense inverse above csize
+        x0 = solver.solve(b)
+        np.testing.assert_allclose(bm.to_numpy(x0), bm.to_numpy(x), atol=1e-6)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_solve_batched(self, backend):
+        bm.set_backend(backend)
+        A = laplace_2d(30)
+        x = bm.from_numpy(np.random.rand(A.shape[0], 3))
+        b = A @ x
+        x0 = AMGSolver(rtol=1e-10).setup(A).solve(b)
+        np.testing.assert_allclose(bm.to_numpy(x0), bm.to_numpy(x), atol=1e-6)
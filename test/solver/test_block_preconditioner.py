@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor, BlockCSRTensor
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace, TensorFunctionSpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, PressWorkIntegrator
+)
+from fealpy.solver import (
+    gmres, minres,
+    BlockDiagonalPreconditioner, BlockTriangularPreconditioner,
+    PressureMassSchur, PCDSchur, LSCSchur
+)
+from fealpy.solver.block_preconditioner import schur_sign
+
+
+def stokes(n, sign=1, alpha=0.0):
+    """Taylor-Hood P2/P1 (unsteady) Stokes matrix of the driven cavity on an
+    n-by-n mesh, with the velocity block alpha M + A restricted to the interior
+    dofs, the gradient block multiplied by `sign`, and the pressure mass and
+    Laplacian matrices."""
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    pspace = LagrangeFESpace(mesh, p=1)
+    uspace = TensorFunctionSpace(LagrangeFESpace(mesh, p=2), (2, -1))
+
+    bform = BilinearForm(uspace)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+    if alpha != 0.0:
+        bform.add_integrator(ScalarMassIntegrator(alpha, q=4))
+    F = bform.assembly().to_scipy()
+    bform = BilinearForm((pspace, uspace))
+    bform.add_integrator(PressWorkIntegrator(-1, q=4))
+    G = bform.assembly().to_scipy()
+    bform = BilinearForm(pspace)
+    bform.add_integrator(ScalarMassIntegrator(q=4))
+    Mp = bform.assembly()
+    bform = BilinearForm(pspace)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+    Ap = bform.assembly()
+
+    I = np.nonzero(~bm.to_numpy(uspace.is_boundary_dof()))[0]
+    F = F[I][:, I].tocsr()
+    G = G.tocsr()[I].tocsr()
+    K = BlockCSRTensor([[CSRTensor.from_scipy(F), CSRTensor.from_scipy(sign * G)],
+                        [CSRTensor.from_scipy(G.T.tocsr()), None]])
+    return K, Mp, Ap
+
+
+def rhs(K):
+    """Right-hand side in the range of K, with mean-zero pressure part."""
+    rng = np.random.default_rng(0)
+    b = K @ bm.from_numpy(rng.random(K.shape[0]))
+    bu, bp = K.split(b, axis=0)
+    return BlockCSRTensor.join([bu, bp - bm.mean(bp)])
+
+
+def relative_residual(K, x, b):
+    return float(bm.linalg.norm(b - K @ x) / bm.linalg.norm(b))
+
+
+class TestBlockPreconditioner:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("sign", [1, -1])
+    def test_schur_sign(self, backend, sign):
+        bm.set_backend(backend)
+        K, _, _ = stokes(3, sign)
+        assert schur_sign(K[1, 0], K[0, 1]) == sign
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("sign", [1, -1])
+    @pytest.mark.parametrize("schur", ['mass', 'pcd', 'lsc'])
+    def test_triangular_gmres(self, backend, sign, schur):
+        bm.set_backend(backend)
+        K, Mp, Ap = stokes(6, sign)
+        if schur == 'mass':
+            S = PressureMassSchur(Mp)
+        elif schur == 'pcd':
+            S = PCDSchur(Mp, Ap, Ap)
+        else:
+            S = LSCSchur()
+        b = rhs(K)
+        P = BlockTriangularPreconditioner(K, S)
+        x, info = gmres(K, b, solver='fealpy', M=P, rtol=1e-8, restart=50,
+                        maxiter=200, returninfo=True)
+        assert relative_residual(K, x, b) < 1e-7
+        assert info['niter'] < 60
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_diagonal_minres(self, backend):
+        bm.set_backend(backend)
+        K, Mp, _ = stokes(6)
+        b = rhs(K)
+        P = BlockDiagonalPreconditioner(K, PressureMassSchur(Mp))
+        x, info = minres(K, b, M=P, rtol=1e-8, maxiter=300, returninfo=True)
+        assert relative_residual(K, x, b) < 1e-7
+        assert info['niter'] < 100
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_mesh_independence(self, backend):
+        bm.set_backend(backend)
+        niter = []
+        for n in (4, 8, 16):
+            K, Mp, _ = stokes(n)
+            b = rhs(K)
+            P = BlockTriangularPreconditioner(K, PressureMassSchur(Mp), velocity_solver='direct')
+            _, info = gmres(K, b, solver='fealpy', M=P, rtol=1e-8, restart=50,
+                            returninfo=True)
+            niter.append(info['niter'])
+        assert niter[-1] <= niter[0] + 5
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_cahouet_chabard(self, backend):
+        bm.set_backend(backend)
+        K, Mp, Ap = stokes(6, alpha=100.0)
+        b = rhs(K)
+        P = BlockTriangularPreconditioner(K, PressureMassSchur(Mp, nu=1.0, Ap=Ap, alpha=100.0))
+        x, info = gmres(K, b, solver='fealpy', M=P, rtol=1e-8, restart=50,
+                        maxiter=200, returninfo=True)
+        assert relative_residual(K, x, b) < 1e-7
+        assert info['niter'] < 60
+
+
+if __name__ == "__main__":
+    pytest.main(['./test_block_preconditioner.py', '-q'])
@@ -4,7 +4,7 @@ import pytest
 import scipy.sparse as sp
 
 from fealpy.backend import backend_manager as bm
-from fealpy.solver import spsolve
+from fealpy.solver import spsolve, DirectSolver, factorize
 from fealpy.sparse import COOTensor, CSRTensor
 
 class TestDirectSolver:
@@ -50,6 +50,74 @@ class TestDirectSolver:
         assert self._check_solution(x0, x), "Pytorch GPU test failed!!!!!!!!!!!!!!!!!!!!!!!!"
         print("Pytorch GPU test passed!")
 
+class TestDirectSolverCache:
+
+    def _get_data(self, n=20):
+        T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+        I = sp.eye(n)
+        A = (sp.kron(T, I) + sp.kron(I, T) + 0.5 * sp.eye(n*n, k=1)).tocsr()
+        return A
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_multi_rhs(self, backend):
+        bm.set_backend(backend)
+        A = self._get_data()
+        solver = factorize(CSRTensor.from_scipy(A), 'scipy')
+        X = np.random.rand(A.shape[0], 4)
+        x = solver.solve(bm.tensor(A @ X))
+        np.testing.assert_allclose(bm.to_numpy(x), X, atol=1e-10)
+        for i in range(4):
+            x = solver @ bm.tensor(A @ X[:, i])
+            np.testing.assert_allclose(bm.to_numpy(x), X[:, i], atol=1e-10)
+        assert solver.nfactorize == 1
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_symbolic_reuse(self, backend):
+        bm.set_backend(backend)
+        A = self._get_data()
+        solver = DirectSolver('scipy', CSRTensor.from_scipy(A))
+        X = np.random.rand(A.shape[0])
+
+        for _ in range(3):
+            A.data = A.data * (1.0 + 0.1 * np.random.rand(A.nnz))
+            solver.factorize(CSRTensor.from_scipy(A))
+            x = solver.solve(bm.tensor(A @ X))
+            np.testing.assert_allclose(bm.to_numpy(x), X, atol=1e-10)
+        assert solver.nfactorize == 4
+        assert solver.nsymbolic == 1
+
+        B = self._get_data(10)
+        solver.factorize(COOTensor.from_scipy(B.tocoo()))
+        x = solver.solve(bm.tensor(B @ X[:100]))
+        np.testing.assert_allclose(bm.to_numpy(x), X[:100], atol=1e-10)
+        assert solver.nsymbolic == 2
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_mumps(self, backend):
+        pytest.importorskip('mumps')
+        bm.set_backend(backend)
+        A = self._get_data()
+        solver = DirectSolver('mumps', CSRTensor.from_scipy(A))
+        X = np.random.rand(A.shape[0], 3)
+        x = solver.solve(bm.tensor(A @ X))
+        np.testing.assert_allclose(bm.to_numpy(x), X, atol=1e-10)
+        x = solver @ bm.tensor(A @ X[:, 0])
+        np.testing.assert_allclose(bm.to_numpy(x), X[:, 0], atol=1e-10)
+
+        A.data = A.data * (1.0 + 0.1 * np.random.rand(A.nnz))
+        solver.factorize(CSRTensor.from_scipy(A))
+        x = solver.solve(bm.tensor(A @ X))
+        np.testing.assert_allclose(bm.to_numpy(x), X, atol=1e-10)
+        assert solver.nfactorize == 2
+        assert solver.nsymbolic == 1
+        solver.clear()
+
+    def test_not_factorized(self):
+        bm.set_backend('numpy')
+        with pytest.raises(RuntimeError):
+            DirectSolver('scipy').solve(bm.ones((3, )))
+
+
 if __name__ == '__main__':
     test = TestDirectSolver()
     #test.test_cpu('numpy', 'scipy')
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.sparse import CSRTensor
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+from fealpy.fdm import LaplaceOperator
+from fealpy.solver import cg, GMGSolver
+from fealpy.solver.gmg_solver import prolongation_matrix, _GridLevel
+
+
+def uniform_mesh(TD, n):
+    if TD == 2:
+        return UniformMesh2d((0, n, 0, n), h=(1/n, 1/n))
+    return UniformMesh3d((0, n, 0, n, 0, n), h=(1/n, 1/n, 1/n))
+
+
+def coef(p):
+    return 1.0 + 0.9 * bm.sin(5 * p[..., 0]) * bm.cos(3 * p[..., 1])
+
+
+class TestGMGSolver:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('bc', [('dirichlet', 'dirichlet'), ('neumann', 'periodic'),
+                                    ('periodic', 'dirichlet', 'neumann')])
+    def test_grid_operators(self, backend, bc):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(0)
+        TD = len(bc)
+        mesh = UniformMesh2d((0, 8, 0, 12), h=(1/8, 1/12)) if TD == 2 else \
+               UniformMesh3d((0, 8, 0, 4, 0, 12), h=(1/8, 1/4, 1/12))
+        cells = (8, 12) if TD == 2 else (8, 4, 12)
+        A = LaplaceOperator(mesh, bc, coef=coef).assembly()
+        fine = _GridLevel(A, cells, bc)
+        P = prolongation_matrix(cells, bc)
+        coarse = _GridLevel(P.T.tocsr() @ (A @ P), [n // 2 for n in cells], bc)
+
+        u = bm.from_numpy(rng.random(fine.grid_shape + (2, )))
+        np.testing.assert_allclose(bm.reshape(fine.matvec(u), (-1, 2)),
+                                   A @ bm.reshape(u, (-1, 2)), atol=1e-10)
+        c = bm.from_numpy(rng.random(coarse.grid_shape))
+        np.testing.assert_allclose(bm.reshape(fine.prolongate(c), (-1, )),
+                                   P @ bm.reshape(c, (-1, )), atol=1e-14)
+        r = bm.reshape(u[..., 0], (-1, ))
+        np.testing.assert_allclose(bm.reshape(fine.restrict(u[..., 0]), (-1, )),
+                                   (P.T.tocsr() @ r) / 2**TD, atol=1e-14)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('TD', [2, 3])
+    @pytest.mark.parametrize('bc', ['dirichlet', 'neumann', 'periodic'])
+    @pytest.mark.parametrize('smoother, ptype', [('gs', 'V'), ('jacobi', 'V'), ('gs', 'W'),
+                                                 ('gs', 'F')])
+    def test_mesh_independence(self, backend, TD, bc, smoother, ptype):
+        bm.set_backend(backend)
+        niter = []
+        for n in ((16, 64) if TD == 2 else (8, 16)):
+            mesh = uniform_mesh(TD, n)
+            A = LaplaceOperator(mesh, bc, coef=coef).assembly()
+            b = bm.from_numpy(np.random.default_rng(0).random(A.shape[0]))
+            if bc != 'dirichlet':
+                b = b - bm.mean(b)
+            solver = GMGSolver(ptype=ptype, smoother=smoother).setup(mesh, A, bc)
+            assert solver.number_of_levels() > 1
+            x, info = cg(A, b, M=solver, rtol=1e-10, maxiter=100, returninfo=True)
+            assert float(bm.linalg.norm(b - A @ x) / bm.linalg.norm(b)) < 1e-9
+            niter.append(info['niter'])
+        assert niter[1] <= niter[0] + 3
+        assert niter[1] <= 15
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_q1_fem(self, backend):
+        bm.set_backend(backend)
+        mesh = uniform_mesh(2, 32)
+        space = LagrangeFESpace(mesh, p=1)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+        A = bform.assembly().to_scipy()
+        I = np.nonzero(~bm.to_numpy(space.is_boundary_dof()))[0]
+        A = CSRTensor.from_scipy(A[I][:, I].tocsr())
+
+        solver = GMGSolver(rtol=1e-10).setup(mesh, A)
+        b = bm.ones((A.shape[0], ), dtype=bm.float64)
+        x = solver.solve(b)
+        assert float(bm.linalg.norm(b - A @ x) / bm.linalg.norm(b)) < 1e-9
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('n, nlevel', [(63, 1), (90, 2)])
+    @pytest.mark.parametrize('bc', ['dirichlet', 'neumann'])
+    def test_sparse_coarse_solve(self, backend, n, nlevel, bc):
+        bm.set_backend(backend)
+        mesh = uniform_mesh(2, n)
+        A = LaplaceOperator(mesh, bc).assembly()
+        b = bm.from_numpy(np.random.default_rng(0).random(A.shape[0]))
+        if bc != 'dirichlet':
+            b = b - bm.mean(b)
+        solver = GMGSolver(rtol=1e-10).setup(mesh, A, bc)
+        assert solver.number_of_levels() == nlevel
+        assert solver.Ainv is None # no dense inverse above csize
+        x = solver.solve(b)
+        assert float(bm.linalg.norm(b - A @ x) / bm.linalg.norm(b)) < 1e-9
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_setup_errors(self, backend):
+        bm.set_backend(backend)
+        mesh = uniform_mesh(2, 8)
+        A = LaplaceOperator(mesh, 'neumann').assembly()
+        with pytest.raises(ValueError):
+            GMGSolver().setup(mesh, A, 'dirichlet')
+        with pytest.raises(ValueError):
+            GMGSolver(ptype='X')
+
+
+if __name__ == "__main__":
+    pytest.main(['./test_gmg_solver.py', '-q'])
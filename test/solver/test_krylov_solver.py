@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarConvectionIntegrator
+)
+from fealpy.solver import (
+    gmres, minres, bicgstab,
+    JacobiPreconditioner, ILU0Preconditioner
+)
+
+
+def laplace_2d(n):
+    """Five-point Laplacian on an n-by-n grid as a scipy matrix."""
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+    I = sp.eye(n)
+    return (sp.kron(T, I) + sp.kron(I, T)).tocsr()
+
+
+def to_csr(A):
+    return COOTensor.from_scipy(A.tocoo()).tocsr()
+
+
+def convection_diffusion(n):
+    """Nonsymmetric matrix from the upwind convection-diffusion stencil."""
+    C = sp.diags([-1.0, 1.0], [-1, 0], shape=(n*n, n*n))
+    return to_csr(laplace_2d(n) + 0.8 * C)
+
+
+def saddle_point(n, m):
+    """Symmetric indefinite matrix [[A, B^T], [B, 0]]."""
+    A = laplace_2d(n)
+    B = sp.random(m, n*n, density=0.2, random_state=0, format='csr')
+    return to_csr(sp.bmat([[A, B.T], [B, None]]))
+
+
+class TestKrylovSolver:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('pclass', [None, JacobiPreconditioner, ILU0Preconditioner])
+    def test_nonsymmetric(self, backend, pclass):
+        bm.set_backend(backend)
+        A = convection_diffusion(12)
+        x = bm.from_numpy(np.random.rand(A.shape[0], 3))
+        b = A @ x
+        M = None if pclass is None else pclass(A)
+
+        x0, info = gmres(A, b, 'fealpy', atol=1e-14, rtol=1e-10, M=M,
+                         restart=15, returninfo=True)
+        np.testing.assert_allclose(bm.to_numpy(x0), bm.to_numpy(x), atol=1e-7)
+        assert len(info['residual']) == info['niter'] + 1
+
+        x1, info = bicgstab(A, b, rtol=1e-10, M=M, returninfo=True)
+        np.testing.assert_allclose(bm.to_numpy(x1), bm.to_numpy(x), atol=1e-7)
+        assert len(info['residual']) == info['niter'] + 1
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_batched(self, backend):
+        bm.set_backend(backend)
+        A = convection_diffusion(8)
+        b = bm.from_numpy(np.random.rand(A.shape[0], 4))
+        for solve in [lambda b, **kw: gmres(A, b, 'fealpy', rtol=1e-10, **kw),
+                      lambda b, **kw: bicgstab(A, b, rtol=1e-10, **kw)]:
+            X = solve(b)
+            XT = solve(bm.swapaxes(b, 0, 1), batch_first=True)
+            np.testing.assert_allclose(bm.to_numpy(XT), bm.to_numpy(X).T, atol=1e-12)
+            for i in range(4):
+                np.testing.assert_allclose(bm.to_numpy(X[:, i]), bm.to_numpy(solve(b[:, i])), atol=1e-7)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_gmres_maxiter(self, backend):
+        bm.set_backend(backend)
+        # An inconsistent singular system, the residual never reaches the tolerance.
+        A = to_csr(sp.diags([1.0, 2.0, 0.0]))
+        b = bm.from_numpy(np.ones(3))
+        _, info = gmres(A, b, 'fealpy', rtol=1e-10, restart=2, returninfo=True)
+        assert info['niter'] == 10000
+        _, info = gmres(A, b, 'fealpy', rtol=1e-10, maxiter=30, returninfo=True)
+        assert info['niter'] == 30
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_minres(self, backend):
+        bm.set_backend(backend)
+        K = saddle_point(10, 20)
+        x = bm.from_numpy(np.random.rand(K.shape[0], 2))
+        b = K @ x
+        x0, info = minres(K, b, rtol=1e-12, returninfo=True)
+        np.testing.assert_allclose(bm.to_numpy(x0), bm.to_numpy(x), atol=1e-6)
+        assert info['residual'][-1] < info['residual'][0]
+
+        A = to_csr(laplace_2d(10))
+        b = A @ x[:A.shape[0], 0]
+        x1 = minres(A, b, rtol=1e-10, M=JacobiPreconditioner(A))
+        np.testing.assert_allclose(bm.to_numpy(x1), bm.to_numpy(x[:A.shape[0], 0]), atol=1e-6)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_matrix_free(self, backend):
+        bm.set_backend(backend)
+        space = LagrangeFESpace(TriangleMesh.from_box(nx=6, ny=6), p=1)
+        integrators = lambda: [ScalarDiffusionIntegrator(), ScalarMassIntegrator(),
+                               ScalarConvectionIntegrator(bm.array([3.0, 1.0]))]
+        A = BilinearForm(space)
+        A.add_integrator(*integrators())
+        A = A.assembly()
+        bform = BilinearForm(space)
+        bform.add_integrator(*integrators())
+        b = bm.ones((A.shape[0], ), dtype=bm.float64)
+
+        x = gmres(bform, b, 'fealpy', rtol=1e-12)
+        y = bicgstab(bform, b, rtol=1e-12)
+        assert bform._M is None
+        np.testing.assert_allclose(bm.to_numpy(A @ x), bm.to_numpy(b), atol=1e-8)
+        np.testing.assert_allclose(bm.to_numpy(A @ y), bm.to_numpy(b), atol=1e-8)
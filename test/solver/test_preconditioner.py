@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor
+from fealpy.solver import (
+    cg, gmres,
+    JacobiPreconditioner, BlockJacobiPreconditioner,
+    SSORPreconditioner, ILU0Preconditioner
+)
+
+
+def laplace_2d(n, scale=False):
+    """Five-point Laplacian on an n-by-n grid, optionally with badly scaled rows."""
+    N = n * n
+    idx = np.arange(N).reshape(n, n)
+    rows = [idx.ravel()]
+    cols = [idx.ravel()]
+    vals = [np.full(N, 4.0)]
+    for a, b in [(idx[1:, :], idx[:-1, :]), (idx[:, 1:], idx[:, :-1])]:
+        rows += [a.ravel(), b.ravel()]
+        cols += [b.ravel(), a.ravel()]
+        vals += [np.full(a.size, -1.0)] * 2
+    row = np.concatenate(rows)
+    col = np.concatenate(cols)
+    values = np.concatenate(vals)
+    if scale:
+        s = 1.0 + 100.0 * np.random.rand(N)
+        values = values * np.sqrt(s[row] * s[col])
+    A = COOTensor(bm.from_numpy(np.stack([row, col])), bm.from_numpy(values), (N, N))
+    return A.coalesce().tocsr()
+
+
+class TestPreconditioner:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('pclass', [JacobiPreconditioner, SSORPreconditioner])
+    def test_pcg(self, backend, pclass):
+        bm.set_backend(backend)
+        A = laplace_2d(30, scale=True)
+        x = bm.from_numpy(np.random.rand(A.shape[0]))
+        b = A @ x
+
+        x0, info0 = cg(A, b, rtol=1e-10, maxiter=5000, returninfo=True)
+        x1, info1 = cg(A, b, M=pclass(A), rtol=1e-10, maxiter=5000, returninfo=True)
+        np.testing.assert_allclose(bm.to_numpy(x1), bm.to_numpy(x), atol=1e-6)
+        assert info1['niter'] < info0['niter']
+        assert len(info1['residual']) == info1['niter'] + 1
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_batched_apply(self, backend):
+        bm.set_backend(backend)
+        A = laplace_2d(10)
+        r = bm.from_numpy(np.random.rand(A.shape[0], 3))
+        for M in [JacobiPreconditioner(A), SSORPreconditioner(A), ILU0Preconditioner(A)]:
+            z = M @ r
+            for i in range(3):
+                np.testing.assert_allclose(bm.to_numpy(z[:, i]), bm.to_numpy(M @ r[:, i]))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_ilu0_tridiagonal(self, backend):
+        # ILU(0) of a tridiagonal matrix is the exact LU factorization.
+        bm.set_backend(backend)
+        N = 20
+        i = np.arange(N)
+        row = np.concatenate([i, i[1:], i[:-1]])
+        col = np.concatenate([i, i[:-1], i[1:]])
+        val = np.concatenate([np.full(N, 4.0), np.full(N-1, -1.0), np.full(N-1, -2.0)])
+        A = COOTensor(bm.from_numpy(np.stack([row, col])), bm.from_numpy(val), (N, N))
+        A = A.coalesce().tocsr()
+        M = ILU0Preconditioner(A, sweeps=N, steps=N)
+        x = bm.from_numpy(np.random.rand(N))
+        np.testing.assert_allclose(bm.to_numpy(M @ (A @ x)), bm.to_numpy(x), atol=1e-10)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_block_jacobi(self, backend):
+        bm.set_backend(backend)
+        A = laplace_2d(10)
+        N = A.shape[0]
+        blocks = bm.reshape(bm.arange(N, dtype=A.itype), (-1, 2))
+        M = BlockJacobiPreconditioner(A, blocks)
+        Ad = bm.to_numpy(A.to_dense())
+        r = np.random.rand(N)
+        z = bm.to_numpy(M @ bm.from_numpy(r))
+        for k in range(N // 2):
+            s = slice(2*k, 2*k+2)
+            np.testing.assert_allclose(Ad[s, s] @ z[s], r[s])
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_gmres_ilu0(self, backend):
+        bm.set_backend(backend)
+        A = laplace_2d(20, scale=True)
+        x = bm.from_numpy(np.random.rand(A.shape[0]))
+        b = A @ x
+        _, info0 = gmres(A, b, solver='scipy', rtol=1e-10, returninfo=True)
+        x1, info1 = gmres(A, b, solver='scipy', rtol=1e-10, M=ILU0Preconditioner(A),
+                          returninfo=True)
+        np.testing.assert_allclose(bm.to_numpy(x1), bm.to_numpy(x), atol=1e-6)
+        assert info1['niter'] < info0['niter']
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_preconditioner.py"])
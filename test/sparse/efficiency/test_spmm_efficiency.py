@@ -0,0 +1,38 @@
+import time
+
+import pytest
+import numpy as np
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.sparse._spmm import spmm_csr
+
+
+def random_csr(nrow, ncol, nnz_per_row, seed=0):
+    rng = np.random.default_rng(seed)
+    col = rng.integers(0, ncol, size=(nrow, nnz_per_row))
+    col.sort(axis=1)
+    crow = np.arange(0, nrow*nnz_per_row + 1, nnz_per_row)
+    values = rng.random(nrow*nnz_per_row)
+    return crow, col.reshape(-1), values
+
+
+@pytest.mark.parametrize("nrow", [10**5, 10**6])
+@pytest.mark.parametrize("nrhs", [1, 8])
+def test_spmm_csr_efficiency(nrow, nrhs):
+    bm.set_backend('numpy')
+    crow, col, values = random_csr(nrow, nrow, 7)
+    A = CSRTensor(crow, col, values, (nrow, nrow))
+    x = np.random.rand(nrow) if nrhs == 1 else np.random.rand(nrow, nrhs)
+
+    start = time.time()
+    y0 = A @ x # scipy sparsetools path of the numpy backend
+    t0 = time.time() - start
+
+    row = A.row()
+    start = time.time()
+    y1 = spmm_csr(crow, col, values, (nrow, nrow), x, row=row)
+    t1 = time.time() - start
+
+    np.testing.assert_allclose(y1, y0, rtol=1e-12)
+    print(f"nrow={nrow}, nrhs={nrhs}: scipy {t0:.4f} s, vectorized {t1:.4f} s")
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor, CSRTensor, BlockCSRTensor
+
+
+def random_csr(m, n, seed):
+    A = sp.random(m, n, density=0.3, random_state=seed, format='csr')
+    A.sort_indices()
+    return A
+
+
+def saddle_point():
+    A = random_csr(8, 8, 0) + sp.eye(8)
+    B = random_csr(3, 8, 1)
+    C = random_csr(3, 3, 2)
+    return A.tocsr(), B, C
+
+
+class TestBlockCSRTensor:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_matmul_and_flatten(self, backend):
+        bm.set_backend(backend)
+        A, B, C = saddle_point()
+        K = BlockCSRTensor([[CSRTensor.from_scipy(A), COOTensor.from_scipy(B.T.tocoo())],
+                            [CSRTensor.from_scipy(B), None]])
+        K0 = sp.bmat([[A, B.T], [B, None]]).toarray()
+
+        assert K.shape == (11, 11)
+        assert K.block_shape == (2, 2)
+        assert K.nnz == A.nnz + 2 * B.nnz
+        np.testing.assert_allclose(bm.to_numpy(K.to_dense()), K0)
+        np.testing.assert_allclose(bm.to_numpy(K.T.to_dense()), K0.T)
+
+        u = np.random.rand(11)
+        U = np.random.rand(11, 3)
+        np.testing.assert_allclose(bm.to_numpy(K @ bm.from_numpy(u)), K0 @ u)
+        np.testing.assert_allclose(bm.to_numpy(K @ bm.from_numpy(U)), K0 @ U)
+
+        M = K.tocsr()
+        assert M.nnz == K.nnz
+        np.testing.assert_allclose(bm.to_numpy(M @ bm.from_numpy(u)), K0 @ u)
+        u0, u1 = K.split(bm.from_numpy(u))
+        assert u0.shape == (8, ) and u1.shape == (3, )
+        np.testing.assert_allclose(bm.to_numpy(K.join([u0, u1])), u)
+        np.testing.assert_allclose(bm.to_numpy(K.diagonal()),
+                                   np.concatenate([A.diagonal(), np.zeros(3)]))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_block_update(self, backend):
+        bm.set_backend(backend)
+        A, B, C = saddle_point()
+        K = BlockCSRTensor([[CSRTensor.from_scipy(A), CSRTensor.from_scipy(B.T.tocsr())],
+                            [CSRTensor.from_scipy(B), None]])
+        M0 = K.tocsr()
+
+        # Same pattern: the flattening is kept and only the values are written.
+        A2 = A.copy()
+        A2.data = 2.0 * A2.data
+        K[0, 0] = CSRTensor.from_scipy(A2)
+        M1 = K.tocsr()
+        assert M1.crow() is M0.crow()
+        np.testing.assert_allclose(bm.to_numpy(M1.to_dense()),
+                                   sp.bmat([[A2, B.T], [B, None]]).toarray())
+        # The matrices returned before do not change.
+        np.testing.assert_allclose(bm.to_numpy(M0.to_dense()),
+                                   sp.bmat([[A, B.T], [B, None]]).toarray())
+        # Modifying a returned matrix in place does not change the next one.
+        M1.values()[:] = 0.0
+        np.testing.assert_allclose(bm.to_numpy(K.tocsr().to_dense()),
+                                   sp.bmat([[A2, B.T], [B, None]]).toarray())
+
+        # New pattern: flattened again.
+        K[1, 1] = CSRTensor.from_scipy(C)
+        M2 = K.tocsr()
+        assert M2.nnz == M1.nnz + C.nnz
+        np.testing.assert_allclose(bm.to_numpy(M2.to_dense()),
+                                   sp.bmat([[A2, B.T], [B, C]]).toarray())
+
+        with pytest.raises(ValueError):
+            K[1, 1] = CSRTensor.from_scipy(A)
+
+    def test_empty_block_row(self):
+        bm.set_backend('numpy')
+        A = CSRTensor.from_scipy(random_csr(4, 4, 3))
+        with pytest.raises(ValueError):
+            BlockCSRTensor([[A, None], [None, None]])
+        K = BlockCSRTensor([[A, None], [None, None]], row_sizes=[4, 2], col_sizes=[4, 2])
+        assert K.shape == (6, 6)
+        np.testing.assert_allclose(K @ np.ones(6), np.concatenate([A @ np.ones(4), np.zeros(2)]))
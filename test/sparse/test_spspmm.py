@@ -2,8 +2,8 @@
 import pytest
 
 from fealpy.backend import backend_manager as bm
-from fealpy.sparse._spspmm import spspmm_coo
-from fealpy.sparse import COOTensor
+from fealpy.sparse._spspmm import spspmm_coo, spspmm_csr
+from fealpy.sparse import COOTensor, CSRTensor
 
 ALL_BACKENDS = ['numpy', 'pytorch']
 
@@ -49,3 +49,55 @@ def test_spspmm_coo_valid_input(backend):
 
 # Additional tests can be added here to cover more edge cases, different shapes,
 # or to ensure consistency with other matrix multiplication methods under various conditions.
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_coo_batched_values(backend):
+    bm.set_backend(backend)
+    indices1 = bm.tensor([[0, 0, 1, 2],
+                          [0, 1, 1, 2]])
+    values1 = bm.tensor([[1., 3., 4., 2.],
+                         [2., 6., 8., 4.]], dtype=bm.float64)
+    indices2 = bm.tensor([[2, 1, 0],
+                          [0, 0, 1]])
+    values2 = bm.tensor([[3., 9., 2.],
+                         [1., 1., 1.]], dtype=bm.float64)
+
+    indices, values, output_shape = spspmm_coo(indices1, values1, (3, 3),
+                                               indices2, values2, (3, 2))
+    result = COOTensor(indices, values, output_shape).to_dense()
+
+    expected = bm.tensor([[[27., 2.],
+                           [36., 0.],
+                           [6., 0.]],
+                          [[6., 2.],
+                           [8., 0.],
+                           [4., 0.]]], dtype=bm.float64)
+
+    assert bm.allclose(result, expected)
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_csr_reuse_symbolic(backend):
+    bm.set_backend(backend)
+    crow1 = bm.tensor([0, 2, 3, 4])
+    col1 = bm.tensor([0, 1, 1, 2])
+    crow2 = bm.tensor([0, 1, 2, 3])
+    col2 = bm.tensor([1, 0, 0])
+
+    values1 = bm.tensor([1., 3., 4., 2.], dtype=bm.float64)
+    values2 = bm.tensor([2., 9., 3.], dtype=bm.float64)
+    crow, col, values, spshape = spspmm_csr(crow1, col1, values1, (3, 3),
+                                            crow2, col2, values2, (3, 2))
+    result = CSRTensor(crow, col, values, spshape).to_dense()
+    expected = bm.tensor([[27., 2.],
+                          [36., 0.],
+                          [6., 0.]], dtype=bm.float64)
+    assert bm.allclose(result, expected)
+
+    crow_, col_, values, spshape = spspmm_csr(crow1, col1, 2*values1, (3, 3),
+                                              crow2, col2, values2, (3, 2))
+    assert crow_ is crow
+    assert col_ is col
+    result = CSRTensor(crow_, col_, values, spshape).to_dense()
+    assert bm.allclose(result, 2*expected)